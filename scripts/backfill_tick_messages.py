@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Backfill the replay tick index (tick_messages) for an existing VDOS database.
+
+Replay lookups read the tick -> email/chat id mapping the engine records at
+dispatch. Databases created before that table existed have no entries, so
+this script derives each message's tick from its simulated sent_at.
+
+What it does:
+- Resolves DB path via virtualoffice.common.db (honors VDOS_DB_PATH)
+- Creates the simulation tables (including tick_messages) if missing
+- Indexes every email/chat not indexed yet (safe to re-run)
+
+Usage:
+  python scripts/backfill_tick_messages.py
+  python scripts/backfill_tick_messages.py --hours-per-day 8
+  python scripts/backfill_tick_messages.py --base-dt 2025-01-06T00:00:00+00:00
+
+--base-dt is required when the database predates simulation_state.sim_base_dt;
+use midnight (UTC) of simulated day 1.
+
+Note: Stop the simulation manager first.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Ensure local src/ is on path so we can import virtualoffice
+ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT / "src"
+if SRC_DIR.exists():
+    sys.path.insert(0, str(SRC_DIR))
+
+try:
+    from virtualoffice.common.db import execute_script
+    from virtualoffice.sim_manager.engine import SIM_SCHEMA
+    from virtualoffice.sim_manager.replay_manager import backfill_tick_messages
+except Exception as exc:
+    raise SystemExit(f"Unable to import virtualoffice: {exc}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill the replay tick index for existing emails and chats")
+    parser.add_argument("--hours-per-day", type=int, default=8, help="Workday length the simulation ran with")
+    parser.add_argument("--base-dt", help="Simulation base datetime (ISO); defaults to the stored sim_base_dt")
+    args = parser.parse_args()
+
+    base_dt = datetime.fromisoformat(args.base_dt) if args.base_dt else None
+    execute_script(SIM_SCHEMA)
+    try:
+        result = backfill_tick_messages(args.hours_per_day, base_dt=base_dt)
+    except ValueError as exc:
+        raise SystemExit(f"{exc} (use --base-dt)")
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
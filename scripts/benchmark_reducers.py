@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark the clustering reducers (t-SNE, UMAP, PCA) on synthetic embeddings.
+
+Generates unit-norm 1536-dim vectors grouped into topics (like OpenAI
+text-embedding-3-small output) and times Reducer.fit_transform plus the
+transform of 100 unseen points for each reducer and corpus size. Peak memory
+is the largest Python/NumPy allocation total tracemalloc saw during the fit.
+
+What it does:
+- Runs every available reducer (UMAP only if umap-learn is installed)
+- Optionally adds t-SNE on the raw 1536 dims (the pre-PCA behavior) for comparison
+- Prints a table, or JSON with --json
+
+Usage:
+  python scripts/benchmark_reducers.py
+  python scripts/benchmark_reducers.py --sizes 1000 10000
+  python scripts/benchmark_reducers.py --sizes 1000 --include-raw-tsne --json
+
+Note: t-SNE at 50k emails takes several minutes per run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# Ensure local src/ is on path so we can import virtualoffice
+ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT / "src"
+if SRC_DIR.exists():
+    sys.path.insert(0, str(SRC_DIR))
+
+try:
+    from virtualoffice.clustering.reducer import REDUCERS, Reducer, reducer_available
+except Exception as exc:
+    raise SystemExit(f"Unable to import virtualoffice: {exc}")
+
+
+def synthetic_embeddings(n: int, dimension: int = 1536, seed: int = 0) -> np.ndarray:
+    """n unit vectors around max(5, n // 200) topic centers."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(5, n // 200), dimension)).astype(np.float32)
+    topics = rng.integers(0, len(centers), size=n)
+    vectors = centers[topics] + rng.normal(scale=0.6, size=(n, dimension)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def run(method: str, embeddings: np.ndarray, unseen: np.ndarray, pca_components: int) -> dict:
+    reducer = Reducer(method, pca_components=pca_components)
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    reducer.fit_transform(embeddings)
+    fit_seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    reducer.transform(unseen)
+    transform_ms = (time.perf_counter() - started) * 1000
+    return {
+        "fit_seconds": round(fit_seconds, 2),
+        "peak_mb": round(peak / 2**20, 1),
+        "transform_100_ms": round(transform_ms, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare clustering reducers on synthetic embeddings")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="Corpus sizes (emails)")
+    parser.add_argument("--reducers", nargs="+", choices=REDUCERS, default=list(REDUCERS))
+    parser.add_argument("--pca-components", type=int, default=50, help="PCA pre-reduction dimensions")
+    parser.add_argument("--include-raw-tsne", action="store_true", help="Also time t-SNE without the PCA step")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    runs = [(method, args.pca_components) for method in args.reducers if reducer_available(method)]
+    skipped = [method for method in args.reducers if not reducer_available(method)]
+    if args.include_raw_tsne:
+        runs.append(("tsne", 0))
+
+    results = []
+    for size in args.sizes:
+        data = synthetic_embeddings(size + 100)
+        embeddings, unseen = data[:size], data[size:]
+        for method, pca_components in runs:
+            label = method if pca_components else f"{method} (no PCA)"
+            if not args.json:
+                print(f"{size:>7} emails  {label:<15}", end="", flush=True)
+            result = {"emails": size, "reducer": label, **run(method, embeddings, unseen, pca_components)}
+            results.append(result)
+            if not args.json:
+                print(
+                    f"  fit {result['fit_seconds']:>8.2f}s  peak {result['peak_mb']:>8.1f} MB  "
+                    f"transform(100) {result['transform_100_ms']:>7.1f} ms"
+                )
+
+    if args.json:
+        print(json.dumps({"results": results, "skipped": skipped}, indent=2))
+    elif skipped:
+        print(f"Skipped (not installed): {', '.join(skipped)}")
+
+
+if __name__ == "__main__":
+    main()
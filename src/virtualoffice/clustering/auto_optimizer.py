@@ -3,17 +3,30 @@ Auto-optimizer for clustering parameters using GPT-based quality evaluation.
 
 This module tries different parameter combinations and uses GPT to evaluate
 which clustering produces the most coherent, meaningful clusters.
+
+The sweep embeds the persona's emails once (or memory-maps the vectors saved
+with an index that already covers them) and runs t-SNE once per distinct
+perplexity. Every DBSCAN variant is then scored in memory with cheap local
+metrics (silhouette, noise %, cluster size entropy). Only the top-k
+configurations are labeled and judged by GPT, and only the winner is saved.
 """
 
 import logging
+import math
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+import numpy as np
+from sklearn.metrics import silhouette_score
+
 from virtualoffice.clustering.cluster_engine import ClusterEngine
 from virtualoffice.clustering import db
-from virtualoffice.clustering.models import ClusterMetadata
+from virtualoffice.clustering.label_generator import generate_labels_for_clusters
+from virtualoffice.clustering.reducer import Reducer
+from virtualoffice.clustering.models import ClusterLabel, ClusterMetadata, ClusterSample
 from virtualoffice.utils.completion_util import generate_text
+from virtualoffice.utils.llm_scheduler import Priority
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +53,9 @@ class ClusterQuality:
     distribution_score: float  # 0-10 based on cluster size distribution
     overall_score: float  # Weighted combination
     evaluation_details: str  # GPT's reasoning
+    silhouette: Optional[float] = None  # -1..1 on 3D coordinates, None if fewer than 2 clusters
+    size_entropy: float = 0.0  # 0-1, normalized entropy of cluster sizes
+    local_score: float = 0.0  # 0-10 from local metrics, used to shortlist for GPT
 
     def __str__(self):
         return (
@@ -115,18 +131,65 @@ def evaluate_cluster_coherence(
         samples = db.get_cluster_samples(cluster.cluster_id)
 
         if samples:
-            # Take first 3 samples
-            sample_texts = []
-            for sample in samples[:3]:
-                sample_texts.append(f"Subject: {sample.subject}\nBody: {sample.body[:200]}...")
-
-            cluster_summaries.append({
-                "label": cluster.short_label or f"Cluster {cluster.cluster_label}",
-                "description": cluster.description or "No description",
-                "num_emails": cluster.num_emails,
-                "samples": sample_texts
-            })
+            cluster_summaries.append(
+                _cluster_summary(cluster.short_label, cluster.description, cluster.cluster_label, cluster.num_emails, samples)
+            )
+
+    return _evaluate_summaries(cluster_summaries, guideline)
+
+
+def _cluster_summary(
+    short_label: Optional[str],
+    description: Optional[str],
+    cluster_label: int,
+    num_emails: int,
+    samples: list[ClusterSample],
+) -> dict:
+    """One cluster as shown to the GPT judge: label, description, size and first 3 samples."""
+    return {
+        "label": short_label or f"Cluster {cluster_label}",
+        "description": description or "No description",
+        "num_emails": num_emails,
+        "samples": [f"Subject: {sample.subject}\nBody: {sample.body[:200]}..." for sample in samples[:3]],
+    }
+
+
+def evaluate_labeled_clustering(
+    cluster_names: dict[int, ClusterLabel],
+    cluster_samples: dict[int, list[ClusterSample]],
+    cluster_labels: np.ndarray,
+    guideline: Optional[str] = None
+) -> tuple[float, str]:
+    """
+    Same GPT evaluation as evaluate_cluster_coherence, for a clustering not saved to the database.
+
+    Args:
+        cluster_names: GPT labels per cluster label
+        cluster_samples: Sampled emails per cluster label
+        cluster_labels: DBSCAN label per email
+        guideline: Optional natural language guideline for clustering
+
+    Returns:
+        (coherence_score, evaluation_details): Score 0-10 and GPT's reasoning
+    """
+    real_labels = [label for label in cluster_names if label != -1]
+    if not real_labels:
+        return 0.0, "No real clusters - all emails classified as noise"
 
+    cluster_summaries = []
+    for label in real_labels[:10]:  # Limit to 10 clusters to avoid token limits
+        samples = cluster_samples.get(label)
+        if samples:
+            name = cluster_names[label]
+            cluster_summaries.append(
+                _cluster_summary(name.short_label, name.description, label, int((cluster_labels == label).sum()), samples)
+            )
+
+    return _evaluate_summaries(cluster_summaries, guideline)
+
+
+def _evaluate_summaries(cluster_summaries: list[dict], guideline: Optional[str]) -> tuple[float, str]:
+    """Ask GPT to score how well cluster labels match their sample emails."""
     # Build GPT evaluation prompt
     if guideline:
         prompt = f"""You are evaluating the quality of email clustering results. Your job is to assess whether cluster labels accurately describe the emails within them.
@@ -183,7 +246,9 @@ Evaluate:
         response_text, tokens_used = generate_text(
             prompt=[{"role": "user", "content": prompt}],
             model="gpt-4o-mini",
-            temperature=0.3
+            temperature=0.3,
+            priority=Priority.CLUSTER_LABEL,
+            cache_method="cluster_quality",
         )
 
         # Parse response
@@ -226,17 +291,22 @@ def calculate_distribution_score(clusters: list[ClusterMetadata], total_emails:
     real_clusters = [c for c in clusters if c.cluster_label != -1]
     noise_cluster = next((c for c in clusters if c.cluster_label == -1), None)
 
-    if not real_clusters:
+    noise_emails = noise_cluster.num_emails if noise_cluster else 0
+    return _distribution_score([c.num_emails for c in real_clusters], noise_emails, total_emails)
+
+
+def _distribution_score(cluster_sizes: list[int], noise_emails: int, total_emails: int) -> float:
+    """calculate_distribution_score from real cluster sizes and the noise count."""
+    if not cluster_sizes:
         return 0.0  # All noise
 
-    noise_emails = noise_cluster.num_emails if noise_cluster else 0
     noise_pct = (noise_emails / total_emails * 100) if total_emails > 0 else 100
 
     # Penalize high noise
     noise_score = max(0, 10 - (noise_pct / 10))  # 0% noise = 10, 100% noise = 0
 
     # Check cluster count (3-15 is ideal)
-    num_clusters = len(real_clusters)
+    num_clusters = len(cluster_sizes)
     if num_clusters == 0:
         cluster_count_score = 0
     elif num_clusters < 3:
@@ -247,7 +317,6 @@ def calculate_distribution_score(clusters: list[ClusterMetadata], total_emails:
         cluster_count_score = max(0, 10 - (num_clusters - 15) * 0.5)
 
     # Check size distribution - avoid one giant cluster
-    cluster_sizes = [c.num_emails for c in real_clusters]
     if cluster_sizes:
         largest_pct = (max(cluster_sizes) / total_emails * 100)
         if largest_pct > 70:  # One cluster has >70% of emails
@@ -264,144 +333,194 @@ def calculate_distribution_score(clusters: list[ClusterMetadata], total_emails:
     return overall
 
 
+def compute_local_metrics(
+    coordinates_3d: np.ndarray,
+    cluster_labels: np.ndarray,
+    random_seed: int = 42,
+    silhouette_sample_size: int = 2000,
+) -> dict:
+    """
+    Score a clustering without any API calls.
+
+    Args:
+        coordinates_3d: Points DBSCAN ran on
+        cluster_labels: DBSCAN label per point (-1 is noise)
+        random_seed: Seed for silhouette sampling
+        silhouette_sample_size: Max points used for the silhouette score
+
+    Returns:
+        Dict with num_clusters, noise_percentage, silhouette, size_entropy,
+        distribution_score and local_score (0-10)
+    """
+    total = len(cluster_labels)
+    clustered = cluster_labels != -1
+    noise_emails = int(total - clustered.sum())
+    labels, sizes = np.unique(cluster_labels[clustered], return_counts=True)
+    num_clusters = len(labels)
+
+    silhouette = None
+    if 2 <= num_clusters < int(clustered.sum()):
+        silhouette = float(silhouette_score(
+            coordinates_3d[clustered],
+            cluster_labels[clustered],
+            sample_size=min(int(clustered.sum()), silhouette_sample_size),
+            random_state=random_seed,
+        ))
+
+    size_entropy = 0.0
+    if num_clusters > 1:
+        shares = sizes / sizes.sum()
+        size_entropy = float(-(shares * np.log(shares)).sum() / math.log(num_clusters))
+
+    distribution_score = _distribution_score(sizes.tolist(), noise_emails, total)
+    silhouette_score_10 = (silhouette + 1) * 5 if silhouette is not None else 5.0
+    local_score = silhouette_score_10 * 0.4 + distribution_score * 0.4 + size_entropy * 10 * 0.2
+
+    return {
+        "num_clusters": num_clusters,
+        "noise_percentage": (noise_emails / total * 100) if total > 0 else 100,
+        "silhouette": silhouette,
+        "size_entropy": size_entropy,
+        "distribution_score": distribution_score,
+        "local_score": local_score,
+    }
+
+
 def optimize_parameters(
     persona_id: int,
     progress_callback=None,
-    guideline: Optional[str] = None
+    guideline: Optional[str] = None,
+    top_k: int = 3,
 ) -> tuple[ParameterConfig, ClusterQuality]:
     """
     Auto-optimize clustering parameters for a persona.
 
-    Tests multiple parameter configurations, evaluates each with GPT,
-    and returns the best configuration.
+    Embeds the persona's emails once, scores every configuration of the grid
+    with local metrics, evaluates the top_k with GPT, and saves the index for
+    the best one.
 
     Args:
         persona_id: The persona to optimize for
         progress_callback: Optional callback(step, percent, config) for progress updates
+        guideline: Optional natural language guideline for clustering
+        top_k: Number of locally best configurations to label and evaluate with GPT
 
     Returns:
         (best_config, best_quality): Best parameter configuration and its quality metrics
     """
     logger.info(f"Starting parameter optimization for persona {persona_id}")
 
-    # Get email count to determine parameter grid
-    with db.get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT persona_name, total_emails FROM persona_indexes WHERE persona_id = ?",
-            (persona_id,)
-        )
-        row = cursor.fetchone()
-        if not row:
-            # Need to check vdos.db for email count
-            from virtualoffice.common.db import get_connection as get_vdos_connection
-            with get_vdos_connection() as vdos_conn:
-                vdos_cursor = vdos_conn.cursor()
-                vdos_cursor.execute("""
-                    SELECT p.name, p.email_address
-                    FROM people p
-                    WHERE p.id = ?
-                """, (persona_id,))
-                person_row = vdos_cursor.fetchone()
-                if not person_row:
-                    raise ValueError(f"Persona {persona_id} not found")
-
-                persona_name, email_address = person_row
-                vdos_cursor.execute(
-                    "SELECT COUNT(*) FROM emails WHERE sender = ?",
-                    (email_address,)
-                )
-                total_emails = vdos_cursor.fetchone()[0]
-        else:
-            persona_name, total_emails = row
+    if progress_callback:
+        progress_callback("Embedding emails", 0, None)
 
-    logger.info(f"Optimizing for {persona_name} with {total_emails} emails")
+    base_engine = ClusterEngine()
+    corpus = base_engine.load_corpus(persona_id, reuse_index=True)
+    total_emails = len(corpus.emails)
+
+    logger.info(f"Optimizing persona {persona_id} with {total_emails} emails")
 
     # Generate parameter grid
     configs = generate_parameter_grid(total_emails)
     logger.info(f"Testing {len(configs)} parameter configurations")
 
-    results = []
-    all_results = []  # Track all results including all-noise configs for fallback
+    projections: dict[float, tuple[Reducer, np.ndarray]] = {}  # effective perplexity -> fitted reducer, 3D coordinates
+    scored = []  # (quality, coordinates_3d, cluster_labels)
 
     for i, config in enumerate(configs):
         if progress_callback:
             progress_callback(
-                f"Testing config {i+1}/{len(configs)}",
-                (i / len(configs)) * 90,  # Reserve 10% for final selection
+                f"Scoring config {i+1}/{len(configs)}",
+                5 + (i / len(configs)) * 55,  # GPT evaluation and saving take the rest
                 config
             )
 
-        logger.info(f"Testing configuration {i+1}/{len(configs)}: {config}")
-
         try:
-            # Run clustering with this config
             engine = ClusterEngine(
                 dbscan_eps=config.dbscan_eps,
                 dbscan_min_samples=config.dbscan_min_samples,
-                tsne_perplexity=config.tsne_perplexity
+                tsne_perplexity=config.tsne_perplexity,
+                random_seed=base_engine.random_seed,
             )
+            perplexity = engine.effective_perplexity(total_emails)
+            if perplexity not in projections:
+                projections[perplexity] = engine.fit_reducer(corpus.embeddings)
+            coordinates_3d = projections[perplexity][1]
+            cluster_labels = engine._run_dbscan(coordinates_3d)
+            metrics = compute_local_metrics(coordinates_3d, cluster_labels, base_engine.random_seed)
+        except Exception as e:
+            logger.error(f"Failed to test config {config}: {e}")
+            continue
 
-            # Build index (this will save to database)
-            engine.build_index(persona_id, lambda s, p: None)
-
-            # Get results
-            clusters = db.get_clusters_for_persona(persona_id)
-
-            logger.info(f"Config {i+1}: Found {len(clusters)} total clusters")
-
-            # Calculate metrics
-            noise_cluster = next((c for c in clusters if c.cluster_label == -1), None)
-            noise_emails = noise_cluster.num_emails if noise_cluster else 0
-            noise_pct = (noise_emails / total_emails * 100) if total_emails > 0 else 100
-            num_real_clusters = len([c for c in clusters if c.cluster_label != -1])
-
-            logger.info(f"Config {i+1}: {num_real_clusters} real clusters, {noise_pct:.1f}% noise")
-
-            # Only evaluate with GPT if we have actual clusters
-            if num_real_clusters > 0:
-                coherence_score, evaluation = evaluate_cluster_coherence(clusters, persona_id, guideline)
-                distribution_score = calculate_distribution_score(clusters, total_emails)
-                overall_score = (coherence_score * 0.6 + distribution_score * 0.4)
-            else:
-                # All noise - use noise percentage as negative score
-                coherence_score = 0.0
-                evaluation = "No clusters formed - all emails classified as noise"
-                distribution_score = 0.0
-                overall_score = -(noise_pct / 10.0)  # Negative score based on noise %
-
-            quality = ClusterQuality(
-                config=config,
-                total_emails=total_emails,
-                num_clusters=num_real_clusters,
-                noise_percentage=noise_pct,
-                coherence_score=coherence_score,
-                distribution_score=distribution_score,
-                overall_score=overall_score,
-                evaluation_details=evaluation
-            )
+        has_clusters = metrics["num_clusters"] > 0
+        quality = ClusterQuality(
+            config=config,
+            total_emails=total_emails,
+            num_clusters=metrics["num_clusters"],
+            noise_percentage=metrics["noise_percentage"],
+            coherence_score=0.0,
+            distribution_score=metrics["distribution_score"],
+            # All noise - use noise percentage as negative score
+            overall_score=metrics["local_score"] if has_clusters else -(metrics["noise_percentage"] / 10.0),
+            evaluation_details=(
+                "Not evaluated with GPT" if has_clusters
+                else "No clusters formed - all emails classified as noise"
+            ),
+            silhouette=metrics["silhouette"],
+            size_entropy=metrics["size_entropy"],
+            local_score=metrics["local_score"],
+        )
+        scored.append((quality, coordinates_3d, cluster_labels))
+        logger.info(
+            f"Config {i+1}: {quality.num_clusters} clusters, {quality.noise_percentage:.1f}% noise, "
+            f"local score {quality.local_score:.2f}/10"
+        )
 
-            all_results.append(quality)
+    logger.info(f"Ran t-SNE {len(projections)} times for {len(configs)} configurations")
 
-            # Only add to results if it produced actual clusters
-            if num_real_clusters > 0:
-                results.append(quality)
-                logger.info(f"Config {i+1} score: {overall_score:.2f}/10 ✓")
-            else:
-                logger.warning(f"Config {i+1} produced no clusters (all noise)")
+    # Spend GPT only on the locally best configurations
+    shortlist = sorted(
+        (entry for entry in scored if entry[0].num_clusters > 0),
+        key=lambda entry: entry[0].local_score,
+        reverse=True,
+    )[:max(1, top_k)]
 
+    evaluated = []  # (quality, coordinates_3d, cluster_labels, cluster_names)
+    for rank, (quality, coordinates_3d, cluster_labels) in enumerate(shortlist):
+        if progress_callback:
+            progress_callback(
+                f"Evaluating top config {rank+1}/{len(shortlist)} with GPT",
+                60 + (rank / len(shortlist)) * 30,
+                quality.config
+            )
+        try:
+            cluster_samples = base_engine._sample_clusters(corpus.emails, cluster_labels)
+            cluster_names = generate_labels_for_clusters(cluster_samples)
+            quality.coherence_score, quality.evaluation_details = evaluate_labeled_clustering(
+                cluster_names, cluster_samples, cluster_labels, guideline
+            )
         except Exception as e:
-            logger.error(f"Failed to test config {config}: {e}")
+            logger.error(f"Failed to evaluate config {quality.config}: {e}")
             continue
+        quality.overall_score = quality.coherence_score * 0.6 + quality.distribution_score * 0.4
+        evaluated.append((quality, coordinates_3d, cluster_labels, cluster_names))
+        logger.info(f"Config {quality.config} score: {quality.overall_score:.2f}/10 ✓")
 
     # Find best configuration
-    if results:
+    if evaluated:
         # Use best configuration that produced actual clusters
-        best_quality = max(results, key=lambda q: q.overall_score)
+        best_quality, coordinates_3d, cluster_labels, cluster_names = max(
+            evaluated, key=lambda entry: entry[0].overall_score
+        )
         logger.info("Selected best configuration from cluster-producing configs")
-    elif all_results:
+    elif shortlist:
+        # GPT evaluation failed for every shortlisted config: fall back to the best local score
+        best_quality, coordinates_3d, cluster_labels = shortlist[0]
+        cluster_names = None
+        logger.warning("GPT evaluation failed for all shortlisted configs; using the best local score")
+    elif scored:
         # Fallback: all configs produced only noise, pick the one with least noise
-        best_quality = min(all_results, key=lambda q: q.noise_percentage)
+        best_quality, coordinates_3d, cluster_labels = min(scored, key=lambda entry: entry[0].noise_percentage)
+        cluster_names = None
         logger.warning(
             f"All configurations produced only noise! "
             f"Using config with lowest noise: {best_quality.noise_percentage:.1f}%"
@@ -410,17 +529,26 @@ def optimize_parameters(
         raise ValueError("No configurations produced valid results")
 
     if progress_callback:
-        progress_callback("Selecting best configuration", 95, best_quality.config)
+        progress_callback("Saving best configuration", 95, best_quality.config)
 
     logger.info(f"Best configuration: {best_quality.config} with score {best_quality.overall_score:.2f}/10")
 
-    # Re-run with best config to ensure it's saved in database
+    # Save only the winner, reusing its embeddings, projection, clusters and labels
     engine = ClusterEngine(
         dbscan_eps=best_quality.config.dbscan_eps,
         dbscan_min_samples=best_quality.config.dbscan_min_samples,
-        tsne_perplexity=best_quality.config.tsne_perplexity
+        tsne_perplexity=best_quality.config.tsne_perplexity,
+        random_seed=base_engine.random_seed,
+    )
+    engine.build_index(
+        persona_id,
+        lambda s, p: None,
+        corpus=corpus,
+        coordinates_3d=coordinates_3d,
+        cluster_labels=cluster_labels,
+        cluster_names=cluster_names,
+        reducer=projections[engine.effective_perplexity(total_emails)][0],
     )
-    engine.build_index(persona_id, lambda s, p: None)
 
     if progress_callback:
         progress_callback("Optimization complete", 100, best_quality.config)
@@ -3,26 +3,30 @@ Main clustering engine that orchestrates the entire pipeline.
 
 Pipeline steps:
 1. Extract emails for persona from vdos.db
-2. Generate embeddings via OpenAI API
+2. Generate embeddings via OpenAI API (reusing cached vectors)
 3. Store embeddings in FAISS
-4. Run t-SNE for dimensionality reduction to 3D
+4. Reduce to 3D (PCA pre-reduction, then t-SNE, UMAP or PCA; see reducer.py)
 5. Run DBSCAN clustering on 3D coordinates
 6. Sample 3-5 emails per cluster
 7. Generate GPT labels for each cluster
 8. Save all data to email_clusters.db
+
+update_index adds emails sent since the last build without refitting the
+reducer or re-running DBSCAN, falling back to a full build when the index has drifted.
 """
 
 import logging
 import random
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, Callable
 import numpy as np
 from sklearn.cluster import DBSCAN
-from sklearn.manifold import TSNE
 
 from virtualoffice.common.db import get_connection as get_vdos_connection
 from virtualoffice.clustering import db
 from virtualoffice.clustering.models import (
+    ClusterLabel,
     ClusterMetadata,
     ClusterPoint,
     ClusterSample,
@@ -30,14 +34,38 @@ from virtualoffice.clustering.models import (
     PersonaIndexStatus,
 )
 from virtualoffice.clustering.embedding_util import (
-    generate_embeddings_batch,
+    generate_embeddings_cached,
     prepare_email_text_for_embedding,
 )
-from virtualoffice.clustering.faiss_store import FaissStore
+from virtualoffice.clustering.faiss_store import (
+    FaissStore,
+    delete_store_for_persona,
+    load_store_for_persona,
+    load_vectors_for_persona,
+)
 from virtualoffice.clustering.label_generator import generate_labels_for_clusters
+from virtualoffice.clustering.reducer import (
+    Reducer,
+    delete_reducer_for_persona,
+    load_reducer_for_persona,
+    save_reducer_for_persona,
+)
 
 logger = logging.getLogger(__name__)
 
+# Drift thresholds for ClusterEngine.update_index
+DEFAULT_MAX_NEW_SHARE = 0.3
+DEFAULT_MAX_NOISE_SHARE = 0.5
+
+
+@dataclass
+class EmailCorpus:
+    """A persona's emails and their embeddings, row-aligned (see ClusterEngine.load_corpus)."""
+
+    emails: list[EmailData]
+    embeddings: np.ndarray
+    email_ids: list[int]
+
 
 class ClusterEngine:
     """Main engine for email clustering operations."""
@@ -50,6 +78,8 @@ class ClusterEngine:
         dbscan_eps: float = 10.0,
         dbscan_min_samples: int = 3,
         random_seed: int = 42,
+        reducer: str = "tsne",
+        pca_components: int = 50,
     ):
         """
         Initialize clustering engine with parameters.
@@ -61,6 +91,8 @@ class ClusterEngine:
             dbscan_eps: DBSCAN epsilon (neighborhood distance, for normalized 0-100 coordinates)
             dbscan_min_samples: DBSCAN minimum samples per cluster
             random_seed: Random seed for reproducibility
+            reducer: 3D reduction method ("tsne", "umap" or "pca")
+            pca_components: Dimensions kept by the PCA step before t-SNE/UMAP
         """
         self.embedding_model = embedding_model
         self.tsne_perplexity = tsne_perplexity
@@ -68,9 +100,47 @@ class ClusterEngine:
         self.dbscan_eps = dbscan_eps
         self.dbscan_min_samples = dbscan_min_samples
         self.random_seed = random_seed
+        self.reducer = reducer
+        self.pca_components = pca_components
+
+    def load_corpus(self, persona_id: int, reuse_index: bool = False) -> EmailCorpus:
+        """
+        Extract a persona's emails and embed them.
+
+        Callers that build several indexes from the same emails (e.g. the
+        parameter optimizer) load the corpus once and pass it to build_index.
+
+        Args:
+            persona_id: Persona ID
+            reuse_index: Memory-map the vectors saved with the persona's index
+                instead of embedding, when that index holds exactly these emails
+                (same ids, same order) and was built with this embedding model
+
+        Raises:
+            ValueError: If the persona does not exist or has no emails
+        """
+        emails = self._extract_emails_for_persona(persona_id)
+        if not emails:
+            raise ValueError(f"No emails found for persona {persona_id}")
+        if reuse_index:
+            status = db.get_persona_index_status(persona_id)
+            saved = load_vectors_for_persona(persona_id) if status and status.embedding_model == self.embedding_model else None
+            if saved is not None and saved[1] == [email.email_id for email in emails]:
+                logger.info(f"Reusing {len(emails)} indexed embeddings for persona {persona_id}")
+                return EmailCorpus(emails=emails, embeddings=saved[0], email_ids=saved[1])
+        embeddings, email_ids = self._generate_embeddings(emails, None)
+        return EmailCorpus(emails=emails, embeddings=embeddings, email_ids=email_ids)
 
     def build_index(
-        self, persona_id: int, progress_callback: Optional[Callable[[str, float], None]] = None
+        self,
+        persona_id: int,
+        progress_callback: Optional[Callable[[str, float], None]] = None,
+        *,
+        corpus: Optional[EmailCorpus] = None,
+        coordinates_3d: Optional[np.ndarray] = None,
+        cluster_labels: Optional[np.ndarray] = None,
+        cluster_names: Optional[dict[int, ClusterLabel]] = None,
+        reducer: Optional[Reducer] = None,
     ) -> PersonaIndexStatus:
         """
         Build complete clustering index for a persona.
@@ -78,14 +148,21 @@ class ClusterEngine:
         This is the main pipeline that:
         1. Extracts emails
         2. Generates embeddings
-        3. Runs t-SNE
+        3. Reduces embeddings to 3D
         4. Runs DBSCAN
         5. Samples and labels clusters
         6. Saves all data
 
+        Results computed beforehand can be passed in to skip their step.
+
         Args:
             persona_id: Persona ID to build index for
             progress_callback: Optional callback(step_name, progress_percent)
+            corpus: Emails and embeddings from load_corpus (skips steps 1-2)
+            coordinates_3d: Normalized 3D coordinates for the corpus (skips reduction)
+            cluster_labels: DBSCAN label per email (skips DBSCAN)
+            cluster_names: GPT labels per cluster label (skips labeling)
+            reducer: Fitted reducer that produced coordinates_3d, saved for incremental updates
 
         Returns:
             PersonaIndexStatus with indexing results
@@ -99,7 +176,7 @@ class ClusterEngine:
 
             # Step 1: Extract emails for persona
             self._report_progress(progress_callback, "Extracting emails", 5.0)
-            emails = self._extract_emails_for_persona(persona_id)
+            emails = corpus.emails if corpus is not None else self._extract_emails_for_persona(persona_id)
 
             if not emails:
                 raise ValueError(f"No emails found for persona {persona_id}")
@@ -120,43 +197,54 @@ class ClusterEngine:
             db.save_persona_index_status(status)
 
             # Step 2: Generate embeddings
-            self._report_progress(progress_callback, "Generating embeddings", 10.0)
-            embeddings, email_ids = self._generate_embeddings(emails, progress_callback)
+            if corpus is not None:
+                embeddings, email_ids = corpus.embeddings, corpus.email_ids
+            else:
+                self._report_progress(progress_callback, "Generating embeddings", 10.0)
+                embeddings, email_ids = self._generate_embeddings(emails, progress_callback)
 
             # Step 3: Store in FAISS
             self._report_progress(progress_callback, "Storing embeddings", 50.0)
             faiss_store = self._store_embeddings(persona_id, embeddings, email_ids)
 
-            # Step 4: Run t-SNE
-            self._report_progress(progress_callback, "Running t-SNE dimensionality reduction", 55.0)
-            coordinates_3d = self._run_tsne(embeddings)
+            # Step 4: Reduce to 3D
+            if coordinates_3d is None:
+                self._report_progress(progress_callback, f"Running {self.reducer} dimensionality reduction", 55.0)
+                reducer, coordinates_3d = self.fit_reducer(embeddings)
 
             # Step 5: Run DBSCAN clustering
-            self._report_progress(progress_callback, "Running DBSCAN clustering", 70.0)
-            cluster_labels = self._run_dbscan(coordinates_3d)
+            if cluster_labels is None:
+                self._report_progress(progress_callback, "Running DBSCAN clustering", 70.0)
+                cluster_labels = self._run_dbscan(coordinates_3d)
 
             # Step 6: Create cluster points
             points = self._create_cluster_points(emails, coordinates_3d, cluster_labels)
 
-            # Step 7: Sample emails per cluster
-            self._report_progress(progress_callback, "Sampling emails from clusters", 80.0)
-            cluster_samples = self._sample_clusters(emails, cluster_labels)
+            # Step 7-8: Sample emails per cluster and generate GPT labels
+            if cluster_names is None:
+                self._report_progress(progress_callback, "Sampling emails from clusters", 80.0)
+                cluster_samples = self._sample_clusters(emails, cluster_labels)
 
-            # Step 8: Generate GPT labels
-            self._report_progress(progress_callback, "Generating cluster labels with GPT", 85.0)
-            cluster_labels_gpt = generate_labels_for_clusters(cluster_samples)
+                self._report_progress(progress_callback, "Generating cluster labels with GPT", 85.0)
+                cluster_names = generate_labels_for_clusters(cluster_samples)
 
             # Step 9: Save clusters to database
             self._report_progress(progress_callback, "Saving cluster data", 90.0)
-            self._save_clusters(persona_id, points, cluster_labels_gpt, coordinates_3d, cluster_labels)
+            self._save_clusters(persona_id, points, cluster_names, coordinates_3d, cluster_labels)
 
-            # Step 10: Save FAISS index
+            # Step 10: Save FAISS index and the fitted reducer (a stale one would misplace new emails)
             self._report_progress(progress_callback, "Saving FAISS index", 95.0)
             faiss_store.save()
+            if reducer is not None:
+                save_reducer_for_persona(persona_id, reducer)
+            else:
+                delete_reducer_for_persona(persona_id)
 
             # Update status to completed
             status.status = "completed"
             status.indexed_at = datetime.now()
+            status.last_indexed_email_id = max(email_ids)
+            status.full_build_emails = len(emails)
             db.save_persona_index_status(status)
 
             self._report_progress(progress_callback, "Completed", 100.0)
@@ -182,8 +270,150 @@ class ClusterEngine:
             db.save_persona_index_status(status)
             raise
 
-    def _extract_emails_for_persona(self, persona_id: int) -> list[EmailData]:
-        """Extract all emails sent by a persona from vdos.db."""
+    def update_index(
+        self,
+        persona_id: int,
+        progress_callback: Optional[Callable[[str, float], None]] = None,
+        *,
+        max_new_share: float = DEFAULT_MAX_NEW_SHARE,
+        max_noise_share: float = DEFAULT_MAX_NOISE_SHARE,
+        neighbors: int = 5,
+    ) -> PersonaIndexStatus:
+        """
+        Add emails sent since the last build to a persona's existing index.
+
+        Only emails with id > last_indexed_email_id are embedded and appended to
+        the FAISS store. Each new email takes the cluster most of its nearest
+        indexed neighbors (in embedding space) belong to. Its 3D position comes
+        from the reducer saved by the last full build, or is interpolated from
+        the neighbors' positions when there is none. Existing positions and GPT
+        labels stay unchanged. A full rebuild runs instead when there is no usable index,
+        or when the update would leave more than max_new_share of the emails
+        added since the last full build or more than max_noise_share of them
+        in noise.
+
+        Args:
+            persona_id: Persona ID to update
+            progress_callback: Optional callback(step_name, progress_percent)
+            max_new_share: Share of emails added since the last full build that forces a rebuild
+            max_noise_share: Share of noise points that forces a rebuild
+            neighbors: Nearest indexed emails consulted per new email
+
+        Returns:
+            PersonaIndexStatus with indexing results
+        """
+        self._report_progress(progress_callback, "Checking existing index", 0.0)
+        status = db.get_persona_index_status(persona_id)
+        store = load_store_for_persona(persona_id) if status is not None else None
+        if (
+            status is None
+            or status.status != "completed"
+            or status.last_indexed_email_id is None
+            or not status.full_build_emails
+            or store is None
+            or store.size() == 0
+        ):
+            return self._rebuild_index(persona_id, progress_callback, "no incremental index")
+        store.dimension = store.index.d
+
+        self._report_progress(progress_callback, "Extracting new emails", 5.0)
+        new_emails = self._extract_emails_for_persona(persona_id, after_email_id=status.last_indexed_email_id)
+        if not new_emails:
+            logger.info(f"Index for persona {persona_id} is up to date")
+            self._report_progress(progress_callback, "Completed", 100.0)
+            return status
+
+        total = store.size() + len(new_emails)
+        new_share = (total - status.full_build_emails) / total
+        if new_share > max_new_share:
+            return self._rebuild_index(persona_id, progress_callback, f"{new_share:.0%} of emails added since last build")
+
+        self._report_progress(progress_callback, "Generating embeddings", 20.0)
+        embeddings, email_ids = self._generate_embeddings(new_emails, progress_callback)
+
+        self._report_progress(progress_callback, "Assigning new emails to clusters", 60.0)
+        known = db.get_email_coordinates(persona_id)
+        coordinates_3d, cluster_labels = self._project_new_points(store, known, embeddings, neighbors)
+        reducer = load_reducer_for_persona(persona_id)
+        if reducer is not None:
+            coordinates_3d = reducer.transform(embeddings)
+        noise = sum(1 for *_, label in known.values() if label == -1) + int((cluster_labels == -1).sum())
+        noise_share = noise / (len(known) + len(new_emails))
+        if noise_share > max_noise_share:
+            return self._rebuild_index(persona_id, progress_callback, f"{noise_share:.0%} of emails are noise")
+
+        self._report_progress(progress_callback, "Saving cluster data", 80.0)
+        start_index = store.size()
+        store.add_vectors(embeddings, email_ids)
+        db.save_email_positions(
+            self._create_cluster_points(new_emails, coordinates_3d, cluster_labels), persona_id, start_index=start_index
+        )
+        db.refresh_cluster_stats(persona_id)
+
+        self._report_progress(progress_callback, "Saving FAISS index", 95.0)
+        store.save()
+
+        status.total_emails = store.size()
+        status.indexed_at = datetime.now()
+        status.last_indexed_email_id = max(status.last_indexed_email_id, max(email_ids))
+        db.save_persona_index_status(status)
+        self._report_progress(progress_callback, "Completed", 100.0)
+
+        logger.info(
+            f"Incrementally indexed {len(new_emails)} emails for persona {persona_id} "
+            f"({int((cluster_labels == -1).sum())} noise, {total} total)"
+        )
+        return status
+
+    def _rebuild_index(
+        self, persona_id: int, progress_callback: Optional[Callable[[str, float], None]], reason: str
+    ) -> PersonaIndexStatus:
+        """Drop a persona's index and build it from scratch."""
+        logger.info(f"Full rebuild of persona {persona_id} index ({reason})")
+        db.delete_persona_index(persona_id)
+        delete_store_for_persona(persona_id)
+        delete_reducer_for_persona(persona_id)
+        return self.build_index(persona_id, progress_callback)
+
+    def _project_new_points(
+        self,
+        store: FaissStore,
+        known: dict[int, tuple[float, float, float, int]],
+        embeddings: np.ndarray,
+        neighbors: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Place new embeddings in the existing 3D map by k-NN interpolation and vote.
+
+        Coordinates are the inverse-distance weighted mean of the neighbors'
+        positions; the cluster is the label with the largest summed weight
+        (noise counts as a label, so emails near noise stay noise).
+        """
+        k = min(neighbors, store.size())
+        distances, indices = store.index.search(np.ascontiguousarray(embeddings, dtype=np.float32), k)
+        indexed_ids = store.get_email_ids()
+
+        coordinates = np.zeros((len(embeddings), 3))
+        labels = np.full(len(embeddings), -1)
+        for row in range(len(embeddings)):
+            neighbors_found = [
+                (known[indexed_ids[idx]], dist)
+                for idx, dist in zip(indices[row], distances[row])
+                if idx >= 0 and indexed_ids[idx] in known
+            ]
+            if not neighbors_found:
+                continue
+            # IndexFlatL2 returns squared distances
+            weights = np.array([1.0 / (np.sqrt(max(dist, 0.0)) + 1e-6) for _, dist in neighbors_found])
+            positions = np.array([position[:3] for position, _ in neighbors_found])
+            coordinates[row] = weights @ positions / weights.sum()
+            votes: dict[int, float] = {}
+            for (position, _), weight in zip(neighbors_found, weights):
+                votes[position[3]] = votes.get(position[3], 0.0) + weight
+            labels[row] = max(votes, key=votes.get)
+        return coordinates, labels
+
+    def _extract_emails_for_persona(self, persona_id: int, after_email_id: Optional[int] = None) -> list[EmailData]:
+        """Extract emails sent by a persona from vdos.db (only ids above after_email_id, if given)."""
         # Get persona's email address from people table
         with get_vdos_connection() as conn:
             cursor = conn.cursor()
@@ -206,10 +436,10 @@ class ClusterEngine:
                 """
                 SELECT id, sender, subject, body, sent_at
                 FROM emails
-                WHERE sender = ?
+                WHERE sender = ? AND id > ?
                 ORDER BY sent_at
             """,
-                (persona_email,),
+                (persona_email, after_email_id if after_email_id is not None else 0),
             )
 
             rows = cursor.fetchall()
@@ -235,17 +465,15 @@ class ClusterEngine:
     def _generate_embeddings(
         self, emails: list[EmailData], progress_callback: Optional[Callable]
     ) -> tuple[np.ndarray, list[int]]:
-        """Generate embeddings for all emails."""
+        """Generate embeddings for all emails (cached ones are not re-embedded)."""
         # Prepare texts
         texts = [prepare_email_text_for_embedding(email.subject, email.body) for email in emails]
 
-        # Generate embeddings in batches
-        embeddings_list, total_tokens = generate_embeddings_batch(texts, model=self.embedding_model)
+        # Generate embeddings in batches, skipping texts already in the embedding cache
+        embeddings, total_tokens = generate_embeddings_cached(texts, model=self.embedding_model)
 
-        logger.info(f"Generated {len(embeddings_list)} embeddings using {total_tokens} tokens")
+        logger.info(f"Generated {len(embeddings)} embeddings using {total_tokens} tokens")
 
-        # Convert to numpy array
-        embeddings = np.array(embeddings_list, dtype=np.float32)
         email_ids = [email.email_id for email in emails]
 
         return embeddings, email_ids
@@ -263,40 +491,24 @@ class ClusterEngine:
 
         return store
 
-    def _run_tsne(self, embeddings: np.ndarray) -> np.ndarray:
-        """Run t-SNE to reduce embeddings to 3D coordinates."""
-        # Adjust perplexity if necessary
-        n_samples = embeddings.shape[0]
-        perplexity = min(self.tsne_perplexity, (n_samples - 1) / 3)
-
-        tsne = TSNE(
-            n_components=3,
-            perplexity=perplexity,
-            max_iter=self.tsne_n_iter,
-            random_state=self.random_seed,
-            verbose=0,
+    def make_reducer(self) -> Reducer:
+        """Unfitted reducer configured from this engine's parameters."""
+        return Reducer(
+            self.reducer,
+            perplexity=self.tsne_perplexity,
+            n_iter=self.tsne_n_iter,
+            pca_components=self.pca_components,
+            random_seed=self.random_seed,
         )
 
-        coordinates_3d = tsne.fit_transform(embeddings)
-
-        # Normalize coordinates to 0-100 range for consistent DBSCAN eps values
-        # This makes the eps slider values (0.1-10.0) more intuitive
-        min_vals = coordinates_3d.min(axis=0)
-        max_vals = coordinates_3d.max(axis=0)
-        ranges = max_vals - min_vals
-
-        # Avoid division by zero
-        ranges[ranges == 0] = 1.0
-
-        # Scale to 0-100 range
-        coordinates_3d = ((coordinates_3d - min_vals) / ranges) * 100.0
-
-        logger.info(
-            f"t-SNE completed: {embeddings.shape} -> {coordinates_3d.shape}, "
-            f"normalized to range [0, 100]"
-        )
+    def effective_perplexity(self, n_samples: int) -> float:
+        """t-SNE perplexity actually used for n_samples points (must stay below n_samples / 3)."""
+        return self.make_reducer().effective_perplexity(n_samples)
 
-        return coordinates_3d
+    def fit_reducer(self, embeddings: np.ndarray) -> tuple[Reducer, np.ndarray]:
+        """Fit a reducer on the embeddings; returns it with their 3D coordinates (0-100)."""
+        reducer = self.make_reducer()
+        return reducer, reducer.fit_transform(embeddings)
 
     def _run_dbscan(self, coordinates_3d: np.ndarray) -> np.ndarray:
         """Run DBSCAN clustering on 3D coordinates."""
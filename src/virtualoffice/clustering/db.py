@@ -49,11 +49,20 @@ def init_database() -> None:
                 indexed_at TEXT,
                 embedding_model TEXT NOT NULL,
                 status TEXT CHECK(status IN ('indexing', 'completed', 'failed')) NOT NULL,
-                error_message TEXT
+                error_message TEXT,
+                last_indexed_email_id INTEGER,
+                full_build_emails INTEGER
             )
         """
         )
 
+        # Migration: incremental update bookkeeping for indexes created before it existed
+        cursor.execute("PRAGMA table_info(persona_indexes)")
+        columns = {row[1] for row in cursor.fetchall()}
+        for column in ("last_indexed_email_id", "full_build_emails"):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE persona_indexes ADD COLUMN {column} INTEGER")
+
         # Cluster metadata table
         cursor.execute(
             """
@@ -160,21 +169,28 @@ def get_connection():
 
 
 def save_persona_index_status(status: PersonaIndexStatus) -> None:
-    """Save or update persona indexing status."""
+    """Save or update persona indexing status.
+
+    last_indexed_email_id and full_build_emails keep their stored values when
+    the status leaves them unset (e.g. the 'indexing' and 'failed' updates).
+    """
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
             INSERT INTO persona_indexes
-            (persona_id, persona_name, total_emails, indexed_at, embedding_model, status, error_message)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            (persona_id, persona_name, total_emails, indexed_at, embedding_model, status, error_message,
+             last_indexed_email_id, full_build_emails)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(persona_id) DO UPDATE SET
                 persona_name = excluded.persona_name,
                 total_emails = excluded.total_emails,
                 indexed_at = excluded.indexed_at,
                 embedding_model = excluded.embedding_model,
                 status = excluded.status,
-                error_message = excluded.error_message
+                error_message = excluded.error_message,
+                last_indexed_email_id = COALESCE(excluded.last_indexed_email_id, persona_indexes.last_indexed_email_id),
+                full_build_emails = COALESCE(excluded.full_build_emails, persona_indexes.full_build_emails)
         """,
             (
                 status.persona_id,
@@ -184,34 +200,41 @@ def save_persona_index_status(status: PersonaIndexStatus) -> None:
                 status.embedding_model,
                 status.status,
                 status.error_message,
+                status.last_indexed_email_id,
+                status.full_build_emails,
             ),
         )
         conn.commit()
 
 
+_STATUS_COLUMNS = (
+    "persona_id, persona_name, total_emails, indexed_at, embedding_model, status, error_message, "
+    "last_indexed_email_id, full_build_emails"
+)
+
+
+def _row_to_status(row) -> PersonaIndexStatus:
+    return PersonaIndexStatus(
+        persona_id=row[0],
+        persona_name=row[1],
+        total_emails=row[2],
+        indexed_at=datetime.fromisoformat(row[3]) if row[3] else None,
+        embedding_model=row[4],
+        status=row[5],
+        error_message=row[6],
+        last_indexed_email_id=row[7],
+        full_build_emails=row[8],
+    )
+
+
 def get_persona_index_status(persona_id: int) -> Optional[PersonaIndexStatus]:
     """Get persona indexing status."""
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT persona_id, persona_name, total_emails, indexed_at, embedding_model, status, error_message
-            FROM persona_indexes
-            WHERE persona_id = ?
-        """,
-            (persona_id,),
-        )
+        cursor.execute(f"SELECT {_STATUS_COLUMNS} FROM persona_indexes WHERE persona_id = ?", (persona_id,))
         row = cursor.fetchone()
         if row:
-            return PersonaIndexStatus(
-                persona_id=row[0],
-                persona_name=row[1],
-                total_emails=row[2],
-                indexed_at=datetime.fromisoformat(row[3]) if row[3] else None,
-                embedding_model=row[4],
-                status=row[5],
-                error_message=row[6],
-            )
+            return _row_to_status(row)
         return None
 
 
@@ -219,26 +242,9 @@ def get_all_persona_index_statuses() -> list[PersonaIndexStatus]:
     """Get all persona indexing statuses."""
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT persona_id, persona_name, total_emails, indexed_at, embedding_model, status, error_message
-            FROM persona_indexes
-            ORDER BY persona_name
-        """
-        )
+        cursor.execute(f"SELECT {_STATUS_COLUMNS} FROM persona_indexes ORDER BY persona_name")
         rows = cursor.fetchall()
-        return [
-            PersonaIndexStatus(
-                persona_id=row[0],
-                persona_name=row[1],
-                total_emails=row[2],
-                indexed_at=datetime.fromisoformat(row[3]) if row[3] else None,
-                embedding_model=row[4],
-                status=row[5],
-                error_message=row[6],
-            )
-            for row in rows
-        ]
+        return [_row_to_status(row) for row in rows]
 
 
 def delete_persona_index(persona_id: int) -> None:
@@ -380,8 +386,8 @@ def get_cluster_by_id(cluster_id: int) -> Optional[ClusterMetadata]:
 # ============================================================================
 
 
-def save_email_positions(points: list[ClusterPoint], persona_id: int) -> None:
-    """Bulk save email positions."""
+def save_email_positions(points: list[ClusterPoint], persona_id: int, start_index: int = 0) -> None:
+    """Bulk save email positions (start_index is the FAISS position of the first point)."""
     with get_connection() as conn:
         cursor = conn.cursor()
 
@@ -405,7 +411,7 @@ def save_email_positions(points: list[ClusterPoint], persona_id: int) -> None:
                 point.z,
                 idx,  # embedding_index
             )
-            for idx, point in enumerate(points)
+            for idx, point in enumerate(points, start=start_index)
         ]
 
         cursor.executemany(
@@ -451,6 +457,42 @@ def get_email_positions_for_persona(persona_id: int) -> list[ClusterPoint]:
         ]
 
 
+def get_email_coordinates(persona_id: int) -> dict[int, tuple[float, float, float, int]]:
+    """Map email_id -> (x, y, z, cluster_label) for a persona's indexed emails (-1 for noise)."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT ep.email_id, ep.x, ep.y, ep.z, c.cluster_label
+            FROM email_positions ep
+            LEFT JOIN clusters c ON ep.cluster_id = c.id
+            WHERE ep.persona_id = ?
+        """,
+            (persona_id,),
+        )
+        return {
+            row[0]: (row[1], row[2], row[3], row[4] if row[4] is not None else -1)
+            for row in cursor.fetchall()
+        }
+
+
+def refresh_cluster_stats(persona_id: int) -> None:
+    """Recompute each cluster's email count and 3D centroid from its email positions."""
+    with get_connection() as conn:
+        conn.execute(
+            """
+            UPDATE clusters SET
+                num_emails = (SELECT COUNT(*) FROM email_positions ep WHERE ep.cluster_id = clusters.id),
+                centroid_x = COALESCE((SELECT AVG(x) FROM email_positions ep WHERE ep.cluster_id = clusters.id), centroid_x),
+                centroid_y = COALESCE((SELECT AVG(y) FROM email_positions ep WHERE ep.cluster_id = clusters.id), centroid_y),
+                centroid_z = COALESCE((SELECT AVG(z) FROM email_positions ep WHERE ep.cluster_id = clusters.id), centroid_z)
+            WHERE persona_id = ?
+        """,
+            (persona_id,),
+        )
+        conn.commit()
+
+
 # ============================================================================
 # Cluster Sample Operations
 # ============================================================================
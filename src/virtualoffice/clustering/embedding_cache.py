@@ -0,0 +1,310 @@
+"""
+Persistent content-addressed cache of email embeddings.
+
+Embeddings are keyed by (model, SHA-256 of the text sent to the API), so
+re-indexing a persona only embeds emails that are new or whose subject/body
+changed. The key carries no persona, so one cache serves every persona: an
+email CC'd to five people is embedded once.
+
+Layout (under ``VDOS_EMBEDDING_CACHE_DIR``, default ``<project root>/embedding_cache``):
+
+- ``index.sqlite3`` maps (model, text_hash) -> row slot and last access time
+- ``<model>.f32`` is a memory-mapped float32 matrix, one row per slot
+
+The cache is on by default (``VDOS_EMBEDDING_CACHE=0`` disables it) and is
+bounded per model by ``VDOS_EMBEDDING_CACHE_MAX_ENTRIES`` with LRU eviction;
+evicted slots are reused by the rows that displaced them. Writes are
+serialized within one process; the clustering server is the only writer.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[3] / "embedding_cache"
+_MIN_CAPACITY = 1024
+
+
+def text_key(text: str) -> str:
+    """Content hash of an embedding input."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-indexed, memory-mapped LRU cache of embedding vectors."""
+
+    def __init__(self, directory: str | Path, max_entries: int = 200_000) -> None:
+        self.directory = Path(directory)
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._matrices: dict[str, np.memmap] = {}
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Caller holds the lock
+        if self._conn is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.directory / "index.sqlite3", check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS embedding_models (
+                    model TEXT PRIMARY KEY,
+                    dimension INTEGER NOT NULL,
+                    capacity INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS embedding_cache (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    slot INTEGER NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                );
+                CREATE INDEX IF NOT EXISTS idx_embedding_cache_lru ON embedding_cache(model, last_access);
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def _matrix_path(self, model: str) -> Path:
+        return self.directory / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', model)}.f32"
+
+    def _matrix(self, model: str, dimension: int, capacity: int) -> np.memmap:
+        # Caller holds the lock; grows the backing file when capacity increased
+        matrix = self._matrices.get(model)
+        if matrix is not None and matrix.shape == (capacity, dimension):
+            return matrix
+        if matrix is not None:
+            matrix.flush()
+            del self._matrices[model]
+        path = self._matrix_path(model)
+        with open(path, "ab") as handle:
+            if handle.tell() < capacity * dimension * 4:
+                handle.truncate(capacity * dimension * 4)
+        matrix = np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, dimension))
+        self._matrices[model] = matrix
+        return matrix
+
+    def _model_info(self, conn: sqlite3.Connection, model: str) -> tuple[int, int] | None:
+        row = conn.execute("SELECT dimension, capacity FROM embedding_models WHERE model = ?", (model,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _drop_model(self, conn: sqlite3.Connection, model: str) -> None:
+        conn.execute("DELETE FROM embedding_cache WHERE model = ?", (model,))
+        conn.execute("DELETE FROM embedding_models WHERE model = ?", (model,))
+        self._matrices.pop(model, None)
+        self._matrix_path(model).unlink(missing_ok=True)
+
+    def _cached_keys(self, conn: sqlite3.Connection, model: str, keys: list[str]) -> dict[str, int]:
+        slots: dict[str, int] = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            slots.update(
+                conn.execute(
+                    f"SELECT text_hash, slot FROM embedding_cache WHERE model = ? AND text_hash IN ({placeholders})",
+                    (model, *chunk),
+                ).fetchall()
+            )
+        return slots
+
+    def get_many(self, model: str, keys: Sequence[str]) -> dict[str, np.ndarray]:
+        """Cached vectors for the keys that are present (copies, safe to keep)."""
+        unique = list(dict.fromkeys(keys))
+        found: dict[str, np.ndarray] = {}
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            info = self._model_info(conn, model)
+            if info is not None and unique:
+                matrix = self._matrix(model, *info)
+                slots = self._cached_keys(conn, model, unique)
+                if slots:
+                    rows = np.array(matrix[sorted(slots.values())])
+                    order = {slot: i for i, slot in enumerate(sorted(slots.values()))}
+                    found = {key: rows[order[slot]] for key, slot in slots.items()}
+                    conn.executemany(
+                        "UPDATE embedding_cache SET last_access = ? WHERE model = ? AND text_hash = ?",
+                        [(now, model, key) for key in found],
+                    )
+            self._hits += len(found)
+            self._misses += len(unique) - len(found)
+        return found
+
+    def _evict(self, conn: sqlite3.Connection, model: str, incoming: int) -> list[int]:
+        """Delete least recently used rows so ``incoming`` more fit under the cap; returns their slots."""
+        # Caller holds the lock
+        count = conn.execute("SELECT COUNT(*) FROM embedding_cache WHERE model = ?", (model,)).fetchone()[0]
+        excess = count + incoming - self.max_entries
+        if excess <= 0:
+            return []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            victims = conn.execute(
+                "SELECT text_hash, slot FROM embedding_cache WHERE model = ? ORDER BY last_access ASC LIMIT ?",
+                (model, excess),
+            ).fetchall()
+            conn.executemany(
+                "DELETE FROM embedding_cache WHERE model = ? AND text_hash = ?",
+                [(model, key) for key, _ in victims],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._evictions += len(victims)
+        return [slot for _, slot in victims]
+
+    def put_many(self, model: str, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """Store vectors (row-aligned with keys), evicting least recently used rows beyond the cap."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(keys) != vectors.shape[0]:
+            raise ValueError("vectors must be a 2-D array with one row per key")
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            info = self._model_info(conn, model)
+            if info is not None and info[0] != vectors.shape[1]:
+                logger.warning(
+                    f"[EMBED_CACHE] Dimension for {model} changed {info[0]} -> {vectors.shape[1]}; dropping cached rows"
+                )
+                self._drop_model(conn, model)
+                info = None
+
+            new_rows: dict[str, int] = {}
+            for i, key in enumerate(keys):
+                new_rows.setdefault(key, i)
+            for key in self._cached_keys(conn, model, list(new_rows)):
+                del new_rows[key]
+            # A batch larger than the cap keeps only as many rows as fit
+            pending = list(new_rows.items())[: self.max_entries]
+            if not pending:
+                return
+
+            # Evictions are committed before any freed slot is overwritten, so a
+            # failed insert can never roll index rows back onto other texts' vectors
+            freed = self._evict(conn, model, len(pending))
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Evicted slots are refilled before the matrix grows
+                slots = sorted(freed)[: len(pending)]
+                if len(slots) < len(pending):
+                    top = conn.execute("SELECT MAX(slot) FROM embedding_cache WHERE model = ?", (model,)).fetchone()[0]
+                    next_slot = max([-1 if top is None else top, *slots]) + 1
+                    slots += range(next_slot, next_slot + len(pending) - len(slots))
+
+                dimension = vectors.shape[1]
+                capacity = info[1] if info else 0
+                needed = max(slots) + 1
+                if needed > capacity:
+                    capacity = max(needed, min(self.max_entries, max(_MIN_CAPACITY, capacity * 2)))
+                    conn.execute(
+                        "INSERT OR REPLACE INTO embedding_models(model, dimension, capacity) VALUES (?, ?, ?)",
+                        (model, dimension, capacity),
+                    )
+                matrix = self._matrix(model, dimension, capacity)
+                rows = [index for _, index in pending]
+                matrix[slots] = vectors[rows]
+                matrix.flush()
+                conn.executemany(
+                    "INSERT INTO embedding_cache(model, text_hash, slot, last_access) VALUES (?, ?, ?, ?)",
+                    [(model, key, slot, now) for (key, _), slot in zip(pending, slots)],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            self._stores += len(pending)
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connection()
+            for (model,) in conn.execute("SELECT model FROM embedding_models").fetchall():
+                self._drop_model(conn, model)
+            conn.execute("DELETE FROM embedding_cache")
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            conn = self._connection()
+            models = {
+                model: {"entries": entries, "dimension": dimension, "capacity": capacity}
+                for model, dimension, capacity, entries in conn.execute(
+                    "SELECT m.model, m.dimension, m.capacity, COUNT(c.text_hash) FROM embedding_models m "
+                    "LEFT JOIN embedding_cache c ON c.model = m.model GROUP BY m.model"
+                ).fetchall()
+            }
+            hits, misses, stores, evictions = self._hits, self._misses, self._stores, self._evictions
+        return {
+            "enabled": True,
+            "path": str(self.directory),
+            "entries": sum(info["entries"] for info in models.values()),
+            "max_entries_per_model": self.max_entries,
+            "evictions": evictions,
+            "hits": hits,
+            "misses": misses,
+            "stores": stores,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "models": models,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            for matrix in self._matrices.values():
+                matrix.flush()
+            self._matrices.clear()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_cache: EmbeddingCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    """Return the process-wide cache, or None when ``VDOS_EMBEDDING_CACHE`` disables it."""
+    global _cache
+    if os.getenv("VDOS_EMBEDDING_CACHE", "1").strip().lower() not in {"1", "true", "yes", "on"}:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                max_entries = int(os.getenv("VDOS_EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+            except ValueError:
+                max_entries = 200_000
+            _cache = EmbeddingCache(
+                os.getenv("VDOS_EMBEDDING_CACHE_DIR") or _DEFAULT_CACHE_DIR,
+                max_entries=max_entries,
+            )
+        return _cache
+
+
+def embedding_cache_stats() -> dict[str, Any]:
+    cache = get_embedding_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
+
+
+def reset_embedding_cache() -> None:
+    """Close the process-wide cache so the next ``get_embedding_cache`` re-reads the environment."""
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+        _cache = None
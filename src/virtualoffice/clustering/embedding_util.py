@@ -2,14 +2,18 @@
 OpenAI Embeddings API wrapper with caching and batch processing.
 
 Reuses the API key management from completion_util.py but specialized for embeddings.
+Vectors are cached across runs and personas by embedding_cache.
 """
 
 import logging
 from typing import Optional
 import os
+import numpy as np
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from virtualoffice.clustering.embedding_cache import get_embedding_cache, text_key
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -174,6 +178,48 @@ def prepare_email_text_for_embedding(subject: str, body: str) -> str:
     return f"Subject: {subject}\n\n{body}"
 
 
-# Optional: Embedding cache for avoiding duplicate API calls
-# This would be implemented with a SQLite or in-memory cache
-# For MVP, we rely on the FAISS storage acting as our cache
+def generate_embeddings_cached(
+    texts: list[str], model: str = "text-embedding-3-small", batch_size: int = 100
+) -> tuple[np.ndarray, int]:
+    """
+    Generate embeddings, reusing vectors from the persistent embedding cache.
+
+    Only texts whose (model, content hash) is not cached are sent to the API,
+    and each distinct text is sent once. Falls back to embedding everything
+    when the cache is disabled (VDOS_EMBEDDING_CACHE=0).
+
+    Args:
+        texts: List of texts to embed
+        model: Embedding model to use
+        batch_size: Number of texts per API call (max 2048)
+
+    Returns:
+        Tuple of (float32 matrix with one row per text, tokens used for the misses)
+
+    Raises:
+        ValueError: If texts list is empty
+        openai.OpenAIError: If API call fails
+    """
+    if not texts:
+        raise ValueError("Cannot generate embeddings for empty text list")
+
+    cache = get_embedding_cache()
+    if cache is None:
+        embeddings, total_tokens = generate_embeddings_batch(texts, model=model, batch_size=batch_size)
+        return np.asarray(embeddings, dtype=np.float32), total_tokens
+
+    keys = [text_key(text) for text in texts]
+    vectors = cache.get_many(model, keys)
+    missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+    total_tokens = 0
+    if missing:
+        embeddings, total_tokens = generate_embeddings_batch(list(missing.values()), model=model, batch_size=batch_size)
+        fresh = np.asarray(embeddings, dtype=np.float32)
+        cache.put_many(model, list(missing), fresh)
+        vectors.update(zip(missing, fresh))
+
+    logger.info(
+        f"Embedding cache: {len(texts) - len(missing)} of {len(texts)} texts reused, "
+        f"{len(missing)} embedded ({total_tokens} tokens)"
+    )
+    return np.stack([vectors[key] for key in keys]).astype(np.float32, copy=False), total_tokens
@@ -2,9 +2,15 @@
 FAISS vector storage for email embeddings.
 
 Each persona gets its own FAISS index file for isolation and efficiency.
+The raw embedding matrix is also saved as a plain .npy next to it, so
+readers that only need the vectors can memory-map them
+(load_vectors_for_persona) instead of loading the index. Each save writes a
+new generation (email_embeddings_{persona_id}.vectors.{n}.npy) rather than
+replacing the mapped file, which Windows refuses while a map is open.
 """
 
 import logging
+import os
 from pathlib import Path
 from typing import Optional
 import numpy as np
@@ -37,6 +43,29 @@ class FaissStore:
         self.index: Optional[faiss.IndexFlatL2] = None
         self._email_ids: list[int] = []  # Track which email_id corresponds to each index position
 
+    def _vector_generations(self) -> list[tuple[int, Path]]:
+        """Saved vectors files as (generation, path), oldest first."""
+        generations = []
+        for path in self.index_path.parent.glob(f"{self.index_path.stem}.vectors.*.npy"):
+            generation = path.name[len(self.index_path.stem) + len(".vectors.") : -len(".npy")]
+            if generation.isdigit():
+                generations.append((int(generation), path))
+        return sorted(generations)
+
+    @property
+    def vectors_path(self) -> Optional[Path]:
+        """The current saved vectors file, or None if there is none."""
+        generations = self._vector_generations()
+        return generations[-1][1] if generations else None
+
+    def _remove_vector_files(self, paths: list[Path]) -> None:
+        for path in paths:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                # Still mapped by a reader (Windows); removed by a later save
+                logger.debug(f"Could not remove old vectors file {path}: {e}")
+
     def create_index(self) -> None:
         """Create a new FAISS index."""
         # Use IndexFlatL2 for exact L2 distance search
@@ -126,10 +155,15 @@ class FaissStore:
 
         return email_ids, distances_list
 
-    def get_all_vectors(self) -> np.ndarray:
+    def get_all_vectors(self, copy: bool = True) -> np.ndarray:
         """
         Get all vectors from the index.
 
+        Args:
+            copy: Return an independent array. With False, a flat index returns
+                a read-only view of its own storage (no copy); the view is only
+                valid until vectors are added or the index is released.
+
         Returns:
             numpy array of shape (n, dimension) containing all vectors
 
@@ -139,15 +173,15 @@ class FaissStore:
         if self.index is None or self.index.ntotal == 0:
             raise ValueError("Index is empty")
 
-        # FAISS IndexFlatL2 stores vectors in a contiguous array
-        # We can reconstruct them
         n = self.index.ntotal
-        vectors = np.zeros((n, self.dimension), dtype=np.float32)
+        if not copy and isinstance(self.index, faiss.IndexFlat):
+            # IndexFlat keeps vectors as one contiguous float32 buffer
+            view = faiss.rev_swig_ptr(self.index.get_xb(), n * self.index.d).reshape(n, self.index.d)
+            view.flags.writeable = False
+            return view
 
-        for i in range(n):
-            vectors[i] = self.index.reconstruct(i)
-
-        return vectors
+        # One bulk call instead of reconstruct(i) per row
+        return self.index.reconstruct_n(0, n)
 
     def get_email_ids(self) -> list[int]:
         """Get list of email IDs in the index (in order)."""
@@ -165,6 +199,18 @@ class FaissStore:
         metadata_path = self.index_path.with_suffix(".ids.npy")
         np.save(metadata_path, np.array(self._email_ids, dtype=np.int32))
 
+        # Save the raw vectors for memory-mapped readers (written straight from the index buffer)
+        # as a new generation, so files that are still mapped are never replaced or truncated
+        previous = self._vector_generations()
+        if self.index.ntotal:
+            generation = previous[-1][0] + 1 if previous else 1
+            vectors_path = self.index_path.with_suffix(f".vectors.{generation}.npy")
+            tmp_path = vectors_path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as handle:
+                np.save(handle, self.get_all_vectors(copy=False))
+            os.replace(tmp_path, vectors_path)
+        self._remove_vector_files([path for _, path in previous])
+
         logger.info(
             f"Saved FAISS index for persona {self.persona_id} to {self.index_path} "
             f"({self.index.ntotal} vectors)"
@@ -218,6 +264,11 @@ class FaissStore:
             metadata_path.unlink()
             logger.info(f"Deleted metadata file: {metadata_path}")
 
+        vector_files = [path for _, path in self._vector_generations()]
+        if vector_files:
+            self._remove_vector_files(vector_files)
+            logger.info(f"Deleted vectors files: {', '.join(path.name for path in vector_files)}")
+
         self.index = None
         self._email_ids = []
 
@@ -264,6 +315,34 @@ def load_store_for_persona(persona_id: int, dimension: int = 1536) -> Optional[F
     return None
 
 
+def load_vectors_for_persona(persona_id: int) -> Optional[tuple[np.ndarray, list[int]]]:
+    """
+    Memory-map a persona's saved embedding matrix.
+
+    Rows are aligned with the returned email IDs (the FAISS index order).
+    Indexes saved before the .npy existed fall back to a bulk copy out of
+    the FAISS index.
+
+    Args:
+        persona_id: Persona identifier
+
+    Returns:
+        (read-only vectors of shape (n, dimension), email_ids), or None if there is no index
+    """
+    store = FaissStore(persona_id)
+    metadata_path = store.index_path.with_suffix(".ids.npy")
+    vectors_path = store.vectors_path
+    if vectors_path is not None and metadata_path.exists():
+        vectors = np.load(vectors_path, mmap_mode="r")
+        email_ids = np.load(metadata_path).tolist()
+        if len(email_ids) == vectors.shape[0]:
+            return vectors, email_ids
+        logger.warning(f"Vectors file for persona {persona_id} is out of sync with its index; reading the index")
+    if not store.load() or store.size() == 0:
+        return None
+    return store.get_all_vectors(), store.get_email_ids()
+
+
 def delete_store_for_persona(persona_id: int) -> None:
     """
     Delete FAISS store files for a persona.
@@ -14,6 +14,7 @@ from typing import Optional
 
 from virtualoffice.clustering.models import ClusterSample, ClusterLabel
 from virtualoffice.utils.completion_util import generate_text
+from virtualoffice.utils.llm_scheduler import Priority
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +63,8 @@ def generate_cluster_label(
             prompt=[{"role": "user", "content": prompt}],
             model="gpt-4o-mini",
             temperature=0.3,  # Lower temperature for more consistent labeling
+            priority=Priority.CLUSTER_LABEL,
+            cache_method="cluster_label",
         )
 
         # Parse JSON response
@@ -75,6 +75,8 @@ class PersonaIndexStatus(BaseModel):
     embedding_model: str = "text-embedding-3-small"
     status: str  # 'indexing', 'completed', 'failed'
     error_message: Optional[str] = None
+    last_indexed_email_id: Optional[int] = None  # Highest email id in the index
+    full_build_emails: Optional[int] = None  # Emails indexed by the last full build
 
 
 class IndexingProgress(BaseModel):
@@ -0,0 +1,203 @@
+"""
+Dimensionality reduction of email embeddings to 3D coordinates.
+
+Embeddings are first reduced to ``pca_components`` dimensions with PCA, which
+removes most of the cost of the neighbor searches that follow, then mapped
+to 3D by one of:
+
+- ``tsne``: scikit-learn Barnes-Hut t-SNE (default)
+- ``umap``: UMAP, when the optional ``umap-learn`` package is installed
+- ``pca``: the first three principal components (fastest, linear)
+
+Coordinates are scaled to 0-100 so DBSCAN eps values mean the same for every
+reducer. A fitted ``Reducer`` can be pickled next to a persona's FAISS index
+and later place new embeddings without refitting: PCA and UMAP use their own
+``transform``, t-SNE (which has none) interpolates from the nearest training
+points in PCA space.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+import pickle
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from sklearn.decomposition import PCA
+from sklearn.manifold import TSNE
+from sklearn.neighbors import NearestNeighbors
+
+from virtualoffice.clustering import faiss_store
+
+logger = logging.getLogger(__name__)
+
+REDUCERS = ("tsne", "umap", "pca")
+
+
+def reducer_available(method: str) -> bool:
+    """Whether ``method`` is a known reducer whose dependencies are installed."""
+    if method == "umap":
+        return importlib.util.find_spec("umap") is not None
+    return method in REDUCERS
+
+
+class Reducer:
+    """PCA pre-reduction followed by a 3D projection, with transform for new points.
+
+    Args:
+        method: One of REDUCERS
+        perplexity: t-SNE perplexity (capped below n_samples / 3)
+        n_iter: t-SNE iteration count
+        pca_components: Dimensions kept by the PCA pre-reduction (0 disables it)
+        n_neighbors: UMAP neighborhood size, and neighbors used by t-SNE transform
+        random_seed: Seed for PCA, t-SNE and UMAP, so the same input gives the same map
+    """
+
+    def __init__(
+        self,
+        method: str = "tsne",
+        *,
+        perplexity: float = 30.0,
+        n_iter: int = 1000,
+        pca_components: int = 50,
+        n_neighbors: int = 15,
+        random_seed: int = 42,
+    ):
+        if method not in REDUCERS:
+            raise ValueError(f"Unknown reducer '{method}' (choose from {', '.join(REDUCERS)})")
+        if not reducer_available(method):
+            raise ValueError(f"Reducer '{method}' requires the optional umap-learn package")
+        self.method = method
+        self.perplexity = perplexity
+        self.n_iter = n_iter
+        self.pca_components = pca_components
+        self.n_neighbors = n_neighbors
+        self.random_seed = random_seed
+        self._pca: Optional[PCA] = None
+        self._model = None  # Fitted UMAP model
+        self._train_points: Optional[np.ndarray] = None  # PCA-space training points (t-SNE transform)
+        self._train_coords: Optional[np.ndarray] = None  # Their raw t-SNE coordinates
+        self._min: Optional[np.ndarray] = None
+        self._range: Optional[np.ndarray] = None
+
+    def effective_perplexity(self, n_samples: int) -> float:
+        """t-SNE perplexity actually used for n_samples points (must stay below n_samples / 3)."""
+        return min(self.perplexity, (n_samples - 1) / 3)
+
+    def fit_transform(self, embeddings: np.ndarray) -> np.ndarray:
+        """Fit on embeddings and return their 3D coordinates scaled to 0-100."""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        n_samples = embeddings.shape[0]
+
+        if self.method == "pca":
+            self._pca = PCA(n_components=min(3, *embeddings.shape), random_state=self.random_seed)
+            raw = self._pad(self._pca.fit_transform(embeddings))
+        else:
+            points = self._fit_pca(embeddings)
+            if self.method == "tsne":
+                raw = TSNE(
+                    n_components=3,
+                    perplexity=self.effective_perplexity(n_samples),
+                    max_iter=self.n_iter,
+                    method="barnes_hut",
+                    random_state=self.random_seed,
+                    verbose=0,
+                ).fit_transform(points)
+                self._train_points = points
+                self._train_coords = raw
+            else:
+                import umap
+
+                self._model = umap.UMAP(
+                    n_components=3,
+                    n_neighbors=max(2, min(self.n_neighbors, n_samples - 1)),
+                    random_state=self.random_seed,
+                )
+                raw = self._model.fit_transform(points)
+
+        # Normalize coordinates to 0-100 range for consistent DBSCAN eps values
+        self._min = raw.min(axis=0)
+        self._range = raw.max(axis=0) - self._min
+        self._range[self._range == 0] = 1.0
+
+        logger.info(f"{self.method} reduction completed: {embeddings.shape} -> {raw.shape}, normalized to range [0, 100]")
+        return self._scale(raw)
+
+    def transform(self, embeddings: np.ndarray) -> np.ndarray:
+        """Place new embeddings in the fitted map (same 0-100 scale; may fall slightly outside it)."""
+        if self._min is None:
+            raise ValueError("Reducer has not been fitted")
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+
+        if self.method == "pca":
+            return self._scale(self._pad(self._pca.transform(embeddings)))
+        points = self._pca.transform(embeddings) if self._pca is not None else embeddings
+        if self.method == "umap":
+            return self._scale(self._model.transform(points))
+
+        # t-SNE has no transform: inverse-distance weighted mean of the nearest training points
+        k = min(self.n_neighbors, len(self._train_points))
+        distances, indices = NearestNeighbors(n_neighbors=k).fit(self._train_points).kneighbors(points)
+        weights = 1.0 / (distances + 1e-6)
+        raw = np.einsum("nk,nkd->nd", weights, self._train_coords[indices]) / weights.sum(axis=1, keepdims=True)
+        return self._scale(raw)
+
+    def _fit_pca(self, embeddings: np.ndarray) -> np.ndarray:
+        n_components = min(self.pca_components, *embeddings.shape)
+        if n_components <= 0 or n_components >= embeddings.shape[1]:
+            self._pca = None
+            return embeddings
+        self._pca = PCA(n_components=n_components, random_state=self.random_seed)
+        return self._pca.fit_transform(embeddings).astype(np.float32)
+
+    @staticmethod
+    def _pad(coords: np.ndarray) -> np.ndarray:
+        # PCA on fewer than 3 samples/features yields fewer than 3 components
+        if coords.shape[1] < 3:
+            coords = np.hstack([coords, np.zeros((coords.shape[0], 3 - coords.shape[1]))])
+        return coords
+
+    def _scale(self, raw: np.ndarray) -> np.ndarray:
+        return ((raw - self._min) / self._range) * 100.0
+
+    def save(self, path: str | Path) -> None:
+        with open(path, "wb") as handle:
+            pickle.dump(self, handle)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Reducer":
+        with open(path, "rb") as handle:
+            reducer = pickle.load(handle)
+        if not isinstance(reducer, cls):
+            raise ValueError(f"{path} does not contain a fitted Reducer")
+        return reducer
+
+
+# Utility functions
+
+
+def reducer_path(persona_id: int) -> Path:
+    """Fitted reducer file, stored next to the persona's FAISS index."""
+    return faiss_store.INDEX_DIR / f"email_reducer_{persona_id}.pkl"
+
+
+def save_reducer_for_persona(persona_id: int, reducer: Reducer) -> None:
+    reducer.save(reducer_path(persona_id))
+
+
+def load_reducer_for_persona(persona_id: int) -> Optional[Reducer]:
+    """Load a persona's fitted reducer, or None if there is none (or it cannot be read)."""
+    path = reducer_path(persona_id)
+    if not path.exists():
+        return None
+    try:
+        return Reducer.load(path)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable reducer for persona {persona_id}: {e}")
+        return None
+
+
+def delete_reducer_for_persona(persona_id: int) -> None:
+    reducer_path(persona_id).unlink(missing_ok=True)
@@ -1,10 +1,15 @@
 import os
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Iterator
+from typing import Iterator, Sequence
 
 DB_ENV_VAR = "VDOS_DB_PATH"
+POOL_SIZE_ENV_VAR = "VDOS_DB_POOL_SIZE"
+POOL_ENABLED_ENV_VAR = "VDOS_DB_POOL"
 
 
 def _resolve_db_path() -> Path:
@@ -43,13 +48,13 @@ def _resolve_db_path() -> Path:
 DB_PATH = _resolve_db_path()
 
 
-@contextmanager
-def get_connection() -> Iterator[sqlite3.Connection]:
+def _open_connection(path: Path | str, cached_statements: int = 128) -> sqlite3.Connection:
     conn = sqlite3.connect(
-        DB_PATH,
+        path,
         detect_types=sqlite3.PARSE_DECLTYPES,
         check_same_thread=False,
-        timeout=30.0  # Increase timeout for concurrent access
+        timeout=30.0,  # Increase timeout for concurrent access
+        cached_statements=cached_statements,
     )
     conn.row_factory = sqlite3.Row
     # Enable WAL mode for better concurrent access
@@ -57,13 +62,253 @@ def get_connection() -> Iterator[sqlite3.Connection]:
     conn.execute("PRAGMA foreign_keys = ON")
     # Set busy timeout for better lock handling
     conn.execute("PRAGMA busy_timeout = 30000")  # 30 seconds in milliseconds
+    return conn
+
+
+@dataclass
+class PoolStats:
+    """Point-in-time counters for a :class:`ConnectionPool`."""
+
+    path: str
+    max_size: int
+    open_connections: int
+    idle_connections: int
+    in_use: int
+    created: int
+    checkouts: int
+    waits: int
+    total_wait_ms: float
+    max_wait_ms: float
+    overflow_checkouts: int
+    resets: int
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class ConnectionPool:
+    """Bounded pool of long-lived SQLite connections for one database file.
+
+    Connections are created lazily, configured once (WAL, foreign keys, busy
+    timeout, row factory) and handed back to the pool after use so their
+    statement caches stay warm. When every pooled connection is checked out
+    the caller waits up to ``wait_timeout`` seconds; after that an overflow
+    connection is opened and closed on return, so nested ``get_connection()``
+    calls can never deadlock on the pool.
+
+    If the database file is removed or replaced (e.g. the admin reset endpoint
+    unlinks it), idle connections are discarded on the next checkout.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        max_size: int = 8,
+        wait_timeout: float = 0.5,
+        cached_statements: int = 256,
+    ) -> None:
+        self.path = Path(path)
+        self.max_size = max(1, max_size)
+        self.wait_timeout = max(0.0, wait_timeout)
+        self.cached_statements = cached_statements
+        self._cond = threading.Condition()
+        self._idle: list[sqlite3.Connection] = []
+        self._pooled: set[int] = set()
+        self._in_use = 0
+        self._file_id: tuple[int, int] | None = None
+        self._created = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._overflow = 0
+        self._resets = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = _open_connection(self.path, self.cached_statements)
+        self._created += 1
+        return conn
+
+    def _current_file_id(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino)
+
+    def _discard_if_replaced(self) -> None:
+        """Drop idle connections if the database file was deleted or replaced."""
+        file_id = self._current_file_id()
+        if self._file_id is not None and file_id != self._file_id:
+            for conn in self._idle:
+                self._pooled.discard(id(conn))
+                conn.close()
+            self._idle.clear()
+            # Checked-out connections are closed when they come back.
+            self._pooled.clear()
+            self._in_use = 0
+            self._resets += 1
+        self._file_id = file_id
+
+    def acquire(self) -> sqlite3.Connection:
+        start = time.perf_counter()
+        waited = False
+        with self._cond:
+            self._discard_if_replaced()
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if len(self._pooled) < self.max_size:
+                    conn = self._connect()
+                    self._pooled.add(id(conn))
+                    if self._file_id is None:
+                        self._file_id = self._current_file_id()
+                    break
+                remaining = self.wait_timeout - (time.perf_counter() - start)
+                if remaining <= 0:
+                    conn = self._connect()
+                    self._overflow += 1
+                    break
+                waited = True
+                self._cond.wait(remaining)
+            if id(conn) in self._pooled:
+                self._in_use += 1
+            self._checkouts += 1
+            if waited:
+                elapsed = time.perf_counter() - start
+                self._waits += 1
+                self._total_wait += elapsed
+                self._max_wait = max(self._max_wait, elapsed)
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        with self._cond:
+            if id(conn) not in self._pooled:
+                conn.close()
+                return
+            self._in_use -= 1
+            if conn.in_transaction:
+                # Never hand a connection with a dangling transaction to the next caller.
+                try:
+                    conn.rollback()
+                except sqlite3.Error:
+                    self._pooled.discard(id(conn))
+                    conn.close()
+                    self._cond.notify()
+                    return
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Close idle connections; checked-out ones are closed when returned."""
+        with self._cond:
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+            self._pooled.clear()
+            self._in_use = 0
+            self._cond.notify_all()
+
+    def stats(self) -> PoolStats:
+        with self._cond:
+            return PoolStats(
+                path=str(self.path),
+                max_size=self.max_size,
+                open_connections=len(self._pooled),
+                idle_connections=len(self._idle),
+                in_use=self._in_use,
+                created=self._created,
+                checkouts=self._checkouts,
+                waits=self._waits,
+                total_wait_ms=round(self._total_wait * 1000.0, 3),
+                max_wait_ms=round(self._max_wait * 1000.0, 3),
+                overflow_checkouts=self._overflow,
+                resets=self._resets,
+            )
+
+
+def _pool_size_from_env() -> int:
+    try:
+        return int(os.getenv(POOL_SIZE_ENV_VAR, "8"))
+    except ValueError:
+        return 8
+
+
+def _pool_enabled() -> bool:
+    return os.getenv(POOL_ENABLED_ENV_VAR, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path: Path | str | None = None) -> ConnectionPool:
+    """Return the shared pool for ``path`` (defaults to ``DB_PATH``)."""
+    key = str(Path(path if path is not None else DB_PATH))
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(key, max_size=_pool_size_from_env())
+                _pools[key] = pool
+    return pool
+
+
+def pool_stats() -> list[dict]:
+    """Stats for every pool opened in this process."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.stats().to_dict() for pool in pools]
+
+
+def close_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+@contextmanager
+def get_connection() -> Iterator[sqlite3.Connection]:
+    if not _pool_enabled():
+        conn = _open_connection(DB_PATH)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+        return
+
+    pool = get_pool()
+    conn = pool.acquire()
     try:
         yield conn
         conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
     finally:
-        conn.close()
+        pool.release(conn)
 
 
 def execute_script(sql: str) -> None:
     with get_connection() as conn:
-        conn.executescript(sql)
+        conn.executescript(sql)
+
+
+def insert_many(conn: sqlite3.Connection, sql: str, rows: Sequence[Sequence]) -> list[int]:
+    """Run ``executemany`` for an INSERT and return the new rowids in input order.
+
+    ``executemany`` does not report per-row ids, but within one write
+    transaction SQLite assigns rowids to consecutive inserts sequentially, so
+    the ids are the ``len(rows)`` values ending at ``last_insert_rowid()``.
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+    conn.executemany(sql, rows)
+    last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    return list(range(last_id - len(rows) + 1, last_id + 1))
@@ -6,12 +6,15 @@ from typing import Iterable, List
 
 from fastapi import Depends, FastAPI, HTTPException, status
 
-from virtualoffice.common.db import execute_script, get_connection
+from virtualoffice.common.db import execute_script, get_connection, insert_many
 from virtualoffice.servers.chat.models import (
+    BatchCreated,
     DMPost,
+    DMPostBatch,
     MessagePost,
     MessageRecord,
     RoomCreate,
+    RoomMessageBatch,
     RoomRecord,
     UserRecord,
     UserUpdate,
@@ -53,7 +56,17 @@ CREATE TABLE IF NOT EXISTS chat_messages (
     FOREIGN KEY(sender) REFERENCES chat_users(handle)
 );
 
+-- Idempotency keys of stored messages, so a retried send never stores a message twice
+CREATE TABLE IF NOT EXISTS chat_send_keys (
+    key TEXT PRIMARY KEY,
+    message_id INTEGER NOT NULL,
+    FOREIGN KEY(message_id) REFERENCES chat_messages(id) ON DELETE CASCADE
+);
+
 CREATE INDEX IF NOT EXISTS idx_chat_messages_room ON chat_messages(room_id, sent_at);
+-- Keyset paging (before_id) within a room, and "rooms for this handle" lookups
+CREATE INDEX IF NOT EXISTS idx_chat_messages_room_id ON chat_messages(room_id, id);
+CREATE INDEX IF NOT EXISTS idx_chat_members_handle ON chat_members(handle, room_id);
 """
 
 
@@ -72,11 +85,10 @@ def _normalise_handle(handle: str) -> str:
 
 
 def _ensure_users(conn, handles: Iterable[str]) -> None:
-    for handle in {_normalise_handle(h) for h in handles if h}:
-        conn.execute(
-            "INSERT INTO chat_users(handle) VALUES (?) ON CONFLICT(handle) DO NOTHING",
-            (handle,),
-        )
+    conn.executemany(
+        "INSERT INTO chat_users(handle) VALUES (?) ON CONFLICT(handle) DO NOTHING",
+        [(handle,) for handle in {_normalise_handle(h) for h in handles if h}],
+    )
 
 
 def _room_by_slug(conn, slug: str):
@@ -105,14 +117,13 @@ def _room_to_record(conn, room_row) -> RoomRecord:
     )
 
 
-def _message_to_record(conn, message_id: int) -> MessageRecord:
-    row = conn.execute(
-        "SELECT m.id, r.slug, m.sender, m.body, m.sent_at\n"
-        "FROM chat_messages m JOIN chat_rooms r ON m.room_id = r.id WHERE m.id = ?",
-        (message_id,),
-    ).fetchone()
-    if not row:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found")
+_MESSAGE_SELECT = (
+    "SELECT m.id, r.slug, m.sender, m.body, m.sent_at\n"
+    "FROM chat_messages m JOIN chat_rooms r ON m.room_id = r.id"
+)
+
+
+def _row_to_message(row) -> MessageRecord:
     return MessageRecord(
         id=row["id"],
         room_slug=row["slug"],
@@ -122,6 +133,83 @@ def _message_to_record(conn, message_id: int) -> MessageRecord:
     )
 
 
+def _stored_keys(conn, keys: Iterable[str | None]) -> dict[str, int]:
+    """Map idempotency keys that were already stored to their message ids."""
+    keys = sorted({key for key in keys if key})
+    stored: dict[str, int] = {}
+    for start in range(0, len(keys), 500):
+        chunk = keys[start:start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        stored.update(
+            (row["key"], row["message_id"])
+            for row in conn.execute(f"SELECT key, message_id FROM chat_send_keys WHERE key IN ({placeholders})", chunk)
+        )
+    return stored
+
+
+def _record_keys(conn, keyed_ids: Iterable[tuple[str | None, int]]) -> None:
+    conn.executemany(
+        "INSERT INTO chat_send_keys(key, message_id) VALUES (?, ?)",
+        [(key, message_id) for key, message_id in keyed_ids if key],
+    )
+
+
+def _message_to_record(conn, message_id: int) -> MessageRecord:
+    row = conn.execute(f"{_MESSAGE_SELECT} WHERE m.id = ?", (message_id,)).fetchone()
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found")
+    return _row_to_message(row)
+
+
+def _query_messages(
+    conn,
+    where: str,
+    params: list,
+    *,
+    since_id: int | None = None,
+    since_timestamp: str | None = None,
+    before_timestamp: str | None = None,
+    before_id: int | None = None,
+    limit: int | None = None,
+    newest_first: bool = False,
+) -> List[MessageRecord]:
+    """Fetch full message records matching ``where`` in a single query.
+
+    Without ``before_id`` messages are ordered by ``sent_at``. With
+    ``before_id`` the result is the ``limit`` messages immediately older than
+    that id (keyset paging), returned in the same direction.
+    """
+    query = f"{_MESSAGE_SELECT} WHERE {where}"
+    params = list(params)
+
+    if since_id is not None:
+        query += " AND m.id > ?"
+        params.append(since_id)
+
+    if since_timestamp is not None:
+        query += " AND m.sent_at > ?"
+        params.append(since_timestamp)
+
+    if before_timestamp is not None:
+        query += " AND m.sent_at <= ?"
+        params.append(before_timestamp)
+
+    if before_id is not None:
+        query += " AND m.id < ? ORDER BY m.id DESC"
+        params.append(before_id)
+    else:
+        query += " ORDER BY m.sent_at DESC, m.id DESC" if newest_first else " ORDER BY m.sent_at, m.id"
+
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    records = [_row_to_message(row) for row in conn.execute(query, params)]
+    if before_id is not None and not newest_first:
+        records.reverse()
+    return records
+
+
 @app.put("/users/{handle}", response_model=UserRecord, status_code=status.HTTP_201_CREATED)
 def ensure_user(handle: str, update: UserUpdate | None = None, conn=Depends(db_dependency)):
     normalised = _normalise_handle(handle)
@@ -190,6 +278,9 @@ def post_message(slug: str, payload: MessagePost, conn=Depends(db_dependency)):
     ).fetchone()
     if not membership:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Sender not in room")
+    stored = _stored_keys(conn, [payload.idempotency_key])
+    if stored:
+        return _message_to_record(conn, stored[payload.idempotency_key])
 
     if getattr(payload, "sent_at_iso", None):
         cursor = conn.execute(
@@ -201,6 +292,7 @@ def post_message(slug: str, payload: MessagePost, conn=Depends(db_dependency)):
             "INSERT INTO chat_messages(room_id, sender, body) VALUES (?, ?, ?)",
             (room["id"], sender, payload.body),
         )
+    _record_keys(conn, [(payload.idempotency_key, cursor.lastrowid)])
     return _message_to_record(conn, cursor.lastrowid)
 
 
@@ -210,6 +302,7 @@ def list_messages(
     since_id: int | None = None,
     since_timestamp: str | None = None,
     before_timestamp: str | None = None,
+    before_id: int | None = None,
     limit: int | None = None,
     conn=Depends(db_dependency)
 ):
@@ -220,33 +313,20 @@ def list_messages(
         since_id: Only return messages with ID greater than this (for polling new messages)
         since_timestamp: Only return messages sent after this ISO timestamp
         before_timestamp: Only return messages sent before or at this ISO timestamp (for replay mode)
+        before_id: Only return the ``limit`` messages just before this ID (keyset pagination: pass the first ID of the current page)
         limit: Maximum number of messages to return (chronological order)
     """
     room = _room_by_slug(conn, slug)
-
-    query = "SELECT id FROM chat_messages WHERE room_id = ?"
-    params = [room["id"]]
-
-    if since_id is not None:
-        query += " AND id > ?"
-        params.append(since_id)
-
-    if since_timestamp is not None:
-        query += " AND sent_at > ?"
-        params.append(since_timestamp)
-
-    if before_timestamp is not None:
-        query += " AND sent_at <= ?"
-        params.append(before_timestamp)
-
-    query += " ORDER BY sent_at"
-
-    if limit is not None:
-        query += " LIMIT ?"
-        params.append(limit)
-
-    messages = conn.execute(query, params)
-    return [_message_to_record(conn, row["id"]) for row in messages]
+    return _query_messages(
+        conn,
+        "m.room_id = ?",
+        [room["id"]],
+        since_id=since_id,
+        since_timestamp=since_timestamp,
+        before_timestamp=before_timestamp,
+        before_id=before_id,
+        limit=limit,
+    )
 
 
 def _dm_slug(sender: str, recipient: str) -> str:
@@ -254,18 +334,29 @@ def _dm_slug(sender: str, recipient: str) -> str:
     return f"dm:{handles[0]}:{handles[1]}"
 
 
-@app.post("/dms", response_model=MessageRecord, status_code=status.HTTP_201_CREATED)
-def send_dm(payload: DMPost, conn=Depends(db_dependency)):
-    slug = _dm_slug(payload.sender, payload.recipient)
-    handles = {_normalise_handle(payload.sender), _normalise_handle(payload.recipient)}
-    _ensure_users(conn, handles)
-
-    room_row = conn.execute(
-        "SELECT id FROM chat_rooms WHERE slug = ?",
-        (slug,),
-    ).fetchone()
-
-    if not room_row:
+def _rooms_by_slugs(conn, slugs: Iterable[str]) -> dict[str, int]:
+    unique = sorted(set(slugs))
+    if not unique:
+        return {}
+    placeholders = ",".join("?" * len(unique))
+    return {
+        row["slug"]: row["id"]
+        for row in conn.execute(f"SELECT id, slug FROM chat_rooms WHERE slug IN ({placeholders})", unique)
+    }
+
+
+def _ensure_dm_rooms(conn, pairs: Iterable[tuple[str, str]]) -> dict[str, int]:
+    """Create any missing DM rooms for (sender, recipient) pairs; return slug -> room id."""
+    members_by_slug = {
+        _dm_slug(sender, recipient): {_normalise_handle(sender), _normalise_handle(recipient)}
+        for sender, recipient in pairs
+    }
+    _ensure_users(conn, {handle for handles in members_by_slug.values() for handle in handles})
+
+    room_ids = _rooms_by_slugs(conn, members_by_slug)
+    for slug, handles in members_by_slug.items():
+        if slug in room_ids:
+            continue
         sorted_handles = sorted(handles)
         display_name = (
             f"DM {sorted_handles[0]}<->{sorted_handles[1]}" if len(sorted_handles) > 1 else f"DM {sorted_handles[0]}"
@@ -274,26 +365,117 @@ def send_dm(payload: DMPost, conn=Depends(db_dependency)):
             "INSERT INTO chat_rooms(slug, name, is_dm) VALUES (?, ?, 1)",
             (slug, display_name),
         )
-        room_id = cursor.lastrowid
-        for handle in handles:
-            conn.execute(
-                "INSERT INTO chat_members(room_id, handle) VALUES(?, ?)",
-                (room_id, handle),
-            )
-    else:
-        room_id = room_row["id"]
+        room_ids[slug] = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO chat_members(room_id, handle) VALUES(?, ?)",
+            [(cursor.lastrowid, handle) for handle in sorted_handles],
+        )
+    return room_ids
+
+
+@app.post("/dms", response_model=MessageRecord, status_code=status.HTTP_201_CREATED)
+def send_dm(payload: DMPost, conn=Depends(db_dependency)):
+    slug = _dm_slug(payload.sender, payload.recipient)
+    _ensure_dm_rooms(conn, [(payload.sender, payload.recipient)])
 
     # Preserve provided sent_at if present
-    post_payload = MessagePost(sender=payload.sender, body=payload.body, sent_at_iso=getattr(payload, "sent_at_iso", None))
+    post_payload = MessagePost(
+        sender=payload.sender,
+        body=payload.body,
+        sent_at_iso=getattr(payload, "sent_at_iso", None),
+        idempotency_key=payload.idempotency_key,
+    )
     return post_message(slug, post_payload, conn)
 
 
+def _insert_messages(conn, rows: list[tuple[int, str, str, str | None]]) -> list[int]:
+    return insert_many(
+        conn,
+        "INSERT INTO chat_messages(room_id, sender, body, sent_at) VALUES (?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))",
+        rows,
+    )
+
+
+def _insert_keyed_messages(conn, messages: list, rows: list[tuple[int, str, str, str | None]]) -> list[int]:
+    """Insert ``rows`` (one per message) except those whose idempotency key was stored; ids in message order."""
+    stored = _stored_keys(conn, (message.idempotency_key for message in messages))
+    fresh = [(message, row) for message, row in zip(messages, rows) if message.idempotency_key not in stored]
+    new_ids = _insert_messages(conn, [row for _, row in fresh])
+    _record_keys(conn, ((message.idempotency_key, message_id) for (message, _), message_id in zip(fresh, new_ids)))
+    created = iter(new_ids)
+    return [stored.get(message.idempotency_key) or next(created) for message in messages]
+
+
+@app.post("/dms/batch", response_model=BatchCreated, status_code=status.HTTP_201_CREATED)
+def send_dm_batch(payload: DMPostBatch, conn=Depends(db_dependency)):
+    """Store many DMs in one transaction and return their ids in request order.
+
+    DMs whose ``idempotency_key`` was already stored are not stored again.
+    """
+    messages = payload.messages
+    room_ids = _ensure_dm_rooms(conn, [(message.sender, message.recipient) for message in messages])
+    ids = _insert_keyed_messages(
+        conn,
+        messages,
+        [
+            (
+                room_ids[_dm_slug(message.sender, message.recipient)],
+                _normalise_handle(message.sender),
+                message.body,
+                message.sent_at_iso,
+            )
+            for message in messages
+        ],
+    )
+    return BatchCreated(ids=ids)
+
+
+@app.post("/rooms/messages/batch", response_model=BatchCreated, status_code=status.HTTP_201_CREATED)
+def post_message_batch(payload: RoomMessageBatch, conn=Depends(db_dependency)):
+    """Store many room messages in one transaction and return their ids in request order.
+
+    The batch is all-or-nothing: an unknown room (404) or a sender outside its
+    room (403) rejects every message. Messages whose ``idempotency_key`` was
+    already stored are not stored again.
+    """
+    messages = payload.messages
+    if not messages:
+        return BatchCreated(ids=[])
+
+    room_ids = _rooms_by_slugs(conn, (message.room_slug for message in messages))
+    missing = sorted({message.room_slug for message in messages} - room_ids.keys())
+    if missing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Room not found: {', '.join(missing)}")
+
+    senders = [_normalise_handle(message.sender) for message in messages]
+    _ensure_users(conn, senders)
+    placeholders = ",".join("?" * len(room_ids))
+    memberships = {
+        (row["room_id"], row["handle"])
+        for row in conn.execute(
+            f"SELECT room_id, handle FROM chat_members WHERE room_id IN ({placeholders})",
+            list(room_ids.values()),
+        )
+    }
+    rows = []
+    for message, sender in zip(messages, senders):
+        room_id = room_ids[message.room_slug]
+        if (room_id, sender) not in memberships:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Sender {sender} not in room {message.room_slug}",
+            )
+        rows.append((room_id, sender, message.body, message.sent_at_iso))
+    return BatchCreated(ids=_insert_keyed_messages(conn, messages, rows))
+
+
 @app.get("/users/{handle}/dms", response_model=List[MessageRecord])
 def list_user_dms(
     handle: str,
     since_id: int | None = None,
     since_timestamp: str | None = None,
     before_timestamp: str | None = None,
+    before_id: int | None = None,
     limit: int | None = None,
     conn=Depends(db_dependency)
 ):
@@ -304,52 +486,20 @@ def list_user_dms(
         since_id: Only return messages with ID greater than this
         since_timestamp: Only return messages sent after this ISO timestamp
         before_timestamp: Only return messages sent before or at this ISO timestamp (for replay mode)
+        before_id: Only return the ``limit`` messages just before this ID (keyset pagination)
         limit: Maximum number of messages to return
     """
     normalised = _normalise_handle(handle)
-
-    # Find all DM rooms the user is a member of
-    room_ids = [
-        row["room_id"]
-        for row in conn.execute(
-            """
-            SELECT DISTINCT cm.room_id
-            FROM chat_members cm
-            JOIN chat_rooms cr ON cm.room_id = cr.id
-            WHERE cm.handle = ? AND cr.is_dm = 1
-            """,
-            (normalised,),
-        )
-    ]
-
-    if not room_ids:
-        return []
-
-    # Build query for messages in those rooms
-    placeholders = ",".join("?" * len(room_ids))
-    query = f"SELECT id FROM chat_messages WHERE room_id IN ({placeholders})"
-    params = list(room_ids)
-
-    if since_id is not None:
-        query += " AND id > ?"
-        params.append(since_id)
-
-    if since_timestamp is not None:
-        query += " AND sent_at > ?"
-        params.append(since_timestamp)
-
-    if before_timestamp is not None:
-        query += " AND sent_at <= ?"
-        params.append(before_timestamp)
-
-    query += " ORDER BY sent_at"
-
-    if limit is not None:
-        query += " LIMIT ?"
-        params.append(limit)
-
-    messages = conn.execute(query, params)
-    return [_message_to_record(conn, row["id"]) for row in messages]
+    return _query_messages(
+        conn,
+        "r.is_dm = 1 AND m.room_id IN (SELECT room_id FROM chat_members WHERE handle = ?)",
+        [normalised],
+        since_id=since_id,
+        since_timestamp=since_timestamp,
+        before_timestamp=before_timestamp,
+        before_id=before_id,
+        limit=limit,
+    )
 
 
 @app.get("/users/{handle}/rooms", response_model=List[RoomRecord])
@@ -366,7 +516,28 @@ def list_user_rooms(handle: str, conn=Depends(db_dependency)):
         """,
         (normalised,),
     ).fetchall()
-    return [_room_to_record(conn, row) for row in rows]
+
+    # Members of every room in one query rather than one per room
+    participants: dict[int, List[str]] = {row["id"]: [] for row in rows}
+    for member in conn.execute(
+        """
+        SELECT room_id, handle FROM chat_members
+        WHERE room_id IN (SELECT room_id FROM chat_members WHERE handle = ?)
+        ORDER BY handle
+        """,
+        (normalised,),
+    ):
+        participants[member["room_id"]].append(member["handle"])
+
+    return [
+        RoomRecord(
+            slug=row["slug"],
+            name=row["name"],
+            participants=participants[row["id"]],
+            is_dm=bool(row["is_dm"]),
+        )
+        for row in rows
+    ]
 
 
 @app.get("/users/{handle}/messages", response_model=List[MessageRecord])
@@ -374,38 +545,19 @@ def list_user_visible_messages(
     handle: str,
     since_id: int | None = None,
     since_timestamp: str | None = None,
+    before_id: int | None = None,
     limit: int | None = None,
     conn=Depends(db_dependency)
 ):
-    """Get all messages visible to a user (across rooms they belong to)."""
+    """Get all messages visible to a user (across rooms they belong to), newest first."""
     normalised = _normalise_handle(handle)
-    room_ids = [
-        row["room_id"]
-        for row in conn.execute(
-            "SELECT room_id FROM chat_members WHERE handle = ?",
-            (normalised,),
-        )
-    ]
-    if not room_ids:
-        return []
-
-    placeholders = ",".join("?" * len(room_ids))
-    query = f"SELECT id FROM chat_messages WHERE room_id IN ({placeholders})"
-    params = list(room_ids)
-
-    if since_id is not None:
-        query += " AND id > ?"
-        params.append(since_id)
-
-    if since_timestamp is not None:
-        query += " AND sent_at > ?"
-        params.append(since_timestamp)
-
-    query += " ORDER BY sent_at DESC"
-
-    if limit is not None:
-        query += " LIMIT ?"
-        params.append(limit)
-
-    rows = conn.execute(query, params)
-    return [_message_to_record(conn, row["id"]) for row in rows]
+    return _query_messages(
+        conn,
+        "m.room_id IN (SELECT room_id FROM chat_members WHERE handle = ?)",
+        [normalised],
+        since_id=since_id,
+        since_timestamp=since_timestamp,
+        before_id=before_id,
+        limit=limit,
+        newest_first=True,
+    )
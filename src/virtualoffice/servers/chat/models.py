@@ -30,6 +30,8 @@ class MessagePost(BaseModel):
     sender: str
     body: str = Field(..., max_length=4096)
     sent_at_iso: Optional[str] = None
+    # Optional client-chosen key; resending a stored key returns the stored message instead of a copy.
+    idempotency_key: Optional[str] = Field(default=None, max_length=64)
 
 
 class MessageRecord(BaseModel):
@@ -45,3 +47,22 @@ class DMPost(BaseModel):
     recipient: str
     body: str = Field(..., max_length=4096)
     sent_at_iso: Optional[str] = None
+    # Optional client-chosen key; resending a stored key returns the stored message instead of a copy.
+    idempotency_key: Optional[str] = Field(default=None, max_length=64)
+
+
+class DMPostBatch(BaseModel):
+    messages: List[DMPost] = Field(default_factory=list)
+
+
+class RoomMessagePost(MessagePost):
+    room_slug: str
+
+
+class RoomMessageBatch(BaseModel):
+    messages: List[RoomMessagePost] = Field(default_factory=list)
+
+
+class BatchCreated(BaseModel):
+    # Ids of the created messages, in the same order as the submitted messages.
+    ids: List[int]
@@ -9,6 +9,7 @@ Endpoints:
 - GET /clustering/{persona_id}/cluster/{cluster_id} - Get cluster details
 - GET /clustering/{persona_id}/status - Get indexing status
 - DELETE /clustering/{persona_id}/index - Clear index
+- GET /clustering/embedding-cache - Embedding cache counters
 """
 
 import asyncio
@@ -21,7 +22,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from virtualoffice.common.db import get_connection as get_vdos_connection
 from virtualoffice.clustering import db
 from virtualoffice.clustering.cluster_engine import ClusterEngine
+from virtualoffice.clustering.embedding_cache import embedding_cache_stats
 from virtualoffice.clustering.faiss_store import delete_store_for_persona
+from virtualoffice.clustering.reducer import delete_reducer_for_persona, reducer_available
 from virtualoffice.servers.clustering.schemas import (
     BuildIndexRequest,
     ClusterDetailResponse,
@@ -145,8 +148,9 @@ def _progress_callback(persona_id: int, step: str, percent: float):
 
 
 async def _build_index_background(persona_id: int, dbscan_eps: float = 2.0,
-                                   dbscan_min_samples: int = 3, tsne_perplexity: float = 30.0):
-    """Background task to build index."""
+                                   dbscan_min_samples: int = 3, tsne_perplexity: float = 30.0,
+                                   incremental: bool = False, reducer: str = "tsne"):
+    """Background task to build (or incrementally update) an index."""
     try:
         # Initialize status
         _indexing_status[persona_id] = IndexingStatusResponse(
@@ -161,13 +165,15 @@ async def _build_index_background(persona_id: int, dbscan_eps: float = 2.0,
         engine = ClusterEngine(
             dbscan_eps=dbscan_eps,
             dbscan_min_samples=dbscan_min_samples,
-            tsne_perplexity=tsne_perplexity
+            tsne_perplexity=tsne_perplexity,
+            reducer=reducer,
         )
 
         # Run in executor to avoid blocking async loop
         loop = asyncio.get_event_loop()
+        run = engine.update_index if incremental else engine.build_index
         result = await loop.run_in_executor(
-            None, engine.build_index, persona_id, lambda s, p: _progress_callback(persona_id, s, p)
+            None, run, persona_id, lambda s, p: _progress_callback(persona_id, s, p)
         )
 
         # Update final status
@@ -193,6 +199,9 @@ async def build_index(persona_id: int, background_tasks: BackgroundTasks,
 
     This is an async operation that runs in the background.
     Use GET /clustering/{persona_id}/status to poll for progress.
+
+    With ``incremental`` set, the existing index is kept and only emails sent
+    since the last build are added (see ClusterEngine.update_index).
     """
     try:
         # Check if already indexing
@@ -211,13 +220,21 @@ async def build_index(persona_id: int, background_tasks: BackgroundTasks,
                     status_code=status.HTTP_404_NOT_FOUND, detail=f"Persona {persona_id} not found"
                 )
 
+        if not reducer_available(params.reducer):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Reducer '{params.reducer}' is not available (install umap-learn for UMAP)",
+            )
+
         # Delete existing index if present (to avoid foreign key conflicts when re-indexing)
-        try:
-            db.delete_persona_index(persona_id)
-            delete_store_for_persona(persona_id)
-            logger.info(f"Cleared existing index for persona {persona_id} before re-indexing")
-        except Exception as e:
-            logger.warning(f"Could not clear existing index for persona {persona_id}: {e}")
+        if not params.incremental:
+            try:
+                db.delete_persona_index(persona_id)
+                delete_store_for_persona(persona_id)
+                delete_reducer_for_persona(persona_id)
+                logger.info(f"Cleared existing index for persona {persona_id} before re-indexing")
+            except Exception as e:
+                logger.warning(f"Could not clear existing index for persona {persona_id}: {e}")
 
         # Start background task with parameters
         background_tasks.add_task(
@@ -225,7 +242,9 @@ async def build_index(persona_id: int, background_tasks: BackgroundTasks,
             persona_id,
             params.dbscan_eps,
             params.dbscan_min_samples,
-            params.tsne_perplexity
+            params.tsne_perplexity,
+            params.incremental,
+            params.reducer,
         )
 
         return SuccessResponse(
@@ -248,8 +267,9 @@ async def optimize_clustering_parameters(
     """
     Auto-optimize clustering parameters for a persona using GPT evaluation.
 
-    Tests multiple parameter configurations and uses GPT to evaluate which
-    clustering produces the most coherent, meaningful clusters.
+    Scores multiple parameter configurations locally on one set of embeddings,
+    then uses GPT to evaluate which of the top_k produces the most coherent,
+    meaningful clusters.
 
     Optionally provide a natural language guideline for clustering.
     """
@@ -298,13 +318,13 @@ async def optimize_clustering_parameters(
 
                 def progress_callback(step, percent, config):
                     if persona_id in _indexing_status:
-                        _indexing_status[persona_id].current_step = f"{step} ({config})"
+                        _indexing_status[persona_id].current_step = f"{step} ({config})" if config else step
                         _indexing_status[persona_id].progress_percent = percent
 
                 # Run optimization with guideline
                 loop = asyncio.get_event_loop()
                 best_config, best_quality = await loop.run_in_executor(
-                    None, optimize_parameters, persona_id, progress_callback, guideline
+                    None, optimize_parameters, persona_id, progress_callback, guideline, params.top_k
                 )
 
                 # Update status with total emails from result
@@ -327,7 +347,7 @@ async def optimize_clustering_parameters(
 
         return SuccessResponse(
             success=True,
-            message=f"Parameter optimization started for persona {persona_id}. This may take several minutes. Check /clustering/{persona_id}/status for progress."
+            message=f"Parameter optimization started for persona {persona_id}. Check /clustering/{persona_id}/status for progress."
         )
 
     except HTTPException:
@@ -384,8 +404,9 @@ def clear_index(persona_id: int):
         # Delete from database
         db.delete_persona_index(persona_id)
 
-        # Delete FAISS store
+        # Delete FAISS store and fitted reducer
         delete_store_for_persona(persona_id)
+        delete_reducer_for_persona(persona_id)
 
         # Clear from status cache
         if persona_id in _indexing_status:
@@ -402,6 +423,12 @@ def clear_index(persona_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/clustering/embedding-cache")
+def get_embedding_cache_stats():
+    """Embedding cache counters (entries per model, hit rate, evictions); {"enabled": false} when off."""
+    return embedding_cache_stats()
+
+
 # ============================================================================
 # Visualization Data
 # ============================================================================
@@ -3,7 +3,7 @@ API request/response schemas for the clustering server.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -16,12 +16,15 @@ class BuildIndexRequest(BaseModel):
     dbscan_eps: float = Field(default=10.0, description="DBSCAN epsilon (distance threshold)")
     dbscan_min_samples: int = Field(default=3, description="DBSCAN minimum samples per cluster")
     tsne_perplexity: float = Field(default=30.0, description="t-SNE perplexity parameter")
+    reducer: Literal["tsne", "umap", "pca"] = Field(default="tsne", description="3D reduction after PCA-50: Barnes-Hut t-SNE, UMAP (needs umap-learn) or PCA only")
+    incremental: bool = Field(default=False, description="Add only emails sent since the last build; rebuilds fully when the index has drifted")
 
 
 class OptimizeRequest(BaseModel):
     """Request to auto-optimize clustering parameters."""
 
     guideline: Optional[str] = Field(default=None, description="Natural language guideline for clustering (e.g., 'Group by intent', 'Organize by project')")
+    top_k: int = Field(default=3, ge=1, le=10, description="Number of best locally-scored configurations to evaluate with GPT")
 
 
 # Response schemas
@@ -6,12 +6,14 @@ from typing import Iterable, List
 
 from fastapi import Depends, FastAPI, HTTPException, status
 
-from virtualoffice.common.db import execute_script, get_connection
+from virtualoffice.common.db import execute_script, get_connection, insert_many
 from virtualoffice.servers.email.models import (
+    BatchCreated,
     DraftCreate,
     DraftRecord,
     EmailMessage,
     EmailSend,
+    EmailSendBatch,
     Mailbox,
     MailboxUpdate,
     normalise_address,
@@ -53,7 +55,18 @@ CREATE TABLE IF NOT EXISTS drafts (
     FOREIGN KEY(mailbox) REFERENCES mailboxes(address)
 );
 
-CREATE INDEX IF NOT EXISTS idx_email_recipient_address ON email_recipients(address);
+-- Idempotency keys of stored sends, so a retried send never stores an email twice
+CREATE TABLE IF NOT EXISTS email_send_keys (
+    key TEXT PRIMARY KEY,
+    email_id INTEGER NOT NULL,
+    FOREIGN KEY(email_id) REFERENCES emails(id) ON DELETE CASCADE
+);
+
+-- Mailbox and sender listings page newest-first by id within one address
+DROP INDEX IF EXISTS idx_email_recipient_address;
+CREATE INDEX IF NOT EXISTS idx_email_recipients_address_email ON email_recipients(address, email_id);
+CREATE INDEX IF NOT EXISTS idx_email_recipients_email ON email_recipients(email_id);
+CREATE INDEX IF NOT EXISTS idx_emails_sender_id ON emails(sender, id);
 CREATE INDEX IF NOT EXISTS idx_drafts_mailbox ON drafts(mailbox);
 """
 
@@ -77,39 +90,82 @@ def _normalise_or_422(address: str) -> str:
 
 def _ensure_mailboxes(conn, addresses: Iterable[str]) -> None:
     unique_addresses = {_normalise_or_422(addr) for addr in addresses if addr}
-    for address in unique_addresses:
-        conn.execute(
-            "INSERT INTO mailboxes(address) VALUES (?) ON CONFLICT(address) DO NOTHING",
-            (address,),
+    conn.executemany(
+        "INSERT INTO mailboxes(address) VALUES (?) ON CONFLICT(address) DO NOTHING",
+        [(address,) for address in unique_addresses],
+    )
+
+
+def _recipient_rows(email_id: int, payload: EmailSend) -> list[tuple[int, str, str]]:
+    return [
+        (email_id, address, kind)
+        for kind, addresses in (("to", payload.to), ("cc", payload.cc), ("bcc", payload.bcc))
+        for address in addresses
+    ]
+
+
+# Stay well under SQLite's bound-parameter limit when loading emails by id
+_ID_CHUNK_SIZE = 500
+
+
+def _stored_keys(conn, keys: Iterable[str | None]) -> dict[str, int]:
+    """Map idempotency keys that were already stored to their email ids."""
+    keys = sorted({key for key in keys if key})
+    stored: dict[str, int] = {}
+    for start in range(0, len(keys), _ID_CHUNK_SIZE):
+        chunk = keys[start:start + _ID_CHUNK_SIZE]
+        placeholders = ",".join("?" * len(chunk))
+        stored.update(
+            (row["key"], row["email_id"])
+            for row in conn.execute(f"SELECT key, email_id FROM email_send_keys WHERE key IN ({placeholders})", chunk)
         )
+    return stored
 
 
-def _row_to_email(conn, email_id: int) -> EmailMessage:
-    row = conn.execute(
-        "SELECT id, sender, subject, body, thread_id, sent_at FROM emails WHERE id = ?",
-        (email_id,),
-    ).fetchone()
-    if not row:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Email not found")
+def _load_emails(conn, email_ids: List[int]) -> List[EmailMessage]:
+    """Load full emails for ``email_ids`` in bulk, preserving the given order.
 
-    recipients: dict[str, List[str]] = defaultdict(list)
-    for rec in conn.execute(
-        "SELECT address, kind FROM email_recipients WHERE email_id = ? ORDER BY rowid",
-        (email_id,),
-    ):
-        recipients[rec["kind"]].append(rec["address"])
+    Two queries per chunk of ids (email rows, then all of their recipients)
+    instead of two per email.
+    """
+    rows = {}
+    recipients: dict[int, dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+    for start in range(0, len(email_ids), _ID_CHUNK_SIZE):
+        chunk = email_ids[start:start + _ID_CHUNK_SIZE]
+        placeholders = ",".join("?" * len(chunk))
+        for row in conn.execute(
+            f"SELECT id, sender, subject, body, thread_id, sent_at FROM emails WHERE id IN ({placeholders})",
+            chunk,
+        ):
+            rows[row["id"]] = row
+        for rec in conn.execute(
+            f"SELECT email_id, address, kind FROM email_recipients WHERE email_id IN ({placeholders}) ORDER BY rowid",
+            chunk,
+        ):
+            recipients[rec["email_id"]][rec["kind"]].append(rec["address"])
+
+    return [
+        EmailMessage(
+            id=row["id"],
+            sender=row["sender"],
+            to=recipients[email_id].get("to", []),
+            cc=recipients[email_id].get("cc", []),
+            bcc=recipients[email_id].get("bcc", []),
+            subject=row["subject"],
+            body=row["body"],
+            thread_id=row["thread_id"],
+            sent_at=datetime.fromisoformat(row["sent_at"]),
+        )
+        for email_id in email_ids
+        if (row := rows.get(email_id)) is not None
+    ]
 
-    return EmailMessage(
-        id=row["id"],
-        sender=row["sender"],
-        to=recipients.get("to", []),
-        cc=recipients.get("cc", []),
-        bcc=recipients.get("bcc", []),
-        subject=row["subject"],
-        body=row["body"],
-        thread_id=row["thread_id"],
-        sent_at=datetime.fromisoformat(row["sent_at"]),
-    )
+
+def _row_to_email(conn, email_id: int) -> EmailMessage:
+    emails = _load_emails(conn, [email_id])
+    if not emails:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Email not found")
+    return emails[0]
 
 
 @app.put(
@@ -137,6 +193,9 @@ def send_email(payload: EmailSend, conn=Depends(db_dependency)):
     recipients = payload.recipients_flat()
     if not recipients:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one recipient required")
+    stored = _stored_keys(conn, [payload.idempotency_key])
+    if stored:
+        return _row_to_email(conn, stored[payload.idempotency_key])
 
     all_addresses = [payload.sender, *recipients]
     _ensure_mailboxes(conn, all_addresses)
@@ -154,25 +213,62 @@ def send_email(payload: EmailSend, conn=Depends(db_dependency)):
         )
     email_id = cursor.lastrowid
 
-    for address in payload.to:
-        conn.execute(
-            "INSERT INTO email_recipients(email_id, address, kind) VALUES (?, ?, 'to')",
-            (email_id, address),
-        )
-    for address in payload.cc:
-        conn.execute(
-            "INSERT INTO email_recipients(email_id, address, kind) VALUES (?, ?, 'cc')",
-            (email_id, address),
-        )
-    for address in payload.bcc:
-        conn.execute(
-            "INSERT INTO email_recipients(email_id, address, kind) VALUES (?, ?, 'bcc')",
-            (email_id, address),
-        )
+    conn.executemany(
+        "INSERT INTO email_recipients(email_id, address, kind) VALUES (?, ?, ?)",
+        _recipient_rows(email_id, payload),
+    )
+    if payload.idempotency_key:
+        conn.execute("INSERT INTO email_send_keys(key, email_id) VALUES (?, ?)", (payload.idempotency_key, email_id))
 
     return _row_to_email(conn, email_id)
 
 
+@app.post("/emails/send-batch", response_model=BatchCreated, status_code=status.HTTP_201_CREATED)
+def send_email_batch(payload: EmailSendBatch, conn=Depends(db_dependency)):
+    """Store many emails in one transaction and return their ids in request order.
+
+    The batch is all-or-nothing: if any message is rejected, none are stored.
+    Messages whose ``idempotency_key`` was already stored (e.g. a batch retried
+    after a timeout) are not stored again; their existing ids are returned.
+    """
+    messages = payload.messages
+    addresses: list[str] = []
+    for index, message in enumerate(messages):
+        recipients = message.recipients_flat()
+        if not recipients:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Message {index}: at least one recipient required",
+            )
+        addresses.append(message.sender)
+        addresses.extend(recipients)
+    if not messages:
+        return BatchCreated(ids=[])
+
+    stored = _stored_keys(conn, (message.idempotency_key for message in messages))
+    messages = [message for message in messages if message.idempotency_key not in stored]
+    _ensure_mailboxes(conn, addresses)
+    email_ids = insert_many(
+        conn,
+        "INSERT INTO emails(sender, subject, body, thread_id, sent_at) "
+        "VALUES (?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))",
+        [
+            (message.sender, message.subject, message.body, message.thread_id, message.sent_at_iso)
+            for message in messages
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO email_recipients(email_id, address, kind) VALUES (?, ?, ?)",
+        [row for email_id, message in zip(email_ids, messages) for row in _recipient_rows(email_id, message)],
+    )
+    conn.executemany(
+        "INSERT INTO email_send_keys(key, email_id) VALUES (?, ?)",
+        [(message.idempotency_key, email_id) for email_id, message in zip(email_ids, messages) if message.idempotency_key],
+    )
+    created = iter(email_ids)
+    return BatchCreated(ids=[stored.get(message.idempotency_key) or next(created) for message in payload.messages])
+
+
 @app.get("/mailboxes/{address}/emails", response_model=List[EmailMessage])
 def list_mailbox_emails(
     address: str,
@@ -190,6 +286,7 @@ def list_mailbox_emails(
         since_id: Only return emails with ID greater than this (for polling new messages)
         since_timestamp: Only return emails sent after this ISO timestamp (for time-based filtering)
         before_timestamp: Only return emails sent before or at this ISO timestamp (for replay mode)
+        before_id: Only return emails with ID less than this (keyset pagination: pass the last ID of the previous page)
         limit: Maximum number of emails to return (newest first)
     """
     cleaned = _normalise_or_422(address)
@@ -200,13 +297,12 @@ def list_mailbox_emails(
     if not mailbox_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mailbox not found")
 
-    # Build query with optional filters
-    query = """
-        SELECT DISTINCT er.email_id
-        FROM email_recipients er
-        JOIN emails e ON er.email_id = e.id
-        WHERE er.address = ?
-    """
+    # Build query with optional filters; only timestamp filters need the emails table
+    needs_emails = since_timestamp is not None or before_timestamp is not None
+    query = "SELECT DISTINCT er.email_id FROM email_recipients er"
+    if needs_emails:
+        query += " JOIN emails e ON er.email_id = e.id"
+    query += " WHERE er.address = ?"
     params = [cleaned]
 
     if since_id is not None:
@@ -232,7 +328,7 @@ def list_mailbox_emails(
         params.append(limit)
 
     email_ids = [row["email_id"] for row in conn.execute(query, params)]
-    return [_row_to_email(conn, email_id) for email_id in email_ids]
+    return _load_emails(conn, email_ids)
 
 
 @app.get("/senders/{address}/emails", response_model=List[EmailMessage])
@@ -252,6 +348,7 @@ def list_sender_emails(
         since_id: Only return emails with ID greater than this
         since_timestamp: Only return emails sent after this ISO timestamp
         before_timestamp: Only return emails sent before or at this ISO timestamp (for replay mode)
+        before_id: Only return emails with ID less than this (keyset pagination: pass the last ID of the previous page)
         limit: Maximum number of emails to return (newest first)
     """
     cleaned = _normalise_or_422(address)
@@ -285,7 +382,7 @@ def list_sender_emails(
         params.append(limit)
 
     email_ids = [row["id"] for row in conn.execute(query, params)]
-    return [_row_to_email(conn, email_id) for email_id in email_ids]
+    return _load_emails(conn, email_ids)
 
 @app.get("/emails/{email_id}", response_model=EmailMessage)
 def get_email(email_id: int, conn=Depends(db_dependency)):
@@ -35,6 +35,8 @@ class EmailSend(BaseModel):
     thread_id: Optional[str] = Field(default=None, max_length=128)
     # Optional simulated timestamp (ISO 8601). When provided, server uses it for sent_at.
     sent_at_iso: Optional[str] = None
+    # Optional client-chosen key; resending a stored key returns the stored email instead of a copy.
+    idempotency_key: Optional[str] = Field(default=None, max_length=64)
 
     @field_validator("sender")
     @classmethod
@@ -58,6 +60,15 @@ class EmailSend(BaseModel):
         return ordered
 
 
+class EmailSendBatch(BaseModel):
+    messages: List[EmailSend] = Field(default_factory=list)
+
+
+class BatchCreated(BaseModel):
+    # Ids of the created emails, in the same order as the submitted messages.
+    ids: List[int]
+
+
 class EmailMessage(BaseModel):
     id: int
     sender: str
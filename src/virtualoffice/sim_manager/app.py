@@ -12,7 +12,7 @@ import threading
 import time
 
 from .engine import SimulationEngine
-from virtualoffice.common.db import DB_PATH, get_connection
+from virtualoffice.common.db import DB_PATH, get_connection, pool_stats
 from .gateways import HttpChatGateway, HttpEmailGateway
 from .replay_manager import ReplayManager
 from .style_filter.filter import CommunicationStyleFilter
@@ -700,6 +700,23 @@ def create_app(engine: SimulationEngine | None = None) -> FastAPI:
     ) -> list[SimulationReportRead]:
         return engine.list_simulation_reports(limit=limit)
 
+    @app.get(f"{API_PREFIX}/reports/jobs", tags=["Reports & Analytics"])
+    def get_report_jobs(
+        status_filter: str | None = Query(default=None, alias="status"),
+        kind: str | None = Query(default=None),
+        limit: int = Query(default=50, ge=1, le=500),
+        engine: SimulationEngine = Depends(get_engine),
+    ) -> dict[str, Any]:
+        """Background hourly-summary and daily-report jobs.
+
+        Returns job counts by status (overall and per kind) and the most
+        recent jobs, optionally filtered by ``status`` and ``kind``.
+        """
+        return {
+            "summary": engine.report_job_status(),
+            "jobs": engine.list_report_jobs(status=status_filter, kind=kind, limit=limit),
+        }
+
     @app.get(f"{API_PREFIX}/simulation/token-usage", response_model=TokenUsageSummary, tags=["Reports & Analytics"])
     def get_token_usage(engine: SimulationEngine = Depends(get_engine)) -> TokenUsageSummary:
         usage = engine.get_token_usage()
@@ -784,6 +801,30 @@ def create_app(engine: SimulationEngine | None = None) -> FastAPI:
     ) -> list[dict[str, Any]]:
         return engine.get_planner_metrics(limit)
 
+    @app.get(f"{API_PREFIX}/metrics/planner/scheduler", tags=["Reports & Analytics"])
+    def get_llm_scheduler_metrics() -> dict[str, Any]:
+        """LLM scheduler state: in-flight requests, per-lane queue and wait times, rate limits and 429 backoff."""
+        from virtualoffice.utils.llm_client import scheduler_stats
+
+        return scheduler_stats()
+
+    @app.get(f"{API_PREFIX}/metrics/planner/cache", tags=["Reports & Analytics"])
+    def get_llm_cache_metrics() -> dict[str, Any]:
+        """LLM response cache counters (entries, hits/misses per method, evictions); {"enabled": false} when off."""
+        from virtualoffice.utils.llm_cache import cache_stats
+
+        return cache_stats()
+
+    @app.get(f"{API_PREFIX}/metrics/db", tags=["Reports & Analytics"])
+    def get_db_pool_metrics() -> list[dict[str, Any]]:
+        """Connection pool counters (checkouts, wait time, open connections) per database file."""
+        return pool_stats()
+
+    @app.get(f"{API_PREFIX}/metrics/executors", tags=["Reports & Analytics"])
+    def get_executor_metrics(engine: SimulationEngine = Depends(get_engine)) -> dict[str, dict[str, Any]]:
+        """Engine thread pools: concurrency limit, queue depth, utilization and latency per pool."""
+        return engine.executor_stats()
+
     @app.delete(f"{API_PREFIX}/projects/{{project_id}}", tags=["Projects"])
     def delete_project(project_id: int, engine: SimulationEngine = Depends(get_engine)) -> dict[str, Any]:
         """Delete a project and its associations (assignments, referencing events)."""
@@ -1070,8 +1111,9 @@ def create_app(engine: SimulationEngine | None = None) -> FastAPI:
         except Exception as exc:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Schema import failed: {exc}")
 
-        # Remove DB file
+        # Remove DB file (close pooled connections first so the WAL is checkpointed and released)
         try:
+            _db.close_pools()
             _db.DB_PATH.unlink(missing_ok=True)  # type: ignore[attr-defined]
         except Exception as exc:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to remove DB: {exc}")
@@ -1117,9 +1159,9 @@ def create_app(engine: SimulationEngine | None = None) -> FastAPI:
         """Wipe runtime data but preserve personas and projects (except an optional project to delete).
 
         - Preserves: people, schedule_blocks, project_plans (except the one named by delete_project_name), project_assignments
-        - Wipes: worker_plans, hourly_summaries, daily_reports, simulation_reports,
+        - Wipes: worker_plans, hourly_summaries, daily_reports, simulation_reports, report_jobs,
                  worker_runtime_messages, worker_exchange_log, worker_status_overrides,
-                 events, tick_log
+                 events, tick_log, tick_messages
         - Email tables: deletes all rows (emails, email_recipients, drafts, mailboxes)
         - Chat tables: deletes all rows (chat_messages, chat_members, chat_rooms, chat_users)
         - Resets simulation_state to tick=0, is_running=0, auto_tick=0
@@ -1160,11 +1202,13 @@ def create_app(engine: SimulationEngine | None = None) -> FastAPI:
                     "hourly_summaries",
                     "daily_reports",
                     "simulation_reports",
+                    "report_jobs",
                     "worker_runtime_messages",
                     "worker_exchange_log",
                     "worker_status_overrides",
                     "events",
                     "tick_log",
+                    "tick_messages",
                 ):
                     try:
                         conn.execute(f"DELETE FROM {tbl}")
@@ -1179,6 +1223,8 @@ def create_app(engine: SimulationEngine | None = None) -> FastAPI:
                     "ON CONFLICT(id) DO UPDATE SET current_tick=0, is_running=0, auto_tick=0"
                 )
 
+            if delete_project_name:
+                engine.invalidate_project_index()
             state = engine.get_state()
             return {
                 "message": "Soft reset complete; personas and projects preserved (except optional deletion)",
@@ -1200,7 +1246,7 @@ def create_app(engine: SimulationEngine | None = None) -> FastAPI:
         Actions:
         - Stops auto-ticks (best effort)
         - Updates simulation_state.current_tick to the cutoff
-        - Deletes worker plans/summaries/reports/exchanges/tick logs after cutoff
+        - Deletes worker plans/summaries/reports/report jobs/exchanges/tick logs/tick messages after cutoff
         - Deletes events with at_tick strictly greater than cutoff
         - Deletes emails and chats with sent_at after the simulated cutoff datetime (when available)
         """
@@ -1245,12 +1291,25 @@ def create_app(engine: SimulationEngine | None = None) -> FastAPI:
                 if _exists('daily_reports'):
                     deleted['daily_reports'] = _count('daily_reports', 'day_index > ?', (day_index_cutoff,))
                     conn.execute('DELETE FROM daily_reports WHERE day_index > ?', (day_index_cutoff,))
+                if _exists('report_jobs'):
+                    deleted['report_jobs'] = _count(
+                        'report_jobs',
+                        "(kind = 'hourly_summary' AND period_index > ?) OR (kind = 'daily_report' AND period_index > ?)",
+                        (hour_index_cutoff, day_index_cutoff),
+                    )
+                    conn.execute(
+                        "DELETE FROM report_jobs WHERE (kind = 'hourly_summary' AND period_index > ?) OR (kind = 'daily_report' AND period_index > ?)",
+                        (hour_index_cutoff, day_index_cutoff),
+                    )
                 if _exists('worker_exchange_log'):
                     deleted['worker_exchange_log'] = _count('worker_exchange_log', 'tick > ?', (cutoff,))
                     conn.execute('DELETE FROM worker_exchange_log WHERE tick > ?', (cutoff,))
                 if _exists('tick_log'):
                     deleted['tick_log'] = _count('tick_log', 'tick > ?', (cutoff,))
                     conn.execute('DELETE FROM tick_log WHERE tick > ?', (cutoff,))
+                if _exists('tick_messages'):
+                    deleted['tick_messages'] = _count('tick_messages', 'tick > ?', (cutoff,))
+                    conn.execute('DELETE FROM tick_messages WHERE tick > ?', (cutoff,))
                 if _exists('events'):
                     deleted['events'] = _count('events', 'at_tick IS NOT NULL AND at_tick > ?', (cutoff,))
                     conn.execute('DELETE FROM events WHERE at_tick IS NOT NULL AND at_tick > ?', (cutoff,))
@@ -1442,6 +1501,7 @@ def create_app(engine: SimulationEngine | None = None) -> FastAPI:
         limit: int | None = Query(default=100, ge=1, le=1000),
         since_id: int | None = Query(default=None),
         since_timestamp: str | None = Query(default=None),
+        before_id: int | None = Query(default=None),
         engine: SimulationEngine = Depends(get_engine),
         replay: ReplayManager = Depends(get_replay_manager),
     ) -> dict[str, list[dict]]:
@@ -1463,6 +1523,8 @@ def create_app(engine: SimulationEngine | None = None) -> FastAPI:
             params["since_id"] = since_id
         if since_timestamp is not None:
             params["since_timestamp"] = since_timestamp
+        if before_id is not None:
+            params["before_id"] = before_id
 
         result: dict[str, list[dict]] = {"dms": [], "rooms": []}
         try:
@@ -1505,6 +1567,7 @@ def create_app(engine: SimulationEngine | None = None) -> FastAPI:
         limit: int | None = Query(default=100, ge=1, le=1000),
         since_id: int | None = Query(default=None),
         since_timestamp: str | None = Query(default=None),
+        before_id: int | None = Query(default=None),
         engine: SimulationEngine = Depends(get_engine),
     ) -> list[dict]:
         """Return messages for a specific chat room via the chat server."""
@@ -1517,6 +1580,8 @@ def create_app(engine: SimulationEngine | None = None) -> FastAPI:
             params["since_id"] = since_id
         if since_timestamp is not None:
             params["since_timestamp"] = since_timestamp
+        if before_id is not None:
+            params["before_id"] = before_id
 
         try:
             response = chat_client.get(f"/rooms/{room_slug}/messages", params=params)
@@ -1825,6 +1890,19 @@ def create_app(engine: SimulationEngine | None = None) -> FastAPI:
                 "by_message_type": {}
             }
 
+    @app.get(f"{API_PREFIX}/style-filter/metrics/ticks", tags=["Style Filter"])
+    def get_style_filter_tick_metrics(
+        limit: int = Query(default=60, ge=1, le=1440),
+        engine: SimulationEngine = Depends(get_engine),
+    ) -> dict[str, Any]:
+        """Get batched styling latency and token totals for the most recent ticks (oldest first)."""
+        style_filter = getattr(engine.email_gateway, "style_filter", None) or getattr(
+            engine.chat_gateway, "style_filter", None
+        )
+        if style_filter is None:
+            return {"ticks": []}
+        return {"ticks": style_filter.metrics.get_tick_metrics(limit)}
+
     # ========================================================================
     # REPLAY / TIME MACHINE API ENDPOINTS
     # ========================================================================
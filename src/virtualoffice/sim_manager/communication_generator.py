@@ -11,14 +11,24 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import os
 import random
-from typing import Any, Sequence
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Sequence
+
+from virtualoffice.utils.llm_cache import cache_method_scope
+from virtualoffice.utils.llm_scheduler import Priority, priority_scope
 
 from .planner import Planner, PlanResult, PlanningError
 from .schemas import PersonRead
 
 logger = logging.getLogger(__name__)
 
+# Planner calls submitted by the current batch request, so a timed-out request can find its thread
+_planner_calls: ContextVar[list[Future] | None] = ContextVar("_planner_calls", default=None)
+
 
 class CommunicationGenerator:
     """
@@ -35,7 +45,10 @@ class CommunicationGenerator:
         planner: Planner,
         locale: str = "ko",
         random_seed: int | None = None,
-        enable_caching: bool = True
+        enable_caching: bool = True,
+        max_concurrency: int | None = None,
+        request_timeout: float | None = None,
+        executor_factory: Callable[[int], Executor] | None = None,
     ):
         """
         Initialize the communication generator.
@@ -45,12 +58,42 @@ class CommunicationGenerator:
             locale: Language locale ('ko' or 'en')
             random_seed: Random seed for deterministic behavior
             enable_caching: Enable context caching for performance (default: True)
+            max_concurrency: Maximum in-flight GPT calls per batch
+                (default: VDOS_INBOX_REPLY_CONCURRENCY or 8)
+            request_timeout: Per-request timeout in seconds for batch generation
+                (default: VDOS_INBOX_REPLY_TIMEOUT_SECONDS or 60)
+            executor_factory: Returns the executor for blocking planner calls,
+                given max_concurrency (default: a dedicated ThreadPoolExecutor)
         """
         self.planner = planner
         self.locale = locale
         self.random = random.Random(random_seed)
         self.enable_caching = enable_caching
         
+        if max_concurrency is None:
+            try:
+                max_concurrency = int(os.getenv("VDOS_INBOX_REPLY_CONCURRENCY", "8"))
+            except ValueError:
+                logger.warning("Invalid VDOS_INBOX_REPLY_CONCURRENCY value, defaulting to 8")
+                max_concurrency = 8
+        self.max_concurrency = max(1, max_concurrency)
+        if request_timeout is None:
+            try:
+                request_timeout = float(os.getenv("VDOS_INBOX_REPLY_TIMEOUT_SECONDS", "60"))
+            except ValueError:
+                logger.warning("Invalid VDOS_INBOX_REPLY_TIMEOUT_SECONDS value, defaulting to 60")
+                request_timeout = 60.0
+        self.request_timeout = request_timeout if request_timeout > 0 else None
+        # Dedicated worker threads for the blocking planner calls. The default
+        # executor of a fresh event loop is sized by CPU count, which would cap
+        # fan-out well below the configured concurrency on small machines.
+        self._executor: Executor | None = None
+        self._executor_factory = executor_factory
+        # Planner calls whose request timed out but whose thread is still running;
+        # they keep their concurrency slot until the thread returns
+        self._stragglers: set[Future] = set()
+        self._stragglers_lock = threading.Lock()
+        
         # Context cache for performance optimization
         # Cache project info and collaborator lists to avoid repeated processing
         self._project_cache: dict[str, dict[str, Any]] = {}
@@ -433,10 +476,12 @@ Output JSON only."""
                 f"(tick={current_tick}, locale={self.locale}, model={model})"
             )
             
-            result = self.planner.generate_with_messages(
-                messages=messages,
-                model_hint=model
-            )
+            # Fallback communications complete the hourly plan
+            with priority_scope(Priority.HOURLY_PLAN), cache_method_scope("fallback_communications"):
+                result = self.planner.generate_with_messages(
+                    messages=messages,
+                    model_hint=model
+                )
             
             # Calculate latency
             latency_ms = (time.time() - start_time) * 1000
@@ -633,14 +678,11 @@ Output JSON only."""
             )
             
             # Run synchronous planner call in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.planner.generate_with_messages(
-                    messages=messages,
-                    model_hint=model
-                )
-            )
+            call = self._get_executor().submit(self._generate_inbox_reply, messages, model)
+            calls = _planner_calls.get()
+            if calls is not None:
+                calls.append(call)
+            result = await asyncio.wrap_future(call)
             
             # Calculate latency
             latency_ms = (time.time() - start_time) * 1000
@@ -684,7 +726,11 @@ Output JSON only."""
         
         This method batches multiple generation requests and processes them
         concurrently to reduce overall latency when multiple personas need
-        fallback communications at the same time.
+        fallback communications at the same time. At most ``max_concurrency``
+        requests are in flight at once, each bounded by ``request_timeout``;
+        a request that fails or times out yields an empty list. A timed-out
+        planner call cannot be interrupted, so its slot stays taken (in this
+        and later batches) until its thread returns.
         
         Args:
             requests: List of request dicts, each containing:
@@ -698,40 +744,64 @@ Output JSON only."""
                 - model_hint: str | None
                 
         Returns:
-            List of tuples (person, communications) for each request
+            List of tuples (person, communications) for each request,
+            in the same order as ``requests``
         """
         logger.info(
             f"[GPT_FALLBACK_BATCH] Starting batch generation for "
-            f"{len(requests)} personas"
+            f"{len(requests)} personas (concurrency={self.max_concurrency})"
         )
         
-        # Create async tasks for all requests
-        tasks = []
-        for req in requests:
-            task = self.generate_fallback_communications_async(
-                person=req["person"],
-                current_tick=req.get("current_tick"),
-                hourly_plan=req.get("hourly_plan"),
-                daily_plan=req.get("daily_plan"),
-                project=req.get("project"),
-                inbox_messages=req.get("inbox_messages"),
-                collaborators=req.get("collaborators"),
-                model_hint=req.get("model_hint")
-            )
-            tasks.append((req["person"], task))
-        
-        # Execute all tasks concurrently
-        results = []
-        for person, task in tasks:
+        with self._stragglers_lock:
+            stragglers = len(self._stragglers)
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency - stragglers))
+
+        async def run_one(req: dict[str, Any]) -> tuple[PersonRead, list[dict[str, Any]]]:
+            person = req["person"]
+            calls: list[Future] = []
+            # Each run_one is its own task under gather, so this only tracks this request's calls
+            _planner_calls.set(calls)
+            await semaphore.acquire()
+            release = True
             try:
-                communications = await task
-                results.append((person, communications))
-            except Exception as e:
-                logger.error(
-                    f"[GPT_FALLBACK_BATCH] Error in batch for {person.name}: {e}",
-                    exc_info=True
-                )
-                results.append((person, []))
+                try:
+                    communications = await asyncio.wait_for(
+                        self.generate_fallback_communications_async(
+                            person=person,
+                            current_tick=req.get("current_tick"),
+                            hourly_plan=req.get("hourly_plan"),
+                            daily_plan=req.get("daily_plan"),
+                            project=req.get("project"),
+                            inbox_messages=req.get("inbox_messages"),
+                            collaborators=req.get("collaborators"),
+                            model_hint=req.get("model_hint")
+                        ),
+                        timeout=self.request_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        f"[GPT_FALLBACK_BATCH] Timed out after {self.request_timeout}s "
+                        f"for {person.name}"
+                    )
+                    running = [call for call in calls if not call.done()]
+                    if running:
+                        self._hold_slot_until_done(semaphore, running)
+                        release = False
+                    return person, []
+                except Exception as e:
+                    logger.error(
+                        f"[GPT_FALLBACK_BATCH] Error in batch for {person.name}: {e}",
+                        exc_info=True
+                    )
+                    return person, []
+            finally:
+                if release:
+                    semaphore.release()
+            return person, communications
+        
+        # Execute all requests concurrently (bounded by the semaphore);
+        # gather returns results in input order
+        results = list(await asyncio.gather(*(run_one(req) for req in requests)))
         
         logger.info(
             f"[GPT_FALLBACK_BATCH] Completed batch generation for "
@@ -740,6 +810,43 @@ Output JSON only."""
         
         return results
     
+    def _hold_slot_until_done(self, semaphore: asyncio.Semaphore, calls: list[Future]) -> None:
+        """Release ``semaphore`` only once every still-running planner call in ``calls`` returns."""
+        loop = asyncio.get_running_loop()
+        remaining = len(calls)
+        with self._stragglers_lock:
+            self._stragglers.update(calls)
+
+        def on_done(call: Future) -> None:
+            nonlocal remaining
+            with self._stragglers_lock:
+                self._stragglers.discard(call)
+                remaining -= 1
+                finished = remaining == 0
+            if finished:
+                try:
+                    loop.call_soon_threadsafe(semaphore.release)
+                except RuntimeError:
+                    pass  # the batch's event loop is already closed
+
+        for call in calls:
+            call.add_done_callback(on_done)
+
+    def _generate_inbox_reply(self, messages: list[dict[str, str]], model: str) -> PlanResult:
+        # Runs in an executor thread, so the priority has to be set there
+        with priority_scope(Priority.INBOX_REPLY), cache_method_scope("inbox_reply"):
+            return self.planner.generate_with_messages(messages=messages, model_hint=model)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None and self._executor_factory is not None:
+            self._executor = self._executor_factory(self.max_concurrency)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="inbox-reply",
+            )
+        return self._executor
+    
     def clear_cache(self) -> None:
         """
         Clear the context cache.
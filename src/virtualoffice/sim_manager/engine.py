@@ -10,15 +10,17 @@ import threading
 import math
 import uuid
 from collections import deque
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from concurrent.futures import Executor, as_completed
 from datetime import datetime, timezone, timedelta
+from functools import partial
 try:
     from zoneinfo import ZoneInfo  # Python 3.9+
 except Exception:  # pragma: no cover
     ZoneInfo = None  # type: ignore
 import math
 from dataclasses import dataclass, field
-from typing import Any, Iterable, List, Sequence, Tuple
+from typing import Any, Callable, Iterable, Iterator, List, Sequence, Tuple
 
 from virtualoffice.common.db import execute_script, get_connection
 from virtualoffice.virtualWorkers.worker import (
@@ -28,7 +30,7 @@ from virtualoffice.virtualWorkers.worker import (
     render_minute_schedule,
 )
 
-from .gateways import ChatGateway, EmailGateway
+from .gateways import ChatGateway, EmailGateway, OnSent, batch_sends_enabled, style_queued
 from .planner import GPTPlanner, PlanResult, Planner, PlanningError, StubPlanner
 from .schemas import (
     EventCreate,
@@ -44,9 +46,17 @@ from .inbox_manager import InboxManager
 from .participation_balancer import ParticipationBalancer
 from .quality_metrics import QualityMetricsTracker
 from .plan_parser import PlanParser, ParsingError
+from .project_index import ProjectIndex
+from .roster_index import RosterIndex, parse_external_stakeholders
+from .executor_service import ExecutorService
+from .report_worker import DAILY_REPORT, HOURLY_SUMMARY, ReportWorker
+from .wakeup_queue import TickRound, WakeupQueue
 
 logger = logging.getLogger(__name__)
 
+# How long stop() waits for queued summaries/reports before writing the simulation report
+_STOP_REPORT_DRAIN_TIMEOUT = 60.0
+
 @dataclass
 class _InboundMessage:
     sender_id: int
@@ -73,6 +83,77 @@ class _WorkerRuntime:
         self.inbox = []
         return items
 
+
+class _TickWriteBuffer:
+    """Engine-owned writes deferred to the end of a tick and flushed in one transaction.
+
+    Runtime-message inserts carry the message object so its ``message_id`` can be
+    filled in once the flush commits; if the message is drained before the
+    flush, the pending insert is cancelled instead of leaving an orphan row
+    behind. Other inserts can pass ``on_insert`` to receive their row id.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ops: list[tuple[str, tuple, _InboundMessage | None, Callable[[int], None] | None] | None] = []
+        self._pending_messages: dict[int, int] = {}
+
+    def add(
+        self,
+        sql: str,
+        params: tuple,
+        message: _InboundMessage | None = None,
+        on_insert: Callable[[int], None] | None = None,
+    ) -> None:
+        with self._lock:
+            if message is not None:
+                self._pending_messages[id(message)] = len(self._ops)
+            self._ops.append((sql, params, message, on_insert))
+
+    def cancel_messages(self, messages: Iterable[_InboundMessage]) -> int:
+        cancelled = 0
+        with self._lock:
+            for message in messages:
+                index = self._pending_messages.pop(id(message), None)
+                if index is not None:
+                    self._ops[index] = None
+                    cancelled += 1
+        return cancelled
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(1 for op in self._ops if op is not None)
+
+    def flush(self) -> int:
+        with self._lock:
+            ops = [op for op in self._ops if op is not None]
+            self._ops = []
+            self._pending_messages = {}
+        if not ops:
+            return 0
+        inserted: list[tuple[_InboundMessage | None, Callable[[int], None] | None, int]] = []
+        with get_connection() as conn:
+            index = 0
+            while index < len(ops):
+                sql, params, message, on_insert = ops[index]
+                if message is not None or on_insert is not None:
+                    inserted.append((message, on_insert, conn.execute(sql, params).lastrowid))
+                    index += 1
+                    continue
+                # Group consecutive statements with the same SQL into one executemany
+                end = index + 1
+                while end < len(ops) and ops[end][0] == sql and ops[end][2] is None and ops[end][3] is None:
+                    end += 1
+                conn.executemany(sql, [op[1] for op in ops[index:end]])
+                index = end
+        # Row ids are only handed out once the transaction has committed
+        for message, on_insert, row_id in inserted:
+            if message is not None:
+                message.message_id = row_id
+            if on_insert is not None:
+                on_insert(row_id)
+        return len(ops)
+
 SIM_SCHEMA = """
 CREATE TABLE IF NOT EXISTS people (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -193,6 +274,33 @@ CREATE TABLE IF NOT EXISTS daily_reports (
     FOREIGN KEY(person_id) REFERENCES people(id) ON DELETE CASCADE
 );
 
+CREATE TABLE IF NOT EXISTS report_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    person_id INTEGER NOT NULL,
+    period_index INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    available_at REAL NOT NULL DEFAULT 0,
+    enqueued_tick INTEGER,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(kind, person_id, period_index)
+);
+
+CREATE INDEX IF NOT EXISTS idx_report_jobs_status ON report_jobs(status, id);
+
+-- Tick each stored email/chat message was dispatched at (ids from the email/chat servers)
+CREATE TABLE IF NOT EXISTS tick_messages (
+    tick INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    message_id INTEGER NOT NULL,
+    PRIMARY KEY(channel, message_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_tick_messages_tick ON tick_messages(tick, channel);
+
 CREATE TABLE IF NOT EXISTS simulation_reports (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     report TEXT NOT NULL,
@@ -223,6 +331,9 @@ CREATE TABLE IF NOT EXISTS worker_exchange_log (
     FOREIGN KEY(recipient_id) REFERENCES people(id) ON DELETE SET NULL
 );
 
+-- Replay reads MAX(tick) on every jump
+CREATE INDEX IF NOT EXISTS idx_worker_exchange_log_tick ON worker_exchange_log(tick);
+
 CREATE TABLE IF NOT EXISTS worker_status_overrides (
     worker_id INTEGER PRIMARY KEY,
     status TEXT NOT NULL,
@@ -243,6 +354,10 @@ class SimulationStatus:
 
 
 class SimulationEngine:
+    # Work hours 09:00-17:00 mapped onto the 480-tick day (see _is_work_hours_tick)
+    WORK_START_TICK = 180
+    WORK_END_TICK = 340
+
     def __init__(
         self,
         email_gateway: EmailGateway,
@@ -269,9 +384,21 @@ class SimulationEngine:
         self._auto_tick_stop: threading.Event | None = None
         self._advance_lock = threading.Lock()
         self._worker_runtime: dict[int, _WorkerRuntime] = {}
+        # Persona cache: id -> PersonRead, rebuilt lazily after invalidate_people_cache()
+        self._people_cache: dict[int, PersonRead] | None = None
+        self._people_version = 0
+        self._people_lock = threading.Lock()
+        # Project timelines/assignments, rebuilt lazily after invalidate_project_index()
+        self._project_index: ProjectIndex | None = None
+        self._project_index_lock = threading.Lock()
+        # Target-resolution tables for _dispatch_scheduled, keyed by roster identity
+        self._roster_index: RosterIndex | None = None
+        self._roster_index_key: tuple | None = None
         self._status_overrides: dict[int, Tuple[str, int]] = {}
         self._active_person_ids: list[int] | None = None
         self._work_hours_ticks: dict[int, tuple[int, int]] = {}
+        # Work-window start (tick of day) -> ids of the people whose window opens then
+        self._work_start_ids: dict[int, tuple[int, ...]] = {}
         self._random = random.Random()
         self._planner_metrics: deque[dict[str, Any]] = deque(maxlen=200)
         # Locale (simple toggle for certain strings)
@@ -318,9 +445,49 @@ class SimulationEngine:
             self._max_planning_workers = int(os.getenv("VDOS_MAX_PLANNING_WORKERS", "4"))
         except ValueError:
             self._max_planning_workers = 4
-        self._planning_executor: ThreadPoolExecutor | None = None
+        # Per-tick unit of work: buffer engine-owned writes and commit them once per tick
+        self._tick_unit_of_work_enabled = os.getenv("VDOS_TICK_UNIT_OF_WORK", "0").strip().lower() in {"1", "true", "yes", "on"}
+        self._tick_buffer: _TickWriteBuffer | None = None
+        # Queue email/DM sends during dispatch and post them in one batch per service;
+        # a unit-of-work tick always queues, so a rolled-back tick has nothing posted
+        self._batch_sends = batch_sends_enabled() or self._tick_unit_of_work_enabled
+        # Set while a styled tick holds its sends for one end-of-tick flush
+        self._deferred_flush_tick: int | None = None
+        # Event-driven auto-ticks: only visit personas with a due wake-up
+        self._event_driven_ticks = os.getenv("VDOS_EVENT_DRIVEN_TICKS", "true").strip().lower() in {"1", "true", "yes", "on"}
+        self._wakeups = WakeupQueue()
+        self._tick_round: TickRound | None = None
+        # Hour index -> ids of people who stored an hourly plan in it (complete from _hourly_tracking_from on)
+        self._hourly_planners: dict[int, set[int]] = {}
+        self._hourly_tracking_from: int | None = None
+        # Hourly summaries and daily reports run on a background worker; the tick loop only enqueues them
+        self._background_reports = os.getenv("VDOS_BACKGROUND_REPORTS", "true").strip().lower() in {"1", "true", "yes", "on"}
+        try:
+            report_workers = int(os.getenv("VDOS_REPORT_WORKERS", "2"))
+        except ValueError:
+            report_workers = 2
+        try:
+            report_queue_max = int(os.getenv("VDOS_REPORT_QUEUE_MAX", "500"))
+        except ValueError:
+            report_queue_max = 500
+        # Long-lived, adaptively sized thread pools for planner calls, shut down in close()
+        # Initial (tick-0) planning keeps its own pool: it fans out over the whole team at once,
+        # independently of how many hourly planners VDOS_MAX_PLANNING_WORKERS allows
+        self._executors = ExecutorService(
+            {"planning": max(1, self._max_planning_workers), "initial_planning": 4, "summaries": 4, "reports": 4}
+        )
+        self._report_worker = ReportWorker(
+            {HOURLY_SUMMARY: self._run_hourly_summary_job, DAILY_REPORT: self._run_daily_report_job},
+            hours_per_day=hours_per_day,
+            max_workers=report_workers,
+            max_pending=report_queue_max,
+            executor_for=lambda kind: self._executors.pool("summaries" if kind == HOURLY_SUMMARY else "reports"),
+        )
+        # Set on report-job threads so their writes bypass the open tick's write buffer
+        self._report_thread_state = threading.local()
+        self._planning_executor: Executor | None = None
         if self._max_planning_workers > 1:
-            self._planning_executor = ThreadPoolExecutor(max_workers=self._max_planning_workers, thread_name_prefix="planner")
+            self._planning_executor = self._executors.pool("planning")
         
         # Auto-pause configuration - default to enabled with validation
         try:
@@ -774,6 +941,7 @@ class SimulationEngine:
                 existing = sched.setdefault(t, [])
                 if entry not in existing:
                     existing.append(entry)
+                    self._wake(person.id, t)
 
             except Exception as e:
                 logger.warning(f"Error processing JSON communication: {e}")
@@ -1192,10 +1360,10 @@ class SimulationEngine:
         chats_sent = 0
 
         try:
-            # Use async batch processing for performance
-            import asyncio
+            # Use async batch processing for performance, on the shared LLM event loop
+            from virtualoffice.utils.llm_client import run_sync
 
-            batch_results = asyncio.run(
+            batch_results = run_sync(
                 self.communication_generator.generate_batch_async(inbox_reply_requests)
             )
 
@@ -1432,6 +1600,7 @@ class SimulationEngine:
                 if tick not in self._scheduled_comms[person.id]:
                     self._scheduled_comms[person.id][tick] = []
                 self._scheduled_comms[person.id][tick].append(action)
+                self._wake(person.id, tick)
                 scheduled_count += 1
                 
                 logger.debug(
@@ -1601,6 +1770,7 @@ class SimulationEngine:
             existing = sched.setdefault(t, [])
             if entry not in existing:
                 existing.append(entry)
+                self._wake(person.id, t)
 
     def _get_thread_id_for_reply(self, person_id: int, email_id: str) -> tuple[str | None, str | None]:
         """Look up thread_id and original sender from email-id in recent emails.
@@ -1627,49 +1797,11 @@ class SimulationEngine:
         TICKS_PER_CALENDAR_WEEK = 7 * 24 * 60  # 10,080 ticks
         current_week = ((current_tick - 1) // TICKS_PER_CALENDAR_WEEK) + 1 if current_tick > 0 else 1
 
-        # Helper to avoid simultaneous mirrored DMs: if both sides scheduled the same message
-        # at the same minute, only the lower-id sender will fire.
-        handle_index = {p.chat_handle.lower(): p for p in people_by_id.values()}
-        # Email index for quick lookups when suggesting CCs
-        email_index = {p.email_address.lower(): p for p in people_by_id.values()}
-        # Build valid email set from team roster + external stakeholders
-        valid_emails = {p.email_address.lower() for p in people_by_id.values()}
-        # Get external stakeholders from environment (comma-separated list)
-        external_stakeholders = set()
-        external_env = os.getenv("VDOS_EXTERNAL_STAKEHOLDERS", "")
-        if external_env.strip():
-            external_stakeholders = {addr.strip().lower() for addr in external_env.split(",") if addr.strip()}
-        all_valid_emails = valid_emails | external_stakeholders
-
-        def _match_target(raw: str) -> tuple[str | None, str | None]:
-            val = raw.strip().lower()
-            # Check team roster email addresses
-            for p in people_by_id.values():
-                if p.email_address.lower() == val:
-                    return p.email_address, None
-            # Check chat handles
-            for p in people_by_id.values():
-                if p.chat_handle.lower() == val or f"@{p.chat_handle.lower()}" == val:
-                    return None, p.chat_handle
-            # Check names
-            for p in people_by_id.values():
-                if p.name.lower() == val:
-                    return p.email_address, p.chat_handle
-            # Check if looks like email - validate against allowed list
-            if "@" in val:
-                normalized = val.strip()
-                if normalized in all_valid_emails:
-                    # Return original casing from team roster or external list
-                    for p in people_by_id.values():
-                        if p.email_address.lower() == normalized:
-                            return p.email_address, None
-                    # External stakeholder - return normalized
-                    return normalized, None
-                else:
-                    # REJECT hallucinated email addresses
-                    logger.warning(f"Rejecting hallucinated email address: {raw}")
-                    return None, None
-            return None, raw.strip()
+        # Roster lookups (handles, emails, names, external stakeholders) are built once per roster
+        roster = self._roster_for(people_by_id)
+        handle_index = roster.by_handle
+        email_index = roster.by_email
+        _match_target = roster.match_target
         dt = self._sim_datetime_for_tick(current_tick)
         dt_iso = dt.isoformat() if dt else None
         # Heuristic: when no CC explicitly provided, suggest dept head and one relevant peer
@@ -1677,11 +1809,7 @@ class SimulationEngine:
             cc_list: list[str] = []
             primary = email_index.get((primary_to_email or "").lower())
             # Department head first
-            dept_head = None
-            for p in people_by_id.values():
-                if getattr(p, "is_department_head", False):
-                    dept_head = p
-                    break
+            dept_head = roster.department_head
             if dept_head and dept_head.email_address.lower() not in {
                 person.email_address.lower(),
                 (primary_to_email or "").lower(),
@@ -1710,19 +1838,18 @@ class SimulationEngine:
                     want_peer = "dev"
                     break
             if want_peer:
-                for p in people_by_id.values():
+                for p in roster.people_with_role(want_peer):
                     if p.id == person.id:
                         continue
                     if primary and p.id == primary.id:
                         continue
-                    if want_peer in _role(getattr(p, "role", None)):
-                        email = p.email_address
-                        if email and email.lower() not in {
-                            person.email_address.lower(),
-                            (primary_to_email or "").lower(),
-                        }:
-                            cc_list.append(email)
-                            break
+                    email = p.email_address
+                    if email and email.lower() not in {
+                        person.email_address.lower(),
+                        (primary_to_email or "").lower(),
+                    }:
+                        cc_list.append(email)
+                        break
             # Dedupe preserving order
             seen: set[str] = set()
             out: list[str] = []
@@ -1854,7 +1981,22 @@ class SimulationEngine:
                 bcc_emails = [email for email in bcc_emails if email in valid_recipients]
 
                 if self._can_send(tick=current_tick, channel='email', sender=person.email_address, recipient_key=recipients_key, subject=subject, body=body):
-                    result = self.email_gateway.send_email(
+                    on_email_sent = partial(
+                        self._track_sent_email,
+                        person,
+                        email_to=email_to,
+                        cc_emails=list(cc_emails),
+                        subject=subject,
+                        body=body,
+                        thread_id=thread_id,
+                        current_tick=current_tick,
+                        fallback_id=f'email-{current_tick}-{emails + 1}',
+                        email_index=email_index,
+                    )
+                    self._send_or_queue(
+                        self.email_gateway,
+                        'email',
+                        on_email_sent,
                         sender=person.email_address,
                         to=[email_to],
                         subject=subject,
@@ -1867,21 +2009,6 @@ class SimulationEngine:
                     )
                     emails += 1
                     
-                    # Log the exchange
-                    recipient_id = None
-                    recipient_person = email_index.get(email_to.lower())
-                    if recipient_person:
-                        recipient_id = recipient_person.id
-                    
-                    self._log_exchange(
-                        tick=current_tick,
-                        sender_id=person.id,
-                        recipient_id=recipient_id,
-                        channel='email',
-                        subject=subject,
-                        summary=body[:100] if body else None
-                    )
-                    
                     # Get source for tracking
                     source = act.get('_source', 'unknown')
                     
@@ -1903,66 +2030,6 @@ class SimulationEngine:
                         source=source,
                         person_id=person.id
                     )
-
-                    # Track sent email for threading context (store email_id if available)
-                    if result and isinstance(result, dict):
-                        email_id = result.get('id', f'email-{current_tick}-{emails}')
-                        email_record = {
-                            'email_id': email_id,
-                            'from': person.email_address,
-                            'to': email_to,
-                            'subject': subject,
-                            'thread_id': thread_id,
-                            'sent_at_tick': current_tick,
-                        }
-                        # Add to sender's recent emails
-                        if person.id not in self._recent_emails:
-                            self._recent_emails[person.id] = deque(maxlen=10)
-                        self._recent_emails[person.id].append(email_record)
-
-                        # Also add to all recipients' recent emails for their context
-                        for recipient_addr in [email_to, *cc_emails]:
-                            recipient_person = email_index.get(recipient_addr.lower())
-                            if recipient_person:
-                                if recipient_person.id not in self._recent_emails:
-                                    self._recent_emails[recipient_person.id] = deque(maxlen=10)
-                                self._recent_emails[recipient_person.id].append(email_record)
-                                
-                                # Add to InboxManager for tracking and reply generation
-                                from .inbox_manager import InboxMessage
-                                message_type, needs_reply = self.inbox_manager.classify_message_type(subject, body, self._locale)
-                                inbox_msg = InboxMessage(
-                                    message_id=email_id,
-                                    sender_id=person.id,
-                                    sender_name=person.name,
-                                    subject=subject,
-                                    body=body,
-                                    thread_id=thread_id,
-                                    received_tick=current_tick,
-                                    message_type=message_type,
-                                    needs_reply=needs_reply,
-                                    channel='email'
-                                )
-                                self.inbox_manager.add_message(recipient_person.id, inbox_msg)
-                        
-                        # Queue an inbound message to the primary recipient to enable a natural reply/ack during their next planning
-                        primary_recipient = email_index.get((email_to or '').lower())
-                        if primary_recipient is not None:
-                            # Derive a short action item from the subject when possible
-                            action_item = None
-                            if subject:
-                                action_item = subject.strip()
-                            inbound = _InboundMessage(
-                                sender_id=person.id,
-                                sender_name=person.name,
-                                subject=subject,
-                                summary=(body[:140] + '...') if isinstance(body, str) and len(body) > 160 else (body or subject or ''),
-                                action_item=action_item,
-                                message_type='email',
-                                channel='email',
-                                tick=current_tick,
-                            )
-                            self._queue_runtime_message(primary_recipient, inbound)
             elif channel == 'chat' and chat_to:
                 # Deterministic guard: only the lexicographically smaller handle sends to avoid mirrored DMs.
                 s_handle = person.chat_handle.lower()
@@ -1985,23 +2052,26 @@ class SimulationEngine:
                         continue
 
                 if self._can_send(tick=current_tick, channel='chat', sender=person.chat_handle, recipient_key=(chat_to,), subject=None, body=payload):
-                    result = self.chat_gateway.send_dm(sender=person.chat_handle, recipient=chat_to, body=payload, sent_at_iso=dt_iso, persona_id=person.id)
-                    chats += 1
-                    
-                    # Log the exchange
-                    recipient_id = None
-                    recipient_person = handle_index.get(chat_to)
-                    if recipient_person:
-                        recipient_id = recipient_person.id
-                    
-                    self._log_exchange(
-                        tick=current_tick,
-                        sender_id=person.id,
-                        recipient_id=recipient_id,
-                        channel='chat',
-                        subject=None,
-                        summary=payload
+                    recipient = handle_index.get(r_handle)
+                    on_dm_sent = partial(
+                        self._track_sent_dm,
+                        person,
+                        recipient,
+                        payload=payload,
+                        current_tick=current_tick,
+                        fallback_id=f'chat-{current_tick}-{chats + 1}',
+                    )
+                    self._send_or_queue(
+                        self.chat_gateway,
+                        'dm',
+                        on_dm_sent,
+                        sender=person.chat_handle,
+                        recipient=chat_to,
+                        body=payload,
+                        sent_at_iso=dt_iso,
+                        persona_id=person.id,
                     )
+                    chats += 1
                     
                     # Get source for tracking
                     source = act.get('_source', 'unknown')
@@ -2025,26 +2095,7 @@ class SimulationEngine:
                     )
                     
                     # Queue inbound for recipient to enable conversational acks during their next planning cycle
-                    recipient = handle_index.get(r_handle)
                     if recipient is not None:
-                        # Add to InboxManager for tracking
-                        from .inbox_manager import InboxMessage
-                        message_id = result.get('id', f'chat-{current_tick}-{chats}') if isinstance(result, dict) else f'chat-{current_tick}-{chats}'
-                        message_type, needs_reply = self.inbox_manager.classify_message_type(None, payload, self._locale)
-                        inbox_msg = InboxMessage(
-                            message_id=message_id,
-                            sender_id=person.id,
-                            sender_name=person.name,
-                            subject="",
-                            body=payload,
-                            thread_id=None,
-                            received_tick=current_tick,
-                            message_type=message_type,
-                            needs_reply=needs_reply,
-                            channel='chat'
-                        )
-                        self.inbox_manager.add_message(recipient.id, inbox_msg)
-                        
                         inbound = _InboundMessage(
                             sender_id=person.id,
                             sender_name=person.name,
@@ -2056,10 +2107,219 @@ class SimulationEngine:
                             tick=current_tick,
                         )
                         self._queue_runtime_message(recipient, inbound)
+        self._flush_gateways(current_tick)
         return emails, chats
+
+    def _roster_for(self, people_by_id: dict[int, PersonRead]) -> RosterIndex:
+        """Return the RosterIndex for ``people_by_id``, rebuilding it only when the roster changes.
+
+        The key holds each person's identity; the cached index keeps those
+        objects alive, so an id can't be reused by a different person.
+        """
+        external_env = os.getenv("VDOS_EXTERNAL_STAKEHOLDERS", "")
+        key = (external_env, tuple((pid, id(p)) for pid, p in people_by_id.items()))
+        roster = self._roster_index
+        if roster is None or key != self._roster_index_key:
+            roster = RosterIndex(people_by_id.values(), parse_external_stakeholders(external_env))
+            self._roster_index, self._roster_index_key = roster, key
+        return roster
+
+    def _send_or_queue(self, gateway: Any, kind: str, on_sent: OnSent, **kwargs: Any) -> None:
+        """Send through ``gateway.send_<kind>`` now, or queue it for ``_flush_gateways``.
+
+        Only gateways whose class implements ``queue_<kind>`` are batched; any
+        other gateway sends immediately and ``on_sent`` runs with its result.
+        """
+        if self._batch_sends and callable(getattr(type(gateway), f"queue_{kind}", None)):
+            getattr(gateway, f"queue_{kind}")(on_sent=on_sent, **kwargs)
+        else:
+            on_sent(getattr(gateway, f"send_{kind}")(**kwargs))
+
+    def _batching_gateways(self) -> list[Any]:
+        return [
+            gateway
+            for gateway in (self.email_gateway, self.chat_gateway)
+            if callable(getattr(type(gateway), "flush", None))
+        ]
+
+    def _flush_gateways(self, tick: int | None = None) -> None:
+        """Post every queued send, one batch request per service.
+
+        Queued messages from both gateways are styled first in a single pass
+        (one rewrite request per persona). Inside ``_tick_send_batch`` this is
+        a no-op until the tick ends.
+        """
+        if self._deferred_flush_tick is not None:
+            return
+        gateways = self._batching_gateways()
+        style_queued(*gateways, tick=tick)
+        for gateway in gateways:
+            gateway.flush(tick=tick)
+
+    @contextmanager
+    def _tick_send_batch(self, tick: int) -> Iterator[None]:
+        """Hold queued sends until the end of the tick.
+
+        Every email, DM and room message of the tick is then posted in one
+        batch request per service, and styled together (one request per
+        persona, run concurrently) when the style filter is on. Exchange logs
+        and recipients' inbox bookkeeping run once the tick's sends are
+        stored. If the tick raises, the queue is kept for the next flush (a
+        rolled-back unit of work drops it instead).
+        """
+        if not self._batch_sends:
+            yield
+            return
+        self._deferred_flush_tick = tick
+        try:
+            yield
+        finally:
+            self._deferred_flush_tick = None
+        self._flush_gateways(tick)
+
+    def _track_sent_email(
+        self,
+        person: PersonRead,
+        result: Any,
+        *,
+        email_to: str,
+        cc_emails: list[str],
+        subject: str,
+        body: str,
+        thread_id: str | None,
+        current_tick: int,
+        fallback_id: str,
+        email_index: dict[str, PersonRead],
+    ) -> None:
+        """Log a stored email and track it for threading context, recipients' inboxes and reply queues."""
+        primary_recipient = email_index.get((email_to or '').lower())
+        self._log_exchange(
+            tick=current_tick,
+            sender_id=person.id,
+            recipient_id=primary_recipient.id if primary_recipient else None,
+            channel='email',
+            subject=subject,
+            summary=body[:100] if body else None
+        )
+        if not (result and isinstance(result, dict)):
+            return
+        self._index_tick_message(current_tick, 'email', result)
+        email_id = result.get('id', fallback_id)
+        email_record = {
+            'email_id': email_id,
+            'from': person.email_address,
+            'to': email_to,
+            'subject': subject,
+            'thread_id': thread_id,
+            'sent_at_tick': current_tick,
+        }
+        # Add to sender's recent emails
+        if person.id not in self._recent_emails:
+            self._recent_emails[person.id] = deque(maxlen=10)
+        self._recent_emails[person.id].append(email_record)
+
+        # Also add to all recipients' recent emails for their context
+        for recipient_addr in [email_to, *cc_emails]:
+            recipient_person = email_index.get(recipient_addr.lower())
+            if recipient_person:
+                if recipient_person.id not in self._recent_emails:
+                    self._recent_emails[recipient_person.id] = deque(maxlen=10)
+                self._recent_emails[recipient_person.id].append(email_record)
+
+                # Add to InboxManager for tracking and reply generation
+                from .inbox_manager import InboxMessage
+                message_type, needs_reply = self.inbox_manager.classify_message_type(subject, body, self._locale)
+                inbox_msg = InboxMessage(
+                    message_id=email_id,
+                    sender_id=person.id,
+                    sender_name=person.name,
+                    subject=subject,
+                    body=body,
+                    thread_id=thread_id,
+                    received_tick=current_tick,
+                    message_type=message_type,
+                    needs_reply=needs_reply,
+                    channel='email'
+                )
+                self.inbox_manager.add_message(recipient_person.id, inbox_msg)
+
+        # Queue an inbound message to the primary recipient to enable a natural reply/ack during their next planning
+        if primary_recipient is not None:
+            # Derive a short action item from the subject when possible
+            action_item = None
+            if subject:
+                action_item = subject.strip()
+            inbound = _InboundMessage(
+                sender_id=person.id,
+                sender_name=person.name,
+                subject=subject,
+                summary=(body[:140] + '...') if isinstance(body, str) and len(body) > 160 else (body or subject or ''),
+                action_item=action_item,
+                message_type='email',
+                channel='email',
+                tick=current_tick,
+            )
+            self._queue_runtime_message(primary_recipient, inbound)
+
+    def _track_sent_message(
+        self,
+        tick: int,
+        channel: str,
+        result: Any,
+        *,
+        sender_id: int | None,
+        recipient_id: int | None,
+        subject: str | None,
+        summary: str | None,
+    ) -> None:
+        """Log and index a stored acknowledgement or notification that needs no inbox tracking."""
+        self._index_tick_message(tick, channel, result)
+        self._log_exchange(tick, sender_id, recipient_id, channel, subject, summary)
+
+    def _track_sent_dm(
+        self,
+        person: PersonRead,
+        recipient: PersonRead | None,
+        result: Any,
+        *,
+        payload: str,
+        current_tick: int,
+        fallback_id: str,
+    ) -> None:
+        """Log a stored DM and add it to the recipient's inbox for tracking and replies."""
+        self._log_exchange(
+            tick=current_tick,
+            sender_id=person.id,
+            recipient_id=recipient.id if recipient else None,
+            channel='chat',
+            subject=None,
+            summary=payload
+        )
+        self._index_tick_message(current_tick, 'chat', result)
+        if recipient is None:
+            return
+        # Add to InboxManager for tracking
+        from .inbox_manager import InboxMessage
+        message_id = result.get('id', fallback_id) if isinstance(result, dict) else fallback_id
+        message_type, needs_reply = self.inbox_manager.classify_message_type(None, payload, self._locale)
+        inbox_msg = InboxMessage(
+            message_id=message_id,
+            sender_id=person.id,
+            sender_name=person.name,
+            subject="",
+            body=payload,
+            thread_id=None,
+            received_tick=current_tick,
+            message_type=message_type,
+            needs_reply=needs_reply,
+            channel='chat'
+        )
+        self.inbox_manager.add_message(recipient.id, inbox_msg)
+
     def _schedule_direct_comm(self, person_id: int, tick: int, channel: str, target: str, payload: str) -> None:
         by_tick = self._scheduled_comms.setdefault(person_id, {})
         by_tick.setdefault(tick, []).append({'channel': channel, 'target': target, 'payload': payload})
+        self._wake(person_id, tick)
 
     def _apply_migrations(self) -> None:
         with get_connection() as conn:
@@ -2071,6 +2331,8 @@ class SimulationEngine:
             state_columns = {row["name"] for row in conn.execute("PRAGMA table_info(simulation_state)")}
             if "auto_tick" not in state_columns:
                 conn.execute("ALTER TABLE simulation_state ADD COLUMN auto_tick INTEGER NOT NULL DEFAULT 0")
+            if "sim_base_dt" not in state_columns:
+                conn.execute("ALTER TABLE simulation_state ADD COLUMN sim_base_dt TEXT")
             # Multi-project support migrations
             project_columns = {row["name"] for row in conn.execute("PRAGMA table_info(project_plans)")}
             if "start_week" not in project_columns:
@@ -2111,6 +2373,10 @@ class SimulationEngine:
             start_tick, end_tick = self._parse_work_hours_to_ticks(getattr(person, 'work_hours', '') or '')
             cache[person.id] = (start_tick, end_tick)
         self._work_hours_ticks = cache
+        starts: dict[int, list[int]] = {}
+        for person_id, (start_tick, _) in cache.items():
+            starts.setdefault(start_tick, []).append(person_id)
+        self._work_start_ids = {start_tick: tuple(ids) for start_tick, ids in starts.items()}
 
     def _is_work_hours_tick(self, tick: int) -> bool:
         """
@@ -2140,12 +2406,36 @@ class SimulationEngine:
         # Map 09:00-17:00 to 480-tick scale
         # 09:00 = 540 minutes = (540/1440) * 480 = 180 ticks
         # 17:00 = 1020 minutes = (1020/1440) * 480 = 340 ticks
-        WORK_START_TICK = 180  # 09:00 in 480-tick scale
-        WORK_END_TICK = 340    # 17:00 in 480-tick scale
-
         # Check if it's during work hours
         tick_of_day = (tick - 1) % day_ticks if tick > 0 else 0
-        return WORK_START_TICK <= tick_of_day <= WORK_END_TICK
+        return self.WORK_START_TICK <= tick_of_day <= self.WORK_END_TICK
+
+    def _next_work_hours_tick(self, tick: int) -> int | None:
+        """Return the first tick >= ``tick`` for which ``_is_work_hours_tick`` is True.
+
+        Computed in closed form from ``hours_per_day`` and the weekday rule so that
+        ``advance()`` can jump over nights and weekends without walking each tick.
+        Returns None when the configured day is too short to contain any work tick.
+        """
+        day_ticks = max(1, self.hours_per_day * 60)
+        if day_ticks <= self.WORK_START_TICK:
+            return None
+        work_end = min(self.WORK_END_TICK, day_ticks - 1)
+        tick = max(tick, 1)
+        day_index = (tick - 1) // day_ticks
+        tick_of_day = (tick - 1) % day_ticks
+        if day_index % 7 < 5 and tick_of_day <= work_end:
+            if tick_of_day >= self.WORK_START_TICK:
+                return tick
+            return day_index * day_ticks + self.WORK_START_TICK + 1
+        day_index += 1
+        if day_index % 7 >= 5:
+            day_index += 7 - day_index % 7
+        return day_index * day_ticks + self.WORK_START_TICK + 1
+
+    def _skip_off_hours(self, first_tick: int, last_tick: int) -> None:
+        """Advance the clock over off-hours ticks with a single summarised tick_log row."""
+        self._update_tick(last_tick, f"off_hours_skip:{first_tick}-{last_tick}")
 
     def _is_within_work_hours(self, person: PersonRead, tick: int) -> bool:
         if not self.hours_per_day:
@@ -2334,6 +2624,7 @@ class SimulationEngine:
                     "INSERT INTO schedule_blocks(person_id, start, end, activity) VALUES (?, ?, ?, ?)",
                     [(person_id, block.start, block.end, block.activity) for block in schedule],
                 )
+        self.invalidate_people_cache(person_id)
 
         self.email_gateway.ensure_mailbox(payload.email_address, payload.name)
         self.chat_gateway.ensure_user(payload.chat_handle, payload.name)
@@ -2343,18 +2634,13 @@ class SimulationEngine:
         return person
 
     def list_people(self) -> List[PersonRead]:
-        with get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM people ORDER BY id"
-            ).fetchall()
-        return [self._row_to_person(row) for row in rows]
+        return list(self._people_snapshot().values())
 
     def get_person(self, person_id: int) -> PersonRead:
-        with get_connection() as conn:
-            row = conn.execute("SELECT * FROM people WHERE id = ?", (person_id,)).fetchone()
-        if not row:
+        person = self._people_snapshot().get(person_id)
+        if person is None:
             raise ValueError("Person not found")
-        return self._row_to_person(row)
+        return person
 
     def delete_person_by_name(self, name: str) -> bool:
         with get_connection() as conn:
@@ -2362,9 +2648,63 @@ class SimulationEngine:
             if not row:
                 return False
             conn.execute("DELETE FROM people WHERE id = ?", (row["id"],))
+        # Their project assignments were removed via ON DELETE CASCADE
+        self.invalidate_people_cache(row["id"])
+        self.invalidate_project_index()
         self._worker_runtime.pop(row["id"], None)
         return True
 
+    @property
+    def people_version(self) -> int:
+        """Counter bumped on every persona change; lets derived caches detect staleness."""
+        return self._people_version
+
+    def invalidate_people_cache(self, person_id: int | None = None) -> None:
+        """Drop the cached roster after personas are created, updated, deleted or imported.
+
+        Also drops the style filter's cached data for ``person_id`` (or for
+        everyone when None), e.g. after its style examples are regenerated.
+        """
+        with self._people_lock:
+            self._people_version += 1
+            self._people_cache = None
+        seen: set[int] = set()
+        for gateway in (self.email_gateway, self.chat_gateway):
+            style_filter = getattr(gateway, "style_filter", None)
+            if style_filter is None or id(style_filter) in seen:
+                continue
+            seen.add(id(style_filter))
+            invalidate = getattr(style_filter, "invalidate_persona_cache", None)
+            if callable(invalidate):
+                invalidate(person_id)
+
+    def _people_snapshot(self) -> dict[int, PersonRead]:
+        """Personas by id (ordered by id), loaded once per ``people_version``."""
+        with self._people_lock:
+            cached = self._people_cache
+            version = self._people_version
+        if cached is not None:
+            return cached
+        people = self._load_people()
+        with self._people_lock:
+            # Don't cache a roster that was invalidated while it was loading
+            if self._people_version == version:
+                self._people_cache = people
+        return people
+
+    def _load_people(self) -> dict[int, PersonRead]:
+        with get_connection() as conn:
+            rows = conn.execute("SELECT * FROM people ORDER BY id").fetchall()
+            block_rows = conn.execute(
+                "SELECT person_id, start, end, activity FROM schedule_blocks ORDER BY person_id, id"
+            ).fetchall()
+        schedules: dict[int, list[dict]] = {}
+        for block in block_rows:
+            schedules.setdefault(block["person_id"], []).append(
+                {"start": block["start"], "end": block["end"], "activity": block["activity"]}
+            )
+        return {row["id"]: self._row_to_person(row, schedules.get(row["id"], [])) for row in rows}
+
     # ------------------------------------------------------------------
     # Planning lifecycle
     def _call_planner(self, method_name: str, **kwargs) -> PlanResult:
@@ -2675,75 +3015,40 @@ class SimulationEngine:
             # Optional: disable tick-0 initial planning for strict off-hours starts
             disable_initial = (os.getenv("VDOS_DISABLE_INITIAL_PLANNING", "0").strip().lower() in {"1", "true", "yes", "on"})
             if not disable_initial:
-                with ThreadPoolExecutor(max_workers=min(4, len(team))) as executor:
-                    futures = [executor.submit(generate_initial_plans_for_person, person) for person in team]
-                    for future in as_completed(futures):
-                        try:
-                            future.result()
-                        except Exception as e:
-                            logger.error(f"Failed to generate initial plans: {e}", exc_info=True)
+                executor = self._executors.pool("initial_planning")
+                futures = [executor.submit(generate_initial_plans_for_person, person) for person in team]
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to generate initial plans: {e}", exc_info=True)
+
+    def invalidate_project_index(self) -> None:
+        """Drop the cached project index after projects or assignments change."""
+        with self._project_index_lock:
+            self._project_index = None
+
+    def _projects(self) -> ProjectIndex:
+        """Project timelines and assignments, loaded once until invalidated."""
+        with self._project_index_lock:
+            if self._project_index is None:
+                with get_connection() as conn:
+                    self._project_index = ProjectIndex.load(conn, self._row_to_project_plan)
+            return self._project_index
 
     def _get_active_project_for_person(self, person_id: int, week: int) -> dict[str, Any] | None:
         """Get the active project for a person at a given week, considering project timelines."""
-        with get_connection() as conn:
-            # First check if person is assigned to specific projects
-            rows = conn.execute(
-                """
-                SELECT pp.* FROM project_plans pp
-                INNER JOIN project_assignments pa ON pp.id = pa.project_id
-                WHERE pa.person_id = ? AND pp.start_week <= ? AND (pp.start_week + pp.duration_weeks - 1) >= ?
-                ORDER BY pp.start_week ASC
-                LIMIT 1
-                """,
-                (person_id, week, week),
-            ).fetchall()
-
-            if not rows:
-                # No specific assignment, check for projects without assignments (default: everyone)
-                rows = conn.execute(
-                    """
-                    SELECT pp.* FROM project_plans pp
-                    WHERE pp.id NOT IN (SELECT DISTINCT project_id FROM project_assignments)
-                    AND pp.start_week <= ? AND (pp.start_week + pp.duration_weeks - 1) >= ?
-                    ORDER BY pp.start_week ASC
-                    LIMIT 1
-                    """,
-                    (week, week),
-                ).fetchall()
-
-            if rows:
-                return self._row_to_project_plan(rows[0])
+        index = self._projects()
+        # Assigned projects win; otherwise fall back to projects without assignments (default: everyone)
+        assigned = index.assigned_project_ids(person_id, week)
+        candidates = assigned or index.project_ids_for_person(person_id, week)
+        if not candidates:
             return None
+        return next(dict(p) for p in index.active_projects(week) if p["id"] == candidates[0])
 
     def _get_all_active_projects_for_person(self, person_id: int, week: int) -> list[dict[str, Any]]:
         """Get ALL active projects for a person at a given week."""
-        with get_connection() as conn:
-            # Get assigned projects
-            rows = conn.execute(
-                """
-                SELECT pp.* FROM project_plans pp
-                INNER JOIN project_assignments pa ON pp.id = pa.project_id
-                WHERE pa.person_id = ? AND pp.start_week <= ? AND (pp.start_week + pp.duration_weeks - 1) >= ?
-                ORDER BY pp.start_week ASC
-                """,
-                (person_id, week, week),
-            ).fetchall()
-
-            assigned_ids = {row["id"] for row in rows}
-
-            # Get projects without assignments (everyone works on them)
-            unassigned_rows = conn.execute(
-                """
-                SELECT pp.* FROM project_plans pp
-                WHERE pp.id NOT IN (SELECT DISTINCT project_id FROM project_assignments)
-                AND pp.start_week <= ? AND (pp.start_week + pp.duration_weeks - 1) >= ?
-                ORDER BY pp.start_week ASC
-                """,
-                (week, week),
-            ).fetchall()
-
-            all_rows = list(rows) + [r for r in unassigned_rows if r["id"] not in assigned_ids]
-            return [self._row_to_project_plan(row) for row in all_rows]
+        return self._projects().projects_for_person(person_id, week)
 
     def _validate_project_pair(self, sender_id: int, recipient_id: int, current_week: int) -> bool:
         """Return True if sender and recipient share at least one active project in the given week.
@@ -2751,15 +3056,7 @@ class SimulationEngine:
         Considers both explicitly assigned projects and unassigned active projects (everyone).
         """
         try:
-            s_projects = self._get_all_active_projects_for_person(sender_id, current_week)
-            r_projects = self._get_all_active_projects_for_person(recipient_id, current_week)
-            if not s_projects or not r_projects:
-                return False
-            def _pid(p):
-                return p.get("id") if isinstance(p, dict) else getattr(p, "id", None)
-            s_ids = { _pid(p) for p in s_projects if _pid(p) is not None }
-            r_ids = { _pid(p) for p in r_projects if _pid(p) is not None }
-            return bool(s_ids & r_ids)
+            return self._projects().shares_project(sender_id, recipient_id, current_week)
         except Exception:
             return False
 
@@ -2788,93 +3085,22 @@ class SimulationEngine:
         Returns:
             List of PersonRead objects representing project collaborators
         """
-        with get_connection() as conn:
-            # If project_id is specified, only get collaborators for that specific project (REQ-2.2.1)
-            if project_id is not None:
-                # Verify the person is assigned to this project
-                person_on_project = conn.execute(
-                    """
-                    SELECT 1 FROM project_assignments pa
-                    INNER JOIN project_plans pp ON pa.project_id = pp.id
-                    WHERE pa.person_id = ? AND pa.project_id = ?
-                    AND pp.start_week <= ? AND (pp.start_week + pp.duration_weeks - 1) >= ?
-                    """,
-                    (person_id, project_id, current_week, current_week)
-                ).fetchone()
-
-                if not person_on_project:
-                    # Person not on this project, return empty list
-                    return []
-
-                # Get all people assigned to THIS specific project
-                collaborator_rows = conn.execute(
-                    """
-                    SELECT DISTINCT pa.person_id
-                    FROM project_assignments pa
-                    INNER JOIN project_plans pp ON pa.project_id = pp.id
-                    WHERE pa.project_id = ?
-                    AND pa.person_id != ?
-                    AND pp.start_week <= ?
-                    AND (pp.start_week + pp.duration_weeks - 1) >= ?
-                    """,
-                    (project_id, person_id, current_week, current_week)
-                ).fetchall()
-
-                collaborator_ids = {row['person_id'] for row in collaborator_rows}
-                return [all_people[pid] for pid in collaborator_ids if pid in all_people]
+        index = self._projects()
+        collaborator_ids = index.collaborator_ids(person_id, current_week, project_id)
 
-            # Original behavior: Get projects assigned to this person
-            person_projects = conn.execute(
-                """
-                SELECT DISTINCT pa.project_id
-                FROM project_assignments pa
-                INNER JOIN project_plans pp ON pa.project_id = pp.id
-                WHERE pa.person_id = ?
-                AND pp.start_week <= ?
-                AND (pp.start_week + pp.duration_weeks - 1) >= ?
-                """,
-                (person_id, current_week, current_week)
-            ).fetchall()
-
-            person_project_ids = {row['project_id'] for row in person_projects}
-
-            # If person has no specific project assignments, they work on unassigned projects
-            # In this case, return all other personas (existing behavior)
-            if not person_project_ids:
-                return [p for p in all_people.values() if p.id != person_id]
-
-            # Get all people assigned to the same projects
-            collaborator_rows = conn.execute(
-                """
-                SELECT DISTINCT pa.person_id
-                FROM project_assignments pa
-                INNER JOIN project_plans pp ON pa.project_id = pp.id
-                WHERE pa.project_id IN ({})
-                AND pa.person_id != ?
-                AND pp.start_week <= ?
-                AND (pp.start_week + pp.duration_weeks - 1) >= ?
-                """.format(','.join('?' * len(person_project_ids))),
-                (*person_project_ids, person_id, current_week, current_week)
-            ).fetchall()
-
-            collaborator_ids = {row['person_id'] for row in collaborator_rows}
+        # If person has no specific project assignments, they work on unassigned projects
+        # In this case, return all other personas (existing behavior)
+        if collaborator_ids is None:
+            return [p for p in all_people.values() if p.id != person_id]
 
+        if project_id is None:
             # Also include people with no assignments (they work on unassigned projects)
-            people_with_no_assignments = conn.execute(
-                """
-                SELECT DISTINCT p.id
-                FROM people p
-                WHERE p.id NOT IN (SELECT DISTINCT person_id FROM project_assignments)
-                AND p.id != ?
-                """,
-                (person_id,)
-            ).fetchall()
-
-            for row in people_with_no_assignments:
-                collaborator_ids.add(row['id'])
+            collaborator_ids.update(
+                pid for pid in all_people if pid != person_id and not index.is_assigned(pid)
+            )
 
-            # Return PersonRead objects for collaborators
-            return [all_people[pid] for pid in collaborator_ids if pid in all_people]
+        # Return PersonRead objects for collaborators
+        return [all_people[pid] for pid in collaborator_ids if pid in all_people]
 
     def _validate_project_communication(
         self,
@@ -3029,6 +3255,7 @@ class SimulationEngine:
             row = conn.execute(
                 "SELECT * FROM project_plans WHERE id = ?", (project_id,)
             ).fetchone()
+        self.invalidate_project_index()
         plan = self._row_to_project_plan(row)
         self._project_plan_cache = plan
         self.project_duration_weeks = duration_weeks
@@ -3260,6 +3487,41 @@ class SimulationEngine:
         result: PlanResult,
         context: str | None,
     ) -> dict[str, Any]:
+        params = (
+            person_id,
+            tick,
+            plan_type,
+            result.content,
+            result.model_used,
+            result.tokens_used,
+            context,
+        )
+        if plan_type == "hourly":
+            self._hourly_planners.setdefault((tick - 1) // 60, set()).add(person_id)
+        buffer = self._current_tick_buffer()
+        if buffer is not None:
+            # Deferred insert: check the person now, so one bad plan can't fail the whole tick's commit
+            if person_id not in self._people_snapshot():
+                logger.error(f"Cannot store worker plan: person_id {person_id} does not exist in database")
+                raise ValueError(f"Person ID {person_id} not found in database")
+            created_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+            plan = {
+                "id": None,  # filled in when the tick commits
+                "person_id": person_id,
+                "tick": tick,
+                "plan_type": plan_type,
+                "content": result.content,
+                "model_used": result.model_used,
+                "tokens_used": result.tokens_used,
+                "context": context,
+                "created_at": created_at,
+            }
+            buffer.add(
+                "INSERT INTO worker_plans(person_id, tick, plan_type, content, model_used, tokens_used, context, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*params, created_at),
+                on_insert=lambda row_id: plan.__setitem__("id", row_id),
+            )
+            return plan
         with get_connection() as conn:
             # Verify person exists before attempting insert
             person_exists = conn.execute(
@@ -3271,15 +3533,7 @@ class SimulationEngine:
 
             cursor = conn.execute(
                 "INSERT INTO worker_plans(person_id, tick, plan_type, content, model_used, tokens_used, context) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (
-                    person_id,
-                    tick,
-                    plan_type,
-                    result.content,
-                    result.model_used,
-                    result.tokens_used,
-                    context,
-                ),
+                params,
             )
             row = conn.execute(
                 "SELECT * FROM worker_plans WHERE id = ?", (cursor.lastrowid,)
@@ -3486,6 +3740,51 @@ class SimulationEngine:
             result=result,
         )
 
+    def _enqueue_report_jobs(self, kind: str, people: Sequence[PersonRead], period_index: int, tick: int) -> None:
+        self._report_worker.start()
+        added = self._report_worker.enqueue(kind, [person.id for person in people], period_index, tick=tick)
+        logger.debug(f"[REPORT_WORKER] Enqueued {added} {kind} jobs for period {period_index} at tick {tick}")
+
+    def _run_hourly_summary_job(self, person_id: int, hour_index: int) -> None:
+        person = self._people_snapshot().get(person_id)
+        if person is None:
+            return
+        self._report_thread_state.active = True
+        try:
+            self._generate_hourly_summary(person, hour_index)
+        finally:
+            self._report_thread_state.active = False
+
+    def _run_daily_report_job(self, person_id: int, day_index: int) -> None:
+        person = self._people_snapshot().get(person_id)
+        project_plan = self.get_project_plan()
+        if person is None or project_plan is None:
+            return
+        self._report_thread_state.active = True
+        try:
+            self._generate_daily_report(person, day_index, project_plan)
+        finally:
+            self._report_thread_state.active = False
+
+    def executor_stats(self) -> dict[str, dict[str, Any]]:
+        """Concurrency limit, queue depth and utilization of each shared thread pool."""
+        return self._executors.stats()
+
+    def report_job_status(self) -> dict[str, Any]:
+        """Counts of hourly-summary and daily-report jobs by status."""
+        status = self._report_worker.status()
+        status["background"] = self._background_reports
+        return status
+
+    def list_report_jobs(self, status: str | None = None, kind: str | None = None, limit: int = 100) -> List[dict[str, Any]]:
+        return self._report_worker.list_jobs(status=status, kind=kind, limit=limit)
+
+    def wait_for_reports(self, timeout: float = 30.0) -> bool:
+        """Block until every queued summary/report job has run; returns False on timeout."""
+        if not self._report_worker.is_running:
+            self._report_worker.start()
+        return self._report_worker.wait_idle(timeout)
+
     def _store_daily_report(
         self,
         person_id: int,
@@ -3553,7 +3852,8 @@ class SimulationEngine:
             except Exception:
                 pass
 
-        # Invalidate cache since the latest project might have been removed
+        # Invalidate caches once the delete has committed, so no reader rebuilds from the old rows
+        self.invalidate_project_index()
         self._project_plan_cache = None
 
         return {
@@ -3565,11 +3865,13 @@ class SimulationEngine:
         if not project_plan:
             raise RuntimeError("Cannot generate simulation report without a project plan")
         people = self.list_people()
+        day_ticks = max(1, self.hours_per_day * 60)
         with get_connection() as conn:
-            # Limit tick log to major milestones only (every 480 ticks = 1 day for 8-hour days)
+            # Limit tick log to major milestones only (one per simulated day)
+            # Off-hours ticks are logged as summarised ranges, so anchor each day on its first work tick
             tick_rows = conn.execute(
-                "SELECT tick, reason FROM tick_log WHERE tick % 480 = 1 OR reason IN ('kickoff', 'manual') ORDER BY id LIMIT 100",
-                ()
+                "SELECT tick, reason FROM tick_log WHERE (tick - 1) % ? = ? OR reason IN ('kickoff', 'manual') ORDER BY id LIMIT 100",
+                (day_ticks, self.WORK_START_TICK)
             ).fetchall()
             event_rows = conn.execute("SELECT type, target_ids, project_id, at_tick, payload FROM events ORDER BY id").fetchall()
 
@@ -3697,7 +3999,8 @@ class SimulationEngine:
         self.communication_generator = CommunicationGenerator(
             planner=self.planner,
             locale=self._locale,
-            random_seed=seed
+            random_seed=seed,
+            executor_factory=lambda workers: self._executors.pool("inbox_replies", initial_workers=workers),
         )
         logger.info(f"Initialized CommunicationGenerator with seed={seed}, locale={self._locale}")
         
@@ -3759,6 +4062,12 @@ class SimulationEngine:
         except Exception:
             # Last resort: leave unset (engine will omit sent_at and servers will default)
             self._sim_base_dt = None
+        # Persist the anchor so replay cutoffs and the tick-message backfill can map sent_at back to ticks
+        with get_connection() as conn:
+            conn.execute(
+                "UPDATE simulation_state SET sim_base_dt = ? WHERE id = 1",
+                (self._sim_base_dt.isoformat() if self._sim_base_dt else None,),
+            )
         self._sync_worker_runtimes(active_people)
         # Schedule a kickoff chat/email at the first working minute for each worker
         try:
@@ -3814,6 +4123,12 @@ class SimulationEngine:
         if status.is_running:
             project_plan = self.get_project_plan()
             if project_plan is not None:
+                # The report reads hourly summaries and daily reports, so let queued ones land first
+                if self._background_reports and not self.wait_for_reports(timeout=_STOP_REPORT_DRAIN_TIMEOUT):
+                    logger.warning(
+                        f"Report worker still busy after {_STOP_REPORT_DRAIN_TIMEOUT:.0f}s; "
+                        "generating simulation report without pending summaries"
+                    )
                 self._generate_simulation_report(project_plan, total_ticks=status.current_tick)
         self._set_running(False)
         self._active_person_ids = None
@@ -3830,6 +4145,8 @@ class SimulationEngine:
         if not status.is_running:
             raise RuntimeError("Simulation must be running before enabling automatic ticks")
         self._set_auto_tick(True)
+        if self._background_reports:
+            self._report_worker.start()
         thread = self._auto_tick_thread
         if thread is None or not thread.is_alive():
             stop_event = threading.Event()
@@ -4145,6 +4462,9 @@ class SimulationEngine:
                 raise RuntimeError("Cannot advance simulation without any active personas")
             self._sync_worker_runtimes(people)
             people_by_id = {person.id: person for person in people}
+            positions = {person.id: index for index, person in enumerate(people)}
+            if self._hourly_tracking_from is None:
+                self._hourly_tracking_from = status.current_tick + 1
 
             # Calculate current week for multi-project support
             day_ticks = max(1, self.hours_per_day * 60)
@@ -4154,315 +4474,334 @@ class SimulationEngine:
             emails_sent = 0
             chats_sent = 0
 
-            for _ in range(ticks):
+            target_tick = status.current_tick + ticks
+            while status.current_tick < target_tick:
                 status.current_tick += 1
 
                 # WORK HOURS FILTER: Skip all processing for non-work hours ticks
                 # This dramatically improves performance by skipping 16 hours/day + weekends
                 # Work hours: Mon-Fri 09:00-17:00 (ticks 540-1020 of each calendar day)
+                # Jump straight to the tick before the next work-hours tick (or the target)
+                # and record the whole skipped range as one tick_log row.
                 if not self._is_work_hours_tick(status.current_tick):
-                    self._update_tick(status.current_tick, "off_hours_skip")
+                    next_work_tick = self._next_work_hours_tick(status.current_tick)
+                    last_skipped = target_tick if next_work_tick is None else min(next_work_tick - 1, target_tick)
+                    self._skip_off_hours(status.current_tick, last_skipped)
+                    status.current_tick = last_skipped
                     continue
 
-                self._reset_tick_sends()
-                self._update_tick(status.current_tick, reason)
-                self._refresh_status_overrides(status.current_tick)
-                event_adjustments, _ = self._maybe_generate_events(people, status.current_tick, project_plan)
-                day_index = (status.current_tick - 1) // day_ticks
-                tick_of_day = (status.current_tick - 1) % day_ticks if self.hours_per_day > 0 else 0
-                # Prune stale plan-attempt counters (keep only this minute)
-                if self._hourly_plan_attempts:
-                    keys = list(self._hourly_plan_attempts.keys())
-                    for key in keys:
-                        if key[1] != day_index or key[2] != tick_of_day:
-                            self._hourly_plan_attempts.pop(key, None)
-
-                # PHASE 1: Collect planning tasks and prepare context
-                planning_tasks = []
-                person_contexts = {}
-
-                for person in people:
-                    runtime = self._get_worker_runtime(person)
-                    incoming = runtime.drain()
-                    working = self._is_within_work_hours(person, status.current_tick)
-                    adjustments: list[str] = list(event_adjustments.get(person.id, []))
-                    override = self._status_overrides.get(person.id)
-                    # Respect offline-style overrides: do not plan while unavailable
-                    offline_statuses = {"SickLeave", "Offline", "Absent", "Vacation", "Leave", "Away", "휴가", "병가", "자리비움"}
-                    if override and (override[0] in offline_statuses):
-                        # Drain incoming into queue as reminders and skip planning
-                        if incoming:
-                            for message in incoming:
-                                self._get_worker_runtime(person).queue(message)
-                        logger.info("Skipping planning for %s at tick %s due to status override: %s", person.name, status.current_tick, override[0])
-                        continue
-                    if override and override[0] == 'SickLeave':
-                        incoming = []
-                        adjustments.append('Observe sick leave and hold tasks until recovered.')
-                    if not working:
-                        if incoming:
-                            for message in incoming:
-                                runtime.queue(message)
-                        for note in adjustments:
-                            reminder = _InboundMessage(
-                                sender_id=0,
-                                sender_name='Simulation Manager',
-                                subject='Pending adjustment',
-                                summary=note,
-                                action_item=note,
-                                message_type='event',
-                                channel='system',
-                                tick=status.current_tick,
-                            )
-                            runtime.queue(reminder)
-                        logger.info("Skipping planning for %s at tick %s (off hours)", person.name, status.current_tick)
-                        continue
-                    # Dispatch any scheduled comms for this tick before planning/fallback
-                    se_pre, sc_pre = self._dispatch_scheduled(person, status.current_tick, people_by_id)
-                    emails_sent += se_pre
-                    chats_sent += sc_pre
-                    if se_pre or sc_pre:
-                        # If we sent scheduled comms at this minute, skip fallback sending to avoid duplication
-                        continue
-                    # Plan at the start of each worker's day (their work window), not only at absolute day start
-                    start_end = self._work_hours_ticks.get(person.id, (0, day_ticks))
-                    work_start_tick = start_end[0] if self.hours_per_day > 0 else 0
-                    should_plan = (
-                        bool(incoming)
-                        or bool(adjustments)
-                        or reason != 'auto'
-                        or (tick_of_day == work_start_tick)
-                    )
-                    if not should_plan:
-                        continue
-                    # Hourly planning limiter per minute
-                    key = (person.id, day_index, tick_of_day)
-                    attempts = self._hourly_plan_attempts.get(key, 0)
-                    if attempts >= self._max_hourly_plans_per_minute:
-                        logger.warning(
-                            "Skipping hourly planning for %s at tick %s (minute cap %s reached)",
-                            person.name,
-                            status.current_tick,
-                            self._max_hourly_plans_per_minute,
-                        )
-                        continue
-                    # record attempt before planning to avoid re-entry storms
-                    self._hourly_plan_attempts[key] = attempts + 1
-                    self._remove_runtime_messages([msg.message_id for msg in incoming if msg.message_id is not None])
-                    for message in incoming:
-                        sender_person = people_by_id.get(message.sender_id)
-                        if message.message_type == "ack":
-                            adjustments.append(f"Acknowledged by {message.sender_name}: {message.summary}")
+                # Engine-owned writes for this tick commit together (when enabled);
+                # summaries and reports below read them, so they run after the flush.
+                # Queued sends are posted as the tick ends, after that commit.
+                with self._tick_send_batch(status.current_tick), self._tick_unit_of_work(status.current_tick):
+                    self._reset_tick_sends()
+                    self._update_tick(status.current_tick, reason)
+                    self._refresh_status_overrides(status.current_tick)
+                    event_adjustments, _ = self._maybe_generate_events(people, status.current_tick, project_plan)
+                    day_index = (status.current_tick - 1) // day_ticks
+                    tick_of_day = (status.current_tick - 1) % day_ticks if self.hours_per_day > 0 else 0
+                    # Prune stale plan-attempt counters (keep only this minute)
+                    if self._hourly_plan_attempts:
+                        keys = list(self._hourly_plan_attempts.keys())
+                        for key in keys:
+                            if key[1] != day_index or key[2] != tick_of_day:
+                                self._hourly_plan_attempts.pop(key, None)
+
+                    # PHASE 1: Collect planning tasks and prepare context
+                    planning_tasks = []
+                    person_contexts = {}
+
+                    for person in self._iter_tick_round(people, positions, status.current_tick, reason, event_adjustments):
+                        runtime = self._get_worker_runtime(person)
+                        incoming = runtime.drain()
+                        working = self._is_within_work_hours(person, status.current_tick)
+                        adjustments: list[str] = list(event_adjustments.get(person.id, []))
+                        override = self._status_overrides.get(person.id)
+                        # Respect offline-style overrides: do not plan while unavailable
+                        offline_statuses = {"SickLeave", "Offline", "Absent", "Vacation", "Leave", "Away", "휴가", "병가", "자리비움"}
+                        if override and (override[0] in offline_statuses):
+                            # Drain incoming into queue as reminders and skip planning
+                            if incoming:
+                                for message in incoming:
+                                    self._get_worker_runtime(person).queue(message)
+                                self._wake(person.id, override[1])
+                            logger.info("Skipping planning for %s at tick %s due to status override: %s", person.name, status.current_tick, override[0])
                             continue
-                        if message.action_item:
-                            adjustments.append(f"Handle request from {message.sender_name}: {message.action_item}")
-                        if sender_person is None:
+                        if override and override[0] == 'SickLeave':
+                            incoming = []
+                            adjustments.append('Observe sick leave and hold tasks until recovered.')
+                        if not working:
+                            if incoming:
+                                for message in incoming:
+                                    runtime.queue(message)
+                            for note in adjustments:
+                                reminder = _InboundMessage(
+                                    sender_id=0,
+                                    sender_name='Simulation Manager',
+                                    subject='Pending adjustment',
+                                    summary=note,
+                                    action_item=note,
+                                    message_type='event',
+                                    channel='system',
+                                    tick=status.current_tick,
+                                )
+                                runtime.queue(reminder)
+                            if runtime.inbox:
+                                self._wake(person.id, self._next_work_start_tick(person, status.current_tick))
+                            logger.info("Skipping planning for %s at tick %s (off hours)", person.name, status.current_tick)
                             continue
-                        ack_phrase = (message.action_item or message.summary or ("요청하신 내용" if self._locale == 'ko' else "your latest update")).rstrip('.')
-                        if self._locale == 'ko':
-                            # Casual and natural Korean acknowledgments for chat
-                            import random
-                            ack_patterns = [
-                                f"{sender_person.name.split()[0]}님, {ack_phrase} 확인했어요!",
-                                f"{sender_person.name.split()[0]}님, {ack_phrase} 진행할게요~",
-                                f"{sender_person.name.split()[0]}님, {ack_phrase} 작업 중이에요",
-                                f"{sender_person.name.split()[0]}님, 알겠습니다. {ack_phrase} 처리할게요",
-                                f"{sender_person.name.split()[0]}님, 네~ {ack_phrase} 바로 시작할게요",
-                                f"{sender_person.name.split()[0]}님, {ack_phrase} 확인했습니다. 진행하겠습니다",
-                            ]
-                            ack_body = random.choice(ack_patterns)
-                        else:
-                            ack_body = f"{sender_person.name.split()[0]}, I'm on {ack_phrase}."
-                        # Only acknowledge if on a shared active project
-                        TICKS_PER_CALENDAR_WEEK = 7 * 24 * 60  # 10,080 ticks
-                        current_week_for_validation = ((status.current_tick - 1) // TICKS_PER_CALENDAR_WEEK) + 1 if status.current_tick > 0 else 1
-                        if sender_person is not None and not self._validate_project_pair(person.id, sender_person.id, current_week_for_validation):
+                        # Dispatch any scheduled comms for this tick before planning/fallback
+                        se_pre, sc_pre = self._dispatch_scheduled(person, status.current_tick, people_by_id)
+                        emails_sent += se_pre
+                        chats_sent += sc_pre
+                        if se_pre or sc_pre:
+                            # If we sent scheduled comms at this minute, skip fallback sending to avoid duplication
                             continue
-                        if self._can_send(
-                            tick=status.current_tick,
-                            channel='chat',
-                            sender=person.chat_handle,
-                            recipient_key=(sender_person.chat_handle,),
-                            subject=None,
-                            body=ack_body,
-                        ):
-                            dt = self._sim_datetime_for_tick(status.current_tick)
-                            self.chat_gateway.send_dm(
+                        # Plan at the start of each worker's day (their work window), not only at absolute day start
+                        start_end = self._work_hours_ticks.get(person.id, (0, day_ticks))
+                        work_start_tick = start_end[0] if self.hours_per_day > 0 else 0
+                        should_plan = (
+                            bool(incoming)
+                            or bool(adjustments)
+                            or reason != 'auto'
+                            or (tick_of_day == work_start_tick)
+                        )
+                        if not should_plan:
+                            continue
+                        # Hourly planning limiter per minute
+                        key = (person.id, day_index, tick_of_day)
+                        attempts = self._hourly_plan_attempts.get(key, 0)
+                        if attempts >= self._max_hourly_plans_per_minute:
+                            logger.warning(
+                                "Skipping hourly planning for %s at tick %s (minute cap %s reached)",
+                                person.name,
+                                status.current_tick,
+                                self._max_hourly_plans_per_minute,
+                            )
+                            continue
+                        # record attempt before planning to avoid re-entry storms
+                        self._hourly_plan_attempts[key] = attempts + 1
+                        if self._tick_buffer is not None:
+                            self._tick_buffer.cancel_messages(incoming)
+                        self._remove_runtime_messages([msg.message_id for msg in incoming if msg.message_id is not None])
+                        for message in incoming:
+                            sender_person = people_by_id.get(message.sender_id)
+                            if message.message_type == "ack":
+                                adjustments.append(f"Acknowledged by {message.sender_name}: {message.summary}")
+                                continue
+                            if message.action_item:
+                                adjustments.append(f"Handle request from {message.sender_name}: {message.action_item}")
+                            if sender_person is None:
+                                continue
+                            ack_phrase = (message.action_item or message.summary or ("요청하신 내용" if self._locale == 'ko' else "your latest update")).rstrip('.')
+                            if self._locale == 'ko':
+                                # Casual and natural Korean acknowledgments for chat
+                                import random
+                                ack_patterns = [
+                                    f"{sender_person.name.split()[0]}님, {ack_phrase} 확인했어요!",
+                                    f"{sender_person.name.split()[0]}님, {ack_phrase} 진행할게요~",
+                                    f"{sender_person.name.split()[0]}님, {ack_phrase} 작업 중이에요",
+                                    f"{sender_person.name.split()[0]}님, 알겠습니다. {ack_phrase} 처리할게요",
+                                    f"{sender_person.name.split()[0]}님, 네~ {ack_phrase} 바로 시작할게요",
+                                    f"{sender_person.name.split()[0]}님, {ack_phrase} 확인했습니다. 진행하겠습니다",
+                                ]
+                                ack_body = random.choice(ack_patterns)
+                            else:
+                                ack_body = f"{sender_person.name.split()[0]}, I'm on {ack_phrase}."
+                            # Only acknowledge if on a shared active project
+                            TICKS_PER_CALENDAR_WEEK = 7 * 24 * 60  # 10,080 ticks
+                            current_week_for_validation = ((status.current_tick - 1) // TICKS_PER_CALENDAR_WEEK) + 1 if status.current_tick > 0 else 1
+                            if sender_person is not None and not self._validate_project_pair(person.id, sender_person.id, current_week_for_validation):
+                                continue
+                            if self._can_send(
+                                tick=status.current_tick,
+                                channel='chat',
                                 sender=person.chat_handle,
-                                recipient=sender_person.chat_handle,
+                                recipient_key=(sender_person.chat_handle,),
+                                subject=None,
                                 body=ack_body,
-                                sent_at_iso=(dt.isoformat() if dt else None),
-                                persona_id=person.id
+                            ):
+                                dt = self._sim_datetime_for_tick(status.current_tick)
+                                self._send_or_queue(
+                                    self.chat_gateway,
+                                    'dm',
+                                    partial(
+                                        self._track_sent_message,
+                                        status.current_tick,
+                                        'chat',
+                                        sender_id=person.id,
+                                        recipient_id=sender_person.id,
+                                        subject=None,
+                                        summary=ack_body,
+                                    ),
+                                    sender=person.chat_handle,
+                                    recipient=sender_person.chat_handle,
+                                    body=ack_body,
+                                    sent_at_iso=(dt.isoformat() if dt else None),
+                                    persona_id=person.id,
+                                )
+                                chats_sent += 1
+                            ack_message = _InboundMessage(
+                                sender_id=person.id,
+                                sender_name=person.name,
+                                subject=f"Acknowledgement from {person.name}",
+                                summary=ack_body,
+                                action_item=None,
+                                message_type='ack',
+                                channel='chat',
+                                tick=status.current_tick,
                             )
-                            chats_sent += 1
-                        self._log_exchange(status.current_tick, person.id, sender_person.id, 'chat', None, ack_body)
-                        ack_message = _InboundMessage(
-                            sender_id=person.id,
-                            sender_name=person.name,
-                            subject=f"Acknowledgement from {person.name}",
-                            summary=ack_body,
-                            action_item=None,
-                            message_type='ack',
-                            channel='chat',
-                            tick=status.current_tick,
-                        )
-                        self._queue_runtime_message(sender_person, ack_message)
+                            self._queue_runtime_message(sender_person, ack_message)
+
+                        # Get ALL active projects for this person at current week (concurrent multi-project support)
+                        active_projects = self._get_all_active_projects_for_person(person.id, current_week)
+                        if not active_projects:
+                            active_projects = [project_plan] if project_plan else []
+                        # Prefer assigned projects when multiple are active
+                        if active_projects:
+                            try:
+                                assigned_ids = self._projects().assigned_project_ids(person.id, current_week)
+                                if assigned_ids:
+                                    assigned_first = [p for p in active_projects if p.get("id") in assigned_ids]
+                                    unassigned_rest = [p for p in active_projects if p.get("id") not in assigned_ids]
+                                    active_projects = assigned_first + unassigned_rest
+                            except Exception:
+                                pass
+
+                        # Skip planning if person has no active projects (idle until assigned)
+                        if not active_projects:
+                            logger.info(
+                                "Skipping planning for %s at tick %s (no active project assignments for week %s)",
+                                person.name,
+                                status.current_tick,
+                                current_week,
+                            )
+                            continue
 
-                    # Get ALL active projects for this person at current week (concurrent multi-project support)
-                    active_projects = self._get_all_active_projects_for_person(person.id, current_week)
-                    if not active_projects:
-                        active_projects = [project_plan] if project_plan else []
-                    # Prefer assigned projects when multiple are active
-                    if active_projects:
-                        try:
-                            with get_connection() as conn:
-                                rows = conn.execute(
-                                    """
-                                    SELECT pp.id FROM project_plans pp
-                                    INNER JOIN project_assignments pa ON pp.id = pa.project_id
-                                    WHERE pa.person_id = ? AND pp.start_week <= ? AND (pp.start_week + pp.duration_weeks - 1) >= ?
-                                    ORDER BY pp.start_week ASC
-                                    """,
-                                    (person.id, current_week, current_week),
-                                ).fetchall()
-                            assigned_ids = [r["id"] for r in rows]
-                            if assigned_ids:
-                                assigned_first = [p for p in active_projects if p.get("id") in assigned_ids]
-                                unassigned_rest = [p for p in active_projects if p.get("id") not in assigned_ids]
-                                active_projects = assigned_first + unassigned_rest
-                        except Exception:
-                            pass
+                        # Use first (assigned-first) project for daily plan primary reference, but pass all projects for multi-project support
+                        primary_project = active_projects[0]
 
-                    # Skip planning if person has no active projects (idle until assigned)
-                    if not active_projects:
-                        logger.info(
-                            "Skipping planning for %s at tick %s (no active project assignments for week %s)",
-                            person.name,
+                        daily_plan_text = self._ensure_daily_plan(person, day_index, primary_project, active_projects if len(active_projects) > 1 else None)
+
+                        # Collect planning task for parallel execution
+                        planning_task = (
+                            person,
+                            primary_project,
+                            daily_plan_text,
                             status.current_tick,
-                            current_week,
+                            reason,
+                            adjustments or None,
+                            active_projects if len(active_projects) > 1 else None,
                         )
-                        continue
-
-                    # Use first (assigned-first) project for daily plan primary reference, but pass all projects for multi-project support
-                    primary_project = active_projects[0]
-
-                    daily_plan_text = self._ensure_daily_plan(person, day_index, primary_project, active_projects if len(active_projects) > 1 else None)
-
-                    # Collect planning task for parallel execution
-                    planning_task = (
-                        person,
-                        primary_project,
-                        daily_plan_text,
-                        status.current_tick,
-                        reason,
-                        adjustments or None,
-                        active_projects if len(active_projects) > 1 else None,
-                    )
-                    planning_tasks.append(planning_task)
-
-                    # Store context needed for post-processing
-                    person_contexts[person.id] = {
-                        'incoming': incoming,
-                        'adjustments': adjustments,
-                        'override': override,
-                        'primary_project': primary_project,
-                        'daily_plan_text': daily_plan_text,
-                        'active_projects': active_projects,
-                    }
+                        planning_tasks.append(planning_task)
+
+                        # Store context needed for post-processing
+                        person_contexts[person.id] = {
+                            'incoming': incoming,
+                            'adjustments': adjustments,
+                            'override': override,
+                            'primary_project': primary_project,
+                            'daily_plan_text': daily_plan_text,
+                            'active_projects': active_projects,
+                        }
 
-                # PHASE 2: Execute planning in parallel (or sequential if disabled)
-                if planning_tasks:
-                    plan_results = self._generate_hourly_plans_parallel(planning_tasks)
-                else:
-                    plan_results = []
+                    # PHASE 2: Execute planning in parallel (or sequential if disabled)
+                    if planning_tasks:
+                        plan_results = self._generate_hourly_plans_parallel(planning_tasks)
+                    else:
+                        plan_results = []
 
-                # PHASE 3: Process results and send communications
-                inbox_reply_requests = []  # Collect inbox reply requests for batch processing
+                    # PHASE 3: Process results and send communications
+                    inbox_reply_requests = []  # Collect inbox reply requests for batch processing
 
-                for person, hourly_result in plan_results:
-                    context = person_contexts[person.id]
-                    override = context['override']
-                    daily_plan_text = context['daily_plan_text']
-                    primary_project = context['primary_project']
-                    # person_project is the dict with project details
-                    person_project = primary_project if isinstance(primary_project, dict) else {'project_name': 'Unknown Project'}
+                    for person, hourly_result in plan_results:
+                        context = person_contexts[person.id]
+                        override = context['override']
+                        daily_plan_text = context['daily_plan_text']
+                        primary_project = context['primary_project']
+                        # person_project is the dict with project details
+                        person_project = primary_project if isinstance(primary_project, dict) else {'project_name': 'Unknown Project'}
 
-                    daily_summary = self._summarise_plan(daily_plan_text, max_lines=3)
-                    hourly_summary = self._summarise_plan(hourly_result.content)
+                        daily_summary = self._summarise_plan(daily_plan_text, max_lines=3)
+                        hourly_summary = self._summarise_plan(hourly_result.content)
 
-                    # Store the hourly plan
-                    self._store_worker_plan(
-                        person_id=person.id,
-                        tick=status.current_tick,
-                        plan_type="hourly",
-                        result=hourly_result,
-                        context=None,
-                    )
-
-                    # Task 6: Block ALL communication generation for away/offline personas
-                    # Check status early before scheduling or dispatching any communications
-                    offline_statuses = {"SickLeave", "Offline", "Absent", "Vacation", "Leave", "Away", "휴가", "병가", "자리비움"}
-                    if override and (override[0] in offline_statuses):
-                        logger.debug(
-                            f"[STATUS_BLOCK] Blocking all communications for {person.name} due to status: {override[0]} "
-                            f"(tick={status.current_tick})"
+                        # Store the hourly plan
+                        self._store_worker_plan(
+                            person_id=person.id,
+                            tick=status.current_tick,
+                            plan_type="hourly",
+                            result=hourly_result,
+                            context=None,
                         )
-                        continue
 
-                    # Schedule any explicitly timed comms from the hourly plan
-                    try:
-                        self._schedule_from_hourly_plan(person, hourly_result.content, status.current_tick)
-                    except Exception:
-                        pass
+                        # Task 6: Block ALL communication generation for away/offline personas
+                        # Check status early before scheduling or dispatching any communications
+                        offline_statuses = {"SickLeave", "Offline", "Absent", "Vacation", "Leave", "Away", "휴가", "병가", "자리비움"}
+                        if override and (override[0] in offline_statuses):
+                            logger.debug(
+                                f"[STATUS_BLOCK] Blocking all communications for {person.name} due to status: {override[0]} "
+                                f"(tick={status.current_tick})"
+                            )
+                            continue
 
-                    # Dispatch scheduled communications from hourly plans
-                    se, sc = self._dispatch_scheduled(person, status.current_tick, people_by_id)
-                    emails_sent += se
-                    chats_sent += sc
+                        # Schedule any explicitly timed comms from the hourly plan
+                        try:
+                            self._schedule_from_hourly_plan(person, hourly_result.content, status.current_tick)
+                        except Exception:
+                            pass
 
-                    # BATCH OPTIMIZATION: Collect inbox reply requests instead of processing one-by-one
-                    # Check if this persona should generate an inbox reply
-                    # Note: We collect requests here and process them in batch in PHASE 4
-                    inbox_reply_request = self._prepare_inbox_reply_request(
-                        person=person,
-                        current_tick=status.current_tick,
-                        people_by_id=people_by_id,
-                        day_index=day_index,
-                        person_project=person_project,
-                        hourly_summary=hourly_summary,
-                        daily_summary=daily_summary,
-                        current_week=current_week
-                    )
-                    if inbox_reply_request:
-                        inbox_reply_requests.append(inbox_reply_request)
-
-                    # Automatic fallback generation removed as part of email volume reduction (Task 1)
-                    # Personas now only communicate when:
-                    # 1. They have explicit JSON communications in their hourly plans
-                    # 2. They are responding to inbox messages (inbox-driven replies - Task 4 IMPLEMENTED with BATCH PROCESSING)
-                    # 3. Event-driven notifications (sick leave, etc.) are triggered by the event injection system
-
-                # PHASE 4: Process inbox reply requests in batch for performance optimization
-                # This phase processes all collected inbox reply requests concurrently using async batch processing
-                # Performance: 4-5x faster than sequential processing for multiple personas
-                if inbox_reply_requests:
-                    batch_emails, batch_chats = self._process_inbox_reply_batch(
-                        inbox_reply_requests=inbox_reply_requests,
-                        current_tick=status.current_tick,
-                        people_by_id=people_by_id
-                    )
-                    emails_sent += batch_emails
-                    chats_sent += batch_chats
+                        # Dispatch scheduled communications from hourly plans
+                        se, sc = self._dispatch_scheduled(person, status.current_tick, people_by_id)
+                        emails_sent += se
+                        chats_sent += sc
+
+                        # BATCH OPTIMIZATION: Collect inbox reply requests instead of processing one-by-one
+                        # Check if this persona should generate an inbox reply
+                        # Note: We collect requests here and process them in batch in PHASE 4
+                        inbox_reply_request = self._prepare_inbox_reply_request(
+                            person=person,
+                            current_tick=status.current_tick,
+                            people_by_id=people_by_id,
+                            day_index=day_index,
+                            person_project=person_project,
+                            hourly_summary=hourly_summary,
+                            daily_summary=daily_summary,
+                            current_week=current_week
+                        )
+                        if inbox_reply_request:
+                            inbox_reply_requests.append(inbox_reply_request)
+
+                        # Automatic fallback generation removed as part of email volume reduction (Task 1)
+                        # Personas now only communicate when:
+                        # 1. They have explicit JSON communications in their hourly plans
+                        # 2. They are responding to inbox messages (inbox-driven replies - Task 4 IMPLEMENTED with BATCH PROCESSING)
+                        # 3. Event-driven notifications (sick leave, etc.) are triggered by the event injection system
+
+                    # PHASE 4: Process inbox reply requests in batch for performance optimization
+                    # This phase processes all collected inbox reply requests concurrently using async batch processing
+                    # Performance: 4-5x faster than sequential processing for multiple personas
+                    if inbox_reply_requests:
+                        batch_emails, batch_chats = self._process_inbox_reply_batch(
+                            inbox_reply_requests=inbox_reply_requests,
+                            current_tick=status.current_tick,
+                            people_by_id=people_by_id
+                        )
+                        emails_sent += batch_emails
+                        chats_sent += batch_chats
 
                 # Generate hourly summaries at the end of each hour (every 60 ticks)
-                # PERFORMANCE: Parallelized to avoid blocking - runs 5x faster with ThreadPoolExecutor
+                # PERFORMANCE: Queued for the report worker, or run in parallel on the shared summaries pool
                 if status.current_tick % 60 == 0:
                     completed_hour = (status.current_tick // 60) - 1
-                    # Use ThreadPoolExecutor to generate summaries in parallel instead of sequentially
-                    with ThreadPoolExecutor(max_workers=min(4, len(people))) as executor:
+                    summary_people = self._hourly_summary_people(people, completed_hour)
+                    if self._background_reports:
+                        self._enqueue_report_jobs(HOURLY_SUMMARY, summary_people, completed_hour, status.current_tick)
+                    else:
+                        # Generate summaries in parallel on the shared summaries pool
+                        executor = self._executors.pool("summaries")
                         futures = {
                             executor.submit(self._generate_hourly_summary, person, completed_hour): person
-                            for person in people
+                            for person in summary_people
                         }
                         for future in as_completed(futures):
                             person = futures[future]
@@ -4474,8 +4813,19 @@ class SimulationEngine:
                 # Generate daily reports at the end of each day (hours_per_day * 60 minutes)
                 if status.current_tick % day_ticks == 0:
                     completed_day = (status.current_tick // day_ticks) - 1
-                    for person in people:
-                        self._generate_daily_report(person, completed_day, project_plan)
+                    if self._background_reports:
+                        self._enqueue_report_jobs(DAILY_REPORT, people, completed_day, status.current_tick)
+                    else:
+                        executor = self._executors.pool("reports")
+                        futures = [
+                            executor.submit(self._generate_daily_report, person, completed_day, project_plan)
+                            for person in people
+                        ]
+                        # Wait for every report, then surface the first failure as before
+                        for future in futures:
+                            future.exception()
+                        for future in futures:
+                            future.result()
 
             return SimulationAdvanceResult(
                 ticks_advanced=ticks,
@@ -4521,6 +4871,8 @@ class SimulationEngine:
             runtime = _WorkerRuntime(person=person)
             self._worker_runtime[person.id] = runtime
             self._load_runtime_messages(runtime)
+            if runtime.inbox:
+                self._wake(person.id)
         else:
             runtime.person = person
         return runtime
@@ -4539,9 +4891,66 @@ class SimulationEngine:
             rows = conn.execute("SELECT worker_id, status, until_tick FROM worker_status_overrides").fetchall()
         self._status_overrides = {row["worker_id"]: (row["status"], row["until_tick"]) for row in rows}
 
+    @contextmanager
+    def _tick_unit_of_work(self, tick: int) -> Iterator[None]:
+        """Buffer engine-owned writes for one tick and commit them together.
+
+        Enabled with ``VDOS_TICK_UNIT_OF_WORK``. If the tick raises, the buffered
+        writes are discarded so the database still reflects the previous tick,
+        and the in-memory state they mirror (status overrides, runtime inboxes)
+        is restored to match. Sends queued during the tick are dropped rather
+        than posted; they are only posted once the tick has committed.
+        """
+        if not self._tick_unit_of_work_enabled:
+            yield
+            return
+        status_overrides = dict(self._status_overrides)
+        inboxes = {person_id: list(runtime.inbox) for person_id, runtime in self._worker_runtime.items()}
+        queue_marks = [
+            (gateway, gateway.queue_mark())
+            for gateway in self._batching_gateways()
+            if callable(getattr(gateway, "queue_mark", None))
+        ]
+        buffer = _TickWriteBuffer()
+        self._tick_buffer = buffer
+        try:
+            yield
+        except BaseException:
+            self._tick_buffer = None
+            logger.warning(f"[TICK_UOW] Tick {tick} failed; discarding {len(buffer)} buffered writes")
+            self._status_overrides = status_overrides
+            for person_id, runtime in self._worker_runtime.items():
+                if person_id in inboxes:
+                    runtime.inbox = inboxes[person_id]
+                else:
+                    self._load_runtime_messages(runtime)
+            for gateway, mark in queue_marks:
+                gateway.discard_queued(mark)
+            raise
+        self._tick_buffer = None
+        flushed = buffer.flush()
+        logger.debug(f"[TICK_UOW] Tick {tick} committed {flushed} writes")
+
+    def _current_tick_buffer(self) -> _TickWriteBuffer | None:
+        """The open tick's write buffer, or None on report-worker threads (they commit directly)."""
+        if getattr(self._report_thread_state, "active", False):
+            return None
+        return self._tick_buffer
+
+    def _execute_write(self, sql: str, params: tuple, message: _InboundMessage | None = None) -> None:
+        buffer = self._current_tick_buffer()
+        if buffer is not None:
+            buffer.add(sql, params, message)
+            return
+        with get_connection() as conn:
+            cursor = conn.execute(sql, params)
+            if message is not None:
+                message.message_id = cursor.lastrowid
+
     def _queue_runtime_message(self, recipient: PersonRead, message: _InboundMessage) -> None:
         runtime = self._get_worker_runtime(recipient)
         runtime.queue(message)
+        self._wake(recipient.id)
         self._persist_runtime_message(recipient.id, message)
 
     def _persist_runtime_message(self, recipient_id: int, message: _InboundMessage) -> None:
@@ -4555,16 +4964,19 @@ class SimulationEngine:
             "channel": message.channel,
             "tick": message.tick,
         }
-        with get_connection() as conn:
-            cursor = conn.execute(
-                "INSERT INTO worker_runtime_messages(recipient_id, payload) VALUES (?, ?)",
-                (recipient_id, json.dumps(payload)),
-            )
-            message.message_id = cursor.lastrowid
+        self._execute_write(
+            "INSERT INTO worker_runtime_messages(recipient_id, payload) VALUES (?, ?)",
+            (recipient_id, json.dumps(payload)),
+            message,
+        )
 
     def _remove_runtime_messages(self, message_ids: Sequence[int]) -> None:
         if not message_ids:
             return
+        if self._tick_buffer is not None:
+            for message_id in message_ids:
+                self._tick_buffer.add("DELETE FROM worker_runtime_messages WHERE id = ?", (message_id,))
+            return
         with get_connection() as conn:
             conn.executemany("DELETE FROM worker_runtime_messages WHERE id = ?", [(message_id,) for message_id in message_ids])
 
@@ -4591,37 +5003,115 @@ class SimulationEngine:
                 )
             )
 
+    def _index_tick_message(self, tick: int, channel: str, result: Any) -> None:
+        """Record which tick a stored email/chat message belongs to, for replay lookups."""
+        message_id = result.get('id') if isinstance(result, dict) else None
+        if not isinstance(message_id, int):
+            return
+        self._execute_write(
+            "INSERT OR IGNORE INTO tick_messages(tick, channel, message_id) VALUES (?, ?, ?)",
+            (tick, channel, message_id),
+        )
+
     def _log_exchange(self, tick: int, sender_id: int | None, recipient_id: int | None, channel: str, subject: str | None, summary: str | None) -> None:
-        with get_connection() as conn:
-            conn.execute(
-                "INSERT INTO worker_exchange_log(tick, sender_id, recipient_id, channel, subject, summary) VALUES (?, ?, ?, ?, ?, ?)",
-                (tick, sender_id, recipient_id, channel, subject, summary),
-            )
+        self._execute_write(
+            "INSERT INTO worker_exchange_log(tick, sender_id, recipient_id, channel, subject, summary) VALUES (?, ?, ?, ?, ?, ?)",
+            (tick, sender_id, recipient_id, channel, subject, summary),
+        )
 
     def _set_status_override(self, worker_id: int, status: str, until_tick: int, reason: str) -> None:
         self._status_overrides[worker_id] = (status, until_tick)
-        with get_connection() as conn:
-            conn.execute(
-                ("INSERT INTO worker_status_overrides(worker_id, status, until_tick, reason) VALUES (?, ?, ?, ?)"
-                 " ON CONFLICT(worker_id) DO UPDATE SET status = excluded.status, until_tick = excluded.until_tick, reason = excluded.reason"),
-                (worker_id, status, until_tick, reason),
-            )
+        self._execute_write(
+            ("INSERT INTO worker_status_overrides(worker_id, status, until_tick, reason) VALUES (?, ?, ?, ?)"
+             " ON CONFLICT(worker_id) DO UPDATE SET status = excluded.status, until_tick = excluded.until_tick, reason = excluded.reason"),
+            (worker_id, status, until_tick, reason),
+        )
 
     def _refresh_status_overrides(self, current_tick: int) -> None:
         expired = [worker_id for worker_id, (_, until_tick) in self._status_overrides.items() if until_tick <= current_tick]
         if not expired:
             return
-        with get_connection() as conn:
-            conn.executemany(
-                "DELETE FROM worker_status_overrides WHERE worker_id = ?",
-                [(worker_id,) for worker_id in expired],
-            )
+        if self._tick_buffer is not None:
+            for worker_id in expired:
+                self._tick_buffer.add("DELETE FROM worker_status_overrides WHERE worker_id = ?", (worker_id,))
+        else:
+            with get_connection() as conn:
+                conn.executemany(
+                    "DELETE FROM worker_status_overrides WHERE worker_id = ?",
+                    [(worker_id,) for worker_id in expired],
+                )
         for worker_id in expired:
             self._status_overrides.pop(worker_id, None)
 
+    def _wake(self, person_id: int, tick: int | None = None) -> None:
+        """Have an event-driven auto-tick visit ``person_id`` at ``tick`` (None: as soon as possible)."""
+        if not self._event_driven_ticks:
+            return
+        if tick is None:
+            tick_round = self._tick_round
+            if tick_round is not None and tick_round.wake(person_id):
+                return
+            tick = 0
+        self._wakeups.schedule(person_id, tick)
+
+    def _next_work_start_tick(self, person: PersonRead, tick: int) -> int:
+        """First tick after ``tick`` at which ``person``'s work window opens (weekends not excluded)."""
+        day_ticks = max(1, self.hours_per_day * 60)
+        start_tick = self._work_hours_ticks.get(person.id, (0, day_ticks))[0]
+        candidate = ((tick - 1) // day_ticks) * day_ticks + start_tick + 1
+        if candidate <= tick:
+            candidate += day_ticks
+        return candidate
+
+    def _iter_tick_round(
+        self,
+        people: Sequence[PersonRead],
+        positions: dict[int, int],
+        tick: int,
+        reason: str,
+        event_adjustments: dict[int, list[str]],
+    ) -> Iterator[PersonRead]:
+        """Yield the personas to visit at ``tick``, in roster order.
+
+        Auto-ticks visit only personas with a due wake-up, a new event
+        adjustment or a work window opening this minute; other advances (and
+        auto-ticks with ``VDOS_EVENT_DRIVEN_TICKS`` off) visit everyone.
+        Personas sent a message while the round runs are visited in the same
+        tick when they come later in the roster.
+        """
+        due = self._wakeups.pop_due(tick)
+        if self._event_driven_ticks and reason == 'auto' and self.hours_per_day > 0:
+            due.update(event_adjustments)
+            due.update(self._work_start_ids.get((tick - 1) % (self.hours_per_day * 60), ()))
+        else:
+            due = positions.keys()
+        self._tick_round = TickRound(people, positions, due)
+        try:
+            yield from self._tick_round
+        finally:
+            self._tick_round = None
+
+    def _hourly_summary_people(self, people: Sequence[PersonRead], hour_index: int) -> list[PersonRead]:
+        """People who may have hourly plans to summarise for ``hour_index``.
+
+        Summaries are skipped for people without plans in the hour anyway, so
+        only those who stored one are returned, unless the hour started
+        before this engine began tracking plans.
+        """
+        planners = self._hourly_planners.pop(hour_index, set())
+        for stale in [h for h in self._hourly_planners if h < hour_index]:
+            self._hourly_planners.pop(stale, None)
+        tracked = self._hourly_tracking_from is not None and hour_index * 60 + 1 >= self._hourly_tracking_from
+        if not self._event_driven_ticks or not tracked:
+            return list(people)
+        return [person for person in people if person.id in planners]
+
     def _reset_runtime_state(self) -> None:
         self._worker_runtime.clear()
         self._status_overrides.clear()
+        self._hourly_planners.clear()
+        self._wakeups.clear()
+        self._hourly_tracking_from = None
         self._active_person_ids = None
         with get_connection() as conn:
             conn.execute("DELETE FROM worker_runtime_messages")
@@ -4721,11 +5211,16 @@ class SimulationEngine:
         # Stop auto-ticks BEFORE acquiring lock to avoid deadlock
         self.stop_auto_ticks()
         with self._advance_lock:
+            # Drop pending summary/report jobs and let running ones finish before wiping their tables
+            self._report_worker.clear()
             with get_connection() as conn:
-                for table in ("project_plans", "worker_plans", "worker_exchange_log", "worker_runtime_messages", "daily_reports", "simulation_reports", "events", "tick_log"):
+                for table in ("project_plans", "worker_plans", "worker_exchange_log", "worker_runtime_messages", "daily_reports", "simulation_reports", "events", "tick_log", "tick_messages"):
                     conn.execute(f"DELETE FROM {table}")
                 conn.execute("DELETE FROM worker_status_overrides")
                 conn.execute("UPDATE simulation_state SET current_tick = 0, is_running = 0, auto_tick = 0 WHERE id = 1")
+            # Personas may have been removed underneath us (e.g. the admin hard reset drops the DB file)
+            self.invalidate_people_cache()
+            self.invalidate_project_index()
             self._project_plan_cache = None
             self._planner_model_hint = None
             self._planner_metrics.clear()
@@ -4779,6 +5274,8 @@ class SimulationEngine:
                 conn.execute("DELETE FROM hourly_summaries")
 
             # Reset runtime caches after purge
+            self.invalidate_people_cache()
+            self.invalidate_project_index()
             self._reset_runtime_state()
             self._update_work_windows([])
             status = self._fetch_state()
@@ -4871,14 +5368,24 @@ class SimulationEngine:
                     body = f"{target.name} reported sick leave at tick {tick}. Please redistribute their urgent work."
                     # Use simulated timestamp for consistency with other communications
                     dt = self._sim_datetime_for_tick(tick)
-                    self.email_gateway.send_email(
+                    self._send_or_queue(
+                        self.email_gateway,
+                        'email',
+                        partial(
+                            self._track_sent_message,
+                            tick,
+                            'email',
+                            sender_id=None,
+                            recipient_id=head.id,
+                            subject=subject,
+                            summary=body,
+                        ),
                         sender=self.sim_manager_email,
                         to=[head.email_address],
                         subject=subject,
                         body=body,
                         sent_at_iso=(dt.isoformat() if dt else None),
                     )
-                    self._log_exchange(tick, None, head.id, 'email', subject, body)
                     head_message = _InboundMessage(
                         sender_id=0,
                         sender_name='Simulation Manager',
@@ -5075,6 +5582,10 @@ class SimulationEngine:
         logger.info(f"[REPLAY] Current tick set to {tick}")
 
     def _update_tick(self, tick: int, reason: str) -> None:
+        if self._tick_buffer is not None:
+            self._tick_buffer.add("UPDATE simulation_state SET current_tick = ? WHERE id = 1", (tick,))
+            self._tick_buffer.add("INSERT INTO tick_log(tick, reason) VALUES (?, ?)", (tick, reason))
+            return
         with get_connection() as conn:
             conn.execute(
                 "UPDATE simulation_state SET current_tick = ? WHERE id = 1",
@@ -5085,9 +5596,10 @@ class SimulationEngine:
                 (tick, reason),
             )
 
-    def _row_to_person(self, row) -> PersonRead:
+    def _row_to_person(self, row, schedule: List[dict] | None = None) -> PersonRead:
         person_id = row["id"]
-        schedule = self._fetch_schedule(person_id)
+        if schedule is None:
+            schedule = self._fetch_schedule(person_id)
         # Check if team_name column exists (for backward compatibility)
         try:
             team_name = row["team_name"]
@@ -5155,6 +5667,8 @@ class SimulationEngine:
 
     def close(self) -> None:
         self.stop_auto_ticks()
+        self._report_worker.stop()
+        self._executors.shutdown()
         close_email = getattr(self.email_gateway, "close", None)
         if callable(close_email):
             close_email()
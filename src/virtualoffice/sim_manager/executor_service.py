@@ -0,0 +1,260 @@
+"""
+Executor Service with named, adaptively sized thread pools
+
+The engine fans blocking LLM work out to threads in several places: hourly
+planning, initial planning, hourly summaries, daily reports and inbox
+replies. Instead of each site creating (and tearing down) its own
+``ThreadPoolExecutor`` with a hard-coded worker cap, ``ExecutorService`` owns
+one long-lived pool per kind of work and shuts them all down with the engine.
+
+Each ``AdaptivePool`` runs at most ``limit`` tasks at once and moves that
+limit between ``min_workers`` and ``max_workers`` based on what it observes
+every ``window`` completed tasks:
+
+- new HTTP 429s reported by the LLM scheduler halve the limit,
+- a median task latency above twice the baseline lowers it by one,
+- a backlog with healthy latency raises it by one.
+
+Pools are plain ``concurrent.futures.Executor`` objects, so they work with
+``as_completed`` and ``loop.run_in_executor``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+def llm_rate_limited_total() -> int:
+    """Total 429 responses the shared LLM scheduler has seen, across providers/models."""
+    try:
+        from virtualoffice.utils.llm_client import scheduler_stats
+
+        limits = scheduler_stats().get("limits", {})
+    except Exception:
+        return 0
+    return sum(int(entry.get("rate_limited", 0)) for entry in limits.values())
+
+
+def default_max_workers() -> int:
+    """Per-pool ceiling: ``VDOS_EXECUTOR_MAX_WORKERS``, else ``min(32, cpu_count + 4)``."""
+    try:
+        return max(1, int(os.getenv("VDOS_EXECUTOR_MAX_WORKERS", "")))
+    except ValueError:
+        return min(32, (os.cpu_count() or 1) + 4)
+
+
+class AdaptivePool(Executor):
+    """Thread pool whose concurrency limit adapts to latency and rate limiting.
+
+    Args:
+        name: Pool name, used for thread names and metrics
+        initial_workers: Starting concurrency limit
+        min_workers: Lowest limit adaptation may choose
+        max_workers: Highest limit (and number of threads)
+        adaptive: Whether to adjust the limit at all
+        window: Completed tasks between adjustments
+        rate_limit_probe: Returns a cumulative count of rate-limit responses
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        initial_workers: int,
+        min_workers: int = 1,
+        max_workers: int,
+        adaptive: bool = True,
+        window: int = 20,
+        rate_limit_probe: Callable[[], int] | None = None,
+    ):
+        self.name = name
+        self.max_workers = max(1, max_workers, initial_workers)
+        self.min_workers = max(1, min(min_workers, self.max_workers))
+        self.adaptive = adaptive
+        self.window = max(1, window)
+        self._probe = rate_limit_probe or (lambda: 0)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"vdos-{name}")
+        self._cond = threading.Condition()
+        self._limit = max(self.min_workers, min(initial_workers, self.max_workers))
+        self._active = 0
+        self._queued = 0
+        self._completed = 0
+        self._failed = 0
+        self._busy_seconds = 0.0
+        self._started_at = time.monotonic()
+        self._latencies: deque[float] = deque(maxlen=self.window)
+        self._since_adjust = 0
+        self._baseline: float | None = None
+        self._last_rate_limited = self._safe_probe()
+        self._adjustments = 0
+        self._last_adjustment: str | None = None
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        with self._cond:
+            self._queued += 1
+        try:
+            return self._executor.submit(self._run, fn, args, kwargs)
+        except BaseException:
+            with self._cond:
+                self._queued -= 1
+            raise
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def _run(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        with self._cond:
+            self._cond.wait_for(lambda: self._active < self._limit)
+            self._queued -= 1
+            self._active += 1
+        started = time.monotonic()
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            elapsed = time.monotonic() - started
+            with self._cond:
+                self._active -= 1
+                self._busy_seconds += elapsed
+                if ok:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+                self._latencies.append(elapsed)
+                self._since_adjust += 1
+                if self.adaptive and self._since_adjust >= self.window:
+                    self._adjust()
+                self._cond.notify_all()
+
+    def _safe_probe(self) -> int:
+        try:
+            return int(self._probe())
+        except Exception:
+            return 0
+
+    def _adjust(self) -> None:
+        # Called with self._cond held
+        self._since_adjust = 0
+        rate_limited = self._safe_probe()
+        new_429s = rate_limited - self._last_rate_limited
+        self._last_rate_limited = rate_limited
+        median = statistics.median(self._latencies)
+        # Baseline follows the best window seen, drifting up slowly so it can track a slower model
+        self._baseline = median if self._baseline is None else min(median, self._baseline * 1.05)
+
+        limit = self._limit
+        if new_429s > 0:
+            limit, reason = max(self.min_workers, limit // 2), f"{new_429s} rate-limited responses"
+        elif median > 2 * self._baseline:
+            limit, reason = max(self.min_workers, limit - 1), f"latency {median:.2f}s vs baseline {self._baseline:.2f}s"
+        elif self._queued > 0 and median <= 1.5 * self._baseline:
+            limit, reason = min(self.max_workers, limit + 1), f"{self._queued} tasks waiting"
+        else:
+            return
+        if limit != self._limit:
+            logger.info(f"[EXECUTOR] Pool '{self.name}' concurrency {self._limit} -> {limit} ({reason})")
+            self._limit = limit
+            self._adjustments += 1
+            self._last_adjustment = reason
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            elapsed = max(1e-9, time.monotonic() - self._started_at)
+            latencies = list(self._latencies)
+            return {
+                "limit": self._limit,
+                "min_workers": self.min_workers,
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "queue_depth": self._queued,
+                "completed": self._completed,
+                "failed": self._failed,
+                # Share of the current limit in use right now, and average busy threads over the pool's life
+                "utilization": round(self._active / self._limit, 3),
+                "avg_busy_workers": round(self._busy_seconds / elapsed, 3),
+                "median_latency_ms": round(statistics.median(latencies) * 1000, 1) if latencies else None,
+                "baseline_latency_ms": round(self._baseline * 1000, 1) if self._baseline is not None else None,
+                "adaptive": self.adaptive,
+                "adjustments": self._adjustments,
+                "last_adjustment": self._last_adjustment,
+            }
+
+
+class ExecutorService:
+    """Named ``AdaptivePool``s shared by the whole engine.
+
+    Args:
+        initial_workers: Pool name -> starting concurrency limit; pools not
+            listed here start at ``default_workers`` when first requested
+        max_workers: Ceiling for every pool (default: ``default_max_workers()``)
+        adaptive: Adapt pool limits (default: ``VDOS_EXECUTOR_ADAPTIVE``, on)
+        default_workers: Starting limit for pools not in ``initial_workers``
+        rate_limit_probe: Cumulative rate-limit counter (default: the LLM scheduler's 429s)
+    """
+
+    def __init__(
+        self,
+        initial_workers: dict[str, int] | None = None,
+        *,
+        max_workers: int | None = None,
+        adaptive: bool | None = None,
+        default_workers: int = 4,
+        rate_limit_probe: Callable[[], int] | None = llm_rate_limited_total,
+    ):
+        self.initial_workers = dict(initial_workers or {})
+        self.max_workers = default_max_workers() if max_workers is None else max(1, max_workers)
+        if adaptive is None:
+            adaptive = os.getenv("VDOS_EXECUTOR_ADAPTIVE", "true").strip().lower() in {"1", "true", "yes", "on"}
+        self.adaptive = adaptive
+        self.default_workers = default_workers
+        self.rate_limit_probe = rate_limit_probe
+        self._pools: dict[str, AdaptivePool] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def pool(self, name: str, initial_workers: int | None = None) -> AdaptivePool:
+        """The pool called ``name``, created on first use."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Executor service has been shut down")
+            pool = self._pools.get(name)
+            if pool is None:
+                if initial_workers is None:
+                    initial_workers = self.initial_workers.get(name, self.default_workers)
+                pool = AdaptivePool(
+                    name,
+                    initial_workers=initial_workers,
+                    max_workers=max(self.max_workers, initial_workers),
+                    adaptive=self.adaptive,
+                    rate_limit_probe=self.rate_limit_probe,
+                )
+                self._pools[name] = pool
+            return pool
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            pools = dict(self._pools)
+        return {name: pool.stats() for name, pool in sorted(pools.items())}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop every pool: queued tasks are cancelled, running ones finish (when ``wait``)."""
+        with self._lock:
+            self._closed = True
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.shutdown(wait=wait, cancel_futures=True)
@@ -2,7 +2,11 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import TYPE_CHECKING, Iterable, Optional
+import os
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
 
 import httpx
 
@@ -13,6 +17,146 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Called with {"id": <created id>} once a queued message has been stored.
+OnSent = Callable[[dict], None]
+
+
+def batch_sends_enabled() -> bool:
+    """Whether the engine should queue sends and flush them in batches (``VDOS_BATCH_SENDS``)."""
+    return os.getenv("VDOS_BATCH_SENDS", "1").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _run_style_filter(*coros):
+    """Run style-filter coroutines concurrently on the shared LLM event loop.
+
+    Gateways are called from synchronous engine code, so the filters are handed
+    to the long-lived background loop instead of spinning up a loop per send.
+    Returns the results in argument order.
+    """
+    from virtualoffice.utils.llm_client import run_sync
+
+    async def _gather():
+        return await asyncio.gather(*coros)
+
+    return run_sync(_gather())
+
+
+@dataclass
+class _QueuedSend:
+    """A payload waiting for ``flush()``.
+
+    Messages with a ``persona_id`` are styled by :func:`style_queued` before
+    they are posted: the fields named in ``style_fields`` are rewritten in
+    place and ``styled`` is set so they are never rewritten twice. Each
+    payload carries an ``idempotency_key``, so resending it after a timeout
+    (when the server may already have stored it) never stores a copy.
+    """
+
+    payload: dict
+    on_sent: OnSent | None
+    persona_id: int | None = None
+    message_type: str = "chat"
+    style_fields: tuple[str, ...] = ("body",)
+    styled: bool = False
+
+    def __post_init__(self) -> None:
+        self.payload.setdefault("idempotency_key", uuid.uuid4().hex)
+
+
+def _take_unstyled(pending: list[_QueuedSend]) -> list[_QueuedSend]:
+    # Caller holds the gateway's pending lock
+    entries = [entry for entry in pending if entry.persona_id and not entry.styled]
+    for entry in entries:
+        entry.styled = True
+    return entries
+
+
+def _post_queued(
+    pending: list[_QueuedSend],
+    send_batch: Callable[[list[dict]], list[int]],
+    send_one: Callable[[dict], dict],
+    label: str,
+) -> tuple[int, list[_QueuedSend]]:
+    """Post ``pending`` in one batch request, falling back to one request per message.
+
+    Batch endpoints are all-or-nothing, so a single bad payload would
+    otherwise cost the whole batch. Messages the server rejects (4xx) are
+    dropped with an error, as a direct send would fail; those that fail for
+    any other reason are returned so the caller can queue them again.
+    Returns ``(number sent, entries to retry)``.
+    """
+    if not pending:
+        return 0, []
+    try:
+        ids = send_batch([entry.payload for entry in pending])
+    except Exception as e:
+        logger.warning(f"Batch {label} send failed, sending {len(pending)} individually: {e}")
+    else:
+        for entry, message_id in zip(pending, ids):
+            if entry.on_sent is not None:
+                entry.on_sent({"id": message_id})
+        return len(ids), []
+
+    sent = 0
+    retry: list[_QueuedSend] = []
+    for entry in pending:
+        try:
+            result = send_one(dict(entry.payload))
+        except httpx.HTTPStatusError as e:
+            if 400 <= e.response.status_code < 500:
+                logger.error(f"Dropping queued {label} rejected by the server: {e}")
+            else:
+                retry.append(entry)
+            continue
+        except Exception as e:
+            logger.error(f"Failed to send queued {label}, keeping it queued: {e}")
+            retry.append(entry)
+            continue
+        if entry.on_sent is not None:
+            entry.on_sent(result)
+        sent += 1
+    return sent, retry
+
+
+def style_queued(*gateways: Any, tick: int | None = None) -> int:
+    """Style every message queued on ``gateways`` in one batched pass.
+
+    Messages from all gateways sharing a style filter go through a single
+    ``apply_filter_batch`` call, which sends one rewrite request per persona
+    and runs them concurrently. ``tick`` is recorded in the filter's per-tick
+    metrics. Returns the number of messages styled.
+    """
+    from .style_filter.models import StyleRequest
+
+    by_filter: dict[int, tuple[Any, list[_QueuedSend]]] = {}
+    for gateway in gateways:
+        style_filter = getattr(gateway, "style_filter", None)
+        if style_filter is None or not callable(getattr(type(gateway), "_take_unstyled", None)):
+            continue
+        entries = gateway._take_unstyled()
+        if entries and style_filter.is_enabled():
+            by_filter.setdefault(id(style_filter), (style_filter, []))[1].extend(entries)
+    if not by_filter:
+        return 0
+
+    batches = []
+    for style_filter, entries in by_filter.values():
+        targets = [(entry, field) for entry in entries for field in entry.style_fields]
+        requests = [StyleRequest(entry.persona_id, entry.payload[field], entry.message_type) for entry, field in targets]
+        batches.append((targets, style_filter.apply_filter_batch(requests, tick=tick)))
+    try:
+        all_results = _run_style_filter(*(coro for _, coro in batches))
+    except Exception as e:
+        logger.error(f"Style filter failed, using original messages: {e}", exc_info=True)
+        return 0
+
+    styled = 0
+    for (targets, _), results in zip(batches, all_results):
+        for (entry, field), result in zip(targets, results):
+            entry.payload[field] = result.styled_message
+        styled += len({id(entry) for entry, _ in targets})
+    return styled
+
 
 class EmailGateway:
     def ensure_mailbox(self, address: str, display_name: Optional[str] = None) -> None:
@@ -44,6 +188,9 @@ class HttpEmailGateway(EmailGateway):
         self._client = client or httpx.Client(base_url=self.base_url, timeout=10.0)
         # Style filter: enabled/disabled controlled by database config
         self.style_filter = style_filter
+        # Payloads queued by queue_email, styled and posted together by flush()
+        self._pending: list[_QueuedSend] = []
+        self._pending_lock = threading.Lock()
 
     @property
     def client(self) -> httpx.Client:
@@ -65,58 +212,121 @@ class HttpEmailGateway(EmailGateway):
         thread_id: str | None = None,
         sent_at_iso: str | None = None,
         persona_id: int | None = None,
+    ) -> dict:
+        payload = self._prepare_email(sender, to, subject, body, cc, bcc, thread_id, sent_at_iso, persona_id)
+        return self._post_email(payload)
+
+    def queue_email(
+        self,
+        sender: str,
+        to: Iterable[str],
+        subject: str,
+        body: str,
+        cc: Iterable[str] | None = None,
+        bcc: Iterable[str] | None = None,
+        thread_id: str | None = None,
+        sent_at_iso: str | None = None,
+        persona_id: int | None = None,
+        on_sent: OnSent | None = None,
+    ) -> None:
+        """Queue an email for the next :meth:`flush`.
+
+        Recipient validation happens now, so errors surface at the call site
+        exactly as with :meth:`send_email`. Styling is deferred to
+        :func:`style_queued` so the subject and body are rewritten together
+        with the persona's other queued messages. ``on_sent`` receives
+        ``{"id": ...}`` once the batch has been stored.
+        """
+        payload = self._prepare_email(sender, to, subject, body, cc, bcc, thread_id, sent_at_iso, None)
+        entry = _QueuedSend(
+            payload,
+            on_sent,
+            persona_id=persona_id if self.style_filter and persona_id else None,
+            message_type="email",
+            style_fields=("subject", "body"),
+        )
+        with self._pending_lock:
+            self._pending.append(entry)
+
+    def _take_unstyled(self) -> list[_QueuedSend]:
+        """Claim queued emails that still need styling (see :func:`style_queued`)."""
+        with self._pending_lock:
+            return _take_unstyled(self._pending)
+
+    def send_emails_batch(self, payloads: list[dict]) -> list[int]:
+        """Store prepared email payloads in one request; returns ids in order."""
+        if not payloads:
+            return []
+        response = self.client.post("/emails/send-batch", json={"messages": payloads})
+        response.raise_for_status()
+        return response.json()["ids"]
+
+    def flush(self, tick: int | None = None) -> int:
+        """Style and send every queued email in a single request. Returns the number sent.
+
+        If the batch request fails the emails are sent one by one; any that
+        still fail transiently stay queued for the next flush.
+        """
+        style_queued(self, tick=tick)
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        sent, retry = _post_queued(pending, self.send_emails_batch, self._post_email, "email")
+        if retry:
+            with self._pending_lock:
+                self._pending[:0] = retry
+        return sent
+
+    def queue_mark(self) -> int:
+        """Position in the send queue, for :meth:`discard_queued`."""
+        with self._pending_lock:
+            return len(self._pending)
+
+    def discard_queued(self, mark: int) -> int:
+        """Drop emails queued after ``mark`` (a rolled-back tick). Returns the number dropped."""
+        with self._pending_lock:
+            dropped = self._pending[mark:]
+            del self._pending[mark:]
+        return len(dropped)
+
+    def _post_email(self, payload: dict) -> dict:
+        response = self.client.post("/emails/send", json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def _prepare_email(
+        self,
+        sender: str,
+        to: Iterable[str],
+        subject: str,
+        body: str,
+        cc: Iterable[str] | None,
+        bcc: Iterable[str] | None,
+        thread_id: str | None,
+        sent_at_iso: str | None,
+        persona_id: int | None,
     ) -> dict:
         # Apply style filter if enabled and persona_id provided
         if self.style_filter and persona_id:
             try:
-                # Run async filter in sync context
-                # Handle case where we're in a thread without an event loop
-                try:
-                    loop = asyncio.get_event_loop()
-                except RuntimeError:
-                    # No event loop in this thread, create one
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                
-                if loop.is_running():
-                    # If we're already in an async context, we need to handle this differently
-                    # For now, log and skip filtering to avoid blocking
-                    logger.warning(
-                        "Style filter skipped: already in async context. "
-                        "Consider making gateway methods async."
-                    )
-                else:
-                    # Filter subject
-                    subject_filter_result = loop.run_until_complete(
-                        self.style_filter.apply_filter(
-                            message=subject,
-                            persona_id=persona_id,
-                            message_type="email",
-                        )
-                    )
-                    subject = subject_filter_result.styled_message
-
-                    # Filter body
-                    body_filter_result = loop.run_until_complete(
-                        self.style_filter.apply_filter(
-                            message=body,
-                            persona_id=persona_id,
-                            message_type="email",
-                        )
-                    )
-                    body = body_filter_result.styled_message
-
-                    logger.debug(
-                        f"Style filter applied to email: "
-                        f"subject_tokens={subject_filter_result.tokens_used}, "
-                        f"body_tokens={body_filter_result.tokens_used}, "
-                        f"subject_latency={subject_filter_result.latency_ms:.1f}ms, "
-                        f"body_latency={body_filter_result.latency_ms:.1f}ms"
+                # Subject and body are rewritten together in one request on the shared LLM loop
+                (filter_result,) = _run_style_filter(
+                    self.style_filter.apply_email_filter(
+                        subject=subject,
+                        body=body,
+                        persona_id=persona_id,
                     )
+                )
+                subject = filter_result.styled_subject
+                body = filter_result.styled_body
+
+                logger.debug(
+                    f"Style filter applied to email: success={filter_result.success}, "
+                    f"tokens={filter_result.tokens_used}, latency={filter_result.latency_ms:.1f}ms"
+                )
             except Exception as e:
                 logger.error(f"Style filter failed, using original message: {e}", exc_info=True)
                 # Continue with original subject and body on error
-        
+
         # Filter out empty/invalid email addresses using centralized validation
         cleaned_to = filter_valid_emails(to, normalize=False, strict=False)
         cleaned_cc = filter_valid_emails(cc or [], normalize=False, strict=False)
@@ -146,11 +356,13 @@ class HttpEmailGateway(EmailGateway):
         }
         if sent_at_iso:
             payload["sent_at_iso"] = sent_at_iso
-        response = self.client.post("/emails/send", json=payload)
-        response.raise_for_status()
-        return response.json()
+        return payload
 
     def close(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush queued emails on close: {e}")
         if self._external_client is None:
             self._client.close()
 
@@ -184,11 +396,36 @@ class HttpChatGateway(ChatGateway):
         self._client = client or httpx.Client(base_url=self.base_url, timeout=10.0)
         # Style filter: enabled/disabled controlled by database config
         self.style_filter = style_filter
+        # Payloads queued by queue_dm / queue_room_message, styled and posted together by flush()
+        self._pending_dms: list[_QueuedSend] = []
+        self._pending_room_messages: list[_QueuedSend] = []
+        self._pending_lock = threading.Lock()
 
     @property
     def client(self) -> httpx.Client:
         return self._client
 
+    def _style_chat(self, body: str, persona_id: int | None, label: str) -> str:
+        # Apply style filter if enabled and persona_id provided
+        if self.style_filter and persona_id:
+            try:
+                (filter_result,) = _run_style_filter(
+                    self.style_filter.apply_filter(
+                        message=body,
+                        persona_id=persona_id,
+                        message_type="chat",
+                    )
+                )
+                body = filter_result.styled_message
+                logger.debug(
+                    f"Style filter applied to {label}: success={filter_result.success}, "
+                    f"tokens={filter_result.tokens_used}, latency={filter_result.latency_ms:.1f}ms"
+                )
+            except Exception as e:
+                logger.error(f"Style filter failed, using original message: {e}", exc_info=True)
+                # Continue with original body on error
+        return body
+
     def ensure_user(self, handle: str, display_name: Optional[str] = None) -> None:
         payload = {"display_name": display_name} if display_name else None
         response = self.client.put(f"/users/{handle}", json=payload)
@@ -203,52 +440,59 @@ class HttpChatGateway(ChatGateway):
         sent_at_iso: str | None = None,
         persona_id: int | None = None,
     ) -> dict:
-        # Apply style filter if enabled and persona_id provided
-        if self.style_filter and persona_id:
-            try:
-                # Run async filter in sync context
-                # Handle case where we're in a thread without an event loop
-                try:
-                    loop = asyncio.get_event_loop()
-                except RuntimeError:
-                    # No event loop in this thread, create one
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                
-                if loop.is_running():
-                    # If we're already in an async context, we need to handle this differently
-                    # For now, log and skip filtering to avoid blocking
-                    logger.warning(
-                        "Style filter skipped: already in async context. "
-                        "Consider making gateway methods async."
-                    )
-                else:
-                    filter_result = loop.run_until_complete(
-                        self.style_filter.apply_filter(
-                            message=body,
-                            persona_id=persona_id,
-                            message_type="chat",
-                        )
-                    )
-                    body = filter_result.styled_message
-                    logger.debug(
-                        f"Style filter applied to DM: success={filter_result.success}, "
-                        f"tokens={filter_result.tokens_used}, latency={filter_result.latency_ms:.1f}ms"
-                    )
-            except Exception as e:
-                logger.error(f"Style filter failed, using original message: {e}", exc_info=True)
-                # Continue with original body on error
-        
+        payload = self._prepare_dm(sender, recipient, body, sent_at_iso, persona_id)
+        return self._post_dm(payload)
+
+    def _post_dm(self, payload: dict) -> dict:
+        response = self.client.post("/dms", json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def queue_dm(
+        self,
+        sender: str,
+        recipient: str,
+        body: str,
+        *,
+        sent_at_iso: str | None = None,
+        persona_id: int | None = None,
+        on_sent: OnSent | None = None,
+    ) -> None:
+        """Queue a DM for the next :meth:`flush`; ``on_sent`` receives ``{"id": ...}``.
+
+        Styling is deferred to :func:`style_queued`.
+        """
+        payload = self._prepare_dm(sender, recipient, body, sent_at_iso, None)
+        with self._pending_lock:
+            self._pending_dms.append(self._queued(payload, on_sent, persona_id))
+
+    def _queued(self, payload: dict, on_sent: OnSent | None, persona_id: int | None) -> _QueuedSend:
+        return _QueuedSend(payload, on_sent, persona_id=persona_id if self.style_filter and persona_id else None)
+
+    def _take_unstyled(self) -> list[_QueuedSend]:
+        """Claim queued DMs and room messages that still need styling (see :func:`style_queued`)."""
+        with self._pending_lock:
+            return _take_unstyled(self._pending_dms) + _take_unstyled(self._pending_room_messages)
+
+    def send_dms_batch(self, payloads: list[dict]) -> list[int]:
+        """Store prepared DM payloads in one request; returns ids in order."""
+        if not payloads:
+            return []
+        response = self.client.post("/dms/batch", json={"messages": payloads})
+        response.raise_for_status()
+        return response.json()["ids"]
+
+    def _prepare_dm(
+        self, sender: str, recipient: str, body: str, sent_at_iso: str | None, persona_id: int | None
+    ) -> dict:
         payload = {
             "sender": sender,
             "recipient": recipient,
-            "body": body,
+            "body": self._style_chat(body, persona_id, "DM"),
         }
         if sent_at_iso:
             payload["sent_at_iso"] = sent_at_iso
-        response = self.client.post("/dms", json=payload)
-        response.raise_for_status()
-        return response.json()
+        return payload
 
     def create_room(self, name: str, participants: list[str], slug: str | None = None) -> dict:
         """Create a group chat room with specified participants."""
@@ -272,51 +516,85 @@ class HttpChatGateway(ChatGateway):
         persona_id: int | None = None,
     ) -> dict:
         """Send a message to a group chat room."""
-        # Apply style filter if enabled and persona_id provided
-        if self.style_filter and persona_id:
-            try:
-                # Run async filter in sync context
-                # Handle case where we're in a thread without an event loop
-                try:
-                    loop = asyncio.get_event_loop()
-                except RuntimeError:
-                    # No event loop in this thread, create one
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                
-                if loop.is_running():
-                    # If we're already in an async context, we need to handle this differently
-                    # For now, log and skip filtering to avoid blocking
-                    logger.warning(
-                        "Style filter skipped: already in async context. "
-                        "Consider making gateway methods async."
-                    )
-                else:
-                    filter_result = loop.run_until_complete(
-                        self.style_filter.apply_filter(
-                            message=body,
-                            persona_id=persona_id,
-                            message_type="chat",
-                        )
-                    )
-                    body = filter_result.styled_message
-                    logger.debug(
-                        f"Style filter applied to room message: success={filter_result.success}, "
-                        f"tokens={filter_result.tokens_used}, latency={filter_result.latency_ms:.1f}ms"
-                    )
-            except Exception as e:
-                logger.error(f"Style filter failed, using original message: {e}", exc_info=True)
-                # Continue with original body on error
-        
+        payload = self._prepare_room_message(room_slug, sender, body, sent_at_iso, persona_id)
+        return self._post_room_message(payload)
+
+    def _post_room_message(self, payload: dict) -> dict:
+        response = self.client.post(f"/rooms/{payload.pop('room_slug')}/messages", json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def queue_room_message(
+        self,
+        room_slug: str,
+        sender: str,
+        body: str,
+        *,
+        sent_at_iso: str | None = None,
+        persona_id: int | None = None,
+        on_sent: OnSent | None = None,
+    ) -> None:
+        """Queue a room message for the next :meth:`flush`; ``on_sent`` receives ``{"id": ...}``.
+
+        Styling is deferred to :func:`style_queued`.
+        """
+        payload = self._prepare_room_message(room_slug, sender, body, sent_at_iso, None)
+        with self._pending_lock:
+            self._pending_room_messages.append(self._queued(payload, on_sent, persona_id))
+
+    def send_room_messages_batch(self, payloads: list[dict]) -> list[int]:
+        """Store prepared room-message payloads (with ``room_slug``) in one request; returns ids in order."""
+        if not payloads:
+            return []
+        response = self.client.post("/rooms/messages/batch", json={"messages": payloads})
+        response.raise_for_status()
+        return response.json()["ids"]
+
+    def flush(self, tick: int | None = None) -> int:
+        """Style and send queued DMs and room messages, one request per kind. Returns the number sent.
+
+        A failed batch request falls back to one request per message; messages
+        that still fail transiently stay queued for the next flush.
+        """
+        style_queued(self, tick=tick)
+        with self._pending_lock:
+            dms, self._pending_dms = self._pending_dms, []
+            room_messages, self._pending_room_messages = self._pending_room_messages, []
+        dms_sent, dm_retry = _post_queued(dms, self.send_dms_batch, self._post_dm, "DM")
+        rooms_sent, room_retry = _post_queued(
+            room_messages, self.send_room_messages_batch, self._post_room_message, "room message"
+        )
+        if dm_retry or room_retry:
+            with self._pending_lock:
+                self._pending_dms[:0] = dm_retry
+                self._pending_room_messages[:0] = room_retry
+        return dms_sent + rooms_sent
+
+    def queue_mark(self) -> tuple[int, int]:
+        """Position in the DM and room-message queues, for :meth:`discard_queued`."""
+        with self._pending_lock:
+            return len(self._pending_dms), len(self._pending_room_messages)
+
+    def discard_queued(self, mark: tuple[int, int]) -> int:
+        """Drop messages queued after ``mark`` (a rolled-back tick). Returns the number dropped."""
+        dm_mark, room_mark = mark
+        with self._pending_lock:
+            dropped = len(self._pending_dms[dm_mark:]) + len(self._pending_room_messages[room_mark:])
+            del self._pending_dms[dm_mark:]
+            del self._pending_room_messages[room_mark:]
+        return dropped
+
+    def _prepare_room_message(
+        self, room_slug: str, sender: str, body: str, sent_at_iso: str | None, persona_id: int | None
+    ) -> dict:
         payload = {
+            "room_slug": room_slug,
             "sender": sender,
-            "body": body,
+            "body": self._style_chat(body, persona_id, "room message"),
         }
         if sent_at_iso:
             payload["sent_at_iso"] = sent_at_iso
-        response = self.client.post(f"/rooms/{room_slug}/messages", json=payload)
-        response.raise_for_status()
-        return response.json()
+        return payload
 
     def get_room_info(self, room_slug: str) -> dict:
         """Get room information including participants."""
@@ -325,5 +603,9 @@ class HttpChatGateway(ChatGateway):
         return response.json()
 
     def close(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush queued chat messages on close: {e}")
         if self._external_client is None:
             self._client.close()
@@ -11,6 +11,22 @@ import os
 import re
 from typing import Any
 
+try:
+    from virtualoffice.utils.completion_util import generate_text
+    from virtualoffice.utils.llm_client import agenerate_text, run_sync
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    def generate_text(*args, **kwargs):  # type: ignore[misc]
+        raise RuntimeError("OpenAI package not installed. Install with: pip install openai")
+
+    async def agenerate_text(*args, **kwargs):  # type: ignore[misc]
+        raise RuntimeError("OpenAI package not installed. Install with: pip install openai")
+
+    def run_sync(coro, timeout=None):  # type: ignore[misc]
+        import asyncio
+        return asyncio.run(coro)
+
+from virtualoffice.utils.llm_scheduler import Priority
+
 logger = logging.getLogger(__name__)
 
 # JSON Schema for parsed plans
@@ -71,17 +87,6 @@ class PlanParser:
             model: GPT model to use (default: gpt-4o-mini)
         """
         self.model = model or os.getenv("VDOS_PLAN_PARSER_MODEL", "gpt-4o-mini")
-        self._client = None
-    
-    def _get_client(self):
-        """Lazy load OpenAI client."""
-        if self._client is None:
-            try:
-                from openai import OpenAI
-                self._client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-            except ImportError:
-                raise RuntimeError("OpenAI package not installed. Install with: pip install openai")
-        return self._client
     
     def parse_plan(
         self,
@@ -122,19 +127,18 @@ class PlanParser:
         )
         
         try:
-            client = self._get_client()
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
+            content, _ = generate_text(
+                [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
+                model=self.model,
                 temperature=0.1,  # Low temperature for consistent parsing
-                max_tokens=1500
+                max_tokens=1500,
+                priority=Priority.HOURLY_PLAN,
+                cache_method="plan_parser",
             )
             
-            content = response.choices[0].message.content
-            
             # Try to parse JSON
             parsed_json = self._extract_json(content)
             
@@ -181,9 +185,6 @@ class PlanParser:
             List of (worker_name, parsed_json or None) tuples
         """
         import asyncio
-        from openai import AsyncOpenAI
-        
-        async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         
         async def parse_one(request: dict[str, Any]) -> tuple[str, dict[str, Any] | None]:
             worker_name = request['worker_name']
@@ -198,17 +199,17 @@ class PlanParser:
                     project_name=request.get('project_name')
                 )
                 
-                response = await async_client.chat.completions.create(
-                    model=self.model,
-                    messages=[
+                content, _ = await agenerate_text(
+                    [
                         {"role": "system", "content": system_prompt},
                         {"role": "user", "content": user_prompt}
                     ],
+                    model=self.model,
                     temperature=0.1,
-                    max_tokens=1500
+                    max_tokens=1500,
+                    priority=Priority.HOURLY_PLAN,
+                    cache_method="plan_parser",
                 )
-                
-                content = response.choices[0].message.content
                 parsed_json = self._extract_json(content)
                 self._validate_schema(parsed_json)
                 parsed_json = self._fix_common_errors(
@@ -237,7 +238,7 @@ class PlanParser:
         parse_requests: list[dict[str, Any]]
     ) -> list[tuple[str, dict[str, Any] | None]]:
         """
-        Synchronous wrapper for batch parsing.
+        Synchronous wrapper for batch parsing (runs on the shared LLM event loop).
         
         Args:
             parse_requests: List of parse request dicts
@@ -245,8 +246,7 @@ class PlanParser:
         Returns:
             List of (worker_name, parsed_json or None) tuples
         """
-        import asyncio
-        return asyncio.run(self.parse_plans_batch_async(parse_requests))
+        return run_sync(self.parse_plans_batch_async(parse_requests))
     
     def _build_system_prompt(self) -> str:
         """Build the system prompt for the parser."""
@@ -16,6 +16,8 @@ from .schemas import PersonRead
 from virtualoffice.common.localization import get_current_locale_manager
 from virtualoffice.common.korean_templates import get_korean_prompt
 from virtualoffice.common.korean_validation import validate_korean_content
+from virtualoffice.utils.llm_cache import cache_method_scope
+from virtualoffice.utils.llm_scheduler import Priority, priority_scope
 
 PlanGenerator = Callable[[list[dict[str, str]], str], tuple[str, int]]
 
@@ -227,7 +229,7 @@ class GPTPlanner:
                 {"role": "system", "content": get_korean_prompt("business")},
                 *messages,
             ]
-        return self._invoke(messages, model)
+        return self._invoke(messages, model, Priority.HOURLY_PLAN, "project_plan")
 
     def generate_daily_plan(
         self,
@@ -323,7 +325,7 @@ class GPTPlanner:
                 
                 # Generate with metrics collection
                 model = model_hint or self.daily_model
-                result = self._invoke(messages, model)
+                result = self._invoke(messages, model, Priority.HOURLY_PLAN, "daily_plan")
                 
                 # Record metrics
                 if self._metrics_collector:
@@ -446,7 +448,7 @@ class GPTPlanner:
                 {"role": "system", "content": get_korean_prompt("business")},
                 *messages,
             ]
-        return self._invoke(messages, model)
+        return self._invoke(messages, model, Priority.HOURLY_PLAN, "daily_plan")
 
     def generate_hourly_plan(
         self,
@@ -508,7 +510,7 @@ class GPTPlanner:
                 
                 # Generate with metrics collection
                 model = model_hint or self.hourly_model
-                result = self._invoke(messages, model)
+                result = self._invoke(messages, model, Priority.HOURLY_PLAN, "hourly_plan")
                 
                 # Record metrics
                 if self._metrics_collector:
@@ -780,7 +782,7 @@ class GPTPlanner:
                 {"role": "system", "content": f"{get_korean_prompt('comprehensive')} '{get_current_locale_manager().get_text('scheduled_communications')}' 섹션의 형식은 그대로 유지하되 내용은 한국어로 작성하세요."},
                 *messages,
             ]
-        return self._invoke(messages, model)
+        return self._invoke(messages, model, Priority.HOURLY_PLAN, "hourly_plan")
 
     def generate_daily_report(
         self,
@@ -812,7 +814,7 @@ class GPTPlanner:
                 
                 # Generate with metrics collection
                 model = model_hint or self.daily_report_model
-                result = self._invoke(messages, model)
+                result = self._invoke(messages, model, Priority.SUMMARY, "daily_report")
                 
                 # Record metrics
                 if self._metrics_collector:
@@ -881,7 +883,7 @@ class GPTPlanner:
                 {"role": "system", "content": get_korean_prompt("business")},
                 *messages,
             ]
-        return self._invoke(messages, model)
+        return self._invoke(messages, model, Priority.SUMMARY, "daily_report")
 
     def generate_hourly_summary(
         self,
@@ -921,7 +923,7 @@ class GPTPlanner:
                 {"role": "system", "content": get_korean_prompt("business")},
                 *messages,
             ]
-        return self._invoke(messages, model)
+        return self._invoke(messages, model, Priority.SUMMARY, "hourly_summary")
 
     def generate_simulation_report(
         self,
@@ -973,7 +975,7 @@ class GPTPlanner:
                 {"role": "system", "content": get_korean_prompt("business")},
                 *messages,
             ]
-        return self._invoke(messages, model)
+        return self._invoke(messages, model, Priority.SUMMARY, "simulation_report")
 
     def generate_with_messages(
         self,
@@ -997,15 +999,23 @@ class GPTPlanner:
         model = model_hint or self.hourly_model
         return self._invoke(messages, model)
     
-    def _invoke(self, messages: list[dict[str, str]], model: str) -> PlanResult:
+    def _invoke(
+        self,
+        messages: list[dict[str, str]],
+        model: str,
+        priority: Priority | None = None,
+        method: str | None = None,
+    ) -> PlanResult:
         try:
-            content, tokens = self._generator(messages, model)
-            
-            # Validate Korean content if locale is Korean
-            if self._locale == "ko":
-                content, tokens = self._validate_and_retry_korean_content(
-                    messages, model, content, tokens
-                )
+            # None keeps the caller's lane / cache label (e.g. inbox replies)
+            with priority_scope(priority), cache_method_scope(method):
+                content, tokens = self._generator(messages, model)
+                
+                # Validate Korean content if locale is Korean
+                if self._locale == "ko":
+                    content, tokens = self._validate_and_retry_korean_content(
+                        messages, model, content, tokens
+                    )
             
         except Exception as exc:  # pragma: no cover - surface as planning failure
             raise PlanningError(str(exc)) from exc
@@ -0,0 +1,141 @@
+"""
+Project Index for per-week project membership lookups
+
+This module keeps an in-memory copy of ``project_plans`` and
+``project_assignments`` so the engine can answer the questions it asks on
+every tick without going back to SQLite:
+
+- Which projects is person P working on in week W?
+- Do persons A and B share a project in week W?
+- Who collaborates with P (on project X) in week W?
+
+A project without any assignment rows is worked on by everyone. The index is
+built once from the database and must be rebuilt (see
+``SimulationEngine.invalidate_project_index``) whenever projects or
+assignments are stored, deleted or imported.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectIndex:
+    """Immutable snapshot of project timelines and assignments.
+
+    Per-week answers are memoised on first use, so repeated lookups for the
+    same week are dictionary hits.
+
+    Attributes:
+        projects: Project plan dicts ordered by (start_week, id)
+        members: Project id -> ids of the people assigned to it
+    """
+
+    def __init__(self, projects: Iterable[dict[str, Any]], assignments: Iterable[tuple[int, int]]):
+        self.projects: list[dict[str, Any]] = sorted(projects, key=lambda p: (p["start_week"], p["id"]))
+        by_person: dict[int, set[int]] = {}
+        grouped: dict[int, set[int]] = {}
+        for project_id, person_id in assignments:
+            grouped.setdefault(project_id, set()).add(person_id)
+            by_person.setdefault(person_id, set()).add(project_id)
+        self.members: dict[int, frozenset[int]] = {project_id: frozenset(people) for project_id, people in grouped.items()}
+        self._projects_by_person = {person_id: frozenset(ids) for person_id, ids in by_person.items()}
+        self._lock = threading.Lock()
+        self._active: dict[int, list[dict[str, Any]]] = {}
+        self._person_week: dict[tuple[int, int], tuple[tuple[int, ...], tuple[int, ...]]] = {}
+
+    @classmethod
+    def load(cls, conn, row_to_project: Callable[[Any], dict[str, Any]]) -> "ProjectIndex":
+        """Build the index with two queries on ``conn``."""
+        project_rows = conn.execute("SELECT * FROM project_plans").fetchall()
+        assignment_rows = conn.execute("SELECT project_id, person_id FROM project_assignments").fetchall()
+        index = cls(
+            (row_to_project(row) for row in project_rows),
+            ((row["project_id"], row["person_id"]) for row in assignment_rows),
+        )
+        logger.debug(
+            f"[PROJECT_INDEX] Loaded {len(index.projects)} projects, {len(assignment_rows)} assignments"
+        )
+        return index
+
+    def active_projects(self, week: int) -> list[dict[str, Any]]:
+        """Projects whose timeline covers ``week``, ordered by start week."""
+        active = self._active.get(week)
+        if active is None:
+            active = [
+                project
+                for project in self.projects
+                if project["start_week"] <= week <= project["start_week"] + project["duration_weeks"] - 1
+            ]
+            with self._lock:
+                self._active[week] = active
+        return active
+
+    def _person_ids(self, person_id: int, week: int) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        # (assigned active project ids, unassigned active project ids), both in start-week order
+        key = (person_id, week)
+        cached = self._person_week.get(key)
+        if cached is None:
+            mine = self._projects_by_person.get(person_id, frozenset())
+            active = self.active_projects(week)
+            assigned = tuple(p["id"] for p in active if p["id"] in mine)
+            everyone = tuple(p["id"] for p in active if p["id"] not in self.members)
+            cached = (assigned, everyone)
+            with self._lock:
+                self._person_week[key] = cached
+        return cached
+
+    def assigned_project_ids(self, person_id: int, week: int) -> tuple[int, ...]:
+        """Ids of active projects ``person_id`` is explicitly assigned to."""
+        return self._person_ids(person_id, week)[0]
+
+    def project_ids_for_person(self, person_id: int, week: int) -> tuple[int, ...]:
+        """Ids of every active project for ``person_id``: assigned ones first, then unassigned ones."""
+        assigned, everyone = self._person_ids(person_id, week)
+        return assigned + everyone
+
+    def projects_for_person(self, person_id: int, week: int) -> list[dict[str, Any]]:
+        """Active projects for ``person_id`` as fresh dicts (safe for callers to modify)."""
+        wanted = self.project_ids_for_person(person_id, week)
+        by_id = {project["id"]: project for project in self.active_projects(week)}
+        return [dict(by_id[project_id]) for project_id in wanted]
+
+    def shares_project(self, person_a: int, person_b: int, week: int) -> bool:
+        """Whether both people work on at least one common active project."""
+        a_ids = self.project_ids_for_person(person_a, week)
+        if not a_ids:
+            return False
+        b_ids = self.project_ids_for_person(person_b, week)
+        return not set(a_ids).isdisjoint(b_ids)
+
+    def is_assigned(self, person_id: int) -> bool:
+        """Whether ``person_id`` has any explicit assignment, in any week."""
+        return person_id in self._projects_by_person
+
+    def collaborator_ids(self, person_id: int, week: int, project_id: int | None = None) -> set[int] | None:
+        """Ids of people sharing a project with ``person_id`` in ``week``.
+
+        With ``project_id``, only members of that project count, and an empty
+        set is returned unless ``person_id`` is assigned to it and it is
+        active. Without it, members of all the person's assigned active
+        projects are returned; people with no assignments at all (see
+        :meth:`is_assigned`) also collaborate with everyone. Returns None when
+        the person has no assigned active project, meaning "everyone else".
+        """
+        if project_id is not None:
+            if project_id not in self.assigned_project_ids(person_id, week):
+                return set()
+            return set(self.members.get(project_id, frozenset())) - {person_id}
+
+        assigned = self.assigned_project_ids(person_id, week)
+        if not assigned:
+            return None
+        ids: set[int] = set()
+        for pid in assigned:
+            ids.update(self.members.get(pid, frozenset()))
+        ids.discard(person_id)
+        return ids
@@ -8,6 +8,7 @@ Primary use case: Live feed simulation data to external projects via API.
 """
 
 import logging
+from datetime import datetime, timezone
 from typing import Optional, TYPE_CHECKING
 
 from virtualoffice.common.db import get_connection
@@ -17,6 +18,101 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Stay well below SQLite's bound-parameter limit in IN (...) lookups
+_ID_CHUNK = 500
+
+
+def _fetch_by_ids(conn, query: str, ids: list[int]) -> list:
+    """Run ``query`` (with one ``{}`` placeholder for the IN list) over ``ids`` in chunks."""
+    rows = []
+    for start in range(0, len(ids), _ID_CHUNK):
+        chunk = ids[start:start + _ID_CHUNK]
+        rows.extend(conn.execute(query.format(", ".join("?" * len(chunk))), chunk).fetchall())
+    return rows
+
+
+def _as_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def tick_for_timestamp(sent_at: str, base_dt: datetime, hours_per_day: int) -> int | None:
+    """
+    Map a simulated ``sent_at`` back to its tick (inverse of the engine's tick clock).
+
+    Ticks are minutes of the workday starting at 09:00 on ``base_dt``'s day.
+    Timestamps outside a workday map to None.
+    """
+    try:
+        text = sent_at.strip().replace(" ", "T")
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        sent = _as_naive_utc(datetime.fromisoformat(text))
+    except (AttributeError, ValueError):
+        return None
+    ticks_per_day = max(1, hours_per_day * 60)
+    minutes = int((sent - _as_naive_utc(base_dt)).total_seconds() // 60)
+    day_index, minute_of_day = divmod(minutes, 24 * 60)
+    tick_of_day = minute_of_day - 9 * 60
+    if day_index < 0 or not 0 <= tick_of_day < ticks_per_day:
+        return None
+    return day_index * ticks_per_day + tick_of_day + 1
+
+
+def backfill_tick_messages(hours_per_day: int, base_dt: datetime | None = None) -> dict:
+    """
+    Fill ``tick_messages`` for emails and chats that are not indexed yet.
+
+    The tick is derived from each message's simulated ``sent_at``. ``base_dt``
+    defaults to ``simulation_state.sim_base_dt``; messages whose timestamp
+    falls outside a workday are skipped. Safe to run repeatedly.
+
+    Args:
+        hours_per_day: Workday length the simulation ran with
+        base_dt: Simulation base datetime (midnight of day 1)
+
+    Returns:
+        dict: { "email": {"indexed": int, "skipped": int}, "chat": {...} }
+
+    Raises:
+        ValueError: If no base datetime is given or stored
+    """
+    with get_connection() as conn:
+        if base_dt is None:
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(simulation_state)")}
+            row = conn.execute("SELECT sim_base_dt FROM simulation_state WHERE id = 1").fetchone() if "sim_base_dt" in columns else None
+            if row is None or not row[0]:
+                raise ValueError("No simulation base datetime stored; pass base_dt explicitly")
+            base_dt = datetime.fromisoformat(row[0])
+
+        result = {}
+        for channel, table in (("email", "emails"), ("chat", "chat_messages")):
+            exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+            if not exists:
+                result[channel] = {"indexed": 0, "skipped": 0}
+                continue
+            rows = conn.execute(
+                f"""
+                SELECT id, sent_at FROM {table}
+                WHERE id NOT IN (SELECT message_id FROM tick_messages WHERE channel = ?)
+                """,
+                (channel,)
+            ).fetchall()
+            entries = []
+            for message_id, sent_at in rows:
+                tick = tick_for_timestamp(sent_at, base_dt, hours_per_day)
+                if tick is not None:
+                    entries.append((tick, channel, message_id))
+            conn.executemany(
+                "INSERT OR IGNORE INTO tick_messages(tick, channel, message_id) VALUES (?, ?, ?)",
+                entries,
+            )
+            result[channel] = {"indexed": len(entries), "skipped": len(rows) - len(entries)}
+
+    logger.info(f"[REPLAY] Backfilled tick index: {result}")
+    return result
+
 
 class ReplayManager:
     """
@@ -73,7 +169,7 @@ class ReplayManager:
         Get replay metadata including boundaries and current state.
 
         Returns:
-            dict: Metadata with max_tick, current_tick, mode, stats
+            dict: Metadata with max_tick, current_tick, mode, stats and report job status
         """
         max_tick = self.get_max_generated_tick()
         current_tick = self.engine.get_current_tick()
@@ -103,7 +199,9 @@ class ReplayManager:
             "total_emails": email_count,
             "total_chats": chat_count,
             "ticks_per_day": self.ticks_per_day,
-            "base_hour": self.BASE_HOUR
+            "base_hour": self.BASE_HOUR,
+            # Hourly summaries/daily reports may still be generating in the background
+            "report_jobs": self.engine.report_job_status(),
         }
 
     def tick_to_time(self, tick: int) -> dict:
@@ -197,7 +295,7 @@ class ReplayManager:
         self.mode = 'replay'
 
         # Get data at this tick
-        return self.get_current_tick_data()
+        return self.get_current_tick_data(max_tick)
 
     def jump_to_time(self, day: int, hour: int, minute: int) -> dict:
         """
@@ -223,8 +321,9 @@ class ReplayManager:
         """
         Get emails and chats that were sent at a specific tick.
 
-        Queries the database for communications that occurred at the specified tick
-        by matching timestamps from worker_exchange_log.
+        Looks up the message ids recorded for the tick in ``tick_messages``
+        (filled by the engine at dispatch, or by ``backfill_tick_index``),
+        then fetches the emails, their recipients and the chats in bulk.
 
         Args:
             tick: Tick number to query
@@ -236,61 +335,46 @@ class ReplayManager:
         chats = []
 
         with get_connection() as conn:
-            # Get time range for this tick from worker_exchange_log
-            time_range = conn.execute(
-                """
-                SELECT MIN(created_at), MAX(created_at)
-                FROM worker_exchange_log
-                WHERE tick = ?
-                """,
+            ids: dict[str, list[int]] = {"email": [], "chat": []}
+            for row in conn.execute(
+                "SELECT channel, message_id FROM tick_messages WHERE tick = ?",
                 (tick,)
-            ).fetchone()
-
-            if time_range and time_range[0]:
-                min_time, max_time = time_range
-
-                # Query emails within this time range
-                email_rows = conn.execute(
-                    """
-                    SELECT id, sender, subject, body, thread_id, sent_at
-                    FROM emails
-                    WHERE sent_at >= ? AND sent_at <= ?
-                    ORDER BY sent_at
-                    """,
-                    (min_time, max_time)
-                ).fetchall()
-
-                for row in email_rows:
-                    # Get recipients
-                    # Align with schema: email_recipients(email_id, address, kind)
-                    recipients_rows = conn.execute(
-                        "SELECT address FROM email_recipients WHERE email_id = ? ORDER BY rowid",
-                        (row[0],)
-                    ).fetchall()
-                    recipients = [r[0] for r in recipients_rows]
-
+            ):
+                ids.setdefault(row[0], []).append(row[1])
+
+            if ids["email"]:
+                email_rows = _fetch_by_ids(
+                    conn,
+                    "SELECT id, sender, subject, body, thread_id, sent_at FROM emails WHERE id IN ({})",
+                    ids["email"],
+                )
+                # Align with schema: email_recipients(email_id, address, kind)
+                recipients: dict[int, list[str]] = {}
+                for row in _fetch_by_ids(
+                    conn,
+                    "SELECT email_id, address FROM email_recipients WHERE email_id IN ({}) ORDER BY rowid",
+                    ids["email"],
+                ):
+                    recipients.setdefault(row[0], []).append(row[1])
+
+                for row in sorted(email_rows, key=lambda r: (r[5], r[0])):
                     emails.append({
                         "id": row[0],
                         "sender": row[1],
-                        "recipients": recipients,
+                        "recipients": recipients.get(row[0], []),
                         "subject": row[2],
                         "body": row[3],
                         "thread_id": row[4],
                         "sent_at": row[5]
                     })
 
-                # Query chats within this time range
-                chat_rows = conn.execute(
-                    """
-                    SELECT id, room_id, sender, body, sent_at
-                    FROM chat_messages
-                    WHERE sent_at >= ? AND sent_at <= ?
-                    ORDER BY sent_at
-                    """,
-                    (min_time, max_time)
-                ).fetchall()
-
-                for row in chat_rows:
+            if ids["chat"]:
+                chat_rows = _fetch_by_ids(
+                    conn,
+                    "SELECT id, room_id, sender, body, sent_at FROM chat_messages WHERE id IN ({})",
+                    ids["chat"],
+                )
+                for row in sorted(chat_rows, key=lambda r: (r[4], r[0])):
                     chats.append({
                         "id": row[0],
                         "room_id": row[1],
@@ -306,17 +390,33 @@ class ReplayManager:
             "chats": chats
         }
 
-    def get_current_tick_data(self) -> dict:
+    def backfill_tick_index(self) -> dict:
+        """
+        Index emails and chats stored before ``tick_messages`` existed.
+
+        Uses the engine's day length and simulation base datetime when the
+        simulation has been started in this process.
+
+        Returns:
+            dict: Rows added and messages skipped, per channel
+        """
+        return backfill_tick_messages(self.engine.hours_per_day, base_dt=self.engine._sim_base_dt)
+
+    def get_current_tick_data(self, max_tick: Optional[int] = None) -> dict:
         """
         Get data at the engine's current tick.
 
+        Args:
+            max_tick: Max generated tick, when the caller has already looked it up
+
         Returns:
             dict: Complete response with tick, time, data, and metadata
         """
         current_tick = self.engine.get_current_tick()
         time_info = self.tick_to_time(current_tick)
         tick_data = self.get_tick_data(current_tick)
-        max_tick = self.get_max_generated_tick()
+        if max_tick is None:
+            max_tick = self.get_max_generated_tick()
 
         return {
             "tick": current_tick,
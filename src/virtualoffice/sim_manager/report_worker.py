@@ -0,0 +1,343 @@
+"""
+Report Worker for hourly summaries and daily reports
+
+Hourly summaries and daily reports take one planner call per persona, which
+used to stall ``advance()`` at every hour and day boundary. The tick loop now
+only enqueues jobs in the durable ``report_jobs`` table, and ``ReportWorker``
+runs them on a small pool of background threads:
+
+- Idempotent: a job is unique per (kind, person, period), so enqueueing it
+  twice is a no-op, and the handlers skip summaries/reports that exist.
+- Retries: a failing job is retried with exponential backoff, up to
+  ``max_attempts`` runs, and then marked ``failed`` with its last error.
+- Backpressure: ``enqueue`` waits (up to ``backpressure_timeout``) while
+  ``max_pending`` jobs are outstanding, so the tick loop cannot outrun the
+  planner indefinitely.
+- Ordering: a daily report waits until the person's hourly summaries for that
+  day have finished, since the report is built from them.
+- Durable: jobs left ``running`` by a stopped process are re-queued on start.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from virtualoffice.common.db import get_connection
+
+logger = logging.getLogger(__name__)
+
+HOURLY_SUMMARY = "hourly_summary"
+DAILY_REPORT = "daily_report"
+
+REPORT_JOB_STATUSES = ("queued", "running", "done", "failed")
+
+
+@dataclass(frozen=True)
+class ReportJob:
+    """One claimed job: generate ``kind`` for ``person_id`` and hour/day ``period_index``."""
+
+    id: int
+    kind: str
+    person_id: int
+    period_index: int
+    attempts: int
+
+
+class ReportWorker:
+    """Background runner for ``report_jobs``.
+
+    Args:
+        handlers: Job kind -> callable taking ``(person_id, period_index)``
+        hours_per_day: Hours per simulated day, to map a daily report to its hourly summaries
+        max_workers: Number of background threads (jobs run concurrently)
+        max_pending: Outstanding (queued or running) jobs before ``enqueue`` waits
+        max_attempts: Runs per job before it is marked ``failed``
+        retry_delay: Seconds before the first retry; doubled on each further attempt
+        backpressure_timeout: Longest ``enqueue`` waits for the queue to drain, in seconds
+        poll_interval: Idle threads re-check the table this often, in seconds
+        executor_for: Job kind -> executor to run the handler on (default: the
+            worker thread itself)
+    """
+
+    def __init__(
+        self,
+        handlers: dict[str, Callable[[int, int], Any]],
+        *,
+        hours_per_day: int,
+        max_workers: int = 2,
+        max_pending: int = 500,
+        max_attempts: int = 3,
+        retry_delay: float = 1.0,
+        backpressure_timeout: float = 30.0,
+        poll_interval: float = 0.5,
+        executor_for: Callable[[str], Executor] | None = None,
+    ):
+        self.handlers = handlers
+        self.hours_per_day = max(1, hours_per_day)
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.backpressure_timeout = backpressure_timeout
+        self.poll_interval = poll_interval
+        self.executor_for = executor_for
+
+        self._cond = threading.Condition()
+        self._claim_lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._stopping = False
+        self._running_jobs = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    @property
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        """Re-queue interrupted jobs and start the worker threads (no-op if running)."""
+        with self._cond:
+            if self.is_running:
+                return
+            self._stopping = False
+            with get_connection() as conn:
+                requeued = conn.execute(
+                    "UPDATE report_jobs SET status = 'queued', updated_at = CURRENT_TIMESTAMP WHERE status = 'running'"
+                ).rowcount
+            if requeued:
+                logger.info(f"[REPORT_WORKER] Re-queued {requeued} interrupted jobs")
+            self._threads = [
+                threading.Thread(target=self._run, name=f"report-worker-{i}", daemon=True)
+                for i in range(self.max_workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the threads after their current job; queued jobs stay in the table."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+
+    def clear(self, timeout: float = 30.0) -> None:
+        """Drop every job and wait for the ones already running to finish."""
+        with get_connection() as conn:
+            conn.execute("DELETE FROM report_jobs")
+        with self._cond:
+            self._cond.wait_for(lambda: self._running_jobs == 0, timeout)
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    def enqueue(self, kind: str, person_ids: Iterable[int], period_index: int, tick: int | None = None) -> int:
+        """Queue ``kind`` for each person and period; returns the number of new jobs.
+
+        Waits while ``max_pending`` jobs are outstanding and the worker is
+        running. After ``backpressure_timeout`` the jobs are queued anyway.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown report job kind: {kind}")
+        rows = [(kind, person_id, period_index, tick) for person_id in person_ids]
+        if not rows:
+            return 0
+        self._wait_for_capacity()
+        with get_connection() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO report_jobs(kind, person_id, period_index, enqueued_tick) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            added = conn.total_changes - before
+        if added:
+            with self._cond:
+                self._cond.notify_all()
+        return added
+
+    def _wait_for_capacity(self) -> None:
+        deadline = time.monotonic() + self.backpressure_timeout
+        with self._cond:
+            while self.is_running and self.pending_count() >= self.max_pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(
+                        f"[REPORT_WORKER] {self.max_pending}+ report jobs outstanding after "
+                        f"{self.backpressure_timeout:.0f}s; queueing more anyway"
+                    )
+                    return
+                self._cond.wait(min(remaining, self.poll_interval))
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+    def pending_count(self) -> int:
+        with get_connection() as conn:
+            row = conn.execute("SELECT COUNT(*) FROM report_jobs WHERE status IN ('queued', 'running')").fetchone()
+        return int(row[0])
+
+    def status(self) -> dict[str, Any]:
+        """Job counts by status, overall and per kind."""
+        with get_connection() as conn:
+            rows = conn.execute("SELECT kind, status, COUNT(*) AS n FROM report_jobs GROUP BY kind, status").fetchall()
+        totals = {status: 0 for status in REPORT_JOB_STATUSES}
+        by_kind: dict[str, dict[str, int]] = {
+            kind: {status: 0 for status in REPORT_JOB_STATUSES} for kind in self.handlers
+        }
+        for row in rows:
+            totals[row["status"]] = totals.get(row["status"], 0) + row["n"]
+            by_kind.setdefault(row["kind"], {})[row["status"]] = row["n"]
+        return {
+            "worker_running": self.is_running,
+            "pending": totals["queued"] + totals["running"],
+            "totals": totals,
+            "by_kind": by_kind,
+        }
+
+    def list_jobs(self, status: str | None = None, kind: str | None = None, limit: int = 100) -> list[dict[str, Any]]:
+        """Most recent jobs first, optionally filtered by status and kind."""
+        query = "SELECT * FROM report_jobs WHERE 1 = 1"
+        params: list[Any] = []
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        with get_connection() as conn:
+            rows = conn.execute(query, tuple(params)).fetchall()
+        return [
+            {
+                "id": row["id"],
+                "kind": row["kind"],
+                "person_id": row["person_id"],
+                "period_index": row["period_index"],
+                "status": row["status"],
+                "attempts": row["attempts"],
+                "last_error": row["last_error"],
+                "enqueued_tick": row["enqueued_tick"],
+                "created_at": row["created_at"],
+                "updated_at": row["updated_at"],
+            }
+            for row in rows
+        ]
+
+    def wait_idle(self, timeout: float = 30.0) -> bool:
+        """Block until no job is queued or running; returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self.pending_count() > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(remaining, self.poll_interval))
+        return True
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+            try:
+                job = self._claim()
+            except Exception as exc:
+                logger.warning(f"[REPORT_WORKER] Unable to claim a job: {exc}")
+                job = None
+            if job is None:
+                with self._cond:
+                    if not self._stopping:
+                        self._cond.wait(self.poll_interval)
+                continue
+            self._execute(job)
+
+    def _claim(self) -> ReportJob | None:
+        with self._claim_lock:
+            with get_connection() as conn:
+                row = conn.execute(
+                    """
+                    SELECT * FROM report_jobs AS job
+                    WHERE job.status = 'queued' AND job.available_at <= ?
+                      AND NOT (job.kind = ? AND EXISTS (
+                          SELECT 1 FROM report_jobs AS hourly
+                          WHERE hourly.kind = ? AND hourly.person_id = job.person_id
+                            AND hourly.status IN ('queued', 'running')
+                            AND hourly.period_index BETWEEN job.period_index * ? AND (job.period_index + 1) * ? - 1
+                      ))
+                    ORDER BY job.id
+                    LIMIT 1
+                    """,
+                    (time.time(), DAILY_REPORT, HOURLY_SUMMARY, self.hours_per_day, self.hours_per_day),
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute(
+                    "UPDATE report_jobs SET status = 'running', attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                    (row["id"],),
+                )
+            with self._cond:
+                self._running_jobs += 1
+        return ReportJob(
+            id=row["id"],
+            kind=row["kind"],
+            person_id=row["person_id"],
+            period_index=row["period_index"],
+            attempts=row["attempts"] + 1,
+        )
+
+    def _execute(self, job: ReportJob) -> None:
+        try:
+            handler = self.handlers[job.kind]
+            if self.executor_for is not None:
+                self.executor_for(job.kind).submit(handler, job.person_id, job.period_index).result()
+            else:
+                handler(job.person_id, job.period_index)
+        except Exception as exc:
+            self._finish_failed(job, exc)
+        else:
+            with get_connection() as conn:
+                conn.execute(
+                    "UPDATE report_jobs SET status = 'done', last_error = NULL, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                    (job.id,),
+                )
+        finally:
+            with self._cond:
+                self._running_jobs -= 1
+                self._cond.notify_all()
+
+    def _finish_failed(self, job: ReportJob, exc: Exception) -> None:
+        error = f"{type(exc).__name__}: {exc}"
+        if job.attempts >= self.max_attempts:
+            logger.error(
+                f"[REPORT_WORKER] {job.kind} for person {job.person_id} period {job.period_index} "
+                f"failed after {job.attempts} attempts: {error}"
+            )
+            with get_connection() as conn:
+                conn.execute(
+                    "UPDATE report_jobs SET status = 'failed', last_error = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                    (error, job.id),
+                )
+            return
+        delay = self.retry_delay * (2 ** (job.attempts - 1))
+        logger.warning(
+            f"[REPORT_WORKER] {job.kind} for person {job.person_id} period {job.period_index} "
+            f"failed (attempt {job.attempts}/{self.max_attempts}), retrying in {delay:.1f}s: {error}"
+        )
+        with get_connection() as conn:
+            conn.execute(
+                "UPDATE report_jobs SET status = 'queued', last_error = ?, available_at = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (error, time.time() + delay, job.id),
+            )
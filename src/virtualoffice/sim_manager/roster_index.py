@@ -0,0 +1,97 @@
+"""
+Roster Index for resolving communication targets
+
+Planner output names recipients loosely: an email address, a chat handle,
+``@handle`` or a display name (Korean names included). This module turns a
+roster into lookup tables so each recipient string resolves in O(1), and
+keeps the per-roster data that CC suggestion needs (department head and
+people by role keyword).
+
+The engine builds one index per roster and reuses it until the roster or
+``VDOS_EXTERNAL_STAKEHOLDERS`` changes.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Iterable
+
+from .schemas import PersonRead
+
+logger = logging.getLogger(__name__)
+
+
+def parse_external_stakeholders(raw: str) -> frozenset[str]:
+    """Parse a comma-separated ``VDOS_EXTERNAL_STAKEHOLDERS`` value into lowercase addresses."""
+    return frozenset(addr.strip().lower() for addr in raw.split(",") if addr.strip())
+
+
+class RosterIndex:
+    """Lookup tables over one roster of personas.
+
+    Matching precedence mirrors the original linear scans: email address,
+    then chat handle (with or without ``@``), then display name; within each
+    kind the first person in roster order wins.
+
+    Attributes:
+        people: The roster, in the order it was given
+        by_handle: Lowercase chat handle -> person
+        by_email: Lowercase email address -> person
+        external_stakeholders: Lowercase external addresses allowed as recipients
+        department_head: First department head in the roster, if any
+    """
+
+    def __init__(self, people: Iterable[PersonRead], external_stakeholders: Iterable[str] = ()):
+        self.people: tuple[PersonRead, ...] = tuple(people)
+        self.by_handle: dict[str, PersonRead] = {p.chat_handle.lower(): p for p in self.people}
+        self.by_email: dict[str, PersonRead] = {p.email_address.lower(): p for p in self.people}
+        self.external_stakeholders = frozenset(external_stakeholders)
+
+        self._first_by_email: dict[str, PersonRead] = {}
+        self._first_by_handle: dict[str, PersonRead] = {}
+        self._first_by_name: dict[str, PersonRead] = {}
+        for p in self.people:
+            self._first_by_email.setdefault(p.email_address.lower(), p)
+            handle = p.chat_handle.lower()
+            self._first_by_handle.setdefault(handle, p)
+            self._first_by_handle.setdefault(f"@{handle}", p)
+            self._first_by_name.setdefault(p.name.lower(), p)
+
+        self.department_head: PersonRead | None = next(
+            (p for p in self.people if getattr(p, "is_department_head", False)), None
+        )
+        self._by_role_keyword: dict[str, tuple[PersonRead, ...]] = {}
+
+    def match_target(self, raw: str) -> tuple[str | None, str | None]:
+        """Resolve a recipient string to ``(email, chat_handle)``.
+
+        Unknown email-like strings that are not external stakeholders are
+        rejected as hallucinated and return ``(None, None)``; anything else
+        unknown is treated as a raw chat handle.
+        """
+        val = raw.strip().lower()
+        person = self._first_by_email.get(val)
+        if person is not None:
+            return person.email_address, None
+        person = self._first_by_handle.get(val)
+        if person is not None:
+            return None, person.chat_handle
+        person = self._first_by_name.get(val)
+        if person is not None:
+            return person.email_address, person.chat_handle
+        if "@" in val:
+            # Roster addresses matched above, so only external stakeholders remain valid
+            if val in self.external_stakeholders:
+                return val, None
+            # REJECT hallucinated email addresses
+            logger.warning(f"Rejecting hallucinated email address: {raw}")
+            return None, None
+        return None, raw.strip()
+
+    def people_with_role(self, keyword: str) -> tuple[PersonRead, ...]:
+        """People (in roster order) whose lowercase role contains ``keyword``."""
+        bucket = self._by_role_keyword.get(keyword)
+        if bucket is None:
+            bucket = tuple(p for p in self.people if keyword in (getattr(p, "role", None) or "").strip().lower())
+            self._by_role_keyword[keyword] = bucket
+        return bucket
@@ -8,13 +8,15 @@ communication styles to generated emails and chat messages.
 from .example_generator import StyleExampleGenerator
 from .filter import CommunicationStyleFilter
 from .metrics import FilterMetrics
-from .models import FilterMetricsSummary, FilterResult, StyleExample
+from .models import EmailFilterResult, FilterMetricsSummary, FilterResult, StyleExample, StyleRequest
 
 __all__ = [
     "CommunicationStyleFilter",
+    "EmailFilterResult",
     "FilterMetrics",
     "FilterMetricsSummary",
     "FilterResult",
     "StyleExample",
     "StyleExampleGenerator",
+    "StyleRequest",
 ]
@@ -8,24 +8,27 @@ post-processing layer in the message generation pipeline.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import os
 import random
 import sqlite3
 import time
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Literal, Sequence
 
 if TYPE_CHECKING:
     from sqlite3 import Connection
 
-from .models import FilterResult, StyleExample
+from .models import EmailFilterResult, FilterResult, StyleExample, StyleRequest
 from .metrics import FilterMetrics
+from ...utils.llm_scheduler import Priority
 
 try:
-    from ...utils.completion_util import generate_text
+    from ...utils.llm_client import agenerate_text
 except (ImportError, ModuleNotFoundError):  # pragma: no cover
 
-    def generate_text(*args, **kwargs):  # type: ignore[misc]
+    async def agenerate_text(*args, **kwargs):  # type: ignore[misc]
         raise RuntimeError(
             "OpenAI client is not installed; "
             "install optional dependencies to enable style filtering."
@@ -35,6 +38,13 @@ except (ImportError, ModuleNotFoundError):  # pragma: no cover
 logger = logging.getLogger(__name__)
 
 
+def _default_batch_size() -> int:
+    try:
+        return max(1, int(os.getenv("VDOS_STYLE_FILTER_BATCH_SIZE", "20")))
+    except ValueError:
+        return 20
+
+
 class CommunicationStyleFilter:
     """
     Transforms messages using persona-specific communication styles.
@@ -47,6 +57,7 @@ class CommunicationStyleFilter:
         db_connection: SQLite database connection
         locale: Language locale for prompts ("ko" or "en")
         enabled: Global filter enable flag
+        batch_size: Maximum messages rewritten together in one batched request
     """
 
     def __init__(
@@ -55,6 +66,7 @@ class CommunicationStyleFilter:
         locale: str = "ko",
         enabled: bool = True,
         metrics: FilterMetrics | None = None,
+        batch_size: int | None = None,
     ):
         """
         Initialize the communication style filter.
@@ -64,12 +76,18 @@ class CommunicationStyleFilter:
             locale: Language locale for prompts (default: "ko" for Korean)
             enabled: Global filter enable flag (default: True)
             metrics: Optional FilterMetrics instance for tracking (creates new if None)
+            batch_size: Maximum messages per batched request
+                (default: ``VDOS_STYLE_FILTER_BATCH_SIZE`` or 20)
         """
         self.db_connection = db_connection
         self.locale = locale
         self._global_enabled = enabled
         self._example_cache: dict[int, list[StyleExample]] = {}
+        self._persona_enabled_cache: dict[int, bool] = {}
         self._prompt_templates = self._build_prompt_templates()
+        self._email_json_instructions = self._build_email_json_instructions()
+        self._batch_json_instructions = self._build_batch_json_instructions()
+        self.batch_size = max(1, batch_size) if batch_size is not None else _default_batch_size()
         self.metrics = metrics or FilterMetrics(db_connection)
 
     def _build_prompt_templates(self) -> dict[str, str]:
@@ -102,6 +120,55 @@ Output only the rewritten message without any additional commentary or notes."""
             "en": english_prompt,
         }
 
+    def _build_email_json_instructions(self) -> dict[str, str]:
+        """
+        Build locale-specific instructions appended to the prompt when an
+        email's subject and body are rewritten together as one JSON object.
+        
+        Returns:
+            Dictionary mapping locale codes to instruction text
+        """
+        return {
+            "ko": (
+                '사용자 입력은 "subject"와 "body" 키를 가진 JSON 객체입니다. '
+                "두 값을 모두 위 스타일로 다시 작성하고, 같은 키를 가진 JSON 객체만 출력하세요."
+            ),
+            "en": (
+                'The user\'s input is a JSON object with "subject" and "body" keys. '
+                "Rewrite both values in the style above and output only a JSON object with the same keys."
+            ),
+        }
+
+    def _build_batch_json_instructions(self) -> dict[str, str]:
+        """
+        Build locale-specific instructions appended to the prompt when several
+        messages from one persona are rewritten together as one JSON object.
+        
+        Returns:
+            Dictionary mapping locale codes to instruction text
+        """
+        return {
+            "ko": (
+                '사용자 입력은 "messages" 배열을 가진 JSON 객체이며, 각 항목은 "index", "type", "text" 키를 가집니다. '
+                '각 "text"를 위 스타일로 따로 다시 작성하고, 같은 "index"를 유지한 '
+                '{"messages": [{"index": ..., "text": ...}]} 형식의 JSON 객체만 출력하세요.'
+            ),
+            "en": (
+                'The user\'s input is a JSON object with a "messages" array; each item has "index", "type" and "text" keys. '
+                'Rewrite each "text" separately in the style above, keep its "index", and output only a JSON object '
+                'of the form {"messages": [{"index": ..., "text": ...}]}.'
+            ),
+        }
+
+    @staticmethod
+    def _strip_code_fences(text: str) -> str:
+        """Remove surrounding whitespace and a markdown code block, if present."""
+        text = text.strip()
+        if text.startswith("```"):
+            lines = text.split("\n")
+            text = "\n".join(lines[1:-1]).strip()
+        return text
+
     def is_enabled(self) -> bool:
         """
         Check if the filter is globally enabled.
@@ -111,16 +178,38 @@ Output only the rewritten message without any additional commentary or notes."""
         """
         return self._global_enabled
 
+    def invalidate_persona_cache(self, persona_id: int | None = None) -> None:
+        """
+        Drop cached per-persona data so it is re-read on next use.
+        
+        Call this when a persona is updated or deleted, or its style examples
+        are regenerated.
+        
+        Args:
+            persona_id: Persona to drop, or None to clear every persona
+        """
+        if persona_id is None:
+            self._example_cache.clear()
+            self._persona_enabled_cache.clear()
+        else:
+            self._example_cache.pop(persona_id, None)
+            self._persona_enabled_cache.pop(persona_id, None)
+
     def _is_persona_enabled(self, persona_id: int) -> bool:
         """
         Check if the filter is enabled for a specific persona.
         
+        The flag is cached per persona until :meth:`invalidate_persona_cache`.
+        
         Args:
             persona_id: ID of the persona to check
             
         Returns:
             True if filter is enabled for this persona, False otherwise
         """
+        cached = self._persona_enabled_cache.get(persona_id)
+        if cached is not None:
+            return cached
         try:
             cursor = self.db_connection.execute(
                 "SELECT style_filter_enabled FROM people WHERE id = ?",
@@ -130,7 +219,9 @@ Output only the rewritten message without any additional commentary or notes."""
             if row is None:
                 logger.warning(f"Persona {persona_id} not found in database")
                 return False
-            return bool(row[0])
+            enabled = bool(row[0])
+            self._persona_enabled_cache[persona_id] = enabled
+            return enabled
         except sqlite3.Error as e:
             logger.error(f"Database error checking persona filter status: {e}")
             return False
@@ -322,15 +413,12 @@ Output only the rewritten message without any additional commentary or notes."""
             
             # Call GPT-4o API
             try:
-                styled_message, tokens = generate_text(messages, model="gpt-4o")
+                styled_message, tokens = await agenerate_text(
+                    messages, model="gpt-4o", priority=Priority.STYLE_FILTER, cache_method="style_filter"
+                )
                 
                 # Extract styled message (remove any markdown or commentary)
-                styled_message = styled_message.strip()
-                
-                # Remove markdown code blocks if present
-                if styled_message.startswith("```"):
-                    lines = styled_message.split("\n")
-                    styled_message = "\n".join(lines[1:-1]).strip()
+                styled_message = self._strip_code_fences(styled_message)
                 
                 latency_ms = (time.time() - start_time) * 1000
                 
@@ -413,3 +501,321 @@ Output only the rewritten message without any additional commentary or notes."""
                 success=False,
                 error=error_msg,
             )
+
+    async def apply_email_filter(
+        self,
+        subject: str,
+        body: str,
+        persona_id: int,
+    ) -> EmailFilterResult:
+        """
+        Apply style filter to an email's subject and body in one request.
+        
+        Sends both fields as a single JSON object and asks for a JSON object
+        back, so an email costs one GPT-4o call instead of two. Falls back to
+        the original subject and body on any failure, including a response
+        that is not valid JSON with string "subject" and "body" fields.
+        
+        Args:
+            subject: Original email subject
+            body: Original email body
+            persona_id: ID of the persona sending the email
+            
+        Returns:
+            EmailFilterResult with styled subject and body plus call metadata
+        """
+        start_time = time.time()
+
+        def _unchanged(success: bool, error: str | None, tokens: int = 0) -> EmailFilterResult:
+            return EmailFilterResult(
+                styled_subject=subject,
+                styled_body=body,
+                original_subject=subject,
+                original_body=body,
+                tokens_used=tokens,
+                latency_ms=(time.time() - start_time) * 1000,
+                success=success,
+                error=error,
+            )
+
+        if not self.is_enabled():
+            logger.debug("Style filter is globally disabled")
+            return _unchanged(True, "Filter disabled globally")
+
+        if not self._is_persona_enabled(persona_id):
+            logger.debug(f"Style filter is disabled for persona {persona_id}")
+            return _unchanged(True, "Filter disabled for persona")
+
+        tokens = 0
+        try:
+            examples = await self.get_style_examples(persona_id)
+            if not examples:
+                logger.warning(
+                    f"No style examples available for persona {persona_id}, "
+                    "using original email"
+                )
+                return _unchanged(True, "No style examples available")
+
+            instructions = self._email_json_instructions.get(self.locale, self._email_json_instructions["en"])
+            system_prompt = f"{self._build_filter_prompt(examples, 'email')}\n\n{instructions}"
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": json.dumps({"subject": subject, "body": body}, ensure_ascii=False)},
+            ]
+
+            logger.info(f"Applying style filter for persona {persona_id} (email subject+body)")
+
+            response, tokens = await agenerate_text(
+                messages,
+                model="gpt-4o",
+                priority=Priority.STYLE_FILTER,
+                cache_method="style_filter",
+                response_format={"type": "json_object"},
+            )
+            tokens = tokens or 0
+            parsed = json.loads(self._strip_code_fences(response))
+            styled_subject = parsed.get("subject") if isinstance(parsed, dict) else None
+            styled_body = parsed.get("body") if isinstance(parsed, dict) else None
+            if not isinstance(styled_subject, str) or not isinstance(styled_body, str):
+                raise ValueError("response is missing string 'subject' and 'body' fields")
+
+            latency_ms = (time.time() - start_time) * 1000
+            logger.info(f"Style filter applied successfully: {tokens} tokens, {latency_ms:.1f}ms")
+            await self.metrics.record_transformation(
+                persona_id=persona_id,
+                message_type="email",
+                tokens_used=tokens,
+                latency_ms=latency_ms,
+                success=True,
+            )
+            return EmailFilterResult(
+                styled_subject=styled_subject.strip() or subject,
+                styled_body=styled_body.strip() or body,
+                original_subject=subject,
+                original_body=body,
+                tokens_used=tokens,
+                latency_ms=latency_ms,
+                success=True,
+                error=None,
+            )
+
+        except Exception as e:
+            error_msg = f"Email style filter failed: {e}"
+            logger.error(error_msg, extra={"persona_id": persona_id, "message_type": "email"})
+            result = _unchanged(False, error_msg, tokens)
+            await self.metrics.record_transformation(
+                persona_id=persona_id,
+                message_type="email",
+                tokens_used=tokens,
+                latency_ms=result.latency_ms,
+                success=False,
+            )
+            return result
+
+    async def apply_filter_batch(
+        self,
+        requests: Sequence[StyleRequest],
+        tick: int | None = None,
+    ) -> list[FilterResult]:
+        """
+        Apply style filter to many messages with one request per persona.
+        
+        Requests are grouped by persona and each group (split into chunks of
+        ``batch_size``) is rewritten by a single JSON-mode GPT-4o call; all
+        calls run concurrently. Results are matched back by index, and any
+        message missing from or malformed in the response keeps its original
+        text. When ``tick`` is given the pass is recorded in the per-tick
+        metrics.
+        
+        Args:
+            requests: Messages to style, in any persona order
+            tick: Simulation tick the messages belong to, if any
+            
+        Returns:
+            FilterResult per request, in the same order as ``requests``
+        """
+        start_time = time.time()
+        if not requests:
+            return []
+
+        if not self.is_enabled():
+            logger.debug("Style filter is globally disabled")
+            return [self._unchanged_result(request.message, True, "Filter disabled globally") for request in requests]
+
+        results: list[FilterResult | None] = [None] * len(requests)
+        by_persona: dict[int, list[int]] = {}
+        for index, request in enumerate(requests):
+            by_persona.setdefault(request.persona_id, []).append(index)
+
+        calls = []
+        for persona_id, indexes in by_persona.items():
+            if not self._is_persona_enabled(persona_id):
+                logger.debug(f"Style filter is disabled for persona {persona_id}")
+                for index in indexes:
+                    results[index] = self._unchanged_result(requests[index].message, True, "Filter disabled for persona")
+                continue
+            for offset in range(0, len(indexes), self.batch_size):
+                chunk = indexes[offset:offset + self.batch_size]
+                calls.append(self._apply_persona_batch(persona_id, [(index, requests[index]) for index in chunk]))
+
+        for chunk_results in await asyncio.gather(*calls):
+            for index, result in chunk_results:
+                results[index] = result
+
+        latency_ms = (time.time() - start_time) * 1000
+        final = [result for result in results if result is not None]
+        if calls:
+            logger.info(
+                f"Style filter batch: {len(requests)} messages from {len(by_persona)} personas "
+                f"in {len(calls)} requests, {latency_ms:.1f}ms"
+            )
+        if tick is not None:
+            await self.metrics.record_tick(
+                tick=tick,
+                messages=len(requests),
+                requests=len(calls),
+                tokens_used=sum(result.tokens_used for result in final),
+                latency_ms=latency_ms,
+                fallbacks=sum(1 for result in final if not result.success),
+            )
+        return final
+
+    async def _apply_persona_batch(
+        self,
+        persona_id: int,
+        items: list[tuple[int, StyleRequest]],
+    ) -> list[tuple[int, FilterResult]]:
+        """
+        Rewrite one persona's messages in a single request.
+        
+        Args:
+            persona_id: ID of the persona sending the messages
+            items: (caller index, request) pairs, all for ``persona_id``
+            
+        Returns:
+            (caller index, FilterResult) pairs for every item
+        """
+        start_time = time.time()
+        tokens = 0
+        try:
+            examples = await self.get_style_examples(persona_id)
+            if not examples:
+                logger.warning(
+                    f"No style examples available for persona {persona_id}, "
+                    "using original messages"
+                )
+                return [
+                    (index, self._unchanged_result(request.message, True, "No style examples available"))
+                    for index, request in items
+                ]
+
+            message_types = {request.message_type for _, request in items}
+            message_type = message_types.pop() if len(message_types) == 1 else "email and chat"
+            instructions = self._batch_json_instructions.get(self.locale, self._batch_json_instructions["en"])
+            system_prompt = f"{self._build_filter_prompt(examples, message_type)}\n\n{instructions}"
+            payload = {
+                "messages": [
+                    {"index": position, "type": request.message_type, "text": request.message}
+                    for position, (_, request) in enumerate(items)
+                ]
+            }
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": json.dumps(payload, ensure_ascii=False)},
+            ]
+
+            logger.info(f"Applying style filter for persona {persona_id} ({len(items)} messages)")
+
+            response, tokens = await agenerate_text(
+                messages,
+                model="gpt-4o",
+                priority=Priority.STYLE_FILTER,
+                cache_method="style_filter",
+                response_format={"type": "json_object"},
+            )
+            tokens = tokens or 0
+            styled = self._parse_batch_response(response, len(items))
+            error = None if len(styled) == len(items) else "Message missing from batch response"
+        except Exception as e:
+            styled = {}
+            error = f"Batch style filter failed: {e}"
+            logger.error(error, extra={"persona_id": persona_id})
+
+        latency_ms = (time.time() - start_time) * 1000
+        if len(styled) < len(items):
+            logger.warning(
+                f"Style filter batch for persona {persona_id}: {len(items) - len(styled)} of "
+                f"{len(items)} messages fell back to the original"
+            )
+
+        # Tokens are shared by the whole request; split them across its messages
+        share, remainder = divmod(tokens, len(items))
+        results = []
+        for position, (index, request) in enumerate(items):
+            message_tokens = share + (remainder if position == 0 else 0)
+            success = position in styled
+            await self.metrics.record_transformation(
+                persona_id=persona_id,
+                message_type=request.message_type,
+                tokens_used=message_tokens,
+                latency_ms=latency_ms,
+                success=success,
+            )
+            results.append((
+                index,
+                FilterResult(
+                    styled_message=styled.get(position, request.message),
+                    original_message=request.message,
+                    tokens_used=message_tokens,
+                    latency_ms=latency_ms,
+                    success=success,
+                    error=None if success else error,
+                ),
+            ))
+        return results
+
+    def _parse_batch_response(self, response: str, count: int) -> dict[int, str]:
+        """
+        Extract styled messages from a batch response by index.
+        
+        Entries with an unknown index or a missing/blank "text" are skipped,
+        so only those messages fall back to their original text.
+        
+        Args:
+            response: Raw model output
+            count: Number of messages that were sent
+            
+        Returns:
+            Mapping of message position to styled text
+        """
+        try:
+            parsed = json.loads(self._strip_code_fences(response))
+        except json.JSONDecodeError as e:
+            logger.warning(f"Style filter batch response is not valid JSON: {e}")
+            return {}
+        entries = parsed.get("messages") if isinstance(parsed, dict) else parsed
+        if not isinstance(entries, list):
+            return {}
+
+        styled: dict[int, str] = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            index = entry.get("index")
+            text = entry.get("text")
+            if isinstance(index, bool) or not isinstance(index, int) or not 0 <= index < count:
+                continue
+            if isinstance(text, str) and text.strip():
+                styled[index] = text.strip()
+        return styled
+
+    @staticmethod
+    def _unchanged_result(message: str, success: bool, error: str | None) -> FilterResult:
+        return FilterResult(
+            styled_message=message,
+            original_message=message,
+            tokens_used=0,
+            latency_ms=0.0,
+            success=success,
+            error=error,
+        )
@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import logging
 import sqlite3
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any
 
@@ -32,6 +33,7 @@ class FilterMetrics:
     Attributes:
         db_connection: SQLite database connection
         batch_size: Number of transformations to batch before writing (default: 10)
+        max_tick_history: Number of recent ticks kept for per-tick batch metrics
     """
 
     # GPT-4o pricing (as of 2024)
@@ -39,17 +41,21 @@ class FilterMetrics:
     # Assuming roughly 50/50 split for style transformations
     TOKEN_COST_PER_1M = 6.25  # Average of input and output costs
 
-    def __init__(self, db_connection: Connection, batch_size: int = 10):
+    def __init__(self, db_connection: Connection, batch_size: int = 10, max_tick_history: int = 1440):
         """
         Initialize the filter metrics tracker.
         
         Args:
             db_connection: SQLite database connection
             batch_size: Number of transformations to batch before writing (default: 10)
+            max_tick_history: Number of recent ticks kept in memory for
+                per-tick batch metrics (default: 1440, one simulated day)
         """
         self.db_connection = db_connection
         self.batch_size = batch_size
+        self.max_tick_history = max(1, max_tick_history)
         self._pending_records: list[tuple] = []
+        self._tick_metrics: OrderedDict[int, dict[str, Any]] = OrderedDict()
         self._ensure_table_exists()
 
     def _ensure_table_exists(self) -> None:
@@ -132,6 +138,77 @@ class FilterMetrics:
         if len(self._pending_records) >= self.batch_size:
             await self._flush_batch()
 
+    async def record_tick(
+        self,
+        tick: int,
+        messages: int,
+        requests: int,
+        tokens_used: int,
+        latency_ms: float,
+        fallbacks: int,
+    ) -> None:
+        """
+        Record one batched styling pass for a simulation tick.
+        
+        Several passes in the same tick (for example emails and chat flushed
+        separately) are summed into a single entry. Only the most recent
+        ``max_tick_history`` ticks are kept, in memory.
+        
+        Args:
+            tick: Simulation tick the messages were sent in
+            messages: Number of messages styled in the pass
+            requests: Number of GPT-4o requests the pass made
+            tokens_used: Tokens consumed across those requests
+            latency_ms: Wall-clock time of the pass in milliseconds
+            fallbacks: Messages that kept their original text
+        """
+        entry = self._tick_metrics.get(tick)
+        if entry is None:
+            entry = {
+                "tick": tick,
+                "messages": 0,
+                "requests": 0,
+                "tokens_used": 0,
+                "latency_ms": 0.0,
+                "fallbacks": 0,
+            }
+            self._tick_metrics[tick] = entry
+            while len(self._tick_metrics) > self.max_tick_history:
+                self._tick_metrics.popitem(last=False)
+        entry["messages"] += messages
+        entry["requests"] += requests
+        entry["tokens_used"] += tokens_used
+        entry["latency_ms"] += latency_ms
+        entry["fallbacks"] += fallbacks
+
+        logger.debug(
+            f"Recorded tick {tick} style batch: {messages} messages in {requests} requests, "
+            f"tokens={tokens_used}, latency={latency_ms:.1f}ms, fallbacks={fallbacks}"
+        )
+
+    def get_tick_metrics(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """
+        Get per-tick batch metrics, oldest first.
+        
+        Args:
+            limit: Return only the most recent ``limit`` ticks (default: all kept)
+            
+        Returns:
+            List of dictionaries with tick, messages, requests, tokens_used,
+            latency_ms, fallbacks and estimated_cost_usd
+        """
+        entries = list(self._tick_metrics.values())
+        if limit is not None:
+            entries = entries[-limit:] if limit > 0 else []
+        return [
+            {
+                **entry,
+                "latency_ms": round(entry["latency_ms"], 2),
+                "estimated_cost_usd": (entry["tokens_used"] / 1_000_000) * self.TOKEN_COST_PER_1M,
+            }
+            for entry in entries
+        ]
+
     async def _flush_batch(self) -> None:
         """
         Write pending transformation records to the database.
@@ -4,6 +4,8 @@ Data models for the Communication Style Filter.
 This module defines the core data structures used throughout the style filter system:
 - StyleExample: Individual communication style examples
 - FilterResult: Result of a style transformation operation
+- EmailFilterResult: Result of styling an email subject and body together
+- StyleRequest: One message queued for a batched, multi-message transformation
 - FilterMetricsSummary: Aggregated metrics for filter usage
 """
 
@@ -130,6 +132,68 @@ class FilterResult:
         }
 
 
+@dataclass
+class EmailFilterResult:
+    """
+    Result of styling an email's subject and body in a single request.
+    
+    Attributes:
+        styled_subject: The transformed subject line
+        styled_body: The transformed body
+        original_subject: The subject before transformation
+        original_body: The body before transformation
+        tokens_used: Number of tokens consumed by the GPT-4o API call
+        latency_ms: Time taken for the transformation in milliseconds
+        success: Whether the transformation succeeded
+        error: Error message if transformation failed, None otherwise
+    """
+
+    styled_subject: str
+    styled_body: str
+    original_subject: str
+    original_body: str
+    tokens_used: int
+    latency_ms: float
+    success: bool
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert to dictionary for JSON serialization.
+        
+        Returns:
+            Dictionary representation of the filter result
+        """
+        return {
+            "styled_subject": self.styled_subject,
+            "styled_body": self.styled_body,
+            "original_subject": self.original_subject,
+            "original_body": self.original_body,
+            "tokens_used": self.tokens_used,
+            "latency_ms": self.latency_ms,
+            "success": self.success,
+            "error": self.error,
+        }
+
+
+@dataclass
+class StyleRequest:
+    """
+    A message waiting to be styled as part of a batched transformation.
+    
+    Requests for the same persona are rewritten together in one GPT-4o call.
+    
+    Attributes:
+        persona_id: ID of the persona sending the message
+        message: The original message content
+        message_type: Type of message ("email" or "chat")
+    """
+
+    persona_id: int
+    message: str
+    message_type: Literal["email", "chat"]
+
+
 @dataclass
 class FilterMetricsSummary:
     """
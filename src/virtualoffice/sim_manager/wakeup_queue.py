@@ -0,0 +1,111 @@
+"""
+Wake-up Queue for event-driven auto-ticks
+
+On most auto-ticks most personas have nothing to do: no communication is
+scheduled for the minute, their inbox is empty and their work window did not
+just start. This module lets the engine visit only the personas with due work:
+
+- ``WakeupQueue`` is a min-heap of ``(tick, person_id)`` wake-ups (scheduled
+  communications, inbox arrivals, status-override expiries, work-window
+  starts for messages held off-hours).
+- ``TickRound`` walks one tick's due personas in roster order and still
+  accepts personas woken during the round, so a message from someone earlier
+  in the roster is picked up in the same tick, exactly as a full roster scan
+  would.
+
+Waking a persona that turns out to have nothing due is harmless: the engine
+visits it and moves on. Missing a wake-up is not, so callers wake generously.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+from typing import Iterable, Iterator, Sequence
+
+from .schemas import PersonRead
+
+
+class WakeupQueue:
+    """Min-heap of per-persona wake-ups keyed by tick.
+
+    A wake-up at a tick that has already been reached fires on the next tick
+    the engine processes. Duplicate ``(tick, person_id)`` entries are ignored.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[int, int]] = []
+        self._pending: set[tuple[int, int]] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, person_id: int, tick: int) -> None:
+        """Wake ``person_id`` at ``tick``."""
+        key = (tick, person_id)
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+            heapq.heappush(self._heap, key)
+
+    def next_tick(self) -> int | None:
+        """Tick of the earliest pending wake-up, if any."""
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, tick: int) -> set[int]:
+        """Remove and return the ids of everyone due at or before ``tick``."""
+        due: set[int] = set()
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= tick:
+                key = heapq.heappop(heap)
+                self._pending.discard(key)
+                due.add(key[1])
+        return due
+
+    def clear(self) -> None:
+        with self._lock:
+            self._heap.clear()
+            self._pending.clear()
+
+
+class TickRound:
+    """The personas to visit in one tick, in roster order.
+
+    Args:
+        people: The active roster, in visiting order
+        positions: Person id -> index in ``people``
+        due: Ids of the personas due this tick; unknown ids are ignored
+    """
+
+    def __init__(self, people: Sequence[PersonRead], positions: dict[int, int], due: Iterable[int]):
+        self._people = people
+        self._positions = positions
+        self._heap = sorted({positions[person_id] for person_id in due if person_id in positions})
+        self._queued = set(self._heap)
+        self._current = -1
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def wake(self, person_id: int) -> bool:
+        """Add ``person_id`` to this round if it has not been visited yet.
+
+        Returns False when the persona was already visited (or is not in the
+        roster); the caller should then wake it on a later tick.
+        """
+        position = self._positions.get(person_id)
+        if position is None or position <= self._current:
+            return False
+        if position not in self._queued:
+            self._queued.add(position)
+            heapq.heappush(self._heap, position)
+        return True
+
+    def __iter__(self) -> Iterator[PersonRead]:
+        while self._heap:
+            self._current = heapq.heappop(self._heap)
+            yield self._people[self._current]
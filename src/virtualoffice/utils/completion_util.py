@@ -1,12 +1,11 @@
 import os
 import json
-import time
+import atexit
 import logging
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
 from dotenv import load_dotenv
-from openai import OpenAI, AzureOpenAI
 
 load_dotenv()
 
@@ -41,10 +40,6 @@ _MODEL_FALLBACKS = {
     "gpt-3.5-turbo": "gpt-4o-mini",  # gpt-3.5-turbo not available in Azure
 }
 
-# Client cache
-_client: Optional[OpenAI] = None
-_azure_client: Optional[AzureOpenAI] = None
-
 # Token tracking
 _TOKEN_USAGE_FILE = Path(__file__).parent.parent.parent.parent / "token_usage.json"
 
@@ -63,43 +58,141 @@ def _is_mini_model(model: str) -> bool:
     return "mini" in model_lower or "nano" in model_lower
 
 
+def _empty_usage() -> dict[str, dict[str, int]]:
+    return {
+        "openai_key1": {"mini": 0, "regular": 0},
+        "openai_key2": {"mini": 0, "regular": 0},
+        "azure": {"mini": 0, "regular": 0},
+    }
+
+
+def _utc_today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+class TokenUsageLedger:
+    """
+    Thread-safe in-memory daily/lifetime token counters backed by a JSON file.
+
+    The file is read once on first use. Updates only touch memory; a daemon
+    thread writes them back every ``flush_interval`` seconds (and at exit) via
+    a temp file + ``os.replace`` so readers never see a half-written file.
+    Daily counters reset when the UTC date changes.
+    """
+
+    def __init__(self, path: Path, flush_interval: float = 5.0) -> None:
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # serializes flushes (background thread vs atexit)
+        self._data: dict | None = None
+        self._dirty = False
+        self._stop = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    def _load(self) -> dict:
+        # Caller holds the lock
+        if self._data is None:
+            data = None
+            if self.path.exists():
+                try:
+                    with open(self.path, "r") as f:
+                        data = json.load(f)
+                except (OSError, json.JSONDecodeError) as exc:
+                    logger.warning(f"Could not read {self.path}, starting fresh token usage: {exc}")
+            if not isinstance(data, dict):
+                data = {"last_reset_date": _utc_today(), "daily_usage": _empty_usage(), "lifetime_usage": _empty_usage()}
+            data.setdefault("daily_usage", _empty_usage())
+            data.setdefault("lifetime_usage", _empty_usage())
+            self._data = data
+        # Reset daily usage if new day
+        today = _utc_today()
+        if self._data.get("last_reset_date") != today:
+            self._data["last_reset_date"] = today
+            self._data["daily_usage"] = _empty_usage()
+            self._dirty = True
+        return self._data
+
+    def daily(self, provider: str, model_type: str) -> int:
+        """Tokens used today by ``provider`` for ``model_type`` ("mini"/"regular")."""
+        with self._lock:
+            return self._load()["daily_usage"].get(provider, {}).get(model_type, 0)
+
+    def record(self, tokens: int, provider: str, model_type: str) -> None:
+        with self._lock:
+            data = self._load()
+            for bucket in ("daily_usage", "lifetime_usage"):
+                counters = data[bucket].setdefault(provider, {"mini": 0, "regular": 0})
+                counters[model_type] = counters.get(model_type, 0) + tokens
+            self._dirty = True
+        self._ensure_flusher()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return json.loads(json.dumps(self._load()))
+
+    def replace(self, data: dict) -> None:
+        with self._lock:
+            self._data = json.loads(json.dumps(data))
+            self._dirty = True
+
+    def flush(self) -> bool:
+        """Write pending changes to disk; returns True if anything was written."""
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty or self._data is None:
+                    return False
+                payload = json.dumps(self._data, indent=2)
+                self._dirty = False
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            try:
+                with open(tmp_path, "w") as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.path)
+            except OSError as exc:
+                with self._lock:
+                    self._dirty = True
+                logger.warning(f"Failed to write token usage to {self.path}: {exc}")
+                return False
+            return True
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None or self.flush_interval <= 0:
+            return
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._run_flusher, name="token-usage-flush", daemon=True)
+            self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the background flusher and write any pending changes."""
+        self._stop.set()
+        self.flush()
+
+
+try:
+    _TOKEN_USAGE_FLUSH_SECONDS = float(os.getenv("VDOS_TOKEN_USAGE_FLUSH_SECONDS", "5"))
+except ValueError:
+    _TOKEN_USAGE_FLUSH_SECONDS = 5.0
+
+_usage_ledger = TokenUsageLedger(_TOKEN_USAGE_FILE, _TOKEN_USAGE_FLUSH_SECONDS)
+atexit.register(_usage_ledger.close)
+
+
 def _load_token_usage() -> dict:
-    """Load token usage from file, reset if new day."""
-    if not _TOKEN_USAGE_FILE.exists():
-        return {
-            "last_reset_date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
-            "daily_usage": {
-                "openai_key1": {"mini": 0, "regular": 0},
-                "openai_key2": {"mini": 0, "regular": 0},
-                "azure": {"mini": 0, "regular": 0},
-            },
-            "lifetime_usage": {
-                "openai_key1": {"mini": 0, "regular": 0},
-                "openai_key2": {"mini": 0, "regular": 0},
-                "azure": {"mini": 0, "regular": 0},
-            },
-        }
-
-    with open(_TOKEN_USAGE_FILE, "r") as f:
-        data = json.load(f)
-
-    # Reset daily usage if new day
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    if data.get("last_reset_date") != today:
-        data["last_reset_date"] = today
-        data["daily_usage"] = {
-            "openai_key1": {"mini": 0, "regular": 0},
-            "openai_key2": {"mini": 0, "regular": 0},
-            "azure": {"mini": 0, "regular": 0},
-        }
-
-    return data
+    """Return a copy of the current token usage (daily counters reset if new day)."""
+    return _usage_ledger.snapshot()
 
 
 def _save_token_usage(data: dict) -> None:
-    """Save token usage to file."""
-    with open(_TOKEN_USAGE_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    """Replace the token usage counters and write them to disk."""
+    _usage_ledger.replace(data)
+    _usage_ledger.flush()
 
 
 def _record_tokens(tokens: int, provider: str, model: str) -> None:
@@ -107,19 +200,8 @@ def _record_tokens(tokens: int, provider: str, model: str) -> None:
     if tokens is None or tokens <= 0:
         return
 
-    data = _load_token_usage()
     model_type = "mini" if _is_mini_model(model) else "regular"
-
-    # Ensure provider exists in data structure
-    if provider not in data["daily_usage"]:
-        data["daily_usage"][provider] = {"mini": 0, "regular": 0}
-    if provider not in data["lifetime_usage"]:
-        data["lifetime_usage"][provider] = {"mini": 0, "regular": 0}
-
-    data["daily_usage"][provider][model_type] += tokens
-    data["lifetime_usage"][provider][model_type] += tokens
-
-    _save_token_usage(data)
+    _usage_ledger.record(tokens, provider, model_type)
 
 
 def _choose_provider(model: str) -> tuple[str, bool]:
@@ -156,23 +238,22 @@ def _choose_provider(model: str) -> tuple[str, bool]:
         return ("azure", True)
 
     # Auto mode: Choose based on free tier limits (legacy behavior)
-    data = _load_token_usage()
     model_type = "mini" if _is_mini_model(model) else "regular"
     limit = _FREE_TIER_LIMITS[model_type]
 
     # Priority: OPENAI_API_KEY (key1) -> OPENAI_API_KEY2 (key2) -> Azure
 
     # Check OPENAI_API_KEY (key1)
-    if _API_KEY and data["daily_usage"]["openai_key1"][model_type] < limit:
+    if _API_KEY and _usage_ledger.daily("openai_key1", model_type) < limit:
         return ("openai_key1", False)
 
     # Check OPENAI_API_KEY2 (key2)
-    if _API_KEY2 and data["daily_usage"]["openai_key2"][model_type] < limit:
+    if _API_KEY2 and _usage_ledger.daily("openai_key2", model_type) < limit:
         logger.info(f"Switching to OPENAI_API_KEY2 (key1 free tier limit reached for {model_type})")
         return ("openai_key2", False)
 
     # Check Azure
-    if _AZURE_ENDPOINT and _AZURE_API_KEY and data["daily_usage"]["azure"][model_type] < limit:
+    if _AZURE_ENDPOINT and _AZURE_API_KEY and _usage_ledger.daily("azure", model_type) < limit:
         logger.info(f"Switching to Azure OpenAI (OpenAI free tier limits reached for {model_type})")
         return ("azure", True)
 
@@ -194,42 +275,19 @@ def _choose_provider(model: str) -> tuple[str, bool]:
     raise RuntimeError("No API keys configured")
 
 
-def _get_openai_client(api_key: str) -> OpenAI:
-    """Get OpenAI API client."""
-    return OpenAI(api_key=api_key, timeout=_DEFAULT_TIMEOUT, max_retries=2)
-
-
-def _get_azure_client() -> AzureOpenAI:
-    """Get Azure OpenAI client."""
-    global _azure_client
-    if _azure_client is None:
-        if not _AZURE_ENDPOINT or not _AZURE_API_KEY:
-            raise RuntimeError("Azure OpenAI not configured (missing AZURE_OPENAI_ENDPOINT or AZURE_OPENAI_API_KEY)")
-        _azure_client = AzureOpenAI(
-            azure_endpoint=_AZURE_ENDPOINT,
-            api_key=_AZURE_API_KEY,
-            api_version=_AZURE_API_VERSION,
-            timeout=_DEFAULT_TIMEOUT,
-            max_retries=2,
-        )
-    return _azure_client
+def _api_key_for(provider: str) -> str | None:
+    """Return the OpenAI API key backing an ``openai_key*`` provider."""
+    return _API_KEY if provider == "openai_key1" else _API_KEY2
 
 
-def generate_text(
-    prompt: list[dict],
-    model: str = "gpt-4o-mini",
-    temperature: float | None = None
-) -> tuple[str, int | None]:
+def _prepare_request(model: str, temperature: float | None) -> tuple[str, bool, str, str, float | None]:
     """
-    Generate text using OpenAI API with automatic provider selection.
+    Resolve provider, model and temperature for a completion request.
 
-    Args:
-        prompt: List of message dicts with 'role' and 'content'
-        model: Model name (default: gpt-4o-mini)
-        temperature: Sampling temperature 0.0-2.0 (default: None uses API default ~1.0)
-                     Lower = more deterministic, Higher = more random
+    Applies the FIX_ALL_GPT_MODEL override, the default temperature, provider
+    selection and the model fallbacks (including the Azure model whitelist).
 
-    Priority: OPENAI_API_KEY (free tier) -> OPENAI_API_KEY2 (free tier) -> Azure
+    Returns: (provider, use_azure, requested_model, actual_model, temperature)
     """
     # Experimental: Override model if FIX_ALL_GPT_MODEL is enabled
     fix_all_gpt = os.getenv("FIX_ALL_GPT_MODEL", "false").lower() == "true"
@@ -260,68 +318,52 @@ def generate_text(
         if actual_model not in _AVAILABLE_AZURE_MODELS:
             actual_model = "gpt-4o-mini"
 
-    start_time = time.time()
+    return provider, use_azure, model, actual_model, temperature
 
-    # Prepare common parameters
-    completion_params = {
-        "model": actual_model,
-        "messages": prompt,
-        "timeout": _DEFAULT_TIMEOUT,
-    }
-    if temperature is not None:
-        completion_params["temperature"] = temperature
-
-    try:
-        if use_azure:
-            # Azure OpenAI
-            client = _get_azure_client()
-            response = client.chat.completions.create(**completion_params)
-        else:
-            # OpenAI API (key1 or key2)
-            api_key = _API_KEY if provider == "openai_key1" else _API_KEY2
-            client = _get_openai_client(api_key)
-            response = client.chat.completions.create(**completion_params)
-
-        # Log slow API calls
-        duration = time.time() - start_time
-        if duration > 10:
-            logger.warning(f"Slow GPT API call: {duration:.1f}s for {actual_model} ({provider})")
-
-    except Exception as exc:
-        # Try fallback model
-        fb = _MODEL_FALLBACKS.get(model)
-        if fb and fb != actual_model:
-            try:
-                fallback_params = {
-                    "model": fb,
-                    "messages": prompt,
-                    "timeout": _DEFAULT_TIMEOUT,
-                }
-                if temperature is not None:
-                    fallback_params["temperature"] = temperature
-
-                if use_azure:
-                    if fb in _AVAILABLE_AZURE_MODELS:
-                        response = _get_azure_client().chat.completions.create(**fallback_params)
-                    else:
-                        raise exc
-                else:
-                    api_key = _API_KEY if provider == "openai_key1" else _API_KEY2
-                    response = _get_openai_client(api_key).chat.completions.create(**fallback_params)
-                actual_model = fb
-            except Exception:
-                raise RuntimeError(f"OpenAI completion failed: {exc}") from exc
-        else:
-            raise RuntimeError(f"OpenAI completion failed: {exc}") from exc
-
-    message = response.choices[0].message.content
-    tokens = getattr(getattr(response, "usage", None), "total_tokens", None)
-
-    # Record token usage
-    if tokens:
-        _record_tokens(tokens, provider, actual_model)
-
-    return message, tokens
+
+def generate_text(
+    prompt: list[dict],
+    model: str = "gpt-4o-mini",
+    temperature: float | None = None,
+    priority: int | None = None,
+    cache_method: str | None = None,
+    **params,
+) -> tuple[str, int | None]:
+    """
+    Generate text using OpenAI API with automatic provider selection.
+
+    Synchronous facade over ``llm_client.agenerate_text``: the request runs on
+    the shared background event loop with pooled async clients, and only the
+    calling thread blocks. Coroutines already running on that loop must await
+    ``agenerate_text`` instead.
+
+    Args:
+        prompt: List of message dicts with 'role' and 'content'
+        model: Model name (default: gpt-4o-mini)
+        temperature: Sampling temperature 0.0-2.0 (default: None uses API default ~1.0)
+                     Lower = more deterministic, Higher = more random
+        priority: ``llm_scheduler.Priority`` lane (default: the caller's priority_scope)
+        cache_method: Label for response-cache TTLs/counters (default: the caller's cache_method_scope)
+        **params: Extra chat.completions parameters (e.g. max_tokens)
+
+    Priority: OPENAI_API_KEY (free tier) -> OPENAI_API_KEY2 (free tier) -> Azure
+    """
+    # Imported lazily: llm_client builds on the helpers in this module
+    from .llm_client import agenerate_text, run_sync
+    from .llm_cache import current_cache_method
+    from .llm_scheduler import current_priority
+
+    # Resolve the scopes here: the caller's context does not follow the
+    # coroutine onto the loop thread
+    if priority is None:
+        priority = current_priority()
+    if cache_method is None:
+        cache_method = current_cache_method()
+    return run_sync(
+        agenerate_text(
+            prompt, model=model, temperature=temperature, priority=priority, cache_method=cache_method, **params
+        )
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,234 @@
+"""
+Content-addressed cache for LLM chat completions.
+
+Responses are keyed by a SHA-256 of (model, messages, temperature, extra
+request parameters), so rerunning a scenario with the same seed replays
+identical prompts from disk instead of paying for them again.
+
+The cache is opt-in (``VDOS_LLM_CACHE=1``) and lives in its own SQLite file
+(``VDOS_LLM_CACHE_PATH``). It is bounded by entry count with LRU eviction
+(``VDOS_LLM_CACHE_MAX_ENTRIES``) and supports a default TTL plus per-method
+TTLs (``VDOS_LLM_CACHE_TTL_SECONDS``, ``VDOS_LLM_CACHE_TTLS``).
+
+Callers label their requests with ``cache_method_scope("hourly_plan")`` or
+``cache_method=`` so TTLs and hit/miss counters are tracked per method.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_CACHE_PATH = Path(__file__).parent.parent.parent.parent / "llm_cache.sqlite3"
+DEFAULT_METHOD = "default"
+
+_current_method: contextvars.ContextVar[str | None] = contextvars.ContextVar("vdos_llm_cache_method", default=None)
+
+
+def current_cache_method() -> str:
+    """Method label set by the innermost ``cache_method_scope`` (``"default"`` if none)."""
+    return _current_method.get() or DEFAULT_METHOD
+
+
+@contextmanager
+def cache_method_scope(method: str | None) -> Iterator[None]:
+    """Label LLM calls made inside the block for TTLs and hit/miss counters."""
+    if method is None:
+        yield
+        return
+    token = _current_method.set(method)
+    try:
+        yield
+    finally:
+        _current_method.reset(token)
+
+
+def make_key(model: str, messages: list[dict], temperature: float | None, params: dict[str, Any] | None = None) -> str:
+    """Stable content hash of a chat-completion request."""
+    payload = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "params": params or {},
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed LRU cache of (text, tokens) responses."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_entries: int = 50_000,
+        default_ttl: float = 0.0,
+        ttls: dict[str, float] | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.max_entries = max(1, max_entries)
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._counters: dict[str, dict[str, int]] = {}
+        self._evictions = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Caller holds the lock
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    method TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    tokens INTEGER,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access);
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def _ttl(self, method: str) -> float:
+        return self.ttls.get(method, self.default_ttl)
+
+    def _count(self, method: str, field: str) -> None:
+        counters = self._counters.setdefault(method, {"hits": 0, "misses": 0, "stores": 0})
+        counters[field] += 1
+
+    def get(self, key: str, method: str = DEFAULT_METHOD) -> tuple[str, int | None] | None:
+        now = time.time()
+        ttl = self._ttl(method)
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT response, tokens, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and ttl > 0 and now - row[2] > ttl:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self._count(method, "misses")
+                return None
+            conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._count(method, "hits")
+            return row[0], row[1]
+
+    def put(self, key: str, response: str, tokens: int | None, method: str = DEFAULT_METHOD, model: str = "") -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache(key, method, model, response, tokens, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, method, model, response, tokens, now, now),
+            )
+            self._count(method, "stores")
+            excess = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                    (excess,),
+                )
+                self._evictions += excess
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM llm_cache")
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries = self._connection().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            methods = {method: dict(counters) for method, counters in self._counters.items()}
+            evictions = self._evictions
+        hits = sum(c["hits"] for c in methods.values())
+        misses = sum(c["misses"] for c in methods.values())
+        return {
+            "enabled": True,
+            "path": str(self.path),
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "evictions": evictions,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "methods": methods,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_cache: LLMResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def _load_ttls() -> dict[str, float]:
+    raw = os.getenv("VDOS_LLM_CACHE_TTLS", "").strip()
+    if not raw:
+        return {}
+    try:
+        return {str(method): float(ttl) for method, ttl in json.loads(raw).items()}
+    except (AttributeError, TypeError, ValueError):
+        logger.warning("[LLM_CACHE] Ignoring invalid VDOS_LLM_CACHE_TTLS (expected JSON object of seconds)")
+        return {}
+
+
+def get_cache() -> LLMResponseCache | None:
+    """Return the process-wide cache, or None when caching is disabled."""
+    global _cache
+    if os.getenv("VDOS_LLM_CACHE", "0").strip().lower() not in {"1", "true", "yes", "on"}:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                max_entries = int(os.getenv("VDOS_LLM_CACHE_MAX_ENTRIES", "50000"))
+            except ValueError:
+                max_entries = 50_000
+            try:
+                default_ttl = float(os.getenv("VDOS_LLM_CACHE_TTL_SECONDS", "0"))
+            except ValueError:
+                default_ttl = 0.0
+            _cache = LLMResponseCache(
+                os.getenv("VDOS_LLM_CACHE_PATH") or _DEFAULT_CACHE_PATH,
+                max_entries=max_entries,
+                default_ttl=default_ttl,
+                ttls=_load_ttls(),
+            )
+        return _cache
+
+
+def cache_stats() -> dict[str, Any]:
+    cache = get_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
+
+
+def reset_cache() -> None:
+    """Close the process-wide cache so the next ``get_cache`` re-reads the environment."""
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+        _cache = None
@@ -0,0 +1,331 @@
+"""
+Shared async LLM client for the whole process.
+
+All GPT traffic (planner, plan parser, style filter, communication generator,
+clustering labels) goes through one set of pooled ``AsyncOpenAI`` /
+``AsyncAzureOpenAI`` clients running on a single long-lived background event
+loop, so HTTP connections and the concurrency limit are shared instead of
+being rebuilt per call or per tick.
+
+- Async code running on the shared loop awaits ``agenerate_text`` directly.
+- Synchronous code calls ``run_sync(coro)`` (or ``completion_util.generate_text``),
+  which submits the coroutine to the loop and blocks only the calling thread.
+
+Admission (concurrency, rate limits, priority lanes, 429 backoff) is handled by
+``llm_scheduler.LLMScheduler``; the pooled clients do not retry on their own.
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Coroutine, TypeVar
+
+from openai import APIConnectionError, AsyncAzureOpenAI, AsyncOpenAI
+
+from . import completion_util as _cu
+from .llm_cache import current_cache_method, get_cache, make_key
+from .llm_scheduler import LLMScheduler, Priority, current_priority, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """An asyncio event loop running forever on a daemon thread."""
+
+    def __init__(self, name: str = "vdos-llm-loop") -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is not None and self._thread is not None and self._thread.is_alive():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_run, name=self.name, daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop, self._thread = loop, thread
+            return loop
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._ensure_started()
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "Future[T]":
+        """Schedule ``coro`` on the loop and return a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Run ``coro`` on the loop and block the calling thread for its result."""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError(
+                "Blocking call made from the shared LLM event loop; await the coroutine instead"
+            )
+        return self.submit(coro).result(timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is None or thread is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+
+
+def _retry_after(exc: Exception) -> float | None:
+    """Seconds requested by a ``Retry-After``/``retry-after-ms`` header, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000.0
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_transient(exc: Exception) -> bool:
+    status_code = getattr(exc, "status_code", None)
+    return isinstance(exc, APIConnectionError) or status_code in (408, 409) or (status_code or 0) >= 500
+
+
+class AsyncLLMClient:
+    """Pooled async chat-completion clients behind a shared scheduler.
+
+    Provider selection, model fallbacks and token accounting follow
+    ``completion_util``; this class owns the clients and retries, and asks
+    its ``LLMScheduler`` for a slot before every attempt. The clients and the
+    scheduler are bound to the loop they are first used on, so use one
+    instance per loop (the module-level instance lives on the shared
+    background loop).
+    """
+
+    def __init__(self, max_concurrency: int | None = None, max_retries: int | None = None) -> None:
+        if max_concurrency is None:
+            try:
+                max_concurrency = int(os.getenv("VDOS_LLM_MAX_CONCURRENCY", "16"))
+            except ValueError:
+                max_concurrency = 16
+        if max_retries is None:
+            try:
+                max_retries = int(os.getenv("VDOS_LLM_MAX_RETRIES", "2"))
+            except ValueError:
+                max_retries = 2
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.scheduler = LLMScheduler(max_concurrency=self.max_concurrency)
+        self._clients: dict[str, Any] = {}
+
+    def _client_for(self, provider: str) -> Any:
+        client = self._clients.get(provider)
+        if client is not None:
+            return client
+        if provider == "azure":
+            if not _cu._AZURE_ENDPOINT or not _cu._AZURE_API_KEY:
+                raise RuntimeError("Azure OpenAI not configured (missing AZURE_OPENAI_ENDPOINT or AZURE_OPENAI_API_KEY)")
+            client = AsyncAzureOpenAI(
+                azure_endpoint=_cu._AZURE_ENDPOINT,
+                api_key=_cu._AZURE_API_KEY,
+                api_version=_cu._AZURE_API_VERSION,
+                timeout=_cu._DEFAULT_TIMEOUT,
+                max_retries=0,
+            )
+        else:
+            client = AsyncOpenAI(api_key=_cu._api_key_for(provider), timeout=_cu._DEFAULT_TIMEOUT, max_retries=0)
+        self._clients[provider] = client
+        return client
+
+    async def _create(self, provider: str, params: dict[str, Any], priority: Priority) -> Any:
+        model = params["model"]
+        cost = estimate_tokens(params["messages"], params.get("max_tokens"))
+        attempt = 0
+        while True:
+            async with self.scheduler.slot(provider, model, priority, cost):
+                try:
+                    response = await self._client_for(provider).chat.completions.create(**params)
+                except Exception as exc:
+                    if attempt >= self.max_retries:
+                        raise
+                    if getattr(exc, "status_code", None) == 429:
+                        # Pauses every queued request for this provider/model
+                        self.scheduler.record_rate_limited(provider, model, _retry_after(exc))
+                        delay = 0.0
+                    elif _is_transient(exc):
+                        delay = self.scheduler.backoff_base * (2 ** attempt)
+                    else:
+                        raise
+                else:
+                    tokens = getattr(getattr(response, "usage", None), "total_tokens", None)
+                    self.scheduler.record_success(provider, model, cost, tokens)
+                    return response
+            attempt += 1
+            self.scheduler.record_retry()
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def complete(
+        self,
+        prompt: list[dict],
+        model: str = "gpt-4o-mini",
+        temperature: float | None = None,
+        priority: Priority | None = None,
+        **extra: Any,
+    ) -> tuple[str, int | None]:
+        if priority is None:
+            priority = current_priority()
+        provider, use_azure, requested_model, actual_model, temperature = _cu._prepare_request(model, temperature)
+
+        start_time = time.time()
+        params: dict[str, Any] = {"model": actual_model, "messages": prompt, "timeout": _cu._DEFAULT_TIMEOUT, **extra}
+        if temperature is not None:
+            params["temperature"] = temperature
+
+        try:
+            response = await self._create(provider, params, priority)
+
+            # Log slow API calls
+            duration = time.time() - start_time
+            if duration > 10:
+                logger.warning(f"Slow GPT API call: {duration:.1f}s for {actual_model} ({provider})")
+
+        except Exception as exc:
+            # Try fallback model
+            fb = _cu._MODEL_FALLBACKS.get(requested_model)
+            if not fb or fb == actual_model or (use_azure and fb not in _cu._AVAILABLE_AZURE_MODELS):
+                raise RuntimeError(f"OpenAI completion failed: {exc}") from exc
+            try:
+                response = await self._create(provider, {**params, "model": fb}, priority)
+            except Exception:
+                raise RuntimeError(f"OpenAI completion failed: {exc}") from exc
+            actual_model = fb
+
+        message = response.choices[0].message.content
+        tokens = getattr(getattr(response, "usage", None), "total_tokens", None)
+
+        # Record token usage
+        if tokens:
+            _cu._record_tokens(tokens, provider, actual_model)
+
+        return message, tokens
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            try:
+                await client.close()
+            except Exception:  # pragma: no cover - best effort on shutdown
+                logger.debug("Failed to close LLM client", exc_info=True)
+
+
+_loop = BackgroundLoop()
+_client = AsyncLLMClient()
+
+
+def get_loop() -> BackgroundLoop:
+    """Return the shared background loop (started on first use)."""
+    return _loop
+
+
+def get_client() -> AsyncLLMClient:
+    return _client
+
+
+def run_sync(coro: Awaitable[T], timeout: float | None = None) -> T:
+    """Run a coroutine on the shared loop from synchronous code."""
+    return _loop.run(coro, timeout)  # type: ignore[arg-type]
+
+
+async def agenerate_text(
+    prompt: list[dict],
+    model: str = "gpt-4o-mini",
+    temperature: float | None = None,
+    priority: Priority | None = None,
+    cache_method: str | None = None,
+    **params: Any,
+) -> tuple[str, int | None]:
+    """
+    Async counterpart of ``completion_util.generate_text``.
+
+    Must run on the shared loop (``run_sync`` / ``get_loop().submit``) because
+    the pooled clients are bound to it; other loops are bridged onto it.
+    ``priority`` and ``cache_method`` default to the caller's scopes. When the
+    response cache is enabled, a hit is returned without calling the API and
+    reports 0 tokens; cache reads and writes are SQLite I/O, so they run in a
+    worker thread instead of blocking the shared loop.
+    """
+    if priority is None:
+        priority = current_priority()
+    if cache_method is None:
+        cache_method = current_cache_method()
+
+    cache = get_cache()
+    key = None
+    if cache is not None:
+        key = make_key(model, prompt, temperature, params)
+        cached = await asyncio.to_thread(cache.get, key, cache_method)
+        if cached is not None:
+            return cached[0], 0
+
+    call = _client.complete(prompt, model=model, temperature=temperature, priority=priority, **params)
+    if _loop.in_loop_thread():
+        result = await call
+    else:
+        result = await asyncio.wrap_future(_loop.submit(call))
+
+    if cache is not None and key is not None and result[0]:
+        await asyncio.to_thread(cache.put, key, result[0], result[1], cache_method, model)
+    return result
+
+
+def scheduler_stats() -> dict[str, Any]:
+    """Snapshot of the shared scheduler (queues, waits, limits, 429 backoff)."""
+    return _client.scheduler.stats()
+
+
+def shutdown() -> None:
+    """Close pooled clients and stop the background loop."""
+    if _loop._loop is None:
+        return
+    try:
+        _loop.run(_client.aclose(), timeout=5.0)
+    except Exception:  # pragma: no cover - best effort on shutdown
+        logger.debug("LLM client shutdown failed", exc_info=True)
+    _loop.stop()
+
+
+atexit.register(shutdown)
@@ -0,0 +1,402 @@
+"""
+Process-wide scheduler for LLM requests.
+
+Every chat completion sent through ``llm_client`` asks the scheduler for a
+slot first. The scheduler enforces:
+
+- a global in-flight cap (``VDOS_LLM_MAX_CONCURRENCY``),
+- token buckets per provider/model for requests per minute and tokens per
+  minute (``VDOS_LLM_RPM``, ``VDOS_LLM_TPM``, ``VDOS_LLM_RATE_LIMITS``),
+- priority lanes, so hourly plans go out before inbox replies, style
+  filtering, summaries and cluster labels when slots are scarce,
+- shared backoff after HTTP 429, honouring ``Retry-After``, so one rate-limit
+  response pauses every caller of that provider/model instead of all of them
+  retrying at once.
+
+Callers tag work with ``priority_scope(Priority.X)`` (sync code, captured in
+the calling thread) or pass ``priority=`` to ``agenerate_text``. The scheduler
+itself runs on the shared LLM event loop; ``stats()`` is safe from any thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Scheduling lanes; lower values are served first."""
+
+    HOURLY_PLAN = 0
+    INBOX_REPLY = 1
+    STYLE_FILTER = 2
+    SUMMARY = 3
+    CLUSTER_LABEL = 4
+
+
+DEFAULT_PRIORITY = Priority.SUMMARY
+
+_current_priority: contextvars.ContextVar[Priority | None] = contextvars.ContextVar(
+    "vdos_llm_priority", default=None
+)
+
+
+def current_priority() -> Priority:
+    """Priority set by the innermost ``priority_scope`` (``SUMMARY`` if none)."""
+    priority = _current_priority.get()
+    return DEFAULT_PRIORITY if priority is None else priority
+
+
+@contextmanager
+def priority_scope(priority: Priority | None) -> Iterator[None]:
+    """Tag LLM calls made inside the block with ``priority``.
+
+    ``None`` leaves the enclosing priority in place, so generic helpers can
+    accept an optional priority and let their caller decide.
+    """
+    if priority is None:
+        yield
+        return
+    token = _current_priority.set(Priority(priority))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def estimate_tokens(messages: list[dict], max_tokens: int | None = None) -> int:
+    """Rough token cost of a request (prompt chars / 4 plus the completion budget)."""
+    chars = sum(len(str(message.get("content") or "")) for message in messages)
+    return chars // 4 + (max_tokens or 512)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+class TokenBucket:
+    """Continuously refilling bucket; ``rate_per_min <= 0`` means unlimited."""
+
+    def __init__(self, rate_per_min: float) -> None:
+        self.rate_per_min = float(rate_per_min)
+        self.capacity = max(self.rate_per_min, 0.0)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate_per_min <= 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate_per_min / 60.0)
+
+    def delay_for(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` can be taken (0 if available now)."""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        # A single request larger than the whole bucket waits for a full bucket
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * 60.0 / self.rate_per_min
+
+    def take(self, amount: float, now: float) -> None:
+        if self.unlimited:
+            return
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        """Correct an earlier estimate once the real cost is known."""
+        if not self.unlimited:
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+
+@dataclass
+class _KeyState:
+    """Limits and backoff state for one provider/model pair."""
+
+    requests: TokenBucket
+    tokens: TokenBucket
+    blocked_until: float = 0.0
+    consecutive_429s: int = 0
+    rate_limited: int = 0
+    waiting: list = field(default_factory=list)
+
+    def delay(self, cost: int, now: float) -> float:
+        return max(
+            self.blocked_until - now,
+            self.requests.delay_for(1, now),
+            self.tokens.delay_for(cost, now),
+        )
+
+
+@dataclass
+class _LaneStats:
+    queued: int = 0
+    granted: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "queued": self.queued,
+            "granted": self.granted,
+            "avg_wait_ms": round(self.wait_seconds_total * 1000 / self.granted, 1) if self.granted else 0.0,
+            "max_wait_ms": round(self.wait_seconds_max * 1000, 1),
+        }
+
+
+@dataclass(order=True)
+class _Ticket:
+    priority: int
+    seq: int
+    key: str = field(compare=False)
+    cost: int = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    future: asyncio.Future = field(compare=False, repr=False)
+
+
+class LLMScheduler:
+    """Priority- and rate-limit-aware admission control for LLM requests.
+
+    Must be used from a single event loop (the shared LLM loop). Waiting
+    requests sit in one heap per provider/model; a dispatcher task grants the
+    highest-priority request whose bucket can afford it whenever a slot frees
+    up, a bucket refills or a backoff expires.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        rpm: float | None = None,
+        tpm: float | None = None,
+        overrides: dict[str, dict[str, float]] | None = None,
+        backoff_base: float | None = None,
+        backoff_max: float | None = None,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.default_rpm = _env_float("VDOS_LLM_RPM", 0) if rpm is None else rpm
+        self.default_tpm = _env_float("VDOS_LLM_TPM", 0) if tpm is None else tpm
+        self.overrides = self._load_overrides() if overrides is None else overrides
+        self.backoff_base = _env_float("VDOS_LLM_BACKOFF_BASE_SECONDS", 1.0) if backoff_base is None else backoff_base
+        self.backoff_max = _env_float("VDOS_LLM_BACKOFF_MAX_SECONDS", 60.0) if backoff_max is None else backoff_max
+
+        self._keys: dict[str, _KeyState] = {}
+        self._lanes: dict[Priority, _LaneStats] = {priority: _LaneStats() for priority in Priority}
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._retries = 0
+        self._lock = threading.Lock()  # guards counters read by stats() from other threads
+        self._wakeup: asyncio.Event | None = None
+        self._dispatcher: asyncio.Task | None = None
+
+    @staticmethod
+    def _load_overrides() -> dict[str, dict[str, float]]:
+        raw = os.getenv("VDOS_LLM_RATE_LIMITS", "").strip()
+        if not raw:
+            return {}
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.warning("[LLM_SCHEDULER] Ignoring invalid VDOS_LLM_RATE_LIMITS (expected JSON object)")
+            return {}
+        return {str(key): dict(value) for key, value in data.items() if isinstance(value, dict)}
+
+    # ------------------------------------------------------------------
+    # Limits
+    # ------------------------------------------------------------------
+    def _state(self, provider: str, model: str) -> tuple[str, _KeyState]:
+        key = f"{provider}/{model}"
+        state = self._keys.get(key)
+        if state is None:
+            limits = self.overrides.get(key) or self.overrides.get(model) or {}
+            state = _KeyState(
+                requests=TokenBucket(limits.get("rpm", self.default_rpm)),
+                tokens=TokenBucket(limits.get("tpm", self.default_tpm)),
+            )
+            with self._lock:
+                self._keys[key] = state
+        return key, state
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+    @asynccontextmanager
+    async def slot(
+        self,
+        provider: str,
+        model: str,
+        priority: Priority = DEFAULT_PRIORITY,
+        cost: int = 0,
+    ) -> AsyncIterator[None]:
+        """Wait for a slot, hold it for the duration of the block, then release it."""
+        await self.acquire(provider, model, priority, cost)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, provider: str, model: str, priority: Priority = DEFAULT_PRIORITY, cost: int = 0) -> None:
+        key, state = self._state(provider, model)
+        loop = asyncio.get_running_loop()
+        ticket = _Ticket(int(priority), next(self._seq), key, cost, time.monotonic(), loop.create_future())
+        heapq.heappush(state.waiting, ticket)
+        with self._lock:
+            self._lanes[Priority(priority)].queued += 1
+        self._ensure_dispatcher()
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if not ticket.future.done() or ticket.future.cancelled():
+                self._forget(state, ticket)
+            else:
+                # Granted just as we were cancelled: hand the slot back
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._wake()
+
+    def _forget(self, state: _KeyState, ticket: _Ticket) -> None:
+        if ticket in state.waiting:
+            state.waiting.remove(ticket)
+            heapq.heapify(state.waiting)
+            with self._lock:
+                self._lanes[Priority(ticket.priority)].queued -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _ensure_dispatcher(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+        self._wake()
+
+    async def _dispatch(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            self._wakeup.clear()
+            sleep_for = self._grant_ready()
+            if sleep_for is None and not any(state.waiting for state in self._keys.values()):
+                self._dispatcher = None
+                return
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_for)
+            except asyncio.TimeoutError:
+                pass
+
+    def _grant_ready(self) -> float | None:
+        """Grant every request that can run now; return seconds until the next may."""
+        while True:
+            now = time.monotonic()
+            best: tuple[_Ticket, _KeyState] | None = None
+            next_delay: float | None = None
+            for state in self._keys.values():
+                while state.waiting and state.waiting[0].future.done():
+                    # Caller went away (cancelled) before being granted
+                    stale = heapq.heappop(state.waiting)
+                    with self._lock:
+                        self._lanes[Priority(stale.priority)].queued -= 1
+                if not state.waiting:
+                    continue
+                head = state.waiting[0]
+                delay = state.delay(head.cost, now)
+                if delay > 0:
+                    next_delay = delay if next_delay is None else min(next_delay, delay)
+                elif best is None or head < best[0]:
+                    best = (head, state)
+            if best is None or self._in_flight >= self.max_concurrency:
+                # Nothing affordable, or all slots busy (release() wakes us)
+                return next_delay
+            ticket, state = best
+            heapq.heappop(state.waiting)
+            state.requests.take(1, now)
+            state.tokens.take(ticket.cost, now)
+            waited = now - ticket.enqueued_at
+            with self._lock:
+                self._in_flight += 1
+                lane = self._lanes[Priority(ticket.priority)]
+                lane.queued -= 1
+                lane.granted += 1
+                lane.wait_seconds_total += waited
+                lane.wait_seconds_max = max(lane.wait_seconds_max, waited)
+            ticket.future.set_result(None)
+
+    # ------------------------------------------------------------------
+    # Feedback from responses
+    # ------------------------------------------------------------------
+    def record_success(self, provider: str, model: str, estimated: int, actual: int | None) -> None:
+        _, state = self._state(provider, model)
+        state.consecutive_429s = 0
+        if actual is not None:
+            state.tokens.adjust(actual - estimated)
+
+    def record_rate_limited(self, provider: str, model: str, retry_after: float | None = None) -> float:
+        """Pause every request for this provider/model; returns the backoff applied."""
+        _, state = self._state(provider, model)
+        state.consecutive_429s += 1
+        if retry_after is not None and retry_after > 0:
+            delay = min(retry_after, self.backoff_max)
+        else:
+            delay = min(self.backoff_base * (2 ** (state.consecutive_429s - 1)), self.backoff_max)
+        with self._lock:
+            state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+            state.rate_limited += 1
+        logger.warning(f"[LLM_SCHEDULER] 429 from {provider}/{model}; pausing {delay:.1f}s")
+        self._wake()
+        return delay
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self._retries += 1
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            keys = {
+                key: {
+                    "rpm_limit": state.requests.rate_per_min or None,
+                    "tpm_limit": state.tokens.rate_per_min or None,
+                    "queued": len(state.waiting),
+                    "rate_limited": state.rate_limited,
+                    "backoff_remaining_s": round(max(0.0, state.blocked_until - now), 2),
+                }
+                for key, state in self._keys.items()
+            }
+            return {
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "retries": self._retries,
+                "lanes": {priority.name.lower(): lane.to_dict() for priority, lane in self._lanes.items()},
+                "limits": keys,
+            }
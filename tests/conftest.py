@@ -1,7 +1,190 @@
+import importlib
 import sys
 from pathlib import Path
 
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SRC_PATH = PROJECT_ROOT / "src"
 if str(SRC_PATH) not in sys.path:
-    sys.path.insert(0, str(SRC_PATH))
\ No newline at end of file
+    sys.path.insert(0, str(SRC_PATH))
+
+@pytest.fixture
+def fast_engine(tmp_path, monkeypatch):
+    """SimulationEngine with no-op gateways, an instant planner and one started persona.
+
+    Yields ``(engine, db_path)``.
+    """
+    db_path = tmp_path / "vdos.db"
+    monkeypatch.setenv("VDOS_DB_PATH", str(db_path))
+    monkeypatch.setenv("VDOS_LOCALE", "en")
+    from fastapi.testclient import TestClient
+    from virtualoffice.sim_manager.planner import PlanResult
+    import virtualoffice.common.db as db_module
+    importlib.reload(db_module)
+
+    importlib.reload(importlib.import_module("virtualoffice.servers.email.app"))
+    importlib.reload(importlib.import_module("virtualoffice.servers.chat.app"))
+    sim_app_module = importlib.reload(importlib.import_module("virtualoffice.sim_manager.app"))
+    sim_engine_module = importlib.reload(importlib.import_module("virtualoffice.sim_manager.engine"))
+
+    class NullEmailGateway:
+        def ensure_mailbox(self, address, display_name=None):
+            pass
+
+        def send_email(self, sender, to, subject, body, cc=None, bcc=None, thread_id=None, **kwargs):
+            return {"id": 1}
+
+        def close(self):
+            pass
+
+    class NullChatGateway:
+        def ensure_user(self, handle, display_name=None):
+            pass
+
+        def send_dm(self, sender, recipient, body, **kwargs):
+            return {"id": 1}
+
+        def close(self):
+            pass
+
+    class FastPlanner:
+        def generate_project_plan(self, **kwargs):
+            return PlanResult(content="Plan", model_used="fast", tokens_used=1)
+
+        def generate_daily_plan(self, **kwargs):
+            return PlanResult(content="Daily", model_used="fast", tokens_used=1)
+
+        def generate_hourly_plan(self, **kwargs):
+            return PlanResult(content="Hourly", model_used="fast", tokens_used=1)
+
+        def generate_daily_report(self, **kwargs):
+            return PlanResult(content="Report", model_used="fast", tokens_used=1)
+
+        def generate_hourly_summary(self, **kwargs):
+            return PlanResult(content="Summary", model_used="fast", tokens_used=1)
+
+        def generate_simulation_report(self, **kwargs):
+            return PlanResult(content="Sim report", model_used="fast", tokens_used=1)
+
+    engine = sim_engine_module.SimulationEngine(
+        email_gateway=NullEmailGateway(),
+        chat_gateway=NullChatGateway(),
+        planner=FastPlanner(),
+        hours_per_day=8,
+    )
+    client = TestClient(sim_app_module.create_app(engine))
+    response = client.post(
+        "/api/v1/people",
+        json={
+            "name": "Unit Lead",
+            "role": "Manager",
+            "timezone": "UTC",
+            "work_hours": "09:00-18:00",
+            "break_frequency": "50/10 cadence",
+            "communication_style": "Direct",
+            "email_address": "lead@vdos.local",
+            "chat_handle": "lead",
+            "skills": ["Management"],
+            "personality": ["Organized"],
+            "is_department_head": True,
+        },
+    )
+    assert response.status_code == 201
+    person_id = response.json()["id"]
+    response = client.post(
+        "/api/v1/simulation/start",
+        json={
+            "project_name": "UoW",
+            "project_summary": "Unit of work test",
+            "duration_weeks": 1,
+            "include_person_ids": [person_id],
+        },
+    )
+    assert response.status_code == 200
+    try:
+        yield engine, db_path
+    finally:
+        client.close()
+        engine.close()
+        db_module.close_pools()
+
+
+@pytest.fixture
+def clustering_env(tmp_path, monkeypatch):
+    """Clustering pipeline on temp databases, with deterministic local embeddings and GPT replies.
+
+    Emails whose subjects start with the same word embed near each other.
+    Yields a namespace with ``add_email(subject, body)``, the ``persona_id``
+    of ``ops@vdos.local`` and call logs: ``embedded`` (one list of texts
+    per embedding request) and ``gpt`` (cache_method per completion).
+    """
+    import zlib
+    from types import SimpleNamespace
+
+    import numpy as np
+
+    monkeypatch.setenv("VDOS_DB_PATH", str(tmp_path / "vdos.db"))
+    import virtualoffice.common.db as db_module
+    importlib.reload(db_module)
+    from virtualoffice.clustering import (
+        auto_optimizer,
+        db as cluster_db,
+        embedding_cache,
+        embedding_util,
+        faiss_store,
+        label_generator,
+    )
+    from virtualoffice.sim_manager.engine import SIM_SCHEMA
+
+    importlib.reload(importlib.import_module("virtualoffice.servers.email.app")).initialise()
+    db_module.execute_script(SIM_SCHEMA)
+    monkeypatch.setattr(cluster_db, "DB_PATH", tmp_path / "email_clusters.db")
+    monkeypatch.setattr(faiss_store, "INDEX_DIR", tmp_path)
+    monkeypatch.setenv("VDOS_EMBEDDING_CACHE_DIR", str(tmp_path / "embedding_cache"))
+    embedding_cache.reset_embedding_cache()
+
+    env = SimpleNamespace(embedded=[], gpt=[], tmp_path=tmp_path)
+
+    def fake_embeddings(texts, model="text-embedding-3-small", batch_size=100):
+        env.embedded.append(list(texts))
+        vectors = []
+        for text in texts:
+            topic = text.split("\n", 1)[0].removeprefix("Subject: ").split(" ", 1)[0]
+            center = np.random.default_rng(zlib.crc32(topic.encode())).normal(size=64) * 5
+            jitter = np.random.default_rng(zlib.crc32(text.encode())).normal(size=64) * 0.5
+            vectors.append((center + jitter).tolist())
+        return vectors, len(texts)
+
+    def fake_generate_text(prompt, model=None, cache_method=None, **kwargs):
+        env.gpt.append(cache_method)
+        if cache_method == "cluster_label":
+            return '{"short_label": "Topic", "description": "Emails about one topic"}', 1
+        return "SCORE: 7\nREASONING: Clusters match their samples", 1
+
+    monkeypatch.setattr(embedding_util, "generate_embeddings_batch", fake_embeddings)
+    monkeypatch.setattr(label_generator, "generate_text", fake_generate_text)
+    monkeypatch.setattr(auto_optimizer, "generate_text", fake_generate_text)
+
+    with db_module.get_connection() as conn:
+        env.persona_id = conn.execute(
+            "INSERT INTO people(name, role, timezone, work_hours, break_frequency, communication_style, "
+            "email_address, chat_handle, skills, personality, objectives, metrics, persona_markdown, "
+            "planning_guidelines, event_playbook, statuses) "
+            "VALUES ('Ops Lead', 'Manager', 'UTC', '09:00-18:00', '50/10', 'Direct', 'ops@vdos.local', 'ops', "
+            "'[\"Operations\"]', '[\"Calm\"]', '[]', '[]', '', '[]', '{}', '[]')"
+        ).lastrowid
+        conn.execute("INSERT INTO mailboxes(address) VALUES ('ops@vdos.local')")
+
+    def add_email(subject, body, sender="ops@vdos.local", sent_at="2025-01-06T09:00:00"):
+        with db_module.get_connection() as conn:
+            return conn.execute(
+                "INSERT INTO emails(sender, subject, body, sent_at) VALUES (?, ?, ?, ?)", (sender, subject, body, sent_at)
+            ).lastrowid
+
+    env.add_email = add_email
+    try:
+        yield env
+    finally:
+        embedding_cache.reset_embedding_cache()
+        db_module.close_pools()
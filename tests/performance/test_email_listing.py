@@ -0,0 +1,101 @@
+"""
+Performance benchmark for the email server listing endpoints.
+
+The dashboard's ``/monitor/emails`` proxy calls ``GET /mailboxes/{addr}/emails``
+and ``GET /senders/{addr}/emails`` with ``limit=50`` on every poll. Both must
+stay fast on a large mailbox: each page is loaded with a fixed number of
+queries, and the composite indexes let SQLite walk straight to the newest ids.
+"""
+
+import importlib
+import sqlite3
+import statistics
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+TOTAL_EMAILS = 100_000
+PEOPLE = 20
+POLLS = 40
+
+
+@pytest.fixture(scope="module")
+def seeded_email_client(tmp_path_factory):
+    db_path = tmp_path_factory.mktemp("email_bench") / "email.db"
+    monkeypatch = pytest.MonkeyPatch()
+    monkeypatch.setenv("VDOS_DB_PATH", str(db_path))
+    importlib.reload(importlib.import_module("virtualoffice.common.db"))
+    app_module = importlib.reload(importlib.import_module("virtualoffice.servers.email.app"))
+
+    with TestClient(app_module.app) as client:
+        addresses = [f"worker{i}@vdos.local" for i in range(PEOPLE)]
+        conn = sqlite3.connect(db_path)
+        conn.executemany("INSERT INTO mailboxes(address) VALUES (?)", [(a,) for a in addresses])
+        conn.executemany(
+            "INSERT INTO emails(id, sender, subject, body, thread_id, sent_at) VALUES (?, ?, ?, ?, NULL, ?)",
+            [
+                (i, addresses[i % PEOPLE], f"Update {i}", "Status update body " * 10, f"2025-01-06T09:{i % 60:02d}:00")
+                for i in range(1, TOTAL_EMAILS + 1)
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO email_recipients(email_id, address, kind) VALUES (?, ?, ?)",
+            [
+                row
+                for i in range(1, TOTAL_EMAILS + 1)
+                for row in (
+                    (i, addresses[(i + 1) % PEOPLE], "to"),
+                    (i, addresses[(i + 2) % PEOPLE], "cc"),
+                )
+            ],
+        )
+        conn.commit()
+        conn.close()
+        yield client
+    monkeypatch.undo()
+
+
+def _p95(samples: list[float]) -> float:
+    return statistics.quantiles(samples, n=20)[-1]
+
+
+def test_monitor_email_poll_p95(seeded_email_client):
+    """Inbox + sent page of 50, as requested by /monitor/emails on each poll."""
+    client = seeded_email_client
+    samples = []
+    for poll in range(POLLS):
+        address = f"worker{poll % PEOPLE}@vdos.local"
+        start = time.perf_counter()
+        inbox = client.get(f"/mailboxes/{address}/emails", params={"limit": 50})
+        sent = client.get(f"/senders/{address}/emails", params={"limit": 50})
+        samples.append(time.perf_counter() - start)
+        assert inbox.status_code == 200 and len(inbox.json()) == 50
+        assert sent.status_code == 200 and len(sent.json()) == 50
+
+    p95 = _p95(samples)
+    print(f"\n/monitor/emails poll over {TOTAL_EMAILS} emails: p95 {p95 * 1000:.1f}ms")
+    assert p95 < 0.25, f"Email listing too slow: p95 {p95 * 1000:.1f}ms"
+
+
+def test_keyset_pages_stay_fast_deep_in_history(seeded_email_client):
+    client = seeded_email_client
+    address = "worker3@vdos.local"
+    before_id = None
+    samples = []
+    seen: list[int] = []
+    for _ in range(POLLS):
+        params = {"limit": 50}
+        if before_id is not None:
+            params["before_id"] = before_id
+        start = time.perf_counter()
+        page = client.get(f"/mailboxes/{address}/emails", params=params).json()
+        samples.append(time.perf_counter() - start)
+        ids = [email["id"] for email in page]
+        seen.extend(ids)
+        before_id = ids[-1]
+
+    assert seen == sorted(set(seen), reverse=True)
+    p95 = _p95(samples)
+    print(f"\nKeyset inbox paging: p95 {p95 * 1000:.1f}ms per page")
+    assert p95 < 0.25, f"Keyset paging too slow: p95 {p95 * 1000:.1f}ms"
@@ -0,0 +1,134 @@
+"""
+Performance benchmarks for batched inbox-reply generation.
+
+CommunicationGenerator.generate_batch_async should fan requests out
+concurrently, so a batch costs roughly the slowest request rather than the
+sum of all request latencies.
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+from virtualoffice.sim_manager.communication_generator import CommunicationGenerator
+from virtualoffice.sim_manager.planner import PlanResult
+from virtualoffice.sim_manager.schemas import PersonRead
+
+
+class SleepingPlanner:
+    """Planner whose generate_with_messages blocks like a real LLM call."""
+
+    def __init__(self, delays: dict[str, float]):
+        self.delays = delays
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def generate_with_messages(self, messages, model_hint=None) -> PlanResult:
+        prompt = "\n".join(message["content"] for message in messages)
+        name = next((name for name in self.delays if name in prompt), None)
+        assert name is not None, "persona name missing from prompt"
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delays[name])
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        payload = {"communications": [{"type": "chat", "target": "lead", "message": f"reply from {name}"}]}
+        return PlanResult(content=json.dumps(payload), model_used="sleepy", tokens_used=1)
+
+
+def _person(index: int) -> PersonRead:
+    return PersonRead(
+        id=index,
+        name=f"Worker{index:02d}",
+        role="Developer",
+        timezone="UTC",
+        work_hours="09:00-18:00",
+        break_frequency="50/10",
+        communication_style="Direct",
+        email_address=f"worker{index}@vdos.local",
+        chat_handle=f"worker{index}",
+        is_department_head=False,
+        skills=["Python"],
+        personality=["Focused"],
+        objectives=[],
+        metrics=[],
+        persona_markdown="",
+        planning_guidelines=[],
+        event_playbook={},
+        statuses=[],
+    )
+
+
+def _requests(people):
+    return [{"person": person, "current_tick": 200, "hourly_plan": "Coding"} for person in people]
+
+
+def test_batch_wall_time_tracks_max_latency():
+    people = [_person(i) for i in range(8)]
+    delays = {person.name: 0.2 for person in people}
+    delays[people[3].name] = 0.4
+    planner = SleepingPlanner(delays)
+    generator = CommunicationGenerator(planner, locale="en", max_concurrency=8)
+
+    start = time.perf_counter()
+    results = asyncio.run(generator.generate_batch_async(_requests(people)))
+    elapsed = time.perf_counter() - start
+
+    serial = sum(delays.values())
+    print(f"\nInbox reply batch: {elapsed:.2f}s concurrent vs {serial:.2f}s serial")
+    # Bounded by the slowest request (0.4s), far below the serial sum (1.8s)
+    assert elapsed < 0.4 + 0.4
+    assert planner.max_in_flight == len(people)
+    # Results keep input order even though Worker03 finishes last
+    assert [person.name for person, _ in results] == [person.name for person in people]
+    assert all(comms and comms[0]["message"] == f"reply from {person.name}" for person, comms in results)
+
+
+def test_batch_respects_concurrency_limit():
+    people = [_person(i) for i in range(6)]
+    planner = SleepingPlanner({person.name: 0.1 for person in people})
+    generator = CommunicationGenerator(planner, locale="en", max_concurrency=2)
+
+    start = time.perf_counter()
+    results = asyncio.run(generator.generate_batch_async(_requests(people)))
+    elapsed = time.perf_counter() - start
+
+    assert planner.max_in_flight == 2
+    assert elapsed >= 0.3 * 0.9  # three waves of two
+    assert len(results) == len(people)
+
+
+def test_batch_times_out_slow_requests(monkeypatch):
+    monkeypatch.setenv("VDOS_INBOX_REPLY_CONCURRENCY", "4")
+    monkeypatch.setenv("VDOS_INBOX_REPLY_TIMEOUT_SECONDS", "0.2")
+    people = [_person(i) for i in range(3)]
+    planner = SleepingPlanner({people[0].name: 0.01, people[1].name: 1.0, people[2].name: 0.01})
+    generator = CommunicationGenerator(planner, locale="en")
+    assert generator.max_concurrency == 4
+
+    start = time.perf_counter()
+    results = asyncio.run(generator.generate_batch_async(_requests(people)))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.8
+    assert [len(comms) for _, comms in results] == [1, 0, 1]
+
+
+def test_timed_out_request_keeps_its_slot_until_its_thread_returns(monkeypatch):
+    monkeypatch.setenv("VDOS_INBOX_REPLY_TIMEOUT_SECONDS", "0.2")
+    people = [_person(i) for i in range(3)]
+    planner = SleepingPlanner({people[0].name: 0.5, people[1].name: 0.01, people[2].name: 0.01})
+    generator = CommunicationGenerator(planner, locale="en", max_concurrency=1)
+
+    results = asyncio.run(generator.generate_batch_async(_requests(people)))
+
+    # The slow call times out, but the others wait for its thread instead of
+    # queueing behind it in the executor and timing out too
+    assert [len(comms) for _, comms in results] == [0, 1, 1]
+    assert planner.max_in_flight == 1
+    assert not generator._stragglers
@@ -0,0 +1,51 @@
+"""
+Performance benchmark for recipient resolution in _dispatch_scheduled.
+
+A 50-persona roster is indexed once; resolving a dispatch's worth of targets
+(primary recipient, CCs and BCCs) must then stay well under a millisecond.
+"""
+
+import time
+
+from virtualoffice.sim_manager.roster_index import RosterIndex
+from virtualoffice.sim_manager.schemas import PersonRead
+
+PEOPLE = 50
+DISPATCHES = 2000
+
+
+def _roster() -> RosterIndex:
+    people = [
+        PersonRead(
+            id=i,
+            name=f"Worker {i}",
+            role="Developer" if i % 3 else "Designer",
+            timezone="UTC",
+            work_hours="09:00-18:00",
+            break_frequency="50/10",
+            communication_style="Direct",
+            email_address=f"worker{i}@vdos.local",
+            chat_handle=f"worker{i}",
+            skills=["x"],
+            personality=["y"],
+            is_department_head=i == PEOPLE,
+            persona_markdown="",
+        )
+        for i in range(1, PEOPLE + 1)
+    ]
+    return RosterIndex(people, {"client@partner.com"})
+
+
+def test_dispatch_target_resolution_is_sub_millisecond():
+    roster = _roster()
+    targets = ["worker49@vdos.local", "@worker50", "Worker 48", "client@partner.com", "worker47"]
+
+    start = time.perf_counter()
+    for _ in range(DISPATCHES):
+        for target in targets:
+            roster.match_target(target)
+        roster.people_with_role("designer")
+    per_dispatch = (time.perf_counter() - start) / DISPATCHES
+
+    print(f"\nResolved {len(targets)} targets per dispatch over {PEOPLE} personas: {per_dispatch * 1e6:.1f}us")
+    assert per_dispatch < 0.001, f"Target resolution too slow: {per_dispatch * 1000:.3f}ms per dispatch"
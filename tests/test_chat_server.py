@@ -78,4 +78,91 @@ def test_non_member_cannot_post(chat_client):
         json={"sender": "outsider", "body": "Hi"},
     )
     assert forbidden.status_code == 403
-    assert forbidden.json()["detail"] == "Sender not in room"
\ No newline at end of file
+    assert forbidden.json()["detail"] == "Sender not in room"
+
+
+def test_dm_batch_creates_rooms_and_returns_ids(chat_client):
+    messages = [
+        {"sender": "Manager", "recipient": "Designer", "body": "Need mockups"},
+        {"sender": "designer", "recipient": "manager", "body": "On it"},
+        {"sender": "manager", "recipient": "analyst", "body": "Numbers?", "sent_at_iso": "2025-01-06T09:30:00"},
+    ]
+    response = chat_client.post("/dms/batch", json={"messages": messages})
+    assert response.status_code == 201
+    ids = response.json()["ids"]
+    assert len(ids) == 3
+
+    history = chat_client.get("/rooms/dm:designer:manager/messages").json()
+    assert [entry["id"] for entry in history] == ids[:2]
+    assert [entry["body"] for entry in history] == ["Need mockups", "On it"]
+
+    analyst_dms = chat_client.get("/users/analyst/dms").json()
+    assert [entry["id"] for entry in analyst_dms] == ids[2:]
+    assert analyst_dms[0]["sent_at"].startswith("2025-01-06T09:30:00")
+
+
+def test_room_message_batch_checks_membership(chat_client):
+    slug = chat_client.post("/rooms", json={"name": "Ops", "participants": ["lead", "analyst"]}).json()["slug"]
+
+    ok = chat_client.post(
+        "/rooms/messages/batch",
+        json={"messages": [
+            {"room_slug": slug, "sender": "lead", "body": "Deploy at 3"},
+            {"room_slug": slug, "sender": "Analyst", "body": "Ack"},
+        ]},
+    )
+    assert ok.status_code == 201
+    assert len(ok.json()["ids"]) == 2
+
+    forbidden = chat_client.post(
+        "/rooms/messages/batch",
+        json={"messages": [
+            {"room_slug": slug, "sender": "lead", "body": "One more"},
+            {"room_slug": slug, "sender": "outsider", "body": "Hi"},
+        ]},
+    )
+    assert forbidden.status_code == 403
+
+    missing = chat_client.post(
+        "/rooms/messages/batch",
+        json={"messages": [{"room_slug": "nope", "sender": "lead", "body": "Hello?"}]},
+    )
+    assert missing.status_code == 404
+
+    history = chat_client.get(f"/rooms/{slug}/messages").json()
+    assert [entry["body"] for entry in history] == ["Deploy at 3", "Ack"]
+
+
+def test_room_history_keyset_pagination(chat_client):
+    slug = chat_client.post("/rooms", json={"name": "Ops", "participants": ["lead", "analyst"]}).json()["slug"]
+    ids = chat_client.post(
+        "/rooms/messages/batch",
+        json={"messages": [{"room_slug": slug, "sender": "lead", "body": f"msg {i}"} for i in range(7)]},
+    ).json()["ids"]
+
+    latest = chat_client.get(f"/rooms/{slug}/messages", params={"before_id": ids[-1] + 1, "limit": 3}).json()
+    assert [m["body"] for m in latest] == ["msg 4", "msg 5", "msg 6"]
+    older = chat_client.get(f"/rooms/{slug}/messages", params={"before_id": latest[0]["id"], "limit": 3}).json()
+    assert [m["body"] for m in older] == ["msg 1", "msg 2", "msg 3"]
+
+    visible = chat_client.get("/users/analyst/messages", params={"before_id": ids[3], "limit": 2}).json()
+    assert [m["body"] for m in visible] == ["msg 2", "msg 1"]
+
+
+def test_user_rooms_and_dms_are_listed_with_participants(chat_client):
+    chat_client.post("/rooms", json={"name": "Ops", "participants": ["lead", "analyst", "designer"], "slug": "ops"})
+    chat_client.post("/dms/batch", json={"messages": [
+        {"sender": "lead", "recipient": "analyst", "body": "hi"},
+        {"sender": "designer", "recipient": "analyst", "body": "hey"},
+        {"sender": "lead", "recipient": "designer", "body": "not for analyst"},
+    ]})
+
+    rooms = chat_client.get("/users/analyst/rooms").json()
+    assert [(room["slug"], room["participants"]) for room in rooms] == [
+        ("dm:analyst:designer", ["analyst", "designer"]),
+        ("dm:analyst:lead", ["analyst", "lead"]),
+        ("ops", ["analyst", "designer", "lead"]),
+    ]
+
+    dms = chat_client.get("/users/analyst/dms").json()
+    assert [m["body"] for m in dms] == ["hi", "hey"]
@@ -0,0 +1,89 @@
+"""Tests for incremental clustering index updates."""
+
+import numpy as np
+import pytest
+
+from virtualoffice.clustering import db
+from virtualoffice.clustering.cluster_engine import ClusterEngine
+from virtualoffice.clustering.faiss_store import load_store_for_persona
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = ClusterEngine(dbscan_min_samples=2)
+    engine.tsne_runs = 0
+    fit_reducer = ClusterEngine.fit_reducer
+
+    def counting_fit(self, embeddings):
+        self.tsne_runs += 1
+        return fit_reducer(self, embeddings)
+
+    monkeypatch.setattr(ClusterEngine, "fit_reducer", counting_fit)
+    return engine
+
+
+def _seed(env, topics=("Budget", "Hiring", "Release"), per_topic=10, start=0):
+    return [
+        env.add_email(f"{topic} update {i}", f"Notes on {topic.lower()} item {i}")
+        for topic in topics
+        for i in range(start, start + per_topic)
+    ]
+
+
+def test_update_without_index_runs_a_full_build(clustering_env, engine):
+    ids = _seed(clustering_env)
+
+    status = engine.update_index(clustering_env.persona_id)
+
+    assert engine.tsne_runs == 1
+    assert (status.total_emails, status.full_build_emails, status.last_indexed_email_id) == (30, 30, max(ids))
+
+
+def _build_with_topic_layout(env, engine):
+    """Full build where each subject topic is its own cluster around a fixed 3D center."""
+    corpus = engine.load_corpus(env.persona_id)
+    topics = sorted({email.subject.split()[0] for email in corpus.emails})
+    labels = np.array([topics.index(email.subject.split()[0]) for email in corpus.emails])
+    rng = np.random.default_rng(0)
+    coordinates = np.array([[10.0 + 40 * label] * 3 for label in labels]) + rng.normal(size=(len(labels), 3))
+    engine.build_index(env.persona_id, corpus=corpus, coordinates_3d=coordinates, cluster_labels=labels)
+
+
+def test_new_emails_join_their_neighbors_cluster(clustering_env, engine):
+    ids = _seed(clustering_env)
+    _build_with_topic_layout(clustering_env, engine)
+    before = db.get_email_coordinates(clustering_env.persona_id)
+    budget_label = before[ids[0]][3]
+
+    new_ids = _seed(clustering_env, topics=("Budget",), per_topic=3, start=10)
+    status = engine.update_index(clustering_env.persona_id)
+
+    assert engine.tsne_runs == 0
+    assert [len(texts) for texts in clustering_env.embedded] == [30, 3]
+    assert (status.total_emails, status.full_build_emails, status.last_indexed_email_id) == (33, 30, max(new_ids))
+
+    after = db.get_email_coordinates(clustering_env.persona_id)
+    assert {email_id: after[email_id] for email_id in before} == before
+    assert [after[email_id][3] for email_id in new_ids] == [budget_label] * 3
+    budget_x = [before[email_id][0] for email_id in ids[:10]]
+    assert all(min(budget_x) <= after[email_id][0] <= max(budget_x) for email_id in new_ids)
+
+    store = load_store_for_persona(clustering_env.persona_id)
+    assert store.size() == 33 and store.get_email_ids()[-3:] == new_ids
+    budget = next(c for c in db.get_clusters_for_persona(clustering_env.persona_id) if c.cluster_label == budget_label)
+    assert budget.num_emails == 13
+
+    assert engine.update_index(clustering_env.persona_id).total_emails == 33
+    assert len(clustering_env.embedded) == 2
+
+
+def test_drift_forces_a_full_rebuild(clustering_env, engine):
+    _seed(clustering_env)
+    engine.build_index(clustering_env.persona_id)
+
+    _seed(clustering_env, topics=("Travel",), per_topic=15)
+    status = engine.update_index(clustering_env.persona_id)
+
+    assert engine.tsne_runs == 2
+    assert (status.total_emails, status.full_build_emails) == (45, 45)
+    assert load_store_for_persona(clustering_env.persona_id).size() == 45
@@ -0,0 +1,103 @@
+"""Tests for the embed-once clustering parameter sweep."""
+
+import numpy as np
+
+from virtualoffice.clustering import db
+from virtualoffice.clustering.auto_optimizer import compute_local_metrics, generate_parameter_grid, optimize_parameters
+from virtualoffice.clustering.cluster_engine import ClusterEngine
+from virtualoffice.clustering.faiss_store import FaissStore
+
+
+def _seed_topics(env, topics=("Budget", "Hiring", "Release"), per_topic=20):
+    for topic in topics:
+        for i in range(per_topic):
+            env.add_email(f"{topic} update {i}", f"Notes on {topic.lower()} item {i}")
+
+
+def test_local_metrics_prefer_separated_clusters():
+    rng = np.random.default_rng(0)
+    centers = np.array([[10, 10, 10], [50, 50, 50], [90, 90, 90]])
+    points = np.vstack([center + rng.normal(size=(20, 3)) for center in centers])
+    labels = np.repeat([0, 1, 2], 20)
+
+    separated = compute_local_metrics(points, labels)
+    assert separated["num_clusters"] == 3 and separated["noise_percentage"] == 0
+    assert separated["silhouette"] > 0.9
+    assert abs(separated["size_entropy"] - 1.0) < 1e-9
+
+    lopsided = compute_local_metrics(points, np.where(np.arange(60) < 57, 0, 1))
+    all_noise = compute_local_metrics(points, np.full(60, -1))
+    assert lopsided["local_score"] < separated["local_score"]
+    assert (all_noise["num_clusters"], all_noise["noise_percentage"], all_noise["silhouette"]) == (0, 100, None)
+
+
+def test_sweep_embeds_once_and_spends_gpt_on_top_k(clustering_env, monkeypatch):
+    _seed_topics(clustering_env)
+    tsne_runs = []
+    fit_reducer = ClusterEngine.fit_reducer
+
+    def counting_fit(self, embeddings):
+        tsne_runs.append(self.effective_perplexity(len(embeddings)))
+        return fit_reducer(self, embeddings)
+
+    monkeypatch.setattr(ClusterEngine, "fit_reducer", counting_fit)
+
+    config, quality = optimize_parameters(clustering_env.persona_id, top_k=2)
+
+    assert len(clustering_env.embedded) == 1
+    # 60 emails cap perplexity at 59/3, so the 4 grid perplexities need 2 projections
+    assert len(generate_parameter_grid(60)) == 24 and len(tsne_runs) == 2
+    assert clustering_env.gpt.count("cluster_quality") <= 2
+    assert quality.coherence_score == 7.0 and quality.silhouette is not None
+
+    status = db.get_persona_index_status(clustering_env.persona_id)
+    clusters = db.get_clusters_for_persona(clustering_env.persona_id)
+    assert status.status == "completed" and status.total_emails == 60
+    assert len([c for c in clusters if c.cluster_label != -1]) == quality.num_clusters
+    assert sum(c.num_emails for c in clusters) == 60
+
+
+def test_sweep_over_an_existing_index_maps_the_saved_vectors(clustering_env, monkeypatch):
+    _seed_topics(clustering_env)
+    ClusterEngine().build_index(clustering_env.persona_id)
+    mapped_path = FaissStore(clustering_env.persona_id).vectors_path
+    corpora = []
+    load_corpus = ClusterEngine.load_corpus
+
+    def recording_load(self, persona_id, reuse_index=False):
+        corpus = load_corpus(self, persona_id, reuse_index=reuse_index)
+        corpora.append(corpus)
+        return corpus
+
+    monkeypatch.setattr(ClusterEngine, "load_corpus", recording_load)
+
+    optimize_parameters(clustering_env.persona_id, top_k=1)
+
+    # The saved vectors were mapped, not re-embedded; saving the winner wrote a new generation beside them
+    assert len(clustering_env.embedded) == 1
+    assert isinstance(corpora[0].embeddings, np.memmap)
+    saved_path = FaissStore(clustering_env.persona_id).vectors_path
+    assert saved_path != mapped_path
+    assert np.array_equal(np.load(saved_path), corpora[0].embeddings)
+
+
+def test_sweep_skips_a_candidate_whose_gpt_labelling_fails(clustering_env, monkeypatch):
+    import virtualoffice.clustering.auto_optimizer as auto_optimizer
+
+    _seed_topics(clustering_env)
+    generate_labels = auto_optimizer.generate_labels_for_clusters
+    calls = []
+
+    def flaky_labels(samples):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("GPT unavailable")
+        return generate_labels(samples)
+
+    monkeypatch.setattr(auto_optimizer, "generate_labels_for_clusters", flaky_labels)
+
+    config, quality = optimize_parameters(clustering_env.persona_id, top_k=2)
+
+    assert len(calls) == 2
+    assert quality.coherence_score == 7.0
+    assert db.get_persona_index_status(clustering_env.persona_id).status == "completed"
@@ -0,0 +1,96 @@
+import importlib
+import sqlite3
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def db_module(tmp_path, monkeypatch):
+    monkeypatch.setenv("VDOS_DB_PATH", str(tmp_path / "pool.db"))
+    monkeypatch.setenv("VDOS_DB_POOL_SIZE", "2")
+    module = importlib.import_module("virtualoffice.common.db")
+    module = importlib.reload(module)
+    yield module
+    module.close_pools()
+
+
+def test_connections_are_reused(db_module):
+    with db_module.get_connection() as conn:
+        first = id(conn)
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)")
+    with db_module.get_connection() as conn:
+        assert id(conn) == first
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    stats = db_module.get_pool().stats()
+    assert stats.created == 1
+    assert stats.checkouts == 2
+    assert stats.in_use == 0
+    assert stats.idle_connections == 1
+
+
+def test_exception_rolls_back_before_return(db_module):
+    db_module.execute_script("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT);")
+    with pytest.raises(RuntimeError):
+        with db_module.get_connection() as conn:
+            conn.execute("INSERT INTO t (name) VALUES ('lost')")
+            raise RuntimeError("boom")
+
+    with db_module.get_connection() as conn:
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_nested_checkouts_overflow_instead_of_deadlocking(db_module):
+    pool = db_module.get_pool()
+    pool.wait_timeout = 0.01
+    with db_module.get_connection():
+        with db_module.get_connection():
+            with db_module.get_connection() as third:
+                third.execute("SELECT 1")
+
+    stats = pool.stats()
+    assert stats.open_connections == 2
+    assert stats.overflow_checkouts == 1
+    assert stats.waits == 1
+    assert stats.in_use == 0
+
+
+def test_waiting_caller_gets_released_connection(db_module):
+    pool = db_module.get_pool()
+    pool.wait_timeout = 5.0
+    held = [pool.acquire(), pool.acquire()]
+    acquired = []
+
+    def worker():
+        conn = pool.acquire()
+        acquired.append(conn)
+        pool.release(conn)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    pool.release(held.pop())
+    thread.join(timeout=5)
+    pool.release(held.pop())
+
+    assert acquired
+    assert pool.stats().overflow_checkouts == 0
+
+
+def test_replaced_database_file_drops_idle_connections(db_module):
+    db_module.execute_script("CREATE TABLE t (id INTEGER PRIMARY KEY);")
+    db_module.DB_PATH.unlink()
+
+    with db_module.get_connection() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("SELECT * FROM t")
+
+    assert db_module.get_pool().stats().resets == 1
+
+
+def test_pool_can_be_disabled(db_module, monkeypatch):
+    monkeypatch.setenv("VDOS_DB_POOL", "0")
+    with db_module.get_connection() as conn:
+        conn.execute("SELECT 1")
+    assert db_module.pool_stats() == []
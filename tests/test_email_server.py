@@ -81,4 +81,71 @@ def test_requires_recipient(email_client):
         },
     )
     assert response.status_code == 400
-    assert response.json()["detail"] == "At least one recipient required"
\ No newline at end of file
+    assert response.json()["detail"] == "At least one recipient required"
+
+
+def test_send_batch_returns_ids_in_order(email_client):
+    messages = [
+        {
+            "sender": "lead@vdos.local",
+            "to": [f"dev{i}@vdos.local"],
+            "cc": ["observer@vdos.local"],
+            "subject": f"Task {i}",
+            "body": f"Please pick up task {i}.",
+            "sent_at_iso": f"2025-01-06T09:0{i}:00",
+        }
+        for i in range(3)
+    ]
+    response = email_client.post("/emails/send-batch", json={"messages": messages})
+    assert response.status_code == 201
+    ids = response.json()["ids"]
+    assert len(ids) == 3
+
+    for email_id, message in zip(ids, messages):
+        stored = email_client.get(f"/emails/{email_id}").json()
+        assert stored["subject"] == message["subject"]
+        assert stored["to"] == message["to"]
+        assert stored["cc"] == message["cc"]
+        assert stored["sent_at"].startswith(message["sent_at_iso"])
+
+    inbox = email_client.get("/mailboxes/observer@vdos.local/emails").json()
+    assert [email["id"] for email in inbox] == sorted(ids, reverse=True)
+
+
+def test_send_batch_is_all_or_nothing(email_client):
+    messages = [
+        {"sender": "lead@vdos.local", "to": ["dev@vdos.local"], "subject": "Ok", "body": "Fine."},
+        {"sender": "lead@vdos.local", "to": [], "subject": "Broken", "body": "No recipients."},
+    ]
+    response = email_client.post("/emails/send-batch", json={"messages": messages})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Message 1: at least one recipient required"
+
+    sent = email_client.get("/senders/lead@vdos.local/emails").json()
+    assert sent == []
+
+
+def test_mailbox_keyset_pagination(email_client):
+    for i in range(5):
+        email_client.post(
+            "/emails/send",
+            json={
+                "sender": "lead@vdos.local",
+                "to": ["dev@vdos.local"],
+                "cc": ["dev@vdos.local"] if i % 2 else [],
+                "subject": f"Update {i}",
+                "body": "Progress.",
+            },
+        )
+
+    first = email_client.get("/mailboxes/dev@vdos.local/emails", params={"limit": 3}).json()
+    second = email_client.get(
+        "/mailboxes/dev@vdos.local/emails",
+        params={"limit": 3, "before_id": first[-1]["id"]},
+    ).json()
+
+    assert [email["subject"] for email in first + second] == [f"Update {i}" for i in range(4, -1, -1)]
+    assert first[0]["cc"] == [] and first[1]["cc"] == ["dev@vdos.local"]
+
+    sent = email_client.get("/senders/lead@vdos.local/emails", params={"before_id": first[0]["id"]}).json()
+    assert [email["subject"] for email in sent] == [f"Update {i}" for i in range(3, -1, -1)]
@@ -0,0 +1,119 @@
+"""Tests for the persistent content-hash embedding cache."""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from virtualoffice.clustering.cluster_engine import ClusterEngine
+from virtualoffice.clustering.embedding_cache import EmbeddingCache, embedding_cache_stats
+from virtualoffice.clustering.embedding_util import generate_embeddings_cached
+from virtualoffice.common.db import get_connection
+
+
+def _vectors(n, dim=4, start=0):
+    return np.arange(start, start + n * dim, dtype=np.float32).reshape(n, dim)
+
+
+def test_vectors_survive_reopening(tmp_path):
+    cache = EmbeddingCache(tmp_path)
+    cache.put_many("model-a", ["a", "b"], _vectors(2))
+    cache.close()
+
+    reopened = EmbeddingCache(tmp_path)
+    found = reopened.get_many("model-a", ["b", "a", "missing"])
+    assert sorted(found) == ["a", "b"]
+    np.testing.assert_array_equal(found["b"], _vectors(2)[1])
+    assert reopened.get_many("model-b", ["a"]) == {}
+
+    stats = reopened.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 2, 0.5)
+    assert stats["models"]["model-a"] == {"entries": 2, "dimension": 4, "capacity": 1024}
+    reopened.close()
+
+
+def test_least_recently_used_rows_are_evicted(tmp_path):
+    cache = EmbeddingCache(tmp_path, max_entries=3)
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put_many("m", [key], _vectors(3)[i : i + 1])
+    cache.get_many("m", ["a"])
+
+    cache.put_many("m", ["d"], _vectors(1, start=100))
+
+    found = cache.get_many("m", ["a", "b", "c", "d"])
+    assert sorted(found) == ["a", "c", "d"]
+    np.testing.assert_array_equal(found["a"], _vectors(3)[0])
+    np.testing.assert_array_equal(found["d"], _vectors(1, start=100)[0])
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["models"]["m"]["capacity"] == 3
+    cache.close()
+
+
+class _FailingInserts:
+    """Connection proxy whose cache-row inserts fail, as on a full disk."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def executemany(self, sql, rows):
+        if sql.startswith("INSERT INTO embedding_cache"):
+            raise sqlite3.OperationalError("disk I/O error")
+        return self._conn.executemany(sql, rows)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def test_failed_insert_never_leaves_rows_on_overwritten_slots(tmp_path):
+    cache = EmbeddingCache(tmp_path, max_entries=2)
+    cache.put_many("m", ["a"], _vectors(1))
+    cache.put_many("m", ["b"], _vectors(1, start=10))
+
+    real = cache._conn
+    cache._conn = _FailingInserts(real)
+    with pytest.raises(sqlite3.OperationalError):
+        cache.put_many("m", ["c"], _vectors(1, start=100))
+    cache._conn = real
+
+    # "a" stays evicted rather than coming back pointing at "c"'s vector
+    found = cache.get_many("m", ["a", "b", "c"])
+    assert list(found) == ["b"]
+    np.testing.assert_array_equal(found["b"], _vectors(1, start=10)[0])
+    cache.close()
+
+
+def test_dimension_change_drops_the_model(tmp_path):
+    cache = EmbeddingCache(tmp_path)
+    cache.put_many("m", ["a"], _vectors(1))
+    cache.put_many("m", ["b"], _vectors(1, dim=8))
+
+    assert list(cache.get_many("m", ["a", "b"])) == ["b"]
+    with pytest.raises(ValueError):
+        cache.put_many("m", ["c", "d"], _vectors(1))
+    cache.close()
+
+
+def test_only_unseen_texts_are_embedded(clustering_env):
+    first, tokens = generate_embeddings_cached(["one", "two", "one"])
+    second, _ = generate_embeddings_cached(["two", "three"])
+
+    assert clustering_env.embedded == [["one", "two"], ["three"]]
+    assert first.dtype == np.float32 and first.shape == (3, 64) and tokens == 2
+    np.testing.assert_array_equal(first[0], first[2])
+    np.testing.assert_array_equal(first[1], second[0])
+    assert embedding_cache_stats()["hits"] == 1
+
+
+def test_reindex_embeds_only_new_and_edited_emails(clustering_env):
+    ids = [clustering_env.add_email(f"Budget line {i}", f"Numbers for line {i}") for i in range(12)]
+    engine = ClusterEngine(dbscan_min_samples=2)
+    engine.build_index(clustering_env.persona_id)
+
+    with get_connection() as conn:
+        conn.execute("UPDATE emails SET body = 'Final' WHERE id = ?", (ids[0],))
+    clustering_env.add_email("Hiring loop", "Schedule")
+    status = engine.build_index(clustering_env.persona_id)
+
+    assert [len(texts) for texts in clustering_env.embedded] == [12, 2]
+    assert sorted(text.split("\n\n")[1] for text in clustering_env.embedded[1]) == ["Final", "Schedule"]
+    assert status.total_emails == 13
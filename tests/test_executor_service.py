@@ -0,0 +1,105 @@
+"""Tests for the engine's shared, adaptively sized thread pools."""
+
+import threading
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from virtualoffice.sim_manager.executor_service import AdaptivePool, ExecutorService
+
+
+def test_pool_never_runs_more_than_its_limit():
+    pool = AdaptivePool("test", initial_workers=2, max_workers=6, adaptive=False)
+    lock = threading.Lock()
+    running = peak = 0
+
+    def task():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+
+    try:
+        wait([pool.submit(task) for _ in range(12)])
+    finally:
+        pool.shutdown()
+
+    assert peak == 2
+    stats = pool.stats()
+    assert (stats["limit"], stats["completed"], stats["queue_depth"], stats["active"]) == (2, 12, 0, 0)
+
+
+def test_rate_limiting_halves_the_limit():
+    rate_limited = [0]
+    pool = AdaptivePool("test", initial_workers=8, max_workers=8, window=4, rate_limit_probe=lambda: rate_limited[0])
+    try:
+        wait([pool.submit(lambda: None) for _ in range(4)])
+        assert pool.limit == 8
+
+        rate_limited[0] = 3
+        wait([pool.submit(lambda: None) for _ in range(4)])
+    finally:
+        pool.shutdown()
+
+    assert pool.limit == 4
+    assert pool.stats()["last_adjustment"] == "3 rate-limited responses"
+
+
+def test_backlog_with_healthy_latency_raises_the_limit():
+    pool = AdaptivePool("test", initial_workers=1, max_workers=4, window=2)
+    try:
+        wait([pool.submit(time.sleep, 0.01) for _ in range(12)])
+    finally:
+        pool.shutdown()
+
+    assert pool.limit > 1
+    assert pool.stats()["adjustments"] >= 1
+
+
+def test_failures_are_counted_and_propagated():
+    pool = AdaptivePool("test", initial_workers=1, max_workers=1)
+    try:
+        future = pool.submit(lambda: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            future.result()
+    finally:
+        pool.shutdown()
+    assert (pool.stats()["completed"], pool.stats()["failed"]) == (0, 1)
+
+
+def test_service_reuses_named_pools_until_shutdown():
+    service = ExecutorService({"planning": 3}, max_workers=5, adaptive=False)
+    planning = service.pool("planning")
+
+    assert service.pool("planning") is planning
+    assert planning.limit == 3 and planning.max_workers == 5
+    assert service.pool("other").limit == service.default_workers
+    assert service.pool("wide", initial_workers=8).max_workers == 8
+    assert sorted(service.stats()) == ["other", "planning", "wide"]
+
+    service.shutdown()
+    with pytest.raises(RuntimeError):
+        service.pool("planning")
+    with pytest.raises(RuntimeError):
+        planning.submit(lambda: None)
+
+
+def test_engine_shares_pools_and_closes_them(fast_engine):
+    engine, _ = fast_engine
+    engine._background_reports = False
+    engine._is_work_hours_tick = lambda tick: True
+    engine.advance(120, "auto")
+
+    stats = engine.executor_stats()
+    assert "planning" in stats
+    # Start-up planning fans out on its own pool, not the (default single-worker) hourly one
+    assert stats["initial_planning"]["limit"] == 4
+    assert stats["summaries"]["failed"] == 0
+
+    engine.close()
+    with pytest.raises(RuntimeError):
+        engine._executors.pool("planning")
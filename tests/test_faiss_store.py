@@ -0,0 +1,92 @@
+"""Tests for FaissStore bulk vector export and the memory-mappable vectors file."""
+
+import numpy as np
+import pytest
+
+from virtualoffice.clustering import faiss_store
+from virtualoffice.clustering.cluster_engine import ClusterEngine
+from virtualoffice.clustering.faiss_store import FaissStore, delete_store_for_persona, load_vectors_for_persona
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(faiss_store, "INDEX_DIR", tmp_path)
+    store = FaissStore(7, dimension=4)
+    store.add_vectors(np.arange(12, dtype=np.float32).reshape(3, 4), [10, 11, 12])
+    return store
+
+
+def test_vectors_export_as_copy_or_read_only_view(store):
+    expected = np.arange(12, dtype=np.float32).reshape(3, 4)
+
+    copied = store.get_all_vectors()
+    view = store.get_all_vectors(copy=False)
+
+    np.testing.assert_array_equal(copied, expected)
+    np.testing.assert_array_equal(view, expected)
+    assert not view.flags.writeable and not view.flags.owndata
+    copied[0, 0] = 99
+    assert store.get_all_vectors()[0, 0] == 0
+
+    with pytest.raises(ValueError):
+        FaissStore(8, dimension=4).get_all_vectors()
+
+
+def test_saves_write_new_generations_and_drop_old_ones(store):
+    store.save()
+    first = store.vectors_path
+    store.add_vectors(np.ones((1, 4), dtype=np.float32), [13])
+    store.save()
+
+    assert first.name == "email_embeddings_7.vectors.1.npy" and not first.exists()
+    assert store.vectors_path.name == "email_embeddings_7.vectors.2.npy"
+    vectors, email_ids = load_vectors_for_persona(7)
+    assert vectors.shape == (4, 4) and email_ids == [10, 11, 12, 13]
+
+
+def test_saved_vectors_are_memory_mapped(store):
+    store.save()
+
+    vectors, email_ids = load_vectors_for_persona(7)
+
+    assert isinstance(vectors, np.memmap) and vectors.dtype == np.float32
+    np.testing.assert_array_equal(vectors, store.get_all_vectors())
+    assert email_ids == [10, 11, 12]
+
+    # Indexes saved before the .npy existed are read from the index itself
+    store.vectors_path.unlink()
+    vectors, email_ids = load_vectors_for_persona(7)
+    assert not isinstance(vectors, np.memmap) and vectors.shape == (3, 4)
+
+    store.save()
+    delete_store_for_persona(7)
+    assert store.vectors_path is None
+    assert load_vectors_for_persona(7) is None
+
+
+def test_corpus_reuses_indexed_vectors_only_when_they_match(clustering_env):
+    for i in range(12):
+        clustering_env.add_email(f"Budget line {i}", f"Numbers for line {i}")
+    engine = ClusterEngine(reducer="pca", dbscan_min_samples=2)
+    engine.build_index(clustering_env.persona_id)
+    calls = len(clustering_env.embedded)
+
+    corpus = engine.load_corpus(clustering_env.persona_id, reuse_index=True)
+    assert isinstance(corpus.embeddings, np.memmap) and corpus.embeddings.shape == (12, 64)
+    assert len(clustering_env.embedded) == calls
+
+    # Rebuilding from the mapped corpus saves a new generation instead of replacing the mapped file
+    mapped_path = FaissStore(clustering_env.persona_id).vectors_path
+    engine.build_index(clustering_env.persona_id, corpus=corpus)
+    assert float(np.abs(corpus.embeddings).sum()) > 0
+    assert FaissStore(clustering_env.persona_id).vectors_path != mapped_path
+
+    clustering_env.add_email("Budget line 12", "Numbers for line 12")
+    corpus = engine.load_corpus(clustering_env.persona_id, reuse_index=True)
+    assert not isinstance(corpus.embeddings, np.memmap) and len(corpus.email_ids) == 13
+
+    # Vectors from another embedding model are never reused
+    clustering_env.embedded.clear()
+    engine.build_index(clustering_env.persona_id)
+    ClusterEngine(embedding_model="other-model").load_corpus(clustering_env.persona_id, reuse_index=True)
+    assert [len(texts) for texts in clustering_env.embedded] == [13]
@@ -0,0 +1,297 @@
+"""Tests for queued sends on the HTTP gateways and the batch endpoints behind them."""
+
+import importlib
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from virtualoffice.common.db import get_connection
+from virtualoffice.sim_manager.gateways import HttpChatGateway, HttpEmailGateway, style_queued
+
+
+@pytest.fixture
+def servers(tmp_path, monkeypatch):
+    monkeypatch.setenv("VDOS_DB_PATH", str(tmp_path / "vdos.db"))
+    importlib.reload(importlib.import_module("virtualoffice.common.db"))
+    email_app = importlib.reload(importlib.import_module("virtualoffice.servers.email.app"))
+    chat_app = importlib.reload(importlib.import_module("virtualoffice.servers.chat.app"))
+
+    with TestClient(email_app.app) as email_http, TestClient(chat_app.app) as chat_http:
+        requests = []
+        for client in (email_http, chat_http):
+            client.event_hooks["request"].append(lambda request: requests.append((request.method, request.url.path)))
+        yield email_http, chat_http, requests
+
+
+def test_queued_emails_are_sent_in_one_request(servers):
+    email_http, _, requests = servers
+    gateway = HttpEmailGateway("http://email", client=email_http)
+    sent = []
+
+    for i in range(3):
+        gateway.queue_email(
+            sender="lead@vdos.local",
+            to=[f"dev{i}@vdos.local"],
+            subject=f"Task {i}",
+            body="Please pick this up.",
+            sent_at_iso="2025-01-06T09:00:00",
+            on_sent=sent.append,
+        )
+    assert requests == []
+    assert sent == []
+
+    assert gateway.flush() == 3
+    assert requests == [("POST", "/emails/send-batch")]
+    assert [email["subject"] for email in (email_http.get(f"/emails/{r['id']}").json() for r in sent)] == [
+        "Task 0",
+        "Task 1",
+        "Task 2",
+    ]
+
+    # Nothing left to send
+    assert gateway.flush() == 0
+    assert len(requests) == 4
+
+
+def test_queue_email_validates_recipients_immediately(servers):
+    email_http, _, _ = servers
+    gateway = HttpEmailGateway("http://email", client=email_http)
+
+    with pytest.raises(ValueError):
+        gateway.queue_email(sender="lead@vdos.local", to=[""], subject="x", body="y")
+    assert gateway.flush() == 0
+
+
+def test_queued_chat_messages_flush_one_request_per_kind(servers):
+    _, chat_http, requests = servers
+    gateway = HttpChatGateway("http://chat", client=chat_http)
+    room = gateway.create_room("Ops", ["lead", "analyst"], slug="ops")
+    requests.clear()
+    dm_ids, room_ids = [], []
+
+    gateway.queue_dm("lead", "analyst", "Numbers?", on_sent=lambda r: dm_ids.append(r["id"]))
+    gateway.queue_dm("analyst", "lead", "Sending now", on_sent=lambda r: dm_ids.append(r["id"]))
+    gateway.queue_room_message(room["slug"], "lead", "Deploy at 3", on_sent=lambda r: room_ids.append(r["id"]))
+
+    assert gateway.flush() == 3
+    assert requests == [("POST", "/dms/batch"), ("POST", "/rooms/messages/batch")]
+    history = chat_http.get("/rooms/dm:analyst:lead/messages").json()
+    assert [entry["id"] for entry in history] == dm_ids
+    assert [entry["body"] for entry in chat_http.get("/rooms/ops/messages").json()] == ["Deploy at 3"]
+    assert len(room_ids) == 1
+
+
+def test_discard_queued_drops_only_messages_after_the_mark(servers):
+    _, chat_http, requests = servers
+    gateway = HttpChatGateway("http://chat", client=chat_http)
+    gateway.queue_dm("lead", "analyst", "Kept")
+    mark = gateway.queue_mark()
+    gateway.queue_dm("lead", "analyst", "Rolled back")
+    gateway.queue_room_message("ops", "lead", "Rolled back")
+
+    assert gateway.discard_queued(mark) == 2
+    assert gateway.flush() == 1
+    assert requests == [("POST", "/dms/batch")]
+    assert [entry["body"] for entry in chat_http.get("/rooms/dm:analyst:lead/messages").json()] == ["Kept"]
+
+
+class _RecordingStyleFilter:
+    """Uppercases messages and records each batch it is asked to style."""
+
+    def __init__(self):
+        self.batches = []
+
+    def is_enabled(self):
+        return True
+
+    async def apply_filter_batch(self, requests, tick=None):
+        self.batches.append(([(r.persona_id, r.message_type, r.message) for r in requests], tick))
+        return [SimpleNamespace(styled_message=r.message.upper()) for r in requests]
+
+
+def test_style_queued_styles_both_gateways_in_one_pass(servers):
+    email_http, chat_http, _ = servers
+    style_filter = _RecordingStyleFilter()
+    email_gateway = HttpEmailGateway("http://email", client=email_http, style_filter=style_filter)
+    chat_gateway = HttpChatGateway("http://chat", client=chat_http, style_filter=style_filter)
+    ids = []
+
+    email_gateway.queue_email(
+        sender="lead@vdos.local", to=["dev@vdos.local"], subject="Plan", body="Ship it", persona_id=1, on_sent=ids.append
+    )
+    chat_gateway.queue_dm("lead", "dev", "On my way", persona_id=1)
+    chat_gateway.queue_dm("dev", "lead", "Thanks", persona_id=2)
+    chat_gateway.queue_dm("bot", "lead", "unstyled")  # no persona: sent as-is
+
+    assert style_queued(email_gateway, chat_gateway, tick=12) == 3
+    assert style_filter.batches == [
+        (
+            [(1, "email", "Plan"), (1, "email", "Ship it"), (1, "chat", "On my way"), (2, "chat", "Thanks")],
+            12,
+        )
+    ]
+
+    # Already styled messages are not styled again on flush
+    assert email_gateway.flush() == 1
+    assert chat_gateway.flush() == 3
+    assert len(style_filter.batches) == 1
+
+    email = email_http.get(f"/emails/{ids[0]['id']}").json()
+    assert (email["subject"], email["body"]) == ("PLAN", "SHIP IT")
+    bodies = [m["body"] for m in chat_http.get("/rooms/dm:dev:lead/messages").json()]
+    assert bodies == ["ON MY WAY", "THANKS"]
+
+
+def _fail(*args, **kwargs):
+    raise httpx.ConnectError("email server unavailable")
+
+
+def test_failed_batch_falls_back_to_individual_sends(servers, monkeypatch):
+    email_http, _, requests = servers
+    gateway = HttpEmailGateway("http://email", client=email_http)
+    monkeypatch.setattr(gateway, "send_emails_batch", _fail)
+    sent = []
+
+    for i in range(2):
+        gateway.queue_email(sender="lead@vdos.local", to=[f"dev{i}@vdos.local"], subject=f"Task {i}", body="Go", on_sent=sent.append)
+
+    assert gateway.flush() == 2
+    assert requests == [("POST", "/emails/send"), ("POST", "/emails/send")]
+    assert [email_http.get(f"/emails/{r['id']}").json()["subject"] for r in sent] == ["Task 0", "Task 1"]
+
+
+def test_unsent_messages_stay_queued_after_a_failed_flush(servers, monkeypatch):
+    _, chat_http, requests = servers
+    gateway = HttpChatGateway("http://chat", client=chat_http)
+    ids = []
+    gateway.queue_dm("lead", "analyst", "Numbers?", on_sent=lambda r: ids.append(r["id"]))
+
+    with monkeypatch.context() as patched:
+        patched.setattr(gateway, "send_dms_batch", _fail)
+        patched.setattr(gateway, "_post_dm", _fail)
+        assert gateway.flush() == 0
+    assert ids == []
+
+    assert gateway.flush() == 1
+    assert requests == [("POST", "/dms/batch")]
+    assert [m["id"] for m in chat_http.get("/rooms/dm:analyst:lead/messages").json()] == ids
+
+
+def test_retried_batch_is_not_stored_twice(servers, monkeypatch):
+    email_http, _, _ = servers
+    gateway = HttpEmailGateway("http://email", client=email_http)
+    send_batch = gateway.send_emails_batch
+
+    def stored_then_timed_out(payloads):
+        send_batch(payloads)
+        raise httpx.ReadTimeout("no response")
+
+    monkeypatch.setattr(gateway, "send_emails_batch", stored_then_timed_out)
+    sent = []
+    for i in range(2):
+        gateway.queue_email(sender="lead@vdos.local", to=["dev@vdos.local"], subject=f"Task {i}", body="Go", on_sent=sent.append)
+
+    assert gateway.flush() == 2
+
+    inbox = email_http.get("/mailboxes/dev@vdos.local/emails").json()
+    assert sorted(email["subject"] for email in inbox) == ["Task 0", "Task 1"]
+    assert sorted(r["id"] for r in sent) == sorted(email["id"] for email in inbox)
+
+
+class _QueueingEmailGateway:
+    """Batching email gateway that records flushes and can fail them."""
+
+    def __init__(self):
+        self.queued = []
+        self.flushes = 0
+        self.fail = False
+
+    def ensure_mailbox(self, address, display_name=None):
+        pass
+
+    def send_email(self, **kwargs):
+        return {"id": 1}
+
+    def queue_email(self, on_sent=None, **kwargs):
+        self.queued.append(on_sent)
+
+    def flush(self, tick=None):
+        self.flushes += 1
+        if self.fail:
+            raise httpx.ConnectError("email server unavailable")
+        queued, self.queued = self.queued, []
+        for index, on_sent in enumerate(queued):
+            on_sent({"id": 100 + index})
+        return len(queued)
+
+    def close(self):
+        pass
+
+
+def _advance_with_scheduled_emails(engine, gateway):
+    lead = engine.list_people()[0]
+    engine.email_gateway = gateway
+    tick = engine._fetch_state().current_tick + 1
+    while not engine._is_work_hours_tick(tick):
+        tick += 1
+    engine._schedule_direct_comm(lead.id, tick, "email", "client@example.com", "Status | All good")
+    engine._schedule_direct_comm(lead.id, tick, "email", "partner@example.com", "Plan | Next steps")
+    try:
+        engine.advance(tick - engine._fetch_state().current_tick, "manual")
+    except Exception:
+        pass
+    with get_connection() as conn:
+        return [row["subject"] for row in conn.execute("SELECT subject FROM worker_exchange_log WHERE channel = 'email'")]
+
+
+def test_engine_flushes_once_per_tick_and_logs_delivered_mail(fast_engine, monkeypatch):
+    monkeypatch.setenv("VDOS_EXTERNAL_STAKEHOLDERS", "client@example.com,partner@example.com")
+    engine, _ = fast_engine
+    gateway = _QueueingEmailGateway()
+
+    assert sorted(_advance_with_scheduled_emails(engine, gateway)) == ["Plan", "Status"]
+    assert gateway.flushes == 1
+
+
+def test_engine_does_not_log_mail_from_a_failed_flush(fast_engine, monkeypatch):
+    monkeypatch.setenv("VDOS_EXTERNAL_STAKEHOLDERS", "client@example.com,partner@example.com")
+    engine, _ = fast_engine
+    gateway = _QueueingEmailGateway()
+    gateway.fail = True
+
+    assert _advance_with_scheduled_emails(engine, gateway) == []
+
+
+def test_sick_leave_coverage_email_goes_through_the_send_batch(fast_engine):
+    from virtualoffice.sim_manager.schemas import PersonCreate
+
+    engine, _ = fast_engine
+    lead = engine.list_people()[0]
+    dev = engine.create_person(
+        PersonCreate(
+            name="Unit Dev",
+            role="Engineer",
+            timezone="UTC",
+            work_hours="09:00-18:00",
+            break_frequency="50/10 cadence",
+            communication_style="Direct",
+            email_address="dev@vdos.local",
+            chat_handle="dev",
+            skills=["Python"],
+            personality=["Calm"],
+        )
+    )
+    gateway = _QueueingEmailGateway()
+    engine.email_gateway = gateway
+    engine._random = SimpleNamespace(random=lambda: 0.0, choice=lambda people: people[-1])
+
+    with engine._tick_send_batch(61):
+        engine._maybe_generate_events([lead, dev], 61, {})
+        assert gateway.flushes == 0
+
+    assert gateway.flushes == 1
+    with get_connection() as conn:
+        subjects = [row["subject"] for row in conn.execute("SELECT subject FROM worker_exchange_log WHERE channel = 'email'")]
+    assert "Coverage needed: Unit Dev is out sick" in subjects
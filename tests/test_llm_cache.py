@@ -0,0 +1,117 @@
+"""Tests for the content-addressed LLM response cache."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from virtualoffice.sim_manager.planner import GPTPlanner
+from virtualoffice.utils import completion_util
+from virtualoffice.utils import llm_cache
+from virtualoffice.utils import llm_client
+from virtualoffice.utils.llm_cache import LLMResponseCache, make_key
+from virtualoffice.utils.llm_scheduler import Priority
+
+MESSAGES = [{"role": "system", "content": "You plan."}, {"role": "user", "content": "Plan 09:00"}]
+
+
+def test_key_depends_on_model_messages_temperature_and_params():
+    base = make_key("gpt-4o", MESSAGES, 0.2)
+    assert base == make_key("gpt-4o", [dict(m) for m in MESSAGES], 0.2)
+    assert base != make_key("gpt-4o-mini", MESSAGES, 0.2)
+    assert base != make_key("gpt-4o", MESSAGES, 0.3)
+    assert base != make_key("gpt-4o", MESSAGES[:1], 0.2)
+    assert base != make_key("gpt-4o", MESSAGES, 0.2, {"max_tokens": 10})
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path):
+    cache = LLMResponseCache(tmp_path / "cache.db", max_entries=2)
+    cache.put("a", "A", 1)
+    time.sleep(0.01)
+    cache.put("b", "B", 1)
+    time.sleep(0.01)
+    assert cache.get("a") == ("A", 1)  # touch a, so b is now least recently used
+    time.sleep(0.01)
+    cache.put("c", "C", 1)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ("A", 1)
+    assert cache.get("c") == ("C", 1)
+    assert cache.stats()["evictions"] == 1
+    cache.close()
+
+
+def test_per_method_ttl(tmp_path):
+    cache = LLMResponseCache(tmp_path / "cache.db", ttls={"hourly_plan": 0.05})
+    cache.put("k1", "plan", 10, method="hourly_plan")
+    cache.put("k2", "report", 10, method="daily_report")
+    time.sleep(0.1)
+
+    assert cache.get("k1", "hourly_plan") is None
+    assert cache.get("k2", "daily_report") == ("report", 10)
+
+    stats = cache.stats()
+    assert stats["methods"]["hourly_plan"] == {"hits": 0, "misses": 1, "stores": 1}
+    assert stats["methods"]["daily_report"]["hits"] == 1
+    assert stats["entries"] == 1
+    cache.close()
+
+
+@pytest.fixture
+def cached_llm(tmp_path, monkeypatch):
+    monkeypatch.setenv("VDOS_LLM_CACHE", "1")
+    monkeypatch.setenv("VDOS_LLM_CACHE_PATH", str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(
+        completion_util,
+        "_prepare_request",
+        lambda model, temperature: ("openai_key1", False, model, model, temperature),
+    )
+    monkeypatch.setattr(completion_util, "_record_tokens", lambda *args: None)
+    calls = []
+
+    async def create(**params):
+        calls.append(params)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=f"reply #{len(calls)}"))],
+            usage=SimpleNamespace(total_tokens=42),
+        )
+
+    client = llm_client.AsyncLLMClient()
+    client._clients["openai_key1"] = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(llm_client, "_client", client)
+    llm_cache.reset_cache()
+    yield calls
+    llm_cache.reset_cache()
+
+
+def test_generate_text_replays_identical_requests_from_cache(cached_llm):
+    calls = cached_llm
+
+    first = completion_util.generate_text(MESSAGES, model="gpt-4o", temperature=0.7)
+    second = completion_util.generate_text(MESSAGES, model="gpt-4o", temperature=0.7)
+    other = completion_util.generate_text(MESSAGES, model="gpt-4o", temperature=0.1)
+
+    assert first == ("reply #1", 42)
+    assert second == ("reply #1", 0)  # cache hits cost nothing
+    assert other == ("reply #2", 42)
+    assert len(calls) == 2
+    stats = llm_cache.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+
+def test_planner_calls_are_counted_per_method(cached_llm):
+    planner = GPTPlanner()
+
+    for _ in range(3):
+        result = planner._invoke(MESSAGES, "gpt-4o-mini", Priority.HOURLY_PLAN, "hourly_plan")
+
+    assert result.content == "reply #1"
+    assert len(cached_llm) == 1
+    assert llm_cache.cache_stats()["methods"]["hourly_plan"] == {"hits": 2, "misses": 1, "stores": 1}
+
+
+def test_cache_is_opt_in(monkeypatch):
+    monkeypatch.delenv("VDOS_LLM_CACHE", raising=False)
+    llm_cache.reset_cache()
+    assert llm_cache.get_cache() is None
+    assert llm_cache.cache_stats() == {"enabled": False}
@@ -0,0 +1,133 @@
+"""Tests for the shared async LLM client and background event loop."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from virtualoffice.utils import completion_util
+from virtualoffice.utils import llm_client
+
+
+class FakeCompletions:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.threads = set()
+
+    async def create(self, **params):
+        self.calls.append(params)
+        self.threads.add(threading.current_thread().name)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        content = f"echo: {params['messages'][-1]['content']}"
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(total_tokens=7),
+        )
+
+
+class FakeClient:
+    def __init__(self, delay: float = 0.0):
+        self.chat = SimpleNamespace(completions=FakeCompletions(delay))
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    """Route the shared client to an in-process fake and capture token records."""
+    recorded = []
+    monkeypatch.setattr(
+        completion_util,
+        "_prepare_request",
+        lambda model, temperature: ("openai_key1", False, model, model, temperature),
+    )
+    monkeypatch.setattr(completion_util, "_record_tokens", lambda *args: recorded.append(args))
+    fake = FakeClient()
+    monkeypatch.setitem(llm_client.get_client()._clients, "openai_key1", fake)
+    return fake.chat.completions, recorded
+
+
+def test_run_sync_reuses_one_background_loop():
+    async def where():
+        return threading.current_thread().name, id(asyncio.get_running_loop())
+
+    first = llm_client.run_sync(where())
+    second = llm_client.run_sync(where())
+
+    assert first == second
+    assert first[0] == "vdos-llm-loop"
+
+
+def test_blocking_from_loop_thread_raises():
+    async def nested():
+        async def noop():
+            return 1
+
+        llm_client.get_loop().run(noop())
+
+    with pytest.raises(RuntimeError, match="shared LLM event loop"):
+        llm_client.run_sync(nested())
+
+
+def test_generate_text_uses_pooled_async_client(fake_provider):
+    completions, recorded = fake_provider
+
+    text, tokens = completion_util.generate_text(
+        [{"role": "user", "content": "hi"}], model="gpt-4o-mini", temperature=0.2, max_tokens=50
+    )
+
+    assert (text, tokens) == ("echo: hi", 7)
+    assert completions.calls[0]["max_tokens"] == 50
+    assert completions.calls[0]["temperature"] == 0.2
+    assert completions.threads == {"vdos-llm-loop"}
+    assert recorded == [(7, "openai_key1", "gpt-4o-mini")]
+
+
+def test_agenerate_text_bridges_from_foreign_loop(fake_provider):
+    completions, _ = fake_provider
+
+    async def caller():
+        return await asyncio.gather(
+            *(llm_client.agenerate_text([{"role": "user", "content": str(i)}]) for i in range(3))
+        )
+
+    results = asyncio.run(caller())
+
+    assert [text for text, _ in results] == ["echo: 0", "echo: 1", "echo: 2"]
+    assert completions.threads == {"vdos-llm-loop"}
+
+
+def test_concurrency_cap_is_enforced(monkeypatch):
+    monkeypatch.setattr(
+        completion_util,
+        "_prepare_request",
+        lambda model, temperature: ("openai_key1", False, model, model, temperature),
+    )
+    monkeypatch.setattr(completion_util, "_record_tokens", lambda *args: None)
+    client = llm_client.AsyncLLMClient(max_concurrency=2)
+    fake = FakeClient(delay=0.02)
+    client._clients["openai_key1"] = fake
+
+    async def burst():
+        return await asyncio.gather(
+            *(client.complete([{"role": "user", "content": str(i)}]) for i in range(6))
+        )
+
+    results = asyncio.run(burst())
+
+    assert len(results) == 6
+    assert fake.chat.completions.max_in_flight == 2
+
+
+def test_max_concurrency_from_env(monkeypatch):
+    monkeypatch.setenv("VDOS_LLM_MAX_CONCURRENCY", "3")
+    assert llm_client.AsyncLLMClient().max_concurrency == 3
+    monkeypatch.setenv("VDOS_LLM_MAX_CONCURRENCY", "bogus")
+    assert llm_client.AsyncLLMClient().max_concurrency == 16
@@ -0,0 +1,166 @@
+"""Tests for the LLM request scheduler (priority lanes, rate limits, 429 backoff)."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from virtualoffice.utils import completion_util
+from virtualoffice.utils import llm_client
+from virtualoffice.utils.llm_scheduler import (
+    LLMScheduler,
+    Priority,
+    TokenBucket,
+    current_priority,
+    priority_scope,
+)
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after: str | None):
+        super().__init__("rate limited")
+        headers = {"retry-after": retry_after} if retry_after else {}
+        self.response = SimpleNamespace(headers=headers)
+
+
+class FlakyCompletions:
+    """Returns 429 for the first ``failures`` calls, then succeeds."""
+
+    def __init__(self, failures: int = 0, retry_after: str | None = None):
+        self.failures = failures
+        self.retry_after = retry_after
+        self.call_times = []
+
+    async def create(self, **params):
+        self.call_times.append(time.monotonic())
+        if self.failures:
+            self.failures -= 1
+            raise RateLimitError(self.retry_after)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))],
+            usage=SimpleNamespace(total_tokens=5),
+        )
+
+
+@pytest.fixture
+def fake_request(monkeypatch):
+    monkeypatch.setattr(
+        completion_util,
+        "_prepare_request",
+        lambda model, temperature: ("openai_key1", False, model, model, temperature),
+    )
+    monkeypatch.setattr(completion_util, "_record_tokens", lambda *args: None)
+
+
+def _client(completions, **kwargs):
+    client = llm_client.AsyncLLMClient(**kwargs)
+    client.scheduler.backoff_base = 0.05
+    client._clients["openai_key1"] = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return client
+
+
+def test_higher_priority_lane_is_served_first():
+    scheduler = LLMScheduler(max_concurrency=1, rpm=0, tpm=0, overrides={})
+    order = []
+
+    async def request(priority):
+        async with scheduler.slot("p", "m", priority):
+            order.append(priority)
+
+    async def scenario():
+        await scheduler.acquire("p", "m", Priority.SUMMARY)  # occupy the only slot
+        tasks = [
+            asyncio.create_task(request(priority))
+            for priority in (Priority.CLUSTER_LABEL, Priority.STYLE_FILTER, Priority.HOURLY_PLAN, Priority.INBOX_REPLY)
+        ]
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()["lanes"]["cluster_label"]["queued"] == 1
+        scheduler.release()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+
+    assert order == [Priority.HOURLY_PLAN, Priority.INBOX_REPLY, Priority.STYLE_FILTER, Priority.CLUSTER_LABEL]
+    stats = scheduler.stats()
+    assert stats["in_flight"] == 0
+    assert stats["lanes"]["hourly_plan"]["granted"] == 1
+    assert all(lane["queued"] == 0 for lane in stats["lanes"].values())
+
+
+def test_token_bucket_refills_at_configured_rate():
+    bucket = TokenBucket(60)  # one token per second, burst of 60
+    now = 1000.0
+    bucket._updated = now
+    assert bucket.delay_for(60, now) == 0
+    bucket.take(60, now)
+    assert bucket.delay_for(1, now) == pytest.approx(1.0)
+    assert bucket.delay_for(1, now + 0.5) == pytest.approx(0.5)
+    assert TokenBucket(0).delay_for(10**9, now) == 0
+
+
+def test_requests_per_minute_limit_spaces_out_requests():
+    # 600 rpm with a burst of 600: drain it, then the next request waits ~0.1s
+    scheduler = LLMScheduler(max_concurrency=4, rpm=600, tpm=0, overrides={})
+
+    async def scenario():
+        scheduler._state("p", "m")[1].requests.tokens = 0
+        start = time.monotonic()
+        async with scheduler.slot("p", "m"):
+            return time.monotonic() - start
+
+    waited = asyncio.run(scenario())
+    assert 0.08 <= waited < 0.5
+
+
+def test_per_model_override_takes_precedence():
+    scheduler = LLMScheduler(rpm=100, tpm=1000, overrides={"gpt-4o": {"rpm": 5}, "azure/gpt-4o": {"tpm": 7}})
+    assert scheduler._state("openai_key1", "gpt-4o")[1].requests.rate_per_min == 5
+    assert scheduler._state("azure", "gpt-4o")[1].tokens.rate_per_min == 7
+    assert scheduler._state("azure", "gpt-4o-mini")[1].requests.rate_per_min == 100
+
+
+def test_429_pauses_all_requests_for_the_model(fake_request):
+    completions = FlakyCompletions(failures=1, retry_after="0.2")
+    client = _client(completions, max_concurrency=4, max_retries=2)
+
+    async def scenario():
+        first = asyncio.create_task(client.complete([{"role": "user", "content": "a"}], model="m"))
+        await asyncio.sleep(0.02)  # let the 429 land before the second request
+        second = asyncio.create_task(client.complete([{"role": "user", "content": "b"}], model="m"))
+        return await asyncio.gather(first, second)
+
+    results = asyncio.run(scenario())
+
+    assert [text for text, _ in results] == ["ok", "ok"]
+    # Both later calls waited out the Retry-After window opened by the first 429
+    assert completions.call_times[1] - completions.call_times[0] >= 0.18
+    assert completions.call_times[2] - completions.call_times[0] >= 0.18
+    stats = client.scheduler.stats()
+    assert stats["retries"] == 1
+    assert stats["limits"]["openai_key1/m"]["rate_limited"] == 1
+
+
+def test_429_gives_up_after_max_retries(fake_request):
+    client = _client(FlakyCompletions(failures=5), max_retries=1)
+
+    with pytest.raises(RuntimeError, match="OpenAI completion failed"):
+        asyncio.run(client.complete([{"role": "user", "content": "a"}], model="m"))
+
+    assert client.scheduler.stats()["limits"]["openai_key1/m"]["rate_limited"] == 1
+
+
+def test_priority_scope_is_captured_in_calling_thread(fake_request, monkeypatch):
+    client = _client(FlakyCompletions())
+    monkeypatch.setattr(llm_client, "_client", client)
+
+    with priority_scope(Priority.INBOX_REPLY):
+        assert current_priority() is Priority.INBOX_REPLY
+        completion_util.generate_text([{"role": "user", "content": "hi"}], model="m")
+    assert current_priority() is Priority.SUMMARY
+
+    lanes = llm_client.scheduler_stats()["lanes"]
+    assert lanes["inbox_reply"]["granted"] == 1
+    assert lanes["summary"]["granted"] == 0
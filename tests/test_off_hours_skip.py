@@ -0,0 +1,98 @@
+"""Tests for closed-form off-hours tick skipping in SimulationEngine.advance()."""
+
+import sqlite3
+
+import pytest
+
+from virtualoffice.sim_manager.engine import SimulationEngine
+
+
+def _bare_engine(hours_per_day: int) -> SimulationEngine:
+    engine = SimulationEngine.__new__(SimulationEngine)
+    engine.hours_per_day = hours_per_day
+    return engine
+
+
+@pytest.mark.parametrize("hours_per_day", [8, 6, 10, 24])
+def test_next_work_hours_tick_matches_linear_scan(hours_per_day):
+    engine = _bare_engine(hours_per_day)
+    day_ticks = hours_per_day * 60
+    horizon = day_ticks * 15
+    expected = None
+    # Walk backwards so each tick knows the next work tick at or after it.
+    for tick in range(horizon, 0, -1):
+        if engine._is_work_hours_tick(tick):
+            expected = tick
+        if expected is not None:
+            assert engine._next_work_hours_tick(tick) == expected, tick
+
+
+def test_next_work_hours_tick_none_when_day_has_no_work_window():
+    engine = _bare_engine(3)  # 180-tick day never reaches tick_of_day 180
+    assert engine._next_work_hours_tick(1) is None
+
+
+def test_advance_logs_one_row_per_skipped_range(fast_engine):
+    engine, db_path = fast_engine
+    day_ticks = engine.hours_per_day * 60
+
+    # Advance from tick 0 to the last tick of Monday: one skip before 09:00,
+    # 161 work ticks, then one skip for the evening.
+    result = engine.advance(day_ticks, "test")
+
+    assert result.ticks_advanced == day_ticks
+    assert result.current_tick == day_ticks
+    assert engine.get_current_tick() == day_ticks
+
+    conn = sqlite3.connect(db_path)
+    try:
+        skips = conn.execute(
+            "SELECT tick, reason FROM tick_log WHERE reason LIKE 'off_hours_skip%' ORDER BY id"
+        ).fetchall()
+        work_rows = conn.execute("SELECT COUNT(*) FROM tick_log WHERE reason = 'test'").fetchone()[0]
+    finally:
+        conn.close()
+
+    assert skips == [
+        (180, "off_hours_skip:1-180"),
+        (day_ticks, f"off_hours_skip:342-{day_ticks}"),
+    ]
+    assert work_rows == 161
+
+
+def test_advance_jumps_over_weekend(fast_engine):
+    engine, _ = fast_engine
+    day_ticks = engine.hours_per_day * 60
+    # Park the clock at the end of Friday's work window.
+    engine.set_current_tick(4 * day_ticks + 341)
+
+    result = engine.advance(3 * day_ticks, "test")
+
+    assert result.current_tick == 7 * day_ticks + 341
+    assert engine._next_work_hours_tick(4 * day_ticks + 342) == 7 * day_ticks + 181
+
+
+def test_simulation_report_anchors_milestones_on_the_configured_day_length(fast_engine, monkeypatch):
+    engine, db_path = fast_engine
+    engine.hours_per_day = 10
+    day_ticks = engine.hours_per_day * 60
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(
+            "INSERT INTO tick_log(tick, reason) VALUES (?, 'auto')",
+            [(181,), (day_ticks + 181,), (480 + 181,)],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    tick_logs = []
+    generate = engine.planner.generate_simulation_report
+
+    def record(**kwargs):
+        tick_logs.append(kwargs["tick_log"])
+        return generate(**kwargs)
+
+    monkeypatch.setattr(engine.planner, "generate_simulation_report", record)
+    engine._generate_simulation_report(engine.get_project_plan(), total_ticks=day_ticks * 2)
+
+    assert tick_logs == [f"Tick 181: auto\nTick {day_ticks + 181}: auto"]
@@ -0,0 +1,98 @@
+"""Tests for the in-process persona cache in SimulationEngine."""
+
+import sys
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+from virtualoffice.sim_manager.schemas import PersonCreate, ScheduleBlockIn
+
+
+def _payload(name: str, handle: str, **overrides) -> PersonCreate:
+    data = {
+        "name": name,
+        "role": "Engineer",
+        "timezone": "UTC",
+        "work_hours": "09:00-18:00",
+        "break_frequency": "50/10 cadence",
+        "communication_style": "Direct",
+        "email_address": f"{handle}@vdos.local",
+        "chat_handle": handle,
+        "skills": ["Python"],
+        "personality": ["Calm"],
+    }
+    data.update(overrides)
+    return PersonCreate(**data)
+
+
+@contextmanager
+def _count_connections(engine):
+    module = sys.modules[type(engine).__module__]
+    original = module.get_connection
+    calls = []
+
+    def counting(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    module.get_connection = counting
+    try:
+        yield calls
+    finally:
+        module.get_connection = original
+
+
+def test_list_people_is_served_from_memory(fast_engine):
+    engine, _ = fast_engine
+    first = engine.list_people()
+
+    with _count_connections(engine) as calls:
+        again = engine.list_people()
+        person = engine.get_person(first[0].id)
+
+    assert calls == []
+    assert [p.id for p in again] == [p.id for p in first]
+    assert person is again[0]
+
+
+def test_create_and_delete_invalidate_the_cache(fast_engine):
+    engine, _ = fast_engine
+    version = engine.people_version
+    engine.list_people()
+
+    created = engine.create_person(
+        _payload(
+            "Cache Dev",
+            "cachedev",
+            schedule=[ScheduleBlockIn(start="09:00", end="12:00", activity="Focus"), ScheduleBlockIn(start="13:00", end="18:00", activity="Review")],
+        )
+    )
+    assert engine.people_version > version
+    listed = {p.id: p for p in engine.list_people()}
+    assert [block.activity for block in listed[created.id].schedule] == ["Focus", "Review"]
+
+    assert engine.delete_person_by_name("Cache Dev") is True
+    assert created.id not in {p.id for p in engine.list_people()}
+
+
+def test_roster_loads_with_one_bulk_schedule_query(fast_engine):
+    engine, _ = fast_engine
+    for i in range(5):
+        engine.create_person(_payload(f"Bulk {i}", f"bulk{i}", schedule=[ScheduleBlockIn(start="09:00", end="18:00", activity="Work")]))
+    engine.invalidate_people_cache()
+
+    with _count_connections(engine) as calls:
+        people = engine.list_people()
+
+    assert len(calls) == 1
+    assert all(len(p.schedule) == 1 for p in people if p.name.startswith("Bulk"))
+
+
+def test_invalidation_reaches_the_style_filter(fast_engine):
+    engine, _ = fast_engine
+    style_filter = MagicMock()
+    engine.email_gateway.style_filter = style_filter
+    engine.chat_gateway.style_filter = style_filter
+
+    engine.invalidate_people_cache(7)
+
+    style_filter.invalidate_persona_cache.assert_called_once_with(7)
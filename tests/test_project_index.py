@@ -0,0 +1,85 @@
+"""Tests for the in-memory project/assignment index."""
+
+import sqlite3
+
+from virtualoffice.sim_manager.project_index import ProjectIndex
+
+
+def _project(pid, start_week, duration_weeks, name=None):
+    return {"id": pid, "project_name": name or f"P{pid}", "start_week": start_week, "duration_weeks": duration_weeks}
+
+
+def _index():
+    projects = [
+        _project(3, 2, 2),  # weeks 2-3, assigned to 1 and 2
+        _project(1, 1, 2),  # weeks 1-2, assigned to 1
+        _project(2, 1, 4),  # weeks 1-4, no assignments: everyone
+        _project(4, 3, 1),  # week 3, assigned to 3
+    ]
+    return ProjectIndex(projects, [(3, 1), (3, 2), (1, 1), (4, 3)])
+
+
+def test_projects_for_person_lists_assigned_first_then_unassigned():
+    index = _index()
+
+    assert [p["id"] for p in index.projects_for_person(1, 2)] == [1, 3, 2]
+    assert [p["id"] for p in index.projects_for_person(3, 2)] == [2]
+    assert [p["id"] for p in index.projects_for_person(3, 3)] == [4, 2]
+    assert index.projects_for_person(1, 9) == []
+
+
+def test_returned_projects_are_copies():
+    index = _index()
+    index.projects_for_person(1, 1)[0]["project_name"] = "changed"
+    assert index.projects_for_person(1, 1)[0]["project_name"] == "P1"
+
+
+def test_shares_project():
+    index = _index()
+
+    assert index.shares_project(1, 2, 2)  # project 3
+    assert index.shares_project(1, 3, 1)  # project 2 is everyone's
+    assert not index.shares_project(1, 3, 9)
+
+
+def test_collaborator_ids():
+    index = _index()
+
+    assert index.collaborator_ids(1, 2) == {2}
+    assert index.collaborator_ids(1, 2, project_id=3) == {2}
+    # Not on project 4 or the project is not active that week
+    assert index.collaborator_ids(1, 3, project_id=4) == set()
+    assert index.collaborator_ids(2, 1, project_id=3) == set()
+    # No assigned active project: everyone else
+    assert index.collaborator_ids(5, 2) is None
+    assert not index.is_assigned(5) and index.is_assigned(3)
+
+
+def test_load_from_database():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.executescript(
+        """
+        CREATE TABLE project_plans (id INTEGER PRIMARY KEY, project_name TEXT, start_week INTEGER, duration_weeks INTEGER);
+        CREATE TABLE project_assignments (project_id INTEGER, person_id INTEGER);
+        INSERT INTO project_plans VALUES (1, 'Alpha', 1, 2), (2, 'Beta', 2, 1);
+        INSERT INTO project_assignments VALUES (2, 7);
+        """
+    )
+
+    index = ProjectIndex.load(conn, dict)
+
+    assert [p["project_name"] for p in index.active_projects(2)] == ["Alpha", "Beta"]
+    assert index.project_ids_for_person(7, 2) == (2, 1)
+
+
+def test_engine_index_follows_project_deletion(fast_engine):
+    engine, _ = fast_engine
+    person_id = engine.list_people()[0].id
+    projects = engine._get_all_active_projects_for_person(person_id, 1)
+    assert [p["project_name"] for p in projects] == ["UoW"]
+
+    engine.delete_project(projects[0]["id"])
+
+    assert engine._get_all_active_projects_for_person(person_id, 1) == []
+    assert not engine._validate_project_pair(person_id, person_id, 1)
@@ -0,0 +1,77 @@
+"""Tests for the pluggable 3D reducers and their saved models."""
+
+import importlib.util
+
+import numpy as np
+import pytest
+
+from virtualoffice.clustering import db
+from virtualoffice.clustering.cluster_engine import ClusterEngine
+from virtualoffice.clustering.embedding_util import generate_embeddings_cached
+from virtualoffice.clustering.reducer import Reducer, load_reducer_for_persona, reducer_path
+
+
+def _blobs(n_per_topic=20, topics=3, dimension=128, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(topics, dimension)) * 5
+    return np.vstack([center + rng.normal(size=(n_per_topic, dimension)) for center in centers]).astype(np.float32)
+
+
+@pytest.mark.parametrize("method", ["tsne", "pca"])
+def test_reducers_are_seeded_and_normalized(method):
+    embeddings = _blobs()
+
+    first = Reducer(method, pca_components=10).fit_transform(embeddings)
+    second = Reducer(method, pca_components=10).fit_transform(embeddings)
+
+    assert first.shape == (60, 3)
+    np.testing.assert_allclose(first, second)
+    np.testing.assert_allclose(first.min(axis=0), 0, atol=1e-6)
+    np.testing.assert_allclose(first.max(axis=0), 100, atol=1e-4)
+
+
+@pytest.mark.parametrize("method", ["tsne", "pca"])
+def test_saved_reducer_places_new_points_without_refitting(tmp_path, method):
+    embeddings = _blobs()
+    reducer = Reducer(method, pca_components=10)
+    coordinates = reducer.fit_transform(embeddings)
+    reducer.save(tmp_path / "reducer.pkl")
+
+    loaded = Reducer.load(tmp_path / "reducer.pkl")
+    near_first = loaded.transform(embeddings[:1] + 0.01)
+
+    assert loaded._pca.n_components_ == (3 if method == "pca" else 10)
+    # A point next to a training point lands next to it in the map
+    assert np.linalg.norm(near_first[0] - coordinates[0]) < 5
+
+
+def test_unknown_or_missing_reducers_are_rejected():
+    with pytest.raises(ValueError, match="Unknown reducer"):
+        Reducer("isomap")
+    if importlib.util.find_spec("umap") is None:
+        with pytest.raises(ValueError, match="umap-learn"):
+            Reducer("umap")
+
+
+def test_build_saves_the_reducer_and_updates_reuse_it(clustering_env):
+    for topic in ("Budget", "Hiring", "Release"):
+        for i in range(10):
+            clustering_env.add_email(f"{topic} update {i}", f"Notes on {topic.lower()} item {i}")
+    engine = ClusterEngine(reducer="pca", dbscan_eps=25, dbscan_min_samples=2)
+    engine.build_index(clustering_env.persona_id)
+    reducer = load_reducer_for_persona(clustering_env.persona_id)
+    assert reducer is not None and reducer.method == "pca"
+
+    new_id = clustering_env.add_email("Budget update 10", "Notes on budget item 10")
+    engine.update_index(clustering_env.persona_id)
+
+    # The embedding cache returns the vector the update used
+    embedding, _ = generate_embeddings_cached(["Subject: Budget update 10\n\nNotes on budget item 10"])
+    expected = reducer.transform(embedding)[0]
+    np.testing.assert_allclose(db.get_email_coordinates(clustering_env.persona_id)[new_id][:3], expected, rtol=1e-5)
+
+    # Precomputed coordinates come without a fitted model, so the stale one is removed
+    corpus = engine.load_corpus(clustering_env.persona_id)
+    engine.build_index(clustering_env.persona_id, corpus=corpus, coordinates_3d=np.zeros((31, 3)))
+    assert not reducer_path(clustering_env.persona_id).exists()
+
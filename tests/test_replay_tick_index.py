@@ -0,0 +1,112 @@
+"""Tests for the replay tick index (tick_messages) and its backfill."""
+
+import importlib
+from datetime import datetime, timezone
+
+import pytest
+
+from virtualoffice.common.db import get_connection
+from virtualoffice.sim_manager.replay_manager import ReplayManager, backfill_tick_messages, tick_for_timestamp
+
+
+BASE = datetime(2025, 1, 6, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def replay(fast_engine):
+    engine, _ = fast_engine
+    # The email/chat servers share the database; create their tables as they would on startup
+    importlib.import_module("virtualoffice.servers.email.app").initialise()
+    importlib.import_module("virtualoffice.servers.chat.app").initialise()
+    with get_connection() as conn:
+        conn.execute("INSERT INTO mailboxes(address) VALUES ('lead@vdos.local'), ('dev@vdos.local')")
+        conn.execute("INSERT INTO chat_users(handle) VALUES ('lead')")
+        conn.execute("INSERT INTO chat_rooms(slug, name, is_dm) VALUES ('dm:dev:lead', 'DM', 1)")
+    return engine, ReplayManager(engine)
+
+
+def _store_email(subject, sent_at, recipients=("dev@vdos.local",)):
+    with get_connection() as conn:
+        email_id = conn.execute(
+            "INSERT INTO emails(sender, subject, body, sent_at) VALUES ('lead@vdos.local', ?, 'Body', ?)",
+            (subject, sent_at),
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO email_recipients(email_id, address, kind) VALUES (?, ?, 'to')",
+            [(email_id, address) for address in recipients],
+        )
+    return email_id
+
+
+def _store_chat(body, sent_at):
+    with get_connection() as conn:
+        return conn.execute(
+            "INSERT INTO chat_messages(room_id, sender, body, sent_at) VALUES (1, 'lead', ?, ?)", (body, sent_at)
+        ).lastrowid
+
+
+def test_tick_for_timestamp_inverts_the_engine_clock(fast_engine):
+    engine, _ = fast_engine
+    engine._sim_base_dt = BASE
+    for tick in (1, 60, 480, 481, 1000):
+        assert tick_for_timestamp(engine._sim_datetime_for_tick(tick).isoformat(), BASE, 8) == tick
+
+    assert tick_for_timestamp("2025-01-06 09:00:00", BASE, 8) == 1
+    assert tick_for_timestamp("2025-01-06T08:59:00+00:00", BASE, 8) is None
+    assert tick_for_timestamp("2025-01-06T17:00:00+00:00", BASE, 8) is None
+    assert tick_for_timestamp("not a date", BASE, 8) is None
+
+
+def test_tick_data_comes_from_the_index(replay):
+    engine, manager = replay
+    first = _store_email("Status", "2025-01-06T09:04:00+00:00", recipients=("dev@vdos.local", "lead@vdos.local"))
+    second = _store_email("Later", "2025-01-06T09:04:00+00:00")
+    chat = _store_chat("Ping", "2025-01-06T09:04:00+00:00")
+    _store_email("Unindexed", "2025-01-06T09:04:00+00:00")
+
+    engine._index_tick_message(5, "email", {"id": second})
+    engine._index_tick_message(5, "email", {"id": first})
+    engine._index_tick_message(5, "chat", {"id": chat})
+    engine._index_tick_message(5, "chat", {"id": "chat-5-1"})  # fallback ids are not indexed
+
+    data = manager.get_tick_data(5)
+
+    assert [(email["id"], email["recipients"]) for email in data["emails"]] == [
+        (first, ["dev@vdos.local", "lead@vdos.local"]),
+        (second, ["dev@vdos.local"]),
+    ]
+    assert [message["body"] for message in data["chats"]] == ["Ping"]
+    assert manager.get_tick_data(6) == {"emails": [], "chats": []}
+
+
+def test_dispatch_records_the_tick(fast_engine):
+    engine, _ = fast_engine
+    lead = engine.list_people()[0]
+
+    engine._track_sent_dm(lead, None, {"id": 42}, payload="Hi", current_tick=7, fallback_id="chat-7-1")
+
+    with get_connection() as conn:
+        rows = conn.execute("SELECT tick, channel, message_id FROM tick_messages").fetchall()
+    assert [tuple(row) for row in rows] == [(7, "chat", 42)]
+
+
+def test_backfill_indexes_existing_messages_once(replay):
+    engine, manager = replay
+    with get_connection() as conn:
+        conn.execute("UPDATE simulation_state SET sim_base_dt = ?", (BASE.isoformat(),))
+    email_id = _store_email("Old", "2025-01-07T10:30:00+00:00")
+    chat_id = _store_chat("Old chat", "2025-01-06 09:00:00")
+    _store_chat("Night", "2025-01-06T23:00:00+00:00")
+
+    assert backfill_tick_messages(8) == {"email": {"indexed": 1, "skipped": 0}, "chat": {"indexed": 1, "skipped": 1}}
+    assert backfill_tick_messages(8)["email"] == {"indexed": 0, "skipped": 0}
+
+    assert [email["id"] for email in manager.get_tick_data(480 + 91)["emails"]] == [email_id]
+    assert [chat["id"] for chat in manager.get_tick_data(1)["chats"]] == [chat_id]
+
+
+def test_backfill_needs_a_base_datetime(replay):
+    with get_connection() as conn:
+        conn.execute("UPDATE simulation_state SET sim_base_dt = NULL")
+    with pytest.raises(ValueError):
+        backfill_tick_messages(8)
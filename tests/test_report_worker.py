@@ -0,0 +1,133 @@
+"""Tests for the background hourly-summary/daily-report worker and its engine wiring."""
+
+import threading
+
+from fastapi.testclient import TestClient
+
+from virtualoffice.common.db import get_connection
+from virtualoffice.sim_manager.report_worker import DAILY_REPORT, HOURLY_SUMMARY, ReportWorker
+
+
+def _worker(handlers, **kwargs):
+    kwargs.setdefault("hours_per_day", 8)
+    kwargs.setdefault("retry_delay", 0.01)
+    kwargs.setdefault("poll_interval", 0.01)
+    return ReportWorker(handlers, **kwargs)
+
+
+def test_day_boundary_only_enqueues_reports(fast_engine):
+    engine, _ = fast_engine
+    lead = engine.list_people()[0]
+    # The day's last tick is normally skipped as off-hours; process every tick to reach it
+    engine._is_work_hours_tick = lambda tick: True
+
+    engine.advance(480, "auto")
+
+    jobs = engine.list_report_jobs(kind=DAILY_REPORT)
+    assert [(job["person_id"], job["period_index"], job["enqueued_tick"]) for job in jobs] == [(lead.id, 0, 480)]
+    assert engine.list_report_jobs(kind=HOURLY_SUMMARY)
+
+    assert engine.wait_for_reports(timeout=30)
+    status = engine.report_job_status()
+    assert status["pending"] == 0 and status["totals"]["failed"] == 0
+    assert [report["day_index"] for report in engine.list_daily_reports(lead.id)] == [0]
+
+
+def test_stop_drains_queued_reports_before_the_simulation_report(fast_engine):
+    engine, _ = fast_engine
+    engine._is_work_hours_tick = lambda tick: True
+    engine.advance(480, "auto")
+    pending_at_report = []
+    generate = engine._generate_simulation_report
+
+    def record(*args, **kwargs):
+        pending_at_report.append(engine.report_job_status()["pending"])
+        return generate(*args, **kwargs)
+
+    engine._generate_simulation_report = record
+    engine.stop()
+
+    assert pending_at_report == [0]
+
+
+def test_enqueue_is_idempotent(fast_engine):
+    worker = _worker({HOURLY_SUMMARY: lambda person_id, period: None})
+
+    assert worker.enqueue(HOURLY_SUMMARY, [1, 2], 3) == 2
+    assert worker.enqueue(HOURLY_SUMMARY, [2, 1], 3) == 0
+    assert worker.status()["totals"]["queued"] == 2
+
+
+def test_failing_jobs_are_retried_then_marked_failed(fast_engine):
+    calls = []
+
+    def flaky(person_id, period):
+        calls.append(person_id)
+        if person_id == 2 or calls.count(person_id) == 1:
+            raise RuntimeError("planner unavailable")
+
+    worker = _worker({HOURLY_SUMMARY: flaky}, max_attempts=3)
+    worker.enqueue(HOURLY_SUMMARY, [1, 2], 0)
+    worker.start()
+    try:
+        assert worker.wait_idle(timeout=10)
+    finally:
+        worker.stop()
+
+    jobs = {job["person_id"]: job for job in worker.list_jobs()}
+    assert (jobs[1]["status"], jobs[1]["attempts"], jobs[1]["last_error"]) == ("done", 2, None)
+    assert (jobs[2]["status"], jobs[2]["attempts"]) == ("failed", 3)
+    assert jobs[2]["last_error"] == "RuntimeError: planner unavailable"
+
+
+def test_daily_report_waits_for_that_days_hourly_summaries(fast_engine):
+    release = threading.Event()
+    order = []
+
+    def hourly(person_id, period):
+        release.wait(5)
+        order.append(("hourly", period))
+
+    worker = _worker({HOURLY_SUMMARY: hourly, DAILY_REPORT: lambda p, d: order.append(("daily", d))}, max_workers=2)
+    worker.enqueue(HOURLY_SUMMARY, [1], 7)
+    worker.enqueue(DAILY_REPORT, [1], 0)
+    worker.start()
+    try:
+        threading.Event().wait(0.2)
+        assert order == []
+        release.set()
+        assert worker.wait_idle(timeout=10)
+    finally:
+        worker.stop()
+
+    assert order == [("hourly", 7), ("daily", 0)]
+
+
+def test_start_requeues_interrupted_jobs(fast_engine):
+    done = []
+    worker = _worker({DAILY_REPORT: lambda person_id, day: done.append(day)})
+    worker.enqueue(DAILY_REPORT, [1], 4)
+    with get_connection() as conn:
+        conn.execute("UPDATE report_jobs SET status = 'running'")
+
+    worker.start()
+    try:
+        assert worker.wait_idle(timeout=10)
+    finally:
+        worker.stop()
+    assert done == [4]
+
+
+def test_report_jobs_endpoint(fast_engine):
+    engine, _ = fast_engine
+    engine.advance(240, "auto")
+    engine.wait_for_reports(timeout=30)
+
+    from virtualoffice.sim_manager.app import create_app
+
+    with TestClient(create_app(engine)) as client:
+        body = client.get("/api/v1/reports/jobs", params={"kind": HOURLY_SUMMARY}).json()
+
+    assert body["summary"]["background"] is True
+    assert body["summary"]["pending"] == 0
+    assert all(job["kind"] == HOURLY_SUMMARY for job in body["jobs"])
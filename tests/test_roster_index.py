@@ -0,0 +1,88 @@
+"""Tests for RosterIndex target resolution and CC helpers."""
+
+from virtualoffice.sim_manager.roster_index import RosterIndex, parse_external_stakeholders
+from virtualoffice.sim_manager.schemas import PersonRead
+
+
+def _person(pid, name, handle, role="Engineer", head=False):
+    return PersonRead(
+        id=pid,
+        name=name,
+        role=role,
+        timezone="UTC",
+        work_hours="09:00-18:00",
+        break_frequency="50/10",
+        communication_style="Direct",
+        email_address=f"{handle}@vdos.local",
+        chat_handle=handle,
+        skills=["x"],
+        personality=["y"],
+        is_department_head=head,
+        persona_markdown="",
+    )
+
+
+def _roster():
+    people = [
+        _person(1, "김지훈", "jihoon", role="Product Manager", head=True),
+        _person(2, "Dana Dev", "Dana", role="Backend Developer"),
+        _person(3, "Sam Designer", "sam", role="UI Designer"),
+    ]
+    return RosterIndex(people, parse_external_stakeholders(" Client@Partner.com , ,legal@partner.com"))
+
+
+def test_match_target_by_email_handle_and_name():
+    roster = _roster()
+
+    assert roster.match_target(" DANA@vdos.local ") == ("Dana@vdos.local", None)
+    assert roster.match_target("dana") == (None, "Dana")
+    assert roster.match_target("@Dana") == (None, "Dana")
+    assert roster.match_target("김지훈") == ("jihoon@vdos.local", "jihoon")
+    assert roster.match_target("sam designer") == ("sam@vdos.local", "sam")
+
+
+def test_unknown_targets():
+    roster = _roster()
+
+    assert roster.match_target("client@partner.com") == ("client@partner.com", None)
+    assert roster.match_target("ghost@vdos.local") == (None, None)
+    assert roster.match_target(" random-room ") == (None, "random-room")
+
+
+def test_first_person_in_roster_order_wins():
+    roster = RosterIndex([_person(1, "Alex", "alex"), _person(2, "alex", "alex2")])
+
+    # Handles are matched before names, so "alex" resolves to person 1's handle
+    assert roster.match_target("alex") == (None, "alex")
+    assert roster.match_target("alex2") == (None, "alex2")
+
+
+def test_cc_helpers():
+    roster = _roster()
+
+    assert roster.department_head.id == 1
+    assert [p.id for p in roster.people_with_role("dev")] == [2]
+    assert [p.id for p in roster.people_with_role("designer")] == [3]
+    assert roster.people_with_role("dev") is roster.people_with_role("dev")
+    assert set(roster.by_handle) == {"jihoon", "dana", "sam"}
+
+
+def test_engine_reuses_index_until_roster_changes(monkeypatch):
+    from virtualoffice.sim_manager.engine import SimulationEngine
+
+    engine = SimulationEngine.__new__(SimulationEngine)
+    engine._roster_index = None
+    engine._roster_index_key = None
+    people = {p.id: p for p in _roster().people}
+    monkeypatch.delenv("VDOS_EXTERNAL_STAKEHOLDERS", raising=False)
+
+    first = engine._roster_for(people)
+    assert engine._roster_for(dict(people)) is first
+
+    monkeypatch.setenv("VDOS_EXTERNAL_STAKEHOLDERS", "vendor@example.com")
+    second = engine._roster_for(people)
+    assert second is not first
+    assert second.match_target("vendor@example.com") == ("vendor@example.com", None)
+
+    people[4] = _person(4, "New Hire", "newbie")
+    assert engine._roster_for(people).match_target("newbie") == (None, "newbie")
@@ -609,6 +609,32 @@ def test_simulation_reset_endpoint(sim_client):
     assert plan is None
 
 
+def test_admin_hard_reset_clears_cached_people(sim_client):
+    client, _, _ = sim_client
+    payload = {
+        "name": "Hard Reset Tester",
+        "role": "QA",
+        "timezone": "UTC",
+        "work_hours": "09:00-17:00",
+        "break_frequency": "50/10 cadence",
+        "communication_style": "Async",
+        "email_address": "hard.reset@vdos.local",
+        "chat_handle": "hardreset",
+        "skills": ["Testing"],
+        "personality": ["Meticulous"],
+        "schedule": [
+            {"start": "09:00", "end": "10:00", "activity": "Plan"}
+        ],
+    }
+    assert client.post("/api/v1/people", json=payload).status_code == 201
+    assert len(client.get("/api/v1/people").json()) == 1
+
+    reset = client.post("/api/v1/admin/hard-reset")
+    assert reset.status_code == 200
+
+    assert client.get("/api/v1/people").json() == []
+
+
 def test_generate_persona_endpoint(sim_client, monkeypatch):
     client, _, _ = sim_client
     
@@ -5,13 +5,14 @@ Tests filter application with valid examples, random sampling, fallback behavior
 on API failure, and enable/disable toggle functionality.
 """
 
+import asyncio
 import json
 import pytest
 import sqlite3
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from virtualoffice.sim_manager.style_filter.filter import CommunicationStyleFilter
-from virtualoffice.sim_manager.style_filter.models import StyleExample, FilterResult
+from virtualoffice.sim_manager.style_filter.models import StyleExample, FilterResult, StyleRequest
 from virtualoffice.sim_manager.style_filter.metrics import FilterMetrics
 
 
@@ -241,7 +242,7 @@ class TestCommunicationStyleFilter:
         assert examples[0].content in prompt
 
     @pytest.mark.asyncio
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_apply_filter_success(self, mock_generate_text, db_connection, sample_style_examples):
         """Test successful filter application."""
         # Setup database
@@ -329,7 +330,7 @@ class TestCommunicationStyleFilter:
         assert result.error == "No style examples available"
 
     @pytest.mark.asyncio
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_apply_filter_api_failure(self, mock_generate_text, db_connection, sample_style_examples):
         """Test filter fallback behavior on API failure."""
         # Setup database
@@ -357,7 +358,7 @@ class TestCommunicationStyleFilter:
         assert "API connection failed" in result.error
 
     @pytest.mark.asyncio
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_apply_filter_removes_markdown(self, mock_generate_text, db_connection, sample_style_examples):
         """Test that filter removes markdown code blocks from response."""
         # Setup database
@@ -383,7 +384,7 @@ class TestCommunicationStyleFilter:
         assert "```" not in result.styled_message
 
     @pytest.mark.asyncio
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_apply_filter_email_type(self, mock_generate_text, db_connection, sample_style_examples):
         """Test filter application for email message type."""
         examples_json = json.dumps([ex.to_dict() for ex in sample_style_examples])
@@ -406,7 +407,7 @@ class TestCommunicationStyleFilter:
         assert result.styled_message == "Styled email message"
 
     @pytest.mark.asyncio
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_apply_filter_chat_type(self, mock_generate_text, db_connection, sample_style_examples):
         """Test filter application for chat message type."""
         examples_json = json.dumps([ex.to_dict() for ex in sample_style_examples])
@@ -429,7 +430,7 @@ class TestCommunicationStyleFilter:
         assert result.styled_message == "Styled chat message"
 
     @pytest.mark.asyncio
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_apply_filter_metrics_recorded(self, mock_generate_text, db_connection, sample_style_examples):
         """Test that filter records metrics on transformation."""
         examples_json = json.dumps([ex.to_dict() for ex in sample_style_examples])
@@ -480,3 +481,192 @@ class TestCommunicationStyleFilter:
         assert result.success is False
         assert result.styled_message == "Original message"
         assert result.error is not None
+
+
+class TestEmailFilter:
+    """Subject and body are rewritten together in a single JSON request."""
+
+    @pytest.fixture
+    def persona(self, db_connection, sample_style_examples):
+        examples_json = json.dumps([ex.to_dict() for ex in sample_style_examples])
+        db_connection.execute(
+            "INSERT INTO people (id, name, style_examples, style_filter_enabled) VALUES (?, ?, ?, ?)",
+            (1, "Test User", examples_json, 1)
+        )
+        db_connection.commit()
+        return 1
+
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
+    def test_single_call_returns_both_fields(self, mock_generate_text, db_connection, persona):
+        mock_generate_text.return_value = (
+            '```json\n{"subject": "Styled subject", "body": "Styled body"}\n```',
+            120,
+        )
+        filter_obj = CommunicationStyleFilter(db_connection, locale="en")
+
+        result = asyncio.run(filter_obj.apply_email_filter("Subject", "Body", persona_id=persona))
+
+        assert mock_generate_text.await_count == 1
+        messages = mock_generate_text.await_args.args[0]
+        assert json.loads(messages[1]["content"]) == {"subject": "Subject", "body": "Body"}
+        assert mock_generate_text.await_args.kwargs["response_format"] == {"type": "json_object"}
+        assert (result.styled_subject, result.styled_body) == ("Styled subject", "Styled body")
+        assert result.success is True
+        assert result.tokens_used == 120
+
+        asyncio.run(filter_obj.metrics._flush_batch())
+        rows = db_connection.execute("SELECT message_type, tokens_used FROM style_filter_metrics").fetchall()
+        assert rows == [("email", 120)]
+
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
+    def test_unparseable_response_falls_back_to_original(self, mock_generate_text, db_connection, persona):
+        mock_generate_text.return_value = ("Just some prose, not JSON", 40)
+        filter_obj = CommunicationStyleFilter(db_connection)
+
+        result = asyncio.run(filter_obj.apply_email_filter("Subject", "Body", persona_id=persona))
+
+        assert result.success is False
+        assert (result.styled_subject, result.styled_body) == ("Subject", "Body")
+        assert result.tokens_used == 40
+
+    def test_disabled_persona_skips_the_call(self, db_connection, persona):
+        db_connection.execute("UPDATE people SET style_filter_enabled = 0 WHERE id = ?", (persona,))
+        filter_obj = CommunicationStyleFilter(db_connection)
+
+        with patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock) as mock:
+            result = asyncio.run(filter_obj.apply_email_filter("Subject", "Body", persona_id=persona))
+
+        mock.assert_not_awaited()
+        assert result.success is True
+        assert result.styled_body == "Body"
+
+
+class TestBatchFilter:
+    """A tick's messages are rewritten with one request per persona."""
+
+    @pytest.fixture
+    def personas(self, db_connection, sample_style_examples):
+        examples_json = json.dumps([ex.to_dict() for ex in sample_style_examples])
+        db_connection.executemany(
+            "INSERT INTO people (id, name, style_examples, style_filter_enabled) VALUES (?, ?, ?, ?)",
+            [(1, "Alice", examples_json, 1), (2, "Bob", examples_json, 1), (3, "Carol", examples_json, 0)],
+        )
+        db_connection.commit()
+        return 1, 2, 3
+
+    @staticmethod
+    def _echo_styled(messages, **kwargs):
+        """Fake model: uppercase every message it was sent."""
+        sent = json.loads(messages[1]["content"])["messages"]
+        return json.dumps({"messages": [{"index": m["index"], "text": m["text"].upper()} for m in sent]}), 90
+
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
+    def test_one_request_per_persona_results_in_input_order(self, mock_generate_text, db_connection, personas):
+        mock_generate_text.side_effect = self._echo_styled
+        filter_obj = CommunicationStyleFilter(db_connection, locale="en")
+        requests = [
+            StyleRequest(1, "alice chat", "chat"),
+            StyleRequest(2, "bob subject", "email"),
+            StyleRequest(1, "alice email", "email"),
+            StyleRequest(3, "carol chat", "chat"),
+            StyleRequest(2, "bob body", "email"),
+        ]
+
+        results = asyncio.run(filter_obj.apply_filter_batch(requests, tick=7))
+
+        assert mock_generate_text.await_count == 2
+        assert [r.styled_message for r in results] == ["ALICE CHAT", "BOB SUBJECT", "ALICE EMAIL", "carol chat", "BOB BODY"]
+        assert all(r.success for r in results)
+        assert mock_generate_text.await_args.kwargs["response_format"] == {"type": "json_object"}
+        # Tokens of a request are split across its messages
+        assert sum(r.tokens_used for r in results) == 180
+
+        (tick,) = filter_obj.metrics.get_tick_metrics()
+        assert (tick["tick"], tick["messages"], tick["requests"], tick["tokens_used"], tick["fallbacks"]) == (7, 5, 2, 180, 0)
+
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
+    def test_missing_entries_fall_back_per_message(self, mock_generate_text, db_connection, personas):
+        mock_generate_text.return_value = (
+            json.dumps({"messages": [{"index": 1, "text": "Styled second"}, {"index": 9, "text": "stray"}]}),
+            60,
+        )
+        filter_obj = CommunicationStyleFilter(db_connection)
+        requests = [StyleRequest(1, "first", "chat"), StyleRequest(1, "second", "chat"), StyleRequest(1, "third", "chat")]
+
+        results = asyncio.run(filter_obj.apply_filter_batch(requests, tick=3))
+
+        assert [r.styled_message for r in results] == ["first", "Styled second", "third"]
+        assert [r.success for r in results] == [False, True, False]
+        assert filter_obj.metrics.get_tick_metrics()[-1]["fallbacks"] == 2
+
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
+    def test_unparseable_response_keeps_every_original(self, mock_generate_text, db_connection, personas):
+        mock_generate_text.return_value = ("Sorry, I can't do that.", 20)
+        filter_obj = CommunicationStyleFilter(db_connection)
+
+        results = asyncio.run(filter_obj.apply_filter_batch([StyleRequest(1, "hi", "chat"), StyleRequest(1, "yo", "chat")]))
+
+        assert [r.styled_message for r in results] == ["hi", "yo"]
+        assert not any(r.success for r in results)
+        # No tick given, so nothing is recorded per tick
+        assert filter_obj.metrics.get_tick_metrics() == []
+
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
+    def test_large_groups_are_split_by_batch_size(self, mock_generate_text, db_connection, personas):
+        mock_generate_text.side_effect = self._echo_styled
+        filter_obj = CommunicationStyleFilter(db_connection, batch_size=2)
+
+        results = asyncio.run(filter_obj.apply_filter_batch([StyleRequest(1, f"m{i}", "chat") for i in range(5)]))
+
+        assert mock_generate_text.await_count == 3
+        assert [r.styled_message for r in results] == ["M0", "M1", "M2", "M3", "M4"]
+
+
+class TestTickMetrics:
+    """Per-tick batch metrics kept by FilterMetrics."""
+
+    def test_passes_in_the_same_tick_are_summed(self, db_connection):
+        metrics = FilterMetrics(db_connection, max_tick_history=2)
+        asyncio.run(metrics.record_tick(1, messages=4, requests=2, tokens_used=100, latency_ms=50.0, fallbacks=0))
+        asyncio.run(metrics.record_tick(1, messages=2, requests=1, tokens_used=40, latency_ms=30.0, fallbacks=1))
+        asyncio.run(metrics.record_tick(2, messages=1, requests=1, tokens_used=10, latency_ms=5.0, fallbacks=0))
+        asyncio.run(metrics.record_tick(3, messages=1, requests=1, tokens_used=10, latency_ms=5.0, fallbacks=0))
+
+        ticks = metrics.get_tick_metrics()
+        assert [t["tick"] for t in ticks] == [2, 3]
+        assert metrics.get_tick_metrics(limit=1)[0]["tick"] == 3
+
+        metrics = FilterMetrics(db_connection)
+        asyncio.run(metrics.record_tick(1, messages=4, requests=2, tokens_used=100, latency_ms=50.0, fallbacks=0))
+        asyncio.run(metrics.record_tick(1, messages=2, requests=1, tokens_used=40, latency_ms=30.0, fallbacks=1))
+        (tick,) = metrics.get_tick_metrics()
+        assert (tick["messages"], tick["requests"], tick["tokens_used"], tick["latency_ms"], tick["fallbacks"]) == (6, 3, 140, 80.0, 1)
+
+
+class TestPersonaCache:
+    """Per-persona lookups are cached until invalidated."""
+
+    def test_enabled_flag_is_cached_until_invalidated(self, db_connection):
+        db_connection.execute(
+            "INSERT INTO people (id, name, style_filter_enabled) VALUES (?, ?, ?)",
+            (1, "Test User", 1)
+        )
+        db_connection.commit()
+        filter_obj = CommunicationStyleFilter(db_connection)
+        assert filter_obj._is_persona_enabled(1) is True
+
+        db_connection.execute("UPDATE people SET style_filter_enabled = 0 WHERE id = 1")
+        assert filter_obj._is_persona_enabled(1) is True
+
+        filter_obj.invalidate_persona_cache(1)
+        assert filter_obj._is_persona_enabled(1) is False
+
+    def test_invalidate_all_clears_examples(self, db_connection, sample_style_examples):
+        filter_obj = CommunicationStyleFilter(db_connection)
+        filter_obj._example_cache[1] = sample_style_examples
+        filter_obj._persona_enabled_cache[2] = True
+
+        filter_obj.invalidate_persona_cache()
+
+        assert filter_obj._example_cache == {}
+        assert filter_obj._persona_enabled_cache == {}
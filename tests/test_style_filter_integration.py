@@ -121,7 +121,7 @@ class TestStyleFilterIntegration:
         assert all(ex["content"] for ex in stored_examples)
 
     @pytest.mark.asyncio
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_send_email_with_filter(self, mock_generate_text, db_connection, sample_style_examples):
         """Test sending email through gateway with style filter applied."""
         # Setup persona with style examples
@@ -153,7 +153,7 @@ class TestStyleFilterIntegration:
         assert result.tokens_used == 85
 
     @pytest.mark.asyncio
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_send_chat_with_filter(self, mock_generate_text, db_connection, sample_style_examples):
         """Test sending chat message through gateway with style filter applied."""
         # Setup persona with style examples
@@ -185,7 +185,7 @@ class TestStyleFilterIntegration:
         assert result.tokens_used == 65
 
     @pytest.mark.asyncio
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_metrics_recorded_on_transformation(self, mock_generate_text, db_connection, sample_style_examples):
         """Test that metrics are recorded when filter transforms messages."""
         # Setup persona
@@ -227,7 +227,7 @@ class TestStyleFilterIntegration:
         assert row[2] == 1  # success
 
     @pytest.mark.asyncio
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_multiple_messages_different_personas(self, mock_generate_text, db_connection, sample_style_examples):
         """Test filtering messages from multiple personas."""
         # Setup two personas
@@ -270,7 +270,7 @@ class TestStyleFilterIntegration:
         assert result2.styled_message == "Styled message from persona 2"
 
     @pytest.mark.asyncio
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_filter_disabled_for_persona(self, mock_generate_text, db_connection, sample_style_examples):
         """Test that filter is bypassed when disabled for specific persona."""
         # Setup persona with filter disabled
@@ -299,7 +299,7 @@ class TestStyleFilterIntegration:
         assert "disabled for persona" in result.error
 
     @pytest.mark.asyncio
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_filter_fallback_on_api_failure(self, mock_generate_text, db_connection, sample_style_examples):
         """Test that filter falls back to original message on API failure."""
         # Setup persona
@@ -339,7 +339,7 @@ class TestStyleFilterIntegration:
         assert row[0] == 0  # failure
 
     @pytest.mark.asyncio
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_session_metrics_aggregation(self, mock_generate_text, db_connection, sample_style_examples):
         """Test that session metrics aggregate across multiple transformations."""
         # Setup persona
@@ -376,7 +376,7 @@ class TestStyleFilterIntegration:
         assert summary.by_message_type == {"email": 2, "chat": 1}
 
     @pytest.mark.asyncio
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_persona_specific_metrics(self, mock_generate_text, db_connection, sample_style_examples):
         """Test that persona-specific metrics are tracked correctly."""
         # Setup two personas
@@ -421,7 +421,7 @@ class TestStyleFilterIntegration:
 
     @pytest.mark.asyncio
     @patch('virtualoffice.sim_manager.style_filter.example_generator.generate_text')
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_full_workflow_persona_creation_to_message(
         self, mock_filter_generate, mock_example_generate, db_connection
     ):
@@ -479,7 +479,7 @@ class TestStyleFilterIntegration:
         assert summary.total_tokens == 88
 
     @pytest.mark.asyncio
-    @patch('virtualoffice.sim_manager.style_filter.filter.generate_text')
+    @patch('virtualoffice.sim_manager.style_filter.filter.agenerate_text', new_callable=AsyncMock)
     async def test_korean_persona_workflow(self, mock_generate_text, db_connection):
         """Test workflow with Korean persona and locale."""
         # Setup Korean persona with Korean examples
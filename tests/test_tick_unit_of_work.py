@@ -0,0 +1,130 @@
+"""Tests for the opt-in per-tick unit of work in SimulationEngine.advance()."""
+
+import sqlite3
+
+import pytest
+
+FIRST_WORK_TICK = 181  # tick_of_day 180 == 09:00 on day 0
+
+
+@pytest.fixture
+def uow_env(monkeypatch):
+    monkeypatch.setenv("VDOS_TICK_UNIT_OF_WORK", "1")
+
+
+@pytest.fixture
+def uow_engine(uow_env, fast_engine):
+    return fast_engine
+
+
+def _count(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql, params).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_tick_writes_are_committed_at_end_of_tick(uow_engine):
+    engine, db_path = uow_engine
+    engine.advance(FIRST_WORK_TICK, "test")
+
+    assert engine._tick_buffer is None
+    assert engine.get_current_tick() == FIRST_WORK_TICK
+    assert _count(db_path, "SELECT COUNT(*) FROM tick_log WHERE tick = ?", (FIRST_WORK_TICK,)) == 1
+    assert _count(db_path, "SELECT COUNT(*) FROM worker_plans WHERE plan_type = 'hourly' AND tick = ?", (FIRST_WORK_TICK,)) >= 1
+
+
+def test_failed_tick_rolls_back_buffered_writes(uow_engine, monkeypatch):
+    engine, db_path = uow_engine
+    engine.advance(FIRST_WORK_TICK - 1, "test")
+    plans_before = _count(db_path, "SELECT COUNT(*) FROM worker_plans")
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("crash mid-tick")
+
+    monkeypatch.setattr(engine, "_prepare_inbox_reply_request", boom)
+    with pytest.raises(RuntimeError, match="crash mid-tick"):
+        engine.advance(1, "test")
+
+    assert engine._tick_buffer is None
+    assert engine.get_current_tick() == FIRST_WORK_TICK - 1
+    assert _count(db_path, "SELECT COUNT(*) FROM tick_log WHERE tick = ?", (FIRST_WORK_TICK,)) == 0
+    assert _count(db_path, "SELECT COUNT(*) FROM worker_plans") == plans_before
+
+
+def test_pending_runtime_message_is_cancelled_when_drained():
+    from virtualoffice.sim_manager.engine import _InboundMessage, _TickWriteBuffer
+
+    buffer = _TickWriteBuffer()
+    message = _InboundMessage(
+        sender_id=1,
+        sender_name="A",
+        subject="s",
+        summary="b",
+        action_item=None,
+        message_type="email",
+        channel="email",
+        tick=1,
+    )
+    buffer.add("INSERT INTO worker_runtime_messages(recipient_id, payload) VALUES (?, ?)", (2, "{}"), message)
+    buffer.add("INSERT INTO tick_log(tick, reason) VALUES (?, ?)", (1, "x"))
+
+    assert buffer.cancel_messages([message]) == 1
+    assert len(buffer) == 1
+
+
+def test_failed_tick_restores_in_memory_state(uow_engine, monkeypatch):
+    from virtualoffice.sim_manager.engine import _InboundMessage
+
+    engine, db_path = uow_engine
+    engine.advance(FIRST_WORK_TICK - 1, "test")
+    person = engine.list_people()[0]
+    inbox_before = list(engine._get_worker_runtime(person).inbox)
+    overrides_before = dict(engine._status_overrides)
+
+    def boom(*args, **kwargs):
+        engine._set_status_override(person.id, "SickLeave", FIRST_WORK_TICK + 60, "test")
+        engine._queue_runtime_message(
+            person,
+            _InboundMessage(
+                sender_id=person.id,
+                sender_name=person.name,
+                subject="s",
+                summary="b",
+                action_item=None,
+                message_type="email",
+                channel="email",
+                tick=FIRST_WORK_TICK,
+            ),
+        )
+        raise RuntimeError("crash mid-tick")
+
+    monkeypatch.setattr(engine, "_prepare_inbox_reply_request", boom)
+    with pytest.raises(RuntimeError, match="crash mid-tick"):
+        engine.advance(1, "test")
+
+    assert engine._status_overrides == overrides_before
+    assert engine._get_worker_runtime(person).inbox == inbox_before
+    assert _count(db_path, "SELECT COUNT(*) FROM worker_status_overrides") == len(overrides_before)
+
+
+def test_buffered_plan_checks_person_and_gets_id_on_commit(uow_engine):
+    from virtualoffice.sim_manager.engine import _TickWriteBuffer
+    from virtualoffice.sim_manager.planner import PlanResult
+
+    engine, db_path = uow_engine
+    person = engine.list_people()[0]
+    result = PlanResult(content="plan", model_used="stub", tokens_used=1)
+    engine._tick_buffer = buffer = _TickWriteBuffer()
+    try:
+        with pytest.raises(ValueError, match="not found"):
+            engine._store_worker_plan(person.id + 1000, 1, "hourly", result, None)
+        plan = engine._store_worker_plan(person.id, 1, "hourly", result, None)
+    finally:
+        engine._tick_buffer = None
+
+    assert len(buffer) == 1
+    assert plan["id"] is None and plan["created_at"]
+    buffer.flush()
+    assert plan["id"] == _count(db_path, "SELECT MAX(id) FROM worker_plans")
@@ -0,0 +1,84 @@
+"""Tests for the in-memory token usage ledger in completion_util."""
+
+import json
+import threading
+import time
+
+from virtualoffice.utils import completion_util
+from virtualoffice.utils.completion_util import TokenUsageLedger
+
+
+def test_concurrent_records_are_not_lost(tmp_path):
+    ledger = TokenUsageLedger(tmp_path / "usage.json", flush_interval=0)
+
+    def worker():
+        for _ in range(500):
+            ledger.record(2, "openai_key1", "mini")
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert ledger.daily("openai_key1", "mini") == 8 * 500 * 2
+    assert ledger.snapshot()["lifetime_usage"]["openai_key1"]["mini"] == 8 * 500 * 2
+    # Nothing touches the disk until a flush
+    assert not (tmp_path / "usage.json").exists()
+
+
+def test_flush_round_trips_through_file(tmp_path):
+    path = tmp_path / "usage.json"
+    ledger = TokenUsageLedger(path, flush_interval=0)
+    ledger.record(10, "azure", "regular")
+
+    assert ledger.flush() is True
+    assert ledger.flush() is False  # nothing new to write
+    assert not list(tmp_path.glob("*.tmp"))
+    assert json.loads(path.read_text())["daily_usage"]["azure"]["regular"] == 10
+
+    reloaded = TokenUsageLedger(path, flush_interval=0)
+    assert reloaded.daily("azure", "regular") == 10
+
+
+def test_background_flusher_writes_file(tmp_path):
+    path = tmp_path / "usage.json"
+    ledger = TokenUsageLedger(path, flush_interval=0.05)
+    ledger.record(3, "openai_key2", "mini")
+    try:
+        deadline = time.monotonic() + 2
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert json.loads(path.read_text())["daily_usage"]["openai_key2"]["mini"] == 3
+    finally:
+        ledger.close()
+
+
+def test_daily_counters_reset_on_new_utc_day(tmp_path, monkeypatch):
+    ledger = TokenUsageLedger(tmp_path / "usage.json", flush_interval=0)
+    monkeypatch.setattr(completion_util, "_utc_today", lambda: "2025-01-01")
+    ledger.record(100, "openai_key1", "regular")
+
+    monkeypatch.setattr(completion_util, "_utc_today", lambda: "2025-01-02")
+
+    assert ledger.daily("openai_key1", "regular") == 0
+    snapshot = ledger.snapshot()
+    assert snapshot["last_reset_date"] == "2025-01-02"
+    assert snapshot["lifetime_usage"]["openai_key1"]["regular"] == 100
+
+
+def test_auto_provider_choice_uses_in_memory_counters(tmp_path, monkeypatch):
+    ledger = TokenUsageLedger(tmp_path / "usage.json", flush_interval=0)
+    monkeypatch.setattr(completion_util, "_usage_ledger", ledger)
+    monkeypatch.setattr(completion_util, "_API_KEY", "key1")
+    monkeypatch.setattr(completion_util, "_API_KEY2", "key2")
+    monkeypatch.setenv("VDOS_API_PROVIDER", "auto")
+
+    assert completion_util._choose_provider("gpt-4o") == ("openai_key1", False)
+
+    completion_util._record_tokens(completion_util._FREE_TIER_LIMITS["regular"], "openai_key1", "gpt-4o")
+
+    assert completion_util._choose_provider("gpt-4o") == ("openai_key2", False)
+    # Mini models have their own, larger budget
+    assert completion_util._choose_provider("gpt-4o-mini") == ("openai_key1", False)
+    assert not (tmp_path / "usage.json").exists()
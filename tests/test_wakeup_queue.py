@@ -0,0 +1,139 @@
+"""Tests for event-driven auto-ticks: the wake-up heap, tick rounds and the engine wiring."""
+
+import sys
+from types import SimpleNamespace
+
+from virtualoffice.sim_manager.wakeup_queue import TickRound, WakeupQueue
+
+
+def _people(*ids):
+    people = [SimpleNamespace(id=person_id) for person_id in ids]
+    return people, {person.id: index for index, person in enumerate(people)}
+
+
+def test_pop_due_returns_everyone_due_up_to_the_tick():
+    queue = WakeupQueue()
+    queue.schedule(1, 10)
+    queue.schedule(2, 5)
+    queue.schedule(2, 5)  # duplicate
+    queue.schedule(3, 12)
+
+    assert len(queue) == 3
+    assert queue.next_tick() == 5
+    assert queue.pop_due(4) == set()
+    assert queue.pop_due(10) == {1, 2}
+    assert queue.next_tick() == 12
+
+    # A wake-up for a tick already reached fires on the next pop
+    queue.schedule(4, 0)
+    assert queue.pop_due(11) == {4}
+    assert queue.pop_due(12) == {3}
+    assert len(queue) == 0
+
+
+def test_tick_round_visits_in_roster_order_and_accepts_later_wakeups():
+    people, positions = _people(10, 20, 30, 40)
+    tick_round = TickRound(people, positions, [30, 10, 99])
+    visited = []
+
+    for person in tick_round:
+        visited.append(person.id)
+        if person.id == 10:
+            assert tick_round.wake(40) is True
+            assert tick_round.wake(30) is True  # already queued
+        if person.id == 30:
+            assert tick_round.wake(20) is False  # behind the cursor: next tick
+            assert tick_round.wake(30) is False
+            assert tick_round.wake(99) is False  # not on the roster
+
+    assert visited == [10, 30, 40]
+
+
+def _record_rounds(engine):
+    visited = []
+    iterate = engine._iter_tick_round
+
+    def recording(*args):
+        for person in iterate(*args):
+            visited.append(person.id)
+            yield person
+
+    engine._iter_tick_round = recording
+    return visited
+
+
+def _first_work_tick(engine):
+    return next(t for t in range(1, 2000) if engine._is_work_hours_tick(t))
+
+
+def test_auto_ticks_only_visit_personas_with_due_work(fast_engine):
+    engine, _ = fast_engine
+    lead = engine.list_people()[0]
+    visited = _record_rounds(engine)
+
+    # The lead's window opens at the first work tick of the day
+    engine.advance(_first_work_tick(engine), "auto")
+    assert visited == [lead.id]
+
+    visited.clear()
+    engine.advance(5, "auto")
+    assert visited == []
+
+    engine._schedule_direct_comm(lead.id, engine._fetch_state().current_tick + 2, "chat", "someone", "Ping")
+    engine.advance(2, "auto")
+    assert visited == [lead.id]
+
+    # Manual advances still visit everyone
+    visited.clear()
+    engine.advance(1, "manual")
+    assert visited == [lead.id]
+
+
+def test_inbox_arrival_wakes_the_recipient(fast_engine):
+    engine, _ = fast_engine
+    lead = engine.list_people()[0]
+    engine.advance(_first_work_tick(engine) + 3, "auto")
+    tick = engine._fetch_state().current_tick
+    visited = _record_rounds(engine)
+    module = sys.modules[type(engine).__module__]
+
+    engine._queue_runtime_message(
+        lead,
+        module._InboundMessage(
+            sender_id=0,
+            sender_name="Simulation Manager",
+            subject="Heads up",
+            summary="Client moved the demo",
+            action_item="Update the demo plan",
+            message_type="event",
+            channel="system",
+            tick=tick,
+        ),
+    )
+    engine.advance(2, "auto")
+
+    assert visited == [lead.id]
+    assert [plan["tick"] for plan in engine.list_worker_plans(lead.id, plan_type="hourly", limit=1)] == [tick + 1]
+
+
+def test_event_driven_ticks_can_be_disabled(fast_engine):
+    engine, _ = fast_engine
+    engine._event_driven_ticks = False
+    lead = engine.list_people()[0]
+    engine.advance(_first_work_tick(engine), "auto")
+    visited = _record_rounds(engine)
+
+    engine.advance(3, "auto")
+
+    assert visited == [lead.id] * 3
+    assert len(engine._wakeups) == 0
+
+
+def test_reset_drops_wakeups_from_the_previous_run(fast_engine):
+    engine, _ = fast_engine
+    lead = engine.list_people()[0]
+    engine._wake(lead.id, 5000)
+
+    engine.reset()
+
+    assert (5000, lead.id) not in engine._wakeups._pending